@@ -12,10 +12,12 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from src.constants import PROJECT_ROOT
 os.chdir(PROJECT_ROOT)
 
+from src import catalog_rollups, coverage_rollups
 from src.cli_errors import OperationalError
 from src.config import ConfigManager
 from src.local_manifest_archive import (
     active_archive_processes,
+    build_manifest_index,
     dry_run_export,
     execute_export,
     export_legacy_cold_database,
@@ -33,6 +35,7 @@ from src.directory_catalog_validation import (
     describe_database,
     validate_directory_catalog,
 )
+from src.manifest_search import rebuild_sidecars
 from src.pg_backup import (
     apply_directory_catalog_schema_to_database,
     create_migrated_database_from_backup,
@@ -720,7 +723,8 @@ def _run_frontier_bootstrap(cfg, args, parser):
                 remote_user=cfg.remote_user, remote_host=cfg.remote_host,
                 remote_password=cfg.remote_password,
                 skipped_tracker=SkippedFileTracker(), ui=ConsoleUI(),
-                timeout=cfg.ssh_command_timeout_seconds),
+                timeout=cfg.ssh_command_timeout_seconds,
+                persistent_session=cfg.scan_persistent_session),
             stop_event=threading.Event(), source_host=cfg.remote_host,
             ui=ConsoleUI(),
             # Real liveness evidence. Without these the bootstrap's
@@ -828,6 +832,51 @@ def _run_manifest_search(cfg, args):
     return 0
 
 
+def _run_manifest_index(cfg, args):
+    root = validate_archive_root(
+        cfg.local_manifest_archive_root, (cfg.staging_dir,))
+    _print_json(build_manifest_index(root))
+    return 0
+
+
+def _run_manifest_search_index(cfg, args):
+    root = validate_archive_root(
+        cfg.local_manifest_archive_root, (cfg.staging_dir,))
+    report = rebuild_sidecars(
+        [root] + list(args.manifest_dir or []),
+        force=args.rebuild_search_index_all)
+    _print_json(report)
+    return 1 if report["errors"] else 0
+
+
+def _coverage_settings(cfg):
+    """``(max_segs, threshold_bytes)`` the Storage Map web app refreshes with."""
+    from storage_map.lib import core as storage_map_core
+    from storage_map.webapp import coverage as cov
+    from storage_map.webapp.settings import load_webapp_config
+
+    smcfg = storage_map_core.load_storage_map_config(cfg)
+    webcfg = load_webapp_config(cfg, smcfg)
+    mounts = [m for srv in smcfg.servers for m in srv.mounts]
+    return (cov.max_segments(mounts, webcfg.match_depth),
+            int(cfg.index_min_file_mb * 1024 * 1024))
+
+
+def _run_coverage_rollups(cfg, args):
+    from storage_map.webapp.repository import CoverageRepository
+
+    max_segs, threshold_bytes = _coverage_settings(cfg)
+    report = {}
+    if args.rebuild_coverage_rollups:
+        report["rebuild"] = coverage_rollups.rebuild(
+            _conninfo(cfg), max_segs=max_segs,
+            threshold_bytes=threshold_bytes)
+    with CoverageRepository(_conninfo(cfg)) as repo:
+        report["verify"] = repo.verify_rollups(max_segs, threshold_bytes)
+    _print_json(report)
+    return 0 if report["verify"]["passed"] else 1
+
+
 def _run_manifest_prune(cfg, args):
     _require_maintenance_safe(cfg)
     if args.export_id is None:
@@ -1008,6 +1057,18 @@ def _build_parser():
                         help="Allow heavy explicit validation commands.")
     parser.add_argument("--validate-directory-catalog", action="store_true",
                         help="Print read-only directory catalog validation.")
+    parser.add_argument("--verify-directory-rollups", action="store_true",
+                        help="Compare stored directory subtree totals with "
+                             "the catalog (read-only).")
+    parser.add_argument("--rebuild-directory-rollups", action="store_true",
+                        help="Recompute every directory subtree total from "
+                             "the catalog.")
+    parser.add_argument("--verify-coverage-rollups", action="store_true",
+                        help="Compare the maintained Storage Map coverage "
+                             "totals with the full coverage query (read-only).")
+    parser.add_argument("--rebuild-coverage-rollups", action="store_true",
+                        help="Recompute the Storage Map coverage totals for "
+                             "the configured mounts, then verify them.")
     parser.add_argument("--compare-db", help="Source DB for row-count comparison.")
     parser.add_argument("--with-db", help="Target DB for row-count comparison.")
     parser.add_argument("--cleanup-session-data", action="store_true",
@@ -1021,6 +1082,18 @@ def _build_parser():
                         help="Hash and exactly validate a local manifest export.")
     parser.add_argument("--manifest-search",
                         help="Search permanent local small-file manifests.")
+    parser.add_argument("--index-local-manifests", action="store_true",
+                        help="Add unindexed local manifest segments to the "
+                             "point-lookup index.")
+    parser.add_argument("--rebuild-manifest-search-index", action="store_true",
+                        help="Write missing or stale trigram search sidecars "
+                             "for the local manifest archive.")
+    parser.add_argument("--manifest-dir", action="append",
+                        help="Extra directory of small-file manifests for "
+                             "--rebuild-manifest-search-index (repeatable).")
+    parser.add_argument("--rebuild-search-index-all", action="store_true",
+                        help="Rewrite every search sidecar, not only missing "
+                             "or stale ones.")
     parser.add_argument("--prune-exported-small-files",
                         action="store_true",
                         help="Prune only a validated immutable export snapshot.")
@@ -1150,6 +1223,18 @@ def _dispatch(parser, args):
         _print_json(validate_directory_catalog(_conninfo(cfg)))
         return 0
 
+    if args.verify_directory_rollups:
+        report = catalog_rollups.verify(_conninfo(cfg))
+        _print_json(report)
+        return 0 if report["passed"] else 1
+
+    if args.rebuild_directory_rollups:
+        _print_json(catalog_rollups.rebuild(_conninfo(cfg)))
+        return 0
+
+    if args.verify_coverage_rollups or args.rebuild_coverage_rollups:
+        return _run_coverage_rollups(cfg, args)
+
     if args.compare_db or args.with_db:
         if not args.compare_db or not args.with_db:
             parser.error("--compare-db requires --with-db")
@@ -1183,6 +1268,12 @@ def _dispatch(parser, args):
     if args.manifest_search:
         return _run_manifest_search(cfg, args)
 
+    if args.index_local_manifests:
+        return _run_manifest_index(cfg, args)
+
+    if args.rebuild_manifest_search_index:
+        return _run_manifest_search_index(cfg, args)
+
     if args.prune_exported_small_files:
         return _run_manifest_prune(cfg, args)
 
@@ -0,0 +1,232 @@
+"""Offline benchmark: local manifest name search, full scan vs trigram sidecars.
+
+Local-only like ``benchmark_pack.py``: no PostgreSQL, SSH, LTFS or tape. It
+writes a deterministic synthetic manifest archive (10M rows by default, in
+bundle-sized segments) with ``local_manifest_archive._write_segment``, which
+also writes each segment's lookup index entries and trigram search sidecar.
+Every query then runs twice through ``iter_manifest_records``:
+
+1. ``scan``: sidecars ignored, every segment decompressed and matched
+2. ``indexed``: as shipped, segments skipped or read only at candidate frames
+
+Queries cover a rare name (one row), a common token (every tenth row) and an
+absent name. Both flows must return the same rows. ``--scale`` shrinks the row
+count for a quick run.
+
+Output: ``storage_map_logs/benchmark_manifest_search/<timestamp>/summary.json``
+and ``summary.md`` unless ``--output-root`` says otherwise.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Sequence
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import src.local_manifest_archive as archive  # noqa: E402
+from src.manifest_search import SIDECAR_SUFFIX  # noqa: E402
+
+
+HARNESS_VERSION = "manifest-search-benchmark-v1"
+DEFAULT_OUTPUT_ROOT = (
+    REPO_ROOT / "storage_map_logs" / "benchmark_manifest_search")
+DEFAULT_ROWS = 10_000_000
+SEGMENT_ROWS = 50_000
+FLOWS = ("scan", "indexed")
+_PROJECTS = ("alpha", "borealis", "cobalt", "delta", "ember", "fjord",
+             "granite", "harbor")
+_KINDS = ("raw", "scans", "exports", "notes")
+_EXTENSIONS = (".tif", ".pdf", ".docx", ".csv", ".jpg")
+
+
+class HarnessError(RuntimeError):
+    pass
+
+
+def _iso_now():
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _machine_info():
+    return {
+        "platform": platform.platform(),
+        "python": sys.version.split()[0],
+        "cpu_logical": os.cpu_count(),
+    }
+
+
+def _row(index):
+    project = _PROJECTS[index % len(_PROJECTS)]
+    kind = _KINDS[(index // 7) % len(_KINDS)]
+    token = "report" if index % 10 == 0 else "item"
+    name = f"{token}_{index:08d}{_EXTENSIONS[index % len(_EXTENSIONS)]}"
+    return {
+        "source_file_id": index + 1,
+        "original_path": f"/data/{project}/{kind}/{index // 1000:05d}/{name}",
+        "file_name": name,
+        "file_size_bytes": 4096,
+        "tape_label": f"T{index // 1_000_000:05d}",
+        "is_packed": True,
+        "stored_path": f"{project}/{kind}/{name}",
+        "container_name": f"Bundle_{index // SEGMENT_ROWS:05d}.zip",
+    }
+
+
+def generate_archive(root, rows):
+    """Write ``rows`` synthetic rows; returns (segments, seconds)."""
+    started = time.perf_counter()
+    segments = 0
+    for first in range(0, rows, SEGMENT_ROWS):
+        last = min(rows, first + SEGMENT_ROWS)
+        archive._write_segment(
+            root, f"T1/s1/bundle_{segments + 1}.jsonl.zst",
+            (_row(index) for index in range(first, last)))
+        segments += 1
+    return segments, time.perf_counter() - started
+
+
+def _sizes(root):
+    segment_bytes = sidecar_bytes = 0
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            size = os.path.getsize(os.path.join(dirpath, name))
+            if name.endswith(SIDECAR_SUFFIX):
+                sidecar_bytes += size
+            elif name.endswith(".jsonl.zst"):
+                segment_bytes += size
+    return segment_bytes, sidecar_bytes
+
+
+def queries(rows):
+    rare = _row(rows // 2)["file_name"]
+    return {"rare": rare, "common": "report_", "absent": "no-such-file.xyz"}
+
+
+def run_query(root, query, flow):
+    if flow not in FLOWS:
+        raise HarnessError(f"unknown flow {flow!r}")
+    started = time.perf_counter()
+    if flow == "scan":
+        with mock.patch.object(archive, "candidate_frames",
+                               return_value=None):
+            ids = [row["source_file_id"]
+                   for row in archive.iter_manifest_records(root, query=query)]
+    else:
+        ids = [row["source_file_id"]
+               for row in archive.iter_manifest_records(root, query=query)]
+    return ids, time.perf_counter() - started
+
+
+def render_markdown(summary: dict) -> str:
+    lines = [f"# Manifest Search Benchmark ({summary['version']})", ""]
+    lines.append(
+        f"Run date: {summary['run_date_local']}. One local sample with a "
+        "page-cache-warm archive, not a suite average.")
+    lines.append("")
+    build = summary["build"]
+    lines.append(
+        f"{summary['rows']} rows in {build['segments']} segments, written in "
+        f"{build['seconds']:.1f} s. Segments {build['segment_bytes'] / 1024**2:.1f}"
+        f" MiB, sidecars {build['sidecar_bytes'] / 1024**2:.1f} MiB "
+        f"({build['sidecar_ratio'] * 100:.1f}%).")
+    lines.append("")
+    lines.append("| Query | Pattern | Matches | Scan s | Indexed s | Speed-up |")
+    lines.append("|---|---|---:|---:|---:|---:|")
+    for name, row in summary["queries"].items():
+        lines.append(
+            f"| {name} | `{row['pattern']}` | {row['matches']} | "
+            f"{row['scan_seconds']:.3f} | {row['indexed_seconds']:.3f} | "
+            f"{row['speedup']:.1f}x |")
+    lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def run_benchmark(*, output_root: str, scale: float = 1.0,
+                  keep_workspace: bool = False):
+    if scale <= 0:
+        raise HarnessError("--scale must be positive")
+    rows = max(1, int(round(DEFAULT_ROWS * scale)))
+    run_root = os.path.abspath(os.path.join(output_root, _iso_now()))
+    workspace = os.path.join(run_root, "archive")
+    os.makedirs(workspace, exist_ok=True)
+    summary = {
+        "version": HARNESS_VERSION,
+        "run_root": run_root,
+        "run_date_local": datetime.now().astimezone().strftime(
+            "%Y-%m-%d %H:%M:%S"),
+        "scale": scale,
+        "rows": rows,
+        "machine": _machine_info(),
+        "queries": {},
+    }
+    try:
+        segments, seconds = generate_archive(workspace, rows)
+        segment_bytes, sidecar_bytes = _sizes(workspace)
+        summary["build"] = {
+            "segments": segments, "seconds": round(seconds, 3),
+            "segment_bytes": segment_bytes, "sidecar_bytes": sidecar_bytes,
+            "sidecar_ratio": round(sidecar_bytes / max(1, segment_bytes), 4),
+        }
+        for name, pattern in queries(rows).items():
+            scanned, scan_seconds = run_query(workspace, pattern, "scan")
+            indexed, indexed_seconds = run_query(workspace, pattern, "indexed")
+            if scanned != indexed:
+                raise HarnessError(
+                    f"{name} query: indexed search returned "
+                    f"{len(indexed)} rows, full scan {len(scanned)}")
+            summary["queries"][name] = {
+                "pattern": pattern, "matches": len(scanned),
+                "scan_seconds": round(scan_seconds, 4),
+                "indexed_seconds": round(indexed_seconds, 4),
+                "speedup": round(scan_seconds / max(indexed_seconds, 1e-6), 1),
+            }
+    finally:
+        if not keep_workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+    with open(os.path.join(run_root, "summary.json"), "w",
+              encoding="utf-8") as handle:
+        json.dump(summary, handle, indent=2, sort_keys=True)
+    with open(os.path.join(run_root, "summary.md"), "w", encoding="utf-8",
+              newline="\n") as handle:
+        handle.write(render_markdown(summary))
+    return summary
+
+
+def parse_args(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output-root", default=str(DEFAULT_OUTPUT_ROOT),
+        help="Gitignored root for harness output.")
+    parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help=f"Multiply the {DEFAULT_ROWS:,}-row archive (e.g. 0.01).")
+    parser.add_argument(
+        "--keep-workspace", action="store_true",
+        help="Keep the generated archive instead of deleting it.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None):
+    args = parse_args(argv)
+    summary = run_benchmark(
+        output_root=args.output_root, scale=args.scale,
+        keep_workspace=args.keep_workspace)
+    print(render_markdown(summary))
+    print("[BENCHMARK] Manifest search benchmark complete: "
+          f"{summary['run_root']}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+"""Offline benchmark: Stored TAR validation throughput by member digest.
+
+Local-only like ``benchmark_stored_tar.py``: no PostgreSQL, SSH, LTFS or tape.
+It writes one deterministic Stored TAR per profile to a temporary directory and
+validates it with ``validate_stored_tar`` once per ``member_digest`` setting
+(``none``, ``crc32c`` when the optional package is installed, ``blake2b`` and
+``sha256``), best of ``--repeat`` runs, page-cache warm.
+
+Profiles follow the two workloads that matter on the real archive: many small
+members (per-member overhead) and a few large ones (bytes hashed). ``--scale``
+shrinks the member counts for a quick run.
+
+Output: one table on stdout, and ``summary.json`` under
+``storage_map_logs/benchmark_member_digests/<timestamp>/`` unless
+``--output-root`` says otherwise.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Sequence
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.pipeline_types import StoredTarExpectedMember  # noqa: E402
+from src.tar_container import (  # noqa: E402
+    GNU_RECORD_SIZE,
+    MEMBER_DIGEST_ALGORITHMS,
+    STORED_TAR_DIALECT,
+    STORED_TAR_FORMAT_VERSION,
+    StoredTarError,
+    new_member_digest,
+    validate_stored_tar,
+)
+
+
+DEFAULT_OUTPUT_ROOT = (REPO_ROOT / "storage_map_logs"
+                       / "benchmark_member_digests")
+KiB = 1024
+MiB = 1024 * KiB
+
+#: name -> (members, bytes per member)
+PROFILES = {
+    "small": (20_000, 16 * KiB),
+    "large": (8, 128 * MiB),
+}
+
+
+def _payload(index: int, size: int) -> bytes:
+    seed = f"{index:08d}|".encode("ascii") * 512
+    repeats = size // len(seed) + 1
+    return (seed * repeats)[:size]
+
+
+def _write_tar(path: str, members: int, size: int):
+    plan = []
+    with open(path, "wb") as handle:
+        with tarfile.open(fileobj=handle, mode="w",
+                          format=tarfile.PAX_FORMAT) as archive:
+            for index in range(members):
+                name = f"group_{index % 64:03d}/file_{index:06d}.bin"
+                info = tarfile.TarInfo(name)
+                info.size = size
+                info.mtime = 0
+                payload = _payload(index, size)
+                with tempfile.SpooledTemporaryFile(max_size=size + 1) as data:
+                    data.write(payload)
+                    data.seek(0)
+                    archive.addfile(info, data)
+                plan.append(StoredTarExpectedMember(name, size, index))
+        handle.write(bytes((-handle.tell()) % GNU_RECORD_SIZE))
+    return plan
+
+
+def _available_algorithms():
+    names = ["none"]
+    for name in MEMBER_DIGEST_ALGORITHMS:
+        try:
+            new_member_digest(name)
+        except StoredTarError:
+            continue
+        names.append(name)
+    return names
+
+
+def _time_validation(path: str, plan, algorithm, repeat: int) -> float:
+    best = None
+    for _ in range(max(1, repeat)):
+        with open(path, "rb") as source:
+            started = time.perf_counter()
+            validate_stored_tar(
+                source, plan, tar_dialect=STORED_TAR_DIALECT,
+                format_version=STORED_TAR_FORMAT_VERSION,
+                member_digest=algorithm)
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmark(*, profiles: Sequence[str], scale: float, repeat: int,
+                  output_root: str):
+    algorithms = _available_algorithms()
+    summary = {
+        "run_date_local": datetime.now().astimezone().strftime(
+            "%Y-%m-%d %H:%M:%S"),
+        "machine": {"platform": platform.platform(),
+                    "python": platform.python_version(),
+                    "cpu_logical": os.cpu_count()},
+        "repeat": repeat,
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as work:
+        for profile in profiles:
+            members, size = PROFILES[profile]
+            members = max(1, int(members * scale))
+            path = os.path.join(work, f"{profile}.tar")
+            plan = _write_tar(path, members, size)
+            logical = members * size
+            for name in algorithms:
+                seconds = _time_validation(
+                    path, plan, None if name == "none" else name, repeat)
+                summary["results"].append({
+                    "profile": profile, "members": members,
+                    "logical_bytes": logical, "member_digest": name,
+                    "seconds": round(seconds, 6),
+                    "mb_per_second": round(logical / MiB / seconds, 1),
+                })
+    run_root = os.path.join(
+        output_root, datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"))
+    os.makedirs(run_root, exist_ok=True)
+    with open(os.path.join(run_root, "summary.json"), "w",
+              encoding="utf-8") as handle:
+        json.dump(summary, handle, indent=2, sort_keys=True)
+    summary["run_root"] = run_root
+    return summary
+
+
+def parse_args(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", nargs="+", default=sorted(PROFILES),
+                        choices=sorted(PROFILES))
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply every profile's member count.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output-root", default=str(DEFAULT_OUTPUT_ROOT))
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None):
+    args = parse_args(argv)
+    summary = run_benchmark(profiles=args.profiles, scale=args.scale,
+                            repeat=args.repeat, output_root=args.output_root)
+    print(f"{'profile':8} {'members':>8} {'digest':8} {'seconds':>9} "
+          f"{'MB/s':>8}")
+    for row in summary["results"]:
+        print(f"{row['profile']:8} {row['members']:>8} "
+              f"{row['member_digest']:8} {row['seconds']:>9.3f} "
+              f"{row['mb_per_second']:>8.1f}")
+    print(f"[BENCHMARK] member digest benchmark complete: "
+          f"{summary['run_root']}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
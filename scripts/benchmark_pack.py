@@ -0,0 +1,438 @@
+"""Offline benchmark: ZIP_STORED pack throughput by entry writer and backend.
+
+Local-only like ``benchmark_stored_tar.py``: no PostgreSQL, SSH, LTFS or tape,
+and no writes to backup_logs/SUMMARY.csv. It generates a deterministic source
+tree per profile and packs it once per flow with ``LTOPacker``:
+
+1. ``spool``: serial, with the previous per-file path reproduced as a
+   reference: the whole file is copied into a ``SpooledTemporaryFile`` first
+   and then copied again into the entry
+2. ``stream``: serial, as shipped, each file read once straight into its ZIP
+   entry (``zip_container.write_stored_entry``)
+3. ``thread``: ``--workers`` shards on the thread backend
+4. ``process``: ``--workers`` shards on the process backend
+
+CPU seconds and peak RSS include worker processes.
+
+Profiles follow the two workloads that matter on the real archive: 100k x 4 KiB
+(per-file overhead) and 1k x 50 MiB (bytes moved). ``--scale`` shrinks the file
+counts for a quick run; the source tree is page-cache warm for both flows.
+
+Output: ``storage_map_logs/benchmark_pack/<timestamp>/summary.json`` and
+``summary.md`` unless ``--output-root`` says otherwise.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+from unittest import mock
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - requirements includes psutil
+    psutil = None
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import src.packer as packer_mod  # noqa: E402
+from src.packer import LTOPacker  # noqa: E402
+from src.zip_container import zip_entry_location  # noqa: E402
+
+
+HARNESS_VERSION = "pack-throughput-benchmark-v2"
+DEFAULT_OUTPUT_ROOT = REPO_ROOT / "storage_map_logs" / "benchmark_pack"
+GENERATE_CHUNK_SIZE = 1024 * 1024
+SPOOL_COPY_SIZE = 16 * 1024 * 1024
+SAMPLE_INTERVAL = 0.05
+FLOWS = ("spool", "stream", "thread", "process")
+PARALLEL_FLOWS = ("thread", "process")
+DEFAULT_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class ProfileSpec:
+    name: str
+    file_count: int
+    bytes_per_file: int
+    directories: int
+
+
+@dataclass
+class FlowMetrics:
+    flow: str
+    file_count: int
+    logical_bytes: int
+    output_bytes: int
+    wall_seconds: float
+    cpu_seconds: float
+    peak_rss_mb: Optional[float]
+    mib_per_second: float
+    files_per_second: float
+    verified: bool
+
+    def to_json(self):
+        payload = asdict(self)
+        for key in ("wall_seconds", "cpu_seconds", "mib_per_second",
+                    "files_per_second"):
+            payload[key] = round(payload[key], 6)
+        if self.peak_rss_mb is not None:
+            payload["peak_rss_mb"] = round(self.peak_rss_mb, 3)
+        return payload
+
+
+class HarnessError(RuntimeError):
+    pass
+
+
+class RssSampler:
+    """Peak resident set size of this process and its children while a flow
+    runs."""
+
+    def __init__(self, interval_seconds: float = SAMPLE_INTERVAL):
+        self.interval_seconds = interval_seconds
+        self.peak_bytes = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._process = psutil.Process() if psutil is not None else None
+
+    def __enter__(self):
+        if self._process is not None:
+            self._sample()
+            self._thread = threading.Thread(
+                target=self._run, name="benchmark-rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, _exc_type, _exc, _tb):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._sample()
+        return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            self._sample()
+
+    def _sample(self):
+        rss = self._process.memory_info().rss
+        try:
+            children = self._process.children(recursive=True)
+        except psutil.Error:
+            children = []
+        for child in children:
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        self.peak_bytes = max(self.peak_bytes or 0, rss)
+
+
+def _profile_specs() -> Dict[str, ProfileSpec]:
+    kib = 1024
+    mib = 1024 * kib
+    return {
+        "small": ProfileSpec(
+            name="small", file_count=100_000, bytes_per_file=4 * kib,
+            directories=256),
+        "large": ProfileSpec(
+            name="large", file_count=1_000, bytes_per_file=50 * mib,
+            directories=16),
+    }
+
+
+def _scaled(spec: ProfileSpec, scale: float) -> ProfileSpec:
+    if scale <= 0:
+        raise HarnessError("--scale must be positive")
+    count = max(1, int(round(spec.file_count * scale)))
+    return ProfileSpec(spec.name, count, spec.bytes_per_file, spec.directories)
+
+
+def _iso_now():
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _machine_info():
+    info = {
+        "platform": platform.platform(),
+        "python": sys.version.split()[0],
+        "processor": platform.processor(),
+        "cpu_logical": os.cpu_count(),
+        "cpu_physical": None,
+        "ram_gib": None,
+    }
+    if psutil is not None:
+        info["cpu_physical"] = psutil.cpu_count(logical=False)
+        info["ram_gib"] = round(psutil.virtual_memory().total / 1024**3, 2)
+    return info
+
+
+def generate_source(spec: ProfileSpec, root: str):
+    """Write the profile's files; every file has distinct, non-zero bytes."""
+    block = bytes(range(256)) * (GENERATE_CHUNK_SIZE // 256)
+    for index in range(spec.file_count):
+        directory = os.path.join(root, f"group_{index % spec.directories:03d}")
+        os.makedirs(directory, exist_ok=True)
+        seed = f"{index:08d}|".encode("ascii")
+        remaining = spec.bytes_per_file
+        with open(os.path.join(directory, f"file_{index:06d}.bin"), "wb") as out:
+            head = seed[:remaining]
+            out.write(head)
+            remaining -= len(head)
+            while remaining:
+                chunk = block[:min(remaining, len(block))]
+                out.write(chunk)
+                remaining -= len(chunk)
+    return spec.file_count * spec.bytes_per_file
+
+
+def _spool_write_entry(zipf, name, source, _buffer, *, size=0):
+    """Reference: the spool-then-copy entry write the packer used before."""
+    with tempfile.SpooledTemporaryFile(
+            max_size=64 * 1024 * 1024,
+            dir=os.path.dirname(zipf.filename)) as spool:
+        shutil.copyfileobj(source, spool, length=SPOOL_COPY_SIZE)
+        spool.seek(0)
+        with zipf.open(name, "w", force_zip64=True) as zdst:
+            shutil.copyfileobj(spool, zdst, length=SPOOL_COPY_SIZE)
+    return zip_entry_location(zipf.infolist()[-1], zip64=True)
+
+
+def _pack(source: str, dest: str, max_zip_size_gb: float, *, workers: int = 1,
+          backend: str = "thread"):
+    metadata = LTOPacker(
+        max_zip_size_gb=max_zip_size_gb, manifest_enabled=False).run(
+            source=source, dest=dest, threshold_mb=1024 * 1024,
+            on_existing="clean", pack_parallel_workers=workers,
+            pack_parallel_backend=backend)
+    if not metadata or any(not item["is_packed"] for item in metadata):
+        raise HarnessError("packer did not pack every file into a bundle")
+
+
+def _verify_bundles(dest: str, file_count: int, logical_bytes: int,
+                    check_crc: bool):
+    members = 0
+    total = 0
+    for name in sorted(os.listdir(dest)):
+        if not name.endswith(".zip"):
+            continue
+        with zipfile.ZipFile(os.path.join(dest, name)) as zf:
+            infos = zf.infolist()
+            members += len(infos)
+            total += sum(info.file_size for info in infos)
+            if check_crc and zf.testzip() is not None:
+                return False
+    return members == file_count and total == logical_bytes
+
+
+def _bundle_bytes(dest: str):
+    return sum(os.path.getsize(os.path.join(dest, name))
+               for name in os.listdir(dest) if name.endswith(".zip"))
+
+
+def _cpu_seconds():
+    """CPU time of this process plus its reaped children (the pool workers)."""
+    times = os.times()
+    return (times.user + times.system + times.children_user +
+            times.children_system)
+
+
+def run_flow(flow: str, spec: ProfileSpec, source: str, dest: str,
+             logical_bytes: int, *, max_zip_size_gb: float,
+             check_crc: bool, workers: int = DEFAULT_WORKERS) -> FlowMetrics:
+    cpu_start = _cpu_seconds()
+    wall_start = time.perf_counter()
+    with RssSampler() as rss:
+        if flow == "spool":
+            with mock.patch.object(
+                    packer_mod, "write_stored_entry", _spool_write_entry):
+                _pack(source, dest, max_zip_size_gb)
+        elif flow == "stream":
+            _pack(source, dest, max_zip_size_gb)
+        elif flow in PARALLEL_FLOWS:
+            _pack(source, dest, max_zip_size_gb, workers=workers,
+                  backend=flow)
+        else:
+            raise HarnessError(f"unknown flow {flow!r}")
+    wall = time.perf_counter() - wall_start
+    cpu = _cpu_seconds() - cpu_start
+    verified = _verify_bundles(dest, spec.file_count, logical_bytes, check_crc)
+    return FlowMetrics(
+        flow=flow,
+        file_count=spec.file_count,
+        logical_bytes=logical_bytes,
+        output_bytes=_bundle_bytes(dest),
+        wall_seconds=wall,
+        cpu_seconds=cpu,
+        peak_rss_mb=(None if rss.peak_bytes is None
+                     else rss.peak_bytes / 1024**2),
+        mib_per_second=logical_bytes / 1024**2 / max(wall, 1e-9),
+        files_per_second=spec.file_count / max(wall, 1e-9),
+        verified=verified,
+    )
+
+
+def run_profile(spec: ProfileSpec, run_root: str, *, max_zip_size_gb: float,
+                check_crc: bool, keep_workspaces: bool,
+                flows: Sequence[str] = FLOWS, workers: int = DEFAULT_WORKERS):
+    workspace = os.path.join(run_root, spec.name)
+    source = os.path.join(workspace, "source")
+    logical_bytes = generate_source(spec, source)
+    record = {"profile": spec.name, "spec": asdict(spec)}
+    try:
+        for flow in flows:
+            dest = os.path.join(workspace, flow)
+            metrics = run_flow(
+                flow, spec, source, dest, logical_bytes,
+                max_zip_size_gb=max_zip_size_gb, check_crc=check_crc,
+                workers=workers)
+            if not metrics.verified:
+                raise HarnessError(
+                    f"profile {spec.name}: {flow} bundles do not hold the "
+                    "generated files")
+            record[flow] = metrics.to_json()
+            shutil.rmtree(dest, ignore_errors=True)
+    finally:
+        if not keep_workspaces:
+            shutil.rmtree(workspace, ignore_errors=True)
+    return record
+
+
+def render_markdown(summary: dict) -> str:
+    lines = [f"# Pack Throughput Benchmark ({summary['version']})", ""]
+    lines.append(
+        f"Run date: {summary['run_date_local']}. One local sample with a "
+        "page-cache-warm source tree, not a suite average.")
+    lines.append("")
+    machine = summary["machine"]
+    lines.append(
+        f"Machine: `{machine['platform']}`, Python `{machine['python']}`, "
+        f"{machine['cpu_logical']} logical CPUs, RAM `{machine['ram_gib']}` GiB. "
+        f"Parallel flows use {summary['workers']} worker(s).")
+    lines.append("")
+    lines.append(
+        "| Profile | Flow | Files | Logical MiB | Wall s | CPU s | MiB/s | "
+        "Files/s | Peak RSS MiB |")
+    lines.append("|---|---|---:|---:|---:|---:|---:|---:|---:|")
+    for profile in summary["profiles"]:
+        for flow in summary["flows"]:
+            row = profile[flow]
+            rss = ("" if row["peak_rss_mb"] is None
+                   else f"{row['peak_rss_mb']:.1f}")
+            lines.append(
+                f"| {profile['profile']} | {flow} | {row['file_count']} | "
+                f"{row['logical_bytes'] / 1024**2:.1f} | "
+                f"{row['wall_seconds']:.3f} | {row['cpu_seconds']:.3f} | "
+                f"{row['mib_per_second']:.1f} | {row['files_per_second']:.0f} | "
+                f"{rss} |")
+    lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def run_benchmark(*, profiles: Sequence[str], output_root: str,
+                  scale: float = 1.0, max_zip_size_gb: float = 64.0,
+                  check_crc: bool = False, keep_workspaces: bool = False,
+                  flows: Sequence[str] = FLOWS,
+                  workers: int = DEFAULT_WORKERS):
+    specs = _profile_specs()
+    for flow in flows:
+        if flow not in FLOWS:
+            raise HarnessError(
+                f"unknown flow {flow!r}; choose from {', '.join(FLOWS)}")
+    if workers < 2 and any(flow in PARALLEL_FLOWS for flow in flows):
+        raise HarnessError("--workers must be at least 2 for parallel flows")
+    selected = []
+    for name in profiles:
+        if name not in specs:
+            raise HarnessError(
+                f"unknown profile {name!r}; choose from {', '.join(sorted(specs))}")
+        selected.append(_scaled(specs[name], scale))
+    run_root = os.path.abspath(os.path.join(output_root, _iso_now()))
+    os.makedirs(run_root, exist_ok=True)
+    summary = {
+        "version": HARNESS_VERSION,
+        "run_root": run_root,
+        "run_date_local": datetime.now().astimezone().strftime(
+            "%Y-%m-%d %H:%M:%S"),
+        "scale": scale,
+        "flows": list(flows),
+        "workers": workers,
+        "machine": _machine_info(),
+        "profiles": [],
+    }
+    for spec in selected:
+        summary["profiles"].append(run_profile(
+            spec, run_root, max_zip_size_gb=max_zip_size_gb,
+            check_crc=check_crc, keep_workspaces=keep_workspaces,
+            flows=flows, workers=workers))
+    with open(os.path.join(run_root, "summary.json"), "w",
+              encoding="utf-8") as handle:
+        json.dump(summary, handle, indent=2, sort_keys=True)
+    with open(os.path.join(run_root, "summary.md"), "w", encoding="utf-8",
+              newline="\n") as handle:
+        handle.write(render_markdown(summary))
+    return summary
+
+
+def parse_args(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--profiles", nargs="+", default=["small", "large"],
+        help="Profiles to run.")
+    parser.add_argument(
+        "--output-root", default=str(DEFAULT_OUTPUT_ROOT),
+        help="Gitignored root for harness output.")
+    parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help="Multiply every profile's file count (e.g. 0.01 for a quick run).")
+    parser.add_argument(
+        "--max-zip-size-gb", type=float, default=64.0,
+        help="LTOPacker max ZIP size cap for every flow.")
+    parser.add_argument(
+        "--flows", nargs="+", default=list(FLOWS),
+        help="Flows to run, in order.")
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help="pack_parallel_workers for the thread and process flows.")
+    parser.add_argument(
+        "--check-crc", action="store_true",
+        help="Re-read every bundle and verify member CRCs after each flow.")
+    parser.add_argument(
+        "--keep-workspaces", action="store_true",
+        help="Keep the generated source tree instead of deleting it.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None):
+    args = parse_args(argv)
+    summary = run_benchmark(
+        profiles=args.profiles,
+        output_root=args.output_root,
+        scale=args.scale,
+        max_zip_size_gb=args.max_zip_size_gb,
+        check_crc=args.check_crc,
+        keep_workspaces=args.keep_workspaces,
+        flows=args.flows,
+        workers=args.workers,
+    )
+    print(render_markdown(summary))
+    print(f"[BENCHMARK] Pack throughput benchmark complete: {summary['run_root']}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
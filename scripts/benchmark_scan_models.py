@@ -25,6 +25,15 @@ Two modes:
                      query, reporting catalog cardinality, SQL executions, rows
                      and elapsed time as four separate figures.
 
+  --listing-benchmark
+                     Frontier listing transport. Walks the first N
+                     directories under --root breadth-first twice — once with
+                     one SSH connection per directory, once over a single
+                     persistent listing session — and reports
+                     directories-listed-per-second for each. --local runs the
+                     exact remote commands through a local shell instead of
+                     SSH, isolating process-spawn cost from the handshake.
+
 The PostgreSQL mode refuses to run against anything but an explicitly named
 test database: it creates and drops fixtures, and must never see production.
 
@@ -33,18 +42,26 @@ test database: it creates and drops fixtures, and must never see production.
     python scripts/benchmark_scan_models.py --pg-benchmark \\
         --dsn "postgresql://user@localhost/lto_archive_test" \\
         --cardinalities 1000,10000,100000
+    python scripts/benchmark_scan_models.py --listing-benchmark \\
+        --remote-user archive --remote-host so01 --root /strg/projects \\
+        --max-directories 2000
 """
 import argparse
+import contextlib
 import json
 import os
 import posixpath
+import subprocess
 import sys
 import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src import scanning                            # noqa: E402
 from src.pipeline_types import ScanMetrics          # noqa: E402
 from src.planning import StreamingChunkBuilder      # noqa: E402
+from src.skipped import SkippedFileTracker          # noqa: E402
+from src.ui import ConsoleUI                        # noqa: E402
 
 #: A test database must say so in its name. The benchmark creates and drops
 #: tables, so an ambiguous DSN is refused rather than guessed at.
@@ -431,6 +448,87 @@ def run_pg_benchmark(dsn, cardinalities, batch=5000):
     return rows
 
 
+# =============================================================================
+# Frontier listing transport benchmark
+# =============================================================================
+@contextlib.contextmanager
+def _local_transport():
+    """Run the scanner's remote commands through a local shell, not SSH.
+
+    The commands are byte-for-byte the ones production sends, so the only
+    thing removed is the network; what remains is the per-directory process
+    spawn the persistent session also eliminates.
+    """
+    def local_run(_user, _host, command, capture=True, password='',
+                  timeout=None):
+        try:
+            return subprocess.run(
+                ["sh", "-c", command], capture_output=True, text=True,
+                encoding="utf-8", errors="replace", timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return subprocess.CompletedProcess(command, 124, "", "timed out")
+
+    def local_stream(_user, _host, command, password='', cipher=''):
+        return ["sh", "-c", command], None, None
+
+    saved = (scanning._ssh_run, scanning._ssh_stream_command)
+    scanning._ssh_run, scanning._ssh_stream_command = local_run, local_stream
+    try:
+        yield
+    finally:
+        scanning._ssh_run, scanning._ssh_stream_command = saved
+
+
+def _walk_directories(scanner, root, max_directories):
+    """Breadth-first listing of up to ``max_directories`` directories."""
+    pending = [posixpath.normpath(root)]
+    listed = entries = 0
+    started = time.perf_counter()
+    while pending and listed < max_directories:
+        listing = scanner.list_directory(pending.pop(0))
+        pending.extend(listing.directories)
+        listed += 1
+        entries += listing.file_count
+    return listed, entries, time.perf_counter() - started
+
+
+def run_listing_benchmark(remote_user, remote_host, root, max_directories,
+                          password="", local=False):
+    """Directories listed per second: one SSH per directory vs one session.
+
+    Both passes list the same directories in the same order, so the only
+    difference between the two rows is the transport.
+    """
+    rows = []
+    transport = _local_transport() if local else contextlib.nullcontext()
+    with transport:
+        for model, persistent in (("per_directory_ssh", False),
+                                  ("persistent_session", True)):
+            metrics = ScanMetrics()
+            scanner = scanning.DirectoryFrontierScanner(
+                remote_user, remote_host, remote_password=password,
+                skipped_tracker=SkippedFileTracker(), ui=ConsoleUI(),
+                metrics=metrics, persistent_session=persistent)
+            try:
+                listed, entries, elapsed = _walk_directories(
+                    scanner, root, max_directories)
+            finally:
+                scanner.close()
+            connections = (metrics.snapshot()["scan_listing_sessions_opened"]
+                           if persistent else listed)
+            rows.append({
+                "model": model,
+                "transport": "local_shell" if local else "ssh",
+                "directories_listed": listed,
+                "entries_seen": entries,
+                "connections": connections,
+                "elapsed_seconds": round(elapsed, 4),
+                "directories_per_second":
+                    round(listed / elapsed, 2) if elapsed > 0 else None,
+            })
+    return rows
+
+
 # =============================================================================
 # CLI
 # =============================================================================
@@ -483,6 +581,16 @@ def main(argv=None):
                         help="run the isolated-PostgreSQL cardinality benchmark")
     parser.add_argument("--dsn", default=os.environ.get("BENCH_DSN", ""))
     parser.add_argument("--cardinalities", default="1000,10000,100000")
+    parser.add_argument("--listing-benchmark", action="store_true",
+                        help="compare per-directory SSH with one persistent "
+                             "listing session")
+    parser.add_argument("--remote-user", default="")
+    parser.add_argument("--remote-host", default="")
+    parser.add_argument("--root", default="",
+                        help="directory the listing benchmark walks")
+    parser.add_argument("--max-directories", type=int, default=500)
+    parser.add_argument("--local", action="store_true",
+                        help="run the listing commands locally, without SSH")
     args = parser.parse_args(argv)
 
     report = {}
@@ -513,8 +621,26 @@ def main(argv=None):
                   f"elapsed={row['elapsed_seconds']:.6f}s")
         report["postgres"] = rows
 
+    if args.listing_benchmark:
+        if not args.root or not (args.local or args.remote_host):
+            parser.error("--listing-benchmark needs --root and either "
+                         "--remote-host or --local")
+        rows = run_listing_benchmark(
+            args.remote_user, args.remote_host, args.root,
+            max(1, args.max_directories),
+            password=os.environ.get("REMOTE_PASSWORD", ""), local=args.local)
+        print("\nFRONTIER LISTING — directories listed per second")
+        for row in rows:
+            print(f"  {row['model']:<20} transport={row['transport']}  "
+                  f"directories={row['directories_listed']:>7,}  "
+                  f"connections={row['connections']:>7,}  "
+                  f"elapsed={row['elapsed_seconds']:.3f}s  "
+                  f"dirs/s={row['directories_per_second']}")
+        report["listing"] = rows
+
     if not report:
-        parser.error("choose --replay, --synthetic and/or --pg-benchmark")
+        parser.error("choose --replay, --synthetic, --pg-benchmark and/or "
+                     "--listing-benchmark")
 
     if args.json:
         with open(args.json, "w", encoding="utf-8") as handle:
@@ -0,0 +1,205 @@
+"""Offline replay: governor RAM gating, psutil percent vs. the meminfo model.
+
+Feeds recorded ``/proc/meminfo`` samples through two readings of the same host
+state and runs each through ``ResourceGovernor.decision_for`` for an idle
+pipeline's ``fetch``, ``pack`` and ``tape`` starts:
+
+* ``legacy`` — what psutil reports on Linux: ``available`` = ``MemAvailable``
+  and ``percent`` = used share of ``MemTotal``, reclaimable file cache
+  included (the gate behind docs/incidents/001);
+* ``model``  — :class:`~src.resource_governor.MeminfoPressureModel`, which
+  counts only anonymous, dirty/writeback and unreclaimable kernel memory and
+  adds the PSI gate when the trace carries ``/proc/pressure/memory``.
+
+A trace is plain text: consecutive dumps separated by lines starting with
+``---`` (anything after the dashes labels the sample before it), e.g.::
+
+    while :; do cat /proc/meminfo /proc/pressure/memory
+                echo "--- $(date -Is)"; sleep 5; done >> meminfo.trace
+
+Thresholds come from ``--config`` (a config.ini) or the governor defaults.
+Nothing touches PostgreSQL, SSH, LTFS or tape.
+
+Output: a per-stage table on stdout, and ``summary.json`` under
+``storage_map_logs/replay_memory_pressure/<timestamp>/`` unless
+``--output-root`` says otherwise.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Sequence
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.resource_governor import (  # noqa: E402
+    GB,
+    MeminfoPressureModel,
+    MemoryReading,
+    ResourceGovernor,
+    ResourceSnapshot,
+    parse_meminfo,
+    parse_psi_some_avg10,
+)
+
+
+DEFAULT_OUTPUT_ROOT = (REPO_ROOT / "storage_map_logs"
+                       / "replay_memory_pressure")
+STAGES = ("fetch", "pack", "tape")
+# Staging space is not what this replay compares; keep its gate open.
+_AMPLE_DISK = 1 << 62
+
+
+def read_trace(path: str):
+    """``[(label, meminfo fields, psi some avg10)]`` from a trace file."""
+    samples = []
+    block = []
+
+    def flush(label):
+        text = "\n".join(block)
+        block.clear()
+        fields = parse_meminfo(text)
+        if fields.get("MemTotal"):
+            label = label or f"#{len(samples) + 1}"
+            samples.append((label, fields, parse_psi_some_avg10(text)))
+
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.startswith("---"):
+                flush(line.lstrip("-").strip())
+            else:
+                block.append(line.rstrip("\n"))
+    flush("")
+    return samples
+
+
+def legacy_reading(fields) -> MemoryReading:
+    """The psutil view of one meminfo sample (its Linux formula)."""
+    total = int(fields["MemTotal"])
+    available = fields.get("MemAvailable")
+    if available is None:
+        available = sum(int(fields.get(name, 0)) for name in (
+            "MemFree", "Buffers", "Cached", "SReclaimable"))
+    available = min(total, int(available))
+    return MemoryReading(
+        memory_pct=(total - available) / total * 100.0,
+        available_bytes=available, total_bytes=total, model="psutil")
+
+
+def _snapshot(reading: MemoryReading) -> ResourceSnapshot:
+    return ResourceSnapshot(
+        sampled_at=time.monotonic(), memory_pct=reading.memory_pct,
+        available_bytes=reading.available_bytes,
+        total_bytes=reading.total_bytes, disk_free_bytes=_AMPLE_DISK,
+        memory_model=reading.model,
+        memory_psi_some_avg10=reading.psi_some_avg10)
+
+
+def _load_cfg(config_path):
+    if not config_path:
+        return SimpleNamespace()
+    from src.config import ConfigManager
+    return ConfigManager(config_path)
+
+
+def replay(samples, cfg=None, *, strict_commit: bool = False):
+    """Gate every sample both ways; return per-sample rows and stage totals."""
+    governor = ResourceGovernor(cfg or SimpleNamespace(), staging_dir=".")
+    totals = {stage: {"legacy_blocked": 0, "model_blocked": 0,
+                      "legacy_only": 0, "model_only": 0, "reasons": {}}
+              for stage in STAGES}
+    rows = []
+    for label, fields, psi in samples:
+        legacy = legacy_reading(fields)
+        model = MeminfoPressureModel.evaluate(
+            fields, psi_some_avg10=psi, strict_commit=strict_commit)
+        row = {
+            "label": label,
+            "legacy_memory_pct": round(legacy.memory_pct, 2),
+            "legacy_available_gb": round(legacy.available_bytes / GB, 3),
+            "model_memory_pct": round(model.memory_pct, 2),
+            "model_available_gb": round(model.available_bytes / GB, 3),
+            "psi_some_avg10": psi,
+        }
+        for stage in STAGES:
+            old = governor.decision_for(_snapshot(legacy), stage, "start")
+            new = governor.decision_for(_snapshot(model), stage, "start")
+            row[stage] = {"legacy": old.reasons, "model": new.reasons}
+            stage_totals = totals[stage]
+            stage_totals["legacy_blocked"] += not old.allowed
+            stage_totals["model_blocked"] += not new.allowed
+            stage_totals["legacy_only"] += new.allowed and not old.allowed
+            stage_totals["model_only"] += old.allowed and not new.allowed
+            for reason in new.reasons:
+                stage_totals["reasons"][reason] = (
+                    stage_totals["reasons"].get(reason, 0) + 1)
+        rows.append(row)
+    return {"samples": rows, "stages": totals}
+
+
+def run_replay(*, traces: Sequence[str], output_root: str,
+               config_path: str | None = None, strict_commit: bool = False):
+    samples = []
+    for path in traces:
+        samples.extend(read_trace(path))
+    result = replay(samples, _load_cfg(config_path),
+                    strict_commit=strict_commit)
+    summary = {
+        "run_date_local": datetime.now().astimezone().strftime(
+            "%Y-%m-%d %H:%M:%S"),
+        "machine": {"platform": platform.platform(),
+                    "python": platform.python_version()},
+        "traces": [os.path.abspath(path) for path in traces],
+        "config": config_path and os.path.abspath(config_path),
+        "strict_commit": strict_commit,
+        "sample_count": len(samples),
+        **result,
+    }
+    run_root = os.path.join(
+        output_root, datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"))
+    os.makedirs(run_root, exist_ok=True)
+    with open(os.path.join(run_root, "summary.json"), "w",
+              encoding="utf-8") as handle:
+        json.dump(summary, handle, indent=2, sort_keys=True)
+    summary["run_root"] = run_root
+    return summary
+
+
+def parse_args(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("traces", nargs="+",
+                        help="Recorded /proc/meminfo trace file(s).")
+    parser.add_argument("--config", default=None,
+                        help="config.ini whose [PERFORMANCE] limits to use.")
+    parser.add_argument("--strict-commit", action="store_true",
+                        help="Replay as if vm.overcommit_memory = 2.")
+    parser.add_argument("--output-root", default=str(DEFAULT_OUTPUT_ROOT))
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None):
+    args = parse_args(argv)
+    summary = run_replay(traces=args.traces, output_root=args.output_root,
+                         config_path=args.config,
+                         strict_commit=args.strict_commit)
+    print(f"{'stage':6} {'samples':>8} {'legacy':>7} {'model':>7} "
+          f"{'legacy-only':>12} {'model-only':>11}")
+    for stage, totals in summary["stages"].items():
+        print(f"{stage:6} {summary['sample_count']:>8} "
+              f"{totals['legacy_blocked']:>7} {totals['model_blocked']:>7} "
+              f"{totals['legacy_only']:>12} {totals['model_only']:>11}")
+    print(f"[REPLAY] memory pressure replay complete: {summary['run_root']}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,33 @@
+-- 018: ZIP central-directory index for packed files.
+--
+-- The packer knows every bundle entry's local-header offset, stored size and
+-- CRC-32 the moment it writes it, but only the ZIP's own central directory
+-- kept them, so a restore had to read the end of the bundle on tape before it
+-- could find a single member. One row per indexed packed file lets the
+-- retriever seek straight to the member's bytes and check them against the
+-- catalog's CRC without parsing the central directory.
+--
+-- Rows exist only for files packed after this migration; older bundles keep
+-- restoring through the central directory. Additive and idempotent, so it is
+-- part of startup schema init.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS zip_entry_index (
+    file_id         BIGINT PRIMARY KEY
+        REFERENCES files_index(file_id) ON DELETE CASCADE,
+    bundle_id       BIGINT NOT NULL
+        REFERENCES archive_bundles(bundle_id) ON DELETE CASCADE,
+    header_offset   BIGINT NOT NULL CHECK (header_offset >= 0),
+    data_offset     BIGINT NOT NULL,
+    stored_size     BIGINT NOT NULL CHECK (stored_size >= 0),
+    crc32           BIGINT NOT NULL CHECK (crc32 BETWEEN 0 AND 4294967295),
+    CONSTRAINT ck_zip_entry_data_after_header
+        CHECK (data_offset >= header_offset + 30)
+);
+
+-- A restore plans one forward pass per bundle in local-header order.
+CREATE INDEX IF NOT EXISTS idx_zip_entry_index_bundle_offset
+    ON zip_entry_index (bundle_id, header_offset);
+
+COMMIT;
@@ -0,0 +1,36 @@
+-- 019: maintained recursive totals per catalog directory.
+--
+-- The inspector used to size a page of directories with a recursive walk over
+-- catalog_directories joined to files_index, plus the pruned-manifest
+-- aggregates; near a tape root that touches millions of rows per page. One
+-- row per directory now carries the subtree's file count, bytes and latest
+-- backup date, so sizing a page is a primary-key lookup.
+--
+-- The catalog writers keep the rows current in the same transaction as the
+-- files_index change. A database that already had a catalog before this
+-- migration starts with an empty table and no state row: the inspector keeps
+-- the recursive walk until `python inspect_db.py --rebuild-directory-rollups`
+-- has filled the table once. Additive and idempotent, so it is part of startup schema init.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS catalog_directory_rollups (
+    directory_id          BIGINT PRIMARY KEY
+        REFERENCES catalog_directories(directory_id) ON DELETE CASCADE,
+    recursive_file_count  BIGINT NOT NULL DEFAULT 0,
+    recursive_bytes       BIGINT NOT NULL DEFAULT 0,
+    last_backup_date      TIMESTAMPTZ
+);
+
+-- One row once the rollups have been built from the catalog.
+CREATE TABLE IF NOT EXISTS catalog_directory_rollup_state (
+    singleton  BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    built_at   TIMESTAMPTZ NOT NULL
+);
+
+-- An empty catalog has nothing to build: mark it built straight away.
+INSERT INTO catalog_directory_rollup_state (built_at)
+SELECT now() WHERE NOT EXISTS (SELECT 1 FROM catalog_directories)
+ON CONFLICT (singleton) DO NOTHING;
+
+COMMIT;
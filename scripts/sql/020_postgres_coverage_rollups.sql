@@ -0,0 +1,82 @@
+-- 020: maintained tape-coverage totals for the Storage Map web app.
+--
+-- The coverage refresh used to run storage_map's COVERAGE_SQL over the whole
+-- of files_index (per-file dedup included), directory_tree_index and the
+-- pruned-manifest aggregates on every click; on a large catalog that takes
+-- minutes. Two tables now hold its result:
+--
+--   coverage_directory_totals  one row per (host, dirname): the merged bytes,
+--                              file count and latest backup of that directory.
+--   coverage_prefix_totals     the same totals summed per (host, dir_prefix),
+--                              i.e. the rows the web app reads.
+--
+-- A catalog commit point (remote chunk catalog commit, local chunk backed up,
+-- manifest prune, file delete) recomputes the directories it touched and adds
+-- the difference to their prefixes, stamping each changed prefix with the next
+-- change_seq from the state row. The web app keeps the highest change_seq it
+-- has read and only folds in prefixes changed since.
+--
+-- Prefixes depend on the web app's max_segs and the index_min_file_mb
+-- threshold, so the tables start empty with no state row: writers skip them
+-- and the web app keeps the full query until
+-- `python inspect_db.py --rebuild-coverage-rollups` has built them once.
+-- Additive and idempotent, so it is part of startup schema init. The first
+-- run builds the directory expression index on files_index, which takes a
+-- while on a large catalog.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS coverage_directory_totals (
+    host         TEXT   NOT NULL,
+    dirname      TEXT   NOT NULL,
+    dir_prefix   TEXT   NOT NULL,
+    tape_bytes   BIGINT NOT NULL DEFAULT 0,
+    tape_files   BIGINT NOT NULL DEFAULT 0,
+    last_backup  TIMESTAMPTZ,
+    PRIMARY KEY (host, dirname)
+);
+
+CREATE TABLE IF NOT EXISTS coverage_prefix_totals (
+    host         TEXT   NOT NULL,
+    dir_prefix   TEXT   NOT NULL,
+    tape_bytes   BIGINT NOT NULL DEFAULT 0,
+    tape_files   BIGINT NOT NULL DEFAULT 0,
+    last_backup  TIMESTAMPTZ,
+    change_seq   BIGINT NOT NULL,
+    PRIMARY KEY (host, dir_prefix)
+);
+
+CREATE INDEX IF NOT EXISTS idx_coverage_prefix_change
+    ON coverage_prefix_totals(change_seq);
+
+-- One row once the totals have been built; its row lock orders writers.
+CREATE TABLE IF NOT EXISTS coverage_rollup_state (
+    singleton        BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    max_segs         INTEGER NOT NULL CHECK (max_segs > 0),
+    threshold_bytes  BIGINT  NOT NULL CHECK (threshold_bytes >= 0),
+    change_seq       BIGINT  NOT NULL DEFAULT 0,
+    built_at         TIMESTAMPTZ NOT NULL
+);
+
+-- Directory lookups for the recompute, on the same expressions COVERAGE_SQL
+-- groups by.
+CREATE INDEX IF NOT EXISTS idx_files_coverage_directory
+    ON files_index ((lower(split_part(source_host, '.', 1))),
+                    (regexp_replace(original_path, '/[^/]*$', '')))
+    WHERE original_path LIKE '/%';
+
+CREATE INDEX IF NOT EXISTS idx_local_manifest_folder_coverage
+    ON local_manifest_folder_aggregates (
+        (lower(split_part(source_host, '.', 1))), original_dir_path);
+
+-- directory_tree_index arrives with 007, which is applied explicitly.
+DO $$
+BEGIN
+    IF to_regclass('public.directory_tree_index') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_directory_tree_coverage
+            ON directory_tree_index (
+                (lower(split_part(source_host, '.', 1))), original_dir_path);
+    END IF;
+END $$;
+
+COMMIT;
@@ -0,0 +1,28 @@
+-- 021: per-member digests for Stored TAR containers.
+--
+-- Validation already reads every byte of a Stored TAR member; with
+-- [PERFORMANCE] stored_tar_member_digest set it also hashes each member's
+-- logical payload (sparse holes as zeros) and records the digest in the
+-- tar-sidecar-v3 member record. One row per catalogued member keeps the same
+-- value beside files_index, so a restore or an audit can check a member
+-- without first reading its sidecar.
+--
+-- Rows exist only for members archived after this migration with a digest
+-- configured. Additive and idempotent, so it is part of startup schema init.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS tar_member_digests (
+    file_id          BIGINT PRIMARY KEY
+        REFERENCES files_index(file_id) ON DELETE CASCADE,
+    bundle_id        BIGINT NOT NULL
+        REFERENCES archive_bundles(bundle_id) ON DELETE CASCADE,
+    digest_algorithm TEXT NOT NULL
+        CHECK (digest_algorithm IN ('crc32c', 'blake2b', 'sha256')),
+    digest           TEXT NOT NULL CHECK (digest ~ '^[0-9a-f]+$')
+);
+
+CREATE INDEX IF NOT EXISTS idx_tar_member_digests_bundle
+    ON tar_member_digests (bundle_id);
+
+COMMIT;
@@ -40,7 +40,7 @@ import os
 import posixpath
 import shutil
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 try:
     import zstandard as zstd
@@ -51,6 +51,8 @@ from .logsetup import get_logger
 from .paths import _long
 from .pipeline_types import SourceDisposition, StoredTarSourceDiagnostic
 from .tar_container import (
+    BLOCK_SIZE,
+    MEMBER_DIGEST_ALGORITHMS,
     STORED_TAR_DIALECT,
     STORED_TAR_FORMAT_VERSION,
     StoredTarError,
@@ -61,8 +63,14 @@ from .tar_container import (
 #: Artifact format version. A reader refuses anything it does not know.
 ARTIFACT_VERSION = "scan-segment-v1"
 
-# Phase 1 establishes the consumer contract before any TAR producer is enabled.
-TAR_SIDECAR_VERSION = "tar-sidecar-v1"
+# Phase 1 established the consumer contract before any TAR producer was
+# enabled.  v2 adds each member's header/data byte offsets so a restore can
+# seek straight to the selected members; v3 adds the header's
+# ``member_digest_algorithm`` and, when it is set, each member's ``digest`` of
+# its logical bytes.  Older sidecars stay readable because a published
+# sidecar is immutable.
+TAR_SIDECAR_VERSION = "tar-sidecar-v3"
+TAR_SIDECAR_VERSIONS = ("tar-sidecar-v1", "tar-sidecar-v2", TAR_SIDECAR_VERSION)
 TAR_SIDECAR_NAMESPACE = "tar_sidecars"
 MAX_TAR_SIDECAR_RECORDS = 1_000_000
 
@@ -206,8 +214,61 @@ def _sidecar_source_path(header, record, member_name):
     return f"{base}/{member_name}" if base else member_name
 
 
+def _sidecar_member_offsets(record, previous_end):
+    """Return a v2 member's byte offsets, or None for a v1 record.
+
+    Offsets are checked for block alignment and archive order here so a
+    damaged sidecar is refused before a restore seeks anywhere on tape.
+    """
+    if record.get("data_offset") is None and record.get("header_offset") is None:
+        return None
+    try:
+        header_offset = int(record["header_offset"])
+        data_offset = int(record["data_offset"])
+        stored_size = int(record["stored_size"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ArtifactError(
+            "TAR sidecar member offsets are incomplete") from exc
+    if (header_offset < 0 or stored_size < 0
+            or header_offset % BLOCK_SIZE or data_offset % BLOCK_SIZE
+            or data_offset <= header_offset):
+        raise ArtifactError("TAR sidecar member offsets are not block aligned")
+    if previous_end is not None and header_offset < previous_end:
+        raise ArtifactError("TAR sidecar member offsets overlap")
+    return {
+        "header_offset": header_offset,
+        "data_offset": data_offset,
+        "stored_size": stored_size,
+        "sparse": bool(record.get("sparse")),
+    }
+
+
+def _sidecar_digest_algorithm(header):
+    """The member digest algorithm a sidecar header declares, or None."""
+    algorithm = header.get("member_digest_algorithm")
+    if algorithm is not None and algorithm not in MEMBER_DIGEST_ALGORITHMS:
+        raise ArtifactError(
+            f"unsupported TAR sidecar member digest {algorithm!r}")
+    return algorithm
+
+
+def _sidecar_member_digest(record, algorithm):
+    """A member's digest, checked against the header's algorithm."""
+    digest = record.get("digest")
+    if algorithm is None:
+        if digest is not None:
+            raise ArtifactError(
+                "TAR sidecar member digest has no declared algorithm")
+        return None
+    if (not isinstance(digest, str)
+            or len(digest) != MEMBER_DIGEST_ALGORITHMS[algorithm]
+            or digest.strip("0123456789abcdef")):
+        raise ArtifactError("TAR sidecar member digest is missing or malformed")
+    return digest
+
+
 def search_tar_sidecar(path, *, directory=None, query=None, limit=10_000,
-                       expected_version=TAR_SIDECAR_VERSION,
+                       expected_version=None,
                        expected_container_id=None,
                        expected_member_count=None,
                        max_records=MAX_TAR_SIDECAR_RECORDS):
@@ -215,7 +276,8 @@ def search_tar_sidecar(path, *, directory=None, query=None, limit=10_000,
 
     Search output and total input records are both bounded.  The complete
     expectation tuple is retained because a restore validates the whole TAR,
-    not only the selected members.
+    not only the selected members.  Any supported sidecar version is read;
+    ``expected_version`` additionally pins the one the catalog recorded.
     """
     _require_zstd()
     if str(path).endswith(".part"):
@@ -224,10 +286,12 @@ def search_tar_sidecar(path, *, directory=None, query=None, limit=10_000,
     max_records = max(1, int(max_records))
     header = None
     footer = None
+    digest_algorithm = None
     expected = []
     matches = []
     logical_bytes = 0
     previous_ordinal = None
+    previous_end = None
     member_names = set()
     folded_names = set()
     directory_norm = (str(directory or "").replace(
@@ -257,11 +321,13 @@ def search_tar_sidecar(path, *, directory=None, query=None, limit=10_000,
                     if kind != "header":
                         raise ArtifactError("TAR sidecar must begin with a header")
                     header = record
-                    if (expected_version
-                            and record.get("version") != expected_version):
+                    if (record.get("version") not in TAR_SIDECAR_VERSIONS
+                            or (expected_version and record.get("version")
+                                != expected_version)):
                         raise ArtifactError(
                             "unsupported TAR sidecar version "
                             f"{record.get('version')!r}")
+                    digest_algorithm = _sidecar_digest_algorithm(record)
                     if (expected_container_id is not None
                             and record.get("container_id") is not None
                             and int(record["container_id"])
@@ -352,6 +418,15 @@ def search_tar_sidecar(path, *, directory=None, query=None, limit=10_000,
                     raise ArtifactError(
                         "TAR sidecar expected/observed member size mismatch")
                 logical_bytes += size
+                digest = _sidecar_member_digest(record, digest_algorithm)
+                digest_fields = ({} if digest is None else {
+                    "digest": digest, "digest_algorithm": digest_algorithm})
+                item.update(digest_fields)
+                offsets = _sidecar_member_offsets(record, previous_end)
+                if offsets is not None:
+                    item.update(offsets)
+                    previous_end = (offsets["data_offset"]
+                                    + offsets["stored_size"])
                 original_path = _sidecar_source_path(
                     header, record, member_name)
                 if "\0" in original_path or any(
@@ -388,6 +463,8 @@ def search_tar_sidecar(path, *, directory=None, query=None, limit=10_000,
                         "file_name": posixpath.basename(original_path),
                         "file_size_bytes": size,
                         "ordinal": ordinal,
+                        **(offsets or {}),
+                        **digest_fields,
                     })
         finally:
             text.close()
@@ -784,11 +861,13 @@ def _coerce_sidecar_diagnostics(source_diagnostics):
 
 def _sidecar_records(plan, validation, diagnostics, *, session_id,
                      chunk_index, container_id, container_ordinal,
-                     tar_size):
+                     tar_size, version=TAR_SIDECAR_VERSION):
+    if version not in TAR_SIDECAR_VERSIONS:
+        raise ArtifactError(f"unsupported TAR sidecar version {version!r}")
     members = {item.ordinal: item for item in validation.members}
     records = [{
         "record_type": "header",
-        "version": TAR_SIDECAR_VERSION,
+        "version": version,
         "session_id": int(session_id),
         "chunk_index": int(chunk_index),
         "container_id": int(container_id),
@@ -798,6 +877,10 @@ def _sidecar_records(plan, validation, diagnostics, *, session_id,
         "tar_size_bytes": int(tar_size),
         "plan_ordinal_count": len(plan),
     }]
+    digest_algorithm = None
+    if version not in ("tar-sidecar-v1", "tar-sidecar-v2"):
+        digest_algorithm = getattr(validation, "member_digest_algorithm", None)
+        records[0]["member_digest_algorithm"] = digest_algorithm
     logical_bytes = 0
     disposition_counts = {item.value: 0 for item in SourceDisposition}
     for expected in plan:
@@ -846,7 +929,7 @@ def _sidecar_records(plan, validation, diagnostics, *, session_id,
             disposition_counts[SourceDisposition.SOURCE_CHANGED.value] += 1
             raise ArtifactError(
                 f"source_changed at plan ordinal {ordinal}; TAR is rejected")
-        records.append({
+        record = {
             "record_type": "member",
             **identity,
             "member_name": member.name,
@@ -855,7 +938,19 @@ def _sidecar_records(plan, validation, diagnostics, *, session_id,
             "disposition": SourceDisposition.ARCHIVED.value,
             "sparse": bool(member.sparse),
             "sparse_extent_count": int(member.sparse_extent_count),
-        })
+        }
+        if version != "tar-sidecar-v1":
+            if member.header_offset is None or member.data_offset is None:
+                raise ArtifactError(
+                    f"TAR parse recorded no offsets for ordinal {ordinal}")
+            record["header_offset"] = int(member.header_offset)
+            record["data_offset"] = int(member.data_offset)
+        if digest_algorithm is not None:
+            if not member.digest:
+                raise ArtifactError(
+                    f"TAR parse recorded no digest for ordinal {ordinal}")
+            record["digest"] = member.digest
+        records.append(record)
         disposition_counts[SourceDisposition.ARCHIVED.value] += 1
         logical_bytes += member.logical_size
     if sum(disposition_counts.values()) != len(plan):
@@ -927,14 +1022,22 @@ def _read_sidecar_records(path, *, allow_part=False):
 def validate_tar_sidecar(path, plan_members, validation, source_diagnostics,
                          *, session_id, chunk_index, container_id,
                          container_ordinal, tar_size, allow_part=False):
-    """Prove a complete sidecar is exactly equivalent to plan + TAR parse."""
+    """Prove a complete sidecar is exactly equivalent to plan + TAR parse.
+
+    The comparison uses the version the sidecar declares, so an already
+    published v1 sidecar remains exactly verifiable after an upgrade.
+    """
     plan = _coerce_sidecar_plan(plan_members, container_ordinal)
     diagnostics = _coerce_sidecar_diagnostics(source_diagnostics)
+    actual = _read_sidecar_records(path, allow_part=allow_part)
+    version = actual[0].get("version") if actual else None
+    if version not in TAR_SIDECAR_VERSIONS:
+        raise ArtifactError(f"unsupported TAR sidecar version {version!r}")
     expected, counts = _sidecar_records(
         plan, validation, diagnostics, session_id=session_id,
         chunk_index=chunk_index, container_id=container_id,
-        container_ordinal=container_ordinal, tar_size=tar_size)
-    actual = _read_sidecar_records(path, allow_part=allow_part)
+        container_ordinal=container_ordinal, tar_size=tar_size,
+        version=version)
     if actual != expected:
         raise ArtifactError("TAR sidecar is not equivalent to its plan/TAR")
     return counts
@@ -965,7 +1068,7 @@ def read_tar_sidecar_diagnostics(path, *, session_id, chunk_index,
     mismatch = [
         key for key, value in expected_identity.items()
         if header.get(key) is None or int(header[key]) != value]
-    if (header.get("version") != TAR_SIDECAR_VERSION or mismatch):
+    if (header.get("version") not in TAR_SIDECAR_VERSIONS or mismatch):
         raise ArtifactError(
             "TAR sidecar header identity/version mismatch"
             + (f": {', '.join(mismatch)}" if mismatch else ""))
@@ -987,6 +1090,29 @@ def read_tar_sidecar_diagnostics(path, *, session_id, chunk_index,
     return tuple(diagnostics)
 
 
+def _read_tar_sidecar_header(path):
+    records = _read_sidecar_records(path)
+    if not records or records[0].get("record_type") != "header":
+        raise ArtifactError("TAR sidecar must begin with a header")
+    header = records[0]
+    if header.get("version") not in TAR_SIDECAR_VERSIONS:
+        raise ArtifactError(
+            f"unsupported TAR sidecar version {header.get('version')!r}")
+    return header
+
+
+def read_tar_sidecar_version(path):
+    """Return the supported contract version declared by a sidecar header."""
+    return _read_tar_sidecar_header(path)["version"]
+
+
+def _without_digests(validation):
+    return replace(
+        validation, member_digest_algorithm=None,
+        members=tuple(replace(item, digest=None)
+                      for item in validation.members))
+
+
 def _files_equal(left, right, chunk_size=1024 * 1024):
     try:
         if os.path.getsize(_long(left)) != os.path.getsize(_long(right)):
@@ -1041,8 +1167,12 @@ def publish_stored_tar_pair(
         archive_root, tar_part_path, final_tar_path, plan_members,
         source_diagnostics, *, validation=None, session_id, chunk_index,
         container_id, container_ordinal, owner_token, db, pack_dir=None,
-        crash_hook=None):
-    """Sidecar-first filesystem publication followed by one paired DB CAS."""
+        crash_hook=None, member_digest=None):
+    """Sidecar-first filesystem publication followed by one paired DB CAS.
+
+    A new sidecar records member digests with ``member_digest``; one that
+    already exists keeps the algorithm (or none) it was published with.
+    """
     hook = crash_hook or (lambda _stage: None)
     archive_root = os.path.abspath(str(archive_root))
     tar_part_path = os.path.abspath(str(tar_part_path))
@@ -1062,22 +1192,39 @@ def publish_stored_tar_pair(
             "final TAR has no sidecar and source exceptions existed; refuse "
             "to infer or reconstruct exception evidence")
 
+    sidecar_version = TAR_SIDECAR_VERSION
+    if sidecar_existed:
+        # A sidecar published before an upgrade keeps its own version.
+        header = _read_tar_sidecar_header(sidecar_path)
+        sidecar_version = header["version"]
+        member_digest = (_sidecar_digest_algorithm(header)
+                         if sidecar_version == TAR_SIDECAR_VERSION else None)
+
     validation_source = (
         tar_part_path if os.path.isfile(_long(tar_part_path))
         else final_tar_path)
     if not os.path.isfile(_long(validation_source)):
         raise ArtifactError("neither validated TAR part nor final TAR exists")
+    # Digests the caller's validation already computed are not computed
+    # again: the revalidation proves the part's structure is unchanged.
+    reuse_digests = (
+        validation is not None and member_digest is not None
+        and getattr(validation, "member_digest_algorithm", None)
+        == member_digest)
     try:
         current_validation = validate_stored_tar_part(
             validation_source, plan_members,
             container_ordinal=container_ordinal,
             source_diagnostics=diagnostics,
-            require_part=validation_source.endswith(".part"))
+            require_part=validation_source.endswith(".part"),
+            member_digest=None if reuse_digests else member_digest)
     except StoredTarError as exc:
         raise ArtifactError(f"Stored TAR revalidation failed: {exc}") from exc
-    if validation is not None and current_validation != validation:
+    if validation is not None and (_without_digests(current_validation)
+                                   != _without_digests(validation)):
         raise ArtifactError("Stored TAR validation summary changed before publish")
-    validation = current_validation
+    if not reuse_digests:
+        validation = current_validation
     tar_size = validation.archive_size
 
     if sidecar_existed:
@@ -1148,7 +1295,7 @@ def publish_stored_tar_pair(
     row = db.publish_stored_tar_pair(
         container_id=int(container_id), owner_token=str(owner_token),
         sidecar_locator=sidecar_locator,
-        sidecar_version=TAR_SIDECAR_VERSION,
+        sidecar_version=sidecar_version,
         sidecar_size_bytes=sidecar_size,
         temporary_data_locator=final_tar_path,
         tar_size_bytes=tar_size,
@@ -1169,12 +1316,13 @@ def publish_stored_tar_pair(
 
 __all__ = [
     "ARTIFACT_NAMESPACE", "ARTIFACT_VERSION", "TAR_SIDECAR_VERSION",
+    "TAR_SIDECAR_VERSIONS",
     "ArtifactConflict", "ArtifactError", "JsonlZstArtifactWriter",
     "StoredTarPairPublication", "TarSidecarSearchResult", "artifact_root",
     "find_orphan_parts",
     "is_ltfs_locator", "parse_jsonl_zst_artifact",
     "publish_no_clobber", "publish_stored_tar_pair",
-    "read_tar_sidecar_diagnostics",
+    "read_tar_sidecar_diagnostics", "read_tar_sidecar_version",
     "resolve_local_metadata_locator", "resolve_locator",
     "search_tar_sidecar", "segment_locator", "tar_sidecar_locator",
     "validate_tar_sidecar",
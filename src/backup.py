@@ -78,6 +78,9 @@ class LTOBackup:
         self.governor      = governor
         self.index_min_file_mb = index_min_file_mb
         self.index_packed_small_files = bool(index_packed_small_files)
+        #: ``copied_bytes`` plus the tape profiler details of the last
+        #: completed write, for the write-group history (tape_write_log).
+        self.last_tape_write = None
 
     def _write_backup_log(self, details, packer_metadata, loose_map,
                           recovered_direct_existing, skipped_existing,
@@ -157,6 +160,7 @@ class LTOBackup:
         def _ram_interval():
             cfg = getattr(self.governor, "cfg", None)
             return getattr(cfg, "governor_memory_sample_interval_seconds", 5)
+        ram_source = getattr(self.governor, "sampler", None)
         def _stage_ram_details():
             details = {}
             if stage_stats and getattr(stage_stats, "ram_stats", None):
@@ -445,7 +449,8 @@ class LTOBackup:
                 on_write_start()
         try:
             try:
-                with RamStageSampler("tape", _ram_interval()) as tape_sampler:
+                with RamStageSampler("tape", _ram_interval(),
+                                     source=ram_source) as tape_sampler:
                     # Passive per-second profiler: reads only robocopy's own I/O
                     # counter (never the tape) to isolate open/stream/close/stalls.
                     with TapeWriteProfiler(interval_seconds=1.0) as tape_profiler:
@@ -640,7 +645,10 @@ class LTOBackup:
                         'manifest_format', 'manifest_compression',
                         'container_id', 'container_format',
                         'container_ordinal', 'artifact_id', 'artifact_kind',
-                        'artifact_version', 'actual_artifact_bytes'):
+                        'artifact_version', 'actual_artifact_bytes',
+                        'zip_header_offset', 'zip_data_offset',
+                        'zip_stored_size', 'zip_crc32',
+                        'tar_digest_algorithm', 'tar_digest'):
                     if key in metadata:
                         record[key] = metadata.get(key)
             return record
@@ -655,7 +663,8 @@ class LTOBackup:
         # db_sync_active=True and block later fetch/pack/tape work.
         with _remote_catalog_commit_state(
                 self.db, remote_session_id, remote_chunk_index), \
-                RamStageSampler("db_sync", _ram_interval()) as db_sampler:
+                RamStageSampler("db_sync", _ram_interval(),
+                                source=ram_source) as db_sampler:
             with db_guard:
                 if packer_metadata is None:
                     _db_checkpoint()
@@ -783,6 +792,8 @@ class LTOBackup:
             if skipped_tracker and skipped_tracker.has_items() else ''
         )
         log_status = 'completed_with_skips' if skipped_count else 'completed'
+        self.last_tape_write = {'copied_bytes': copied_bytes,
+                                **tape_profiler.as_details("tape")}
         log_path = self._write_backup_log(
             {
                 'status': log_status,
@@ -0,0 +1,274 @@
+"""Maintained recursive totals per catalog directory (migration 019).
+
+``catalog_directory_rollups`` holds, for every directory of the catalog tree,
+the file count, bytes and latest backup date of its whole subtree: the
+``files_index`` rows below it plus the aggregates of pruned local-manifest
+exports. The inspector sizes a page of directories with one primary-key
+lookup instead of a recursive walk.
+
+Writers keep the rows current inside their own transaction: they collect
+per-directory deltas for the rows they changed and :func:`apply_deltas` adds
+them to the directory and every ancestor. Subtree totals only move by what
+was written, so batches never rescan the tree. ``last_backup_date`` only moves
+forward; deleting rows leaves it alone until the next rebuild.
+
+:func:`rebuild` recomputes every row from the catalog and marks the rollups
+as built; until then :func:`rollups_built` is false and readers keep the
+recursive walk. :func:`verify` compares the stored rows with a fresh
+computation without changing anything.
+"""
+import time
+from typing import Any, cast
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+except ImportError:  # pragma: no cover - runtime dependency path
+    psycopg = None
+    dict_row = None
+
+from .pg_bulk import require_psycopg
+
+
+ROLLUP_TABLE = "catalog_directory_rollups"
+ROLLUP_STATE_TABLE = "catalog_directory_rollup_state"
+
+# Directory totals from scratch: files_index rows climb to every ancestor,
+# pruned-manifest aggregates already carry recursive totals per directory.
+_EXPECTED_SQL = """
+    WITH RECURSIVE direct AS (
+        SELECT directory_id, COUNT(*) AS file_count,
+               SUM(file_size_bytes) AS bytes,
+               MAX(catalog_backup_date) AS last_backup
+        FROM files_index
+        GROUP BY directory_id
+    ), up AS (
+        SELECT directory_id AS source_id, directory_id FROM direct
+        UNION ALL
+        SELECT u.source_id, c.parent_id
+        FROM up u
+        JOIN catalog_directories c ON c.directory_id = u.directory_id
+        WHERE c.parent_id IS NOT NULL
+    ), files AS (
+        SELECT u.directory_id, SUM(d.file_count) AS file_count,
+               SUM(d.bytes) AS bytes, MAX(d.last_backup) AS last_backup
+        FROM up u
+        JOIN direct d ON d.directory_id = u.source_id
+        GROUP BY u.directory_id
+    ), manifests AS (
+        SELECT a.directory_id, SUM(a.recursive_file_count) AS file_count,
+               SUM(a.recursive_bytes) AS bytes
+        FROM local_manifest_catalog_aggregates a
+        JOIN local_manifest_exports e ON e.export_id = a.export_id
+        WHERE e.status = 'pruned'
+        GROUP BY a.directory_id
+    ), expected AS (
+        SELECT COALESCE(f.directory_id, m.directory_id) AS directory_id,
+               COALESCE(f.file_count, 0) + COALESCE(m.file_count, 0)
+                   AS recursive_file_count,
+               COALESCE(f.bytes, 0) + COALESCE(m.bytes, 0) AS recursive_bytes,
+               f.last_backup AS last_backup_date
+        FROM files f
+        FULL JOIN manifests m ON m.directory_id = f.directory_id
+    )
+"""
+
+
+def file_deltas(rows, *, sign=1, deltas=None):
+    """Accumulate ``(directory_id, file_size_bytes, backup_date)`` rows into
+    ``{directory_id: [files, bytes, latest backup]}``; ``sign=-1`` for rows
+    that were removed or are about to be replaced."""
+    deltas = {} if deltas is None else deltas
+    for directory_id, size, backup_date in rows:
+        entry = deltas.setdefault(int(directory_id), [0, 0, None])
+        entry[0] += sign
+        entry[1] += sign * int(size or 0)
+        if (sign > 0 and backup_date is not None
+                and (entry[2] is None or backup_date > entry[2])):
+            entry[2] = backup_date
+    return deltas
+
+
+def _table_exists(conn, table_name):
+    row = conn.execute(
+        "SELECT to_regclass(%s) IS NOT NULL AS present",
+        (f"public.{table_name}",)).fetchone()
+    return bool(row["present"])
+
+
+def apply_deltas(conn, deltas):
+    """Add ``deltas`` (see :func:`file_deltas`) to each directory and all of
+    its ancestors, in the caller's transaction."""
+    changed = {directory_id: entry for directory_id, entry in deltas.items()
+               if entry[0] or entry[1] or entry[2] is not None}
+    if not changed or not _table_exists(conn, ROLLUP_TABLE):
+        return 0
+    ids = sorted(changed)
+    # Rows are upserted in directory_id order so concurrent writers lock
+    # shared ancestors in the same order.
+    return conn.execute(
+        """WITH RECURSIVE delta AS (
+               SELECT * FROM unnest(
+                   %s::bigint[], %s::bigint[], %s::bigint[],
+                   %s::timestamptz[])
+                   AS d(directory_id, file_count, bytes, last_backup)
+           ), up AS (
+               SELECT directory_id AS source_id, directory_id FROM delta
+               UNION ALL
+               SELECT u.source_id, c.parent_id
+               FROM up u
+               JOIN catalog_directories c ON c.directory_id = u.directory_id
+               WHERE c.parent_id IS NOT NULL
+           )
+           INSERT INTO catalog_directory_rollups AS r
+               (directory_id, recursive_file_count, recursive_bytes,
+                last_backup_date)
+           SELECT u.directory_id, SUM(d.file_count), SUM(d.bytes),
+                  MAX(d.last_backup)
+           FROM up u
+           JOIN delta d ON d.directory_id = u.source_id
+           GROUP BY u.directory_id
+           ORDER BY u.directory_id
+           ON CONFLICT (directory_id) DO UPDATE SET
+               recursive_file_count =
+                   r.recursive_file_count + EXCLUDED.recursive_file_count,
+               recursive_bytes = r.recursive_bytes + EXCLUDED.recursive_bytes,
+               last_backup_date = GREATEST(
+                   r.last_backup_date, EXCLUDED.last_backup_date)""",
+        (ids, [changed[i][0] for i in ids], [changed[i][1] for i in ids],
+         [changed[i][2] for i in ids]),
+    ).rowcount
+
+
+def add_export_aggregates(conn, export_id):
+    """Count a just-pruned export's catalog aggregates into the rollups.
+
+    The aggregates are recursive already, so each row lands on its own
+    directory only.
+    """
+    if not _table_exists(conn, ROLLUP_TABLE):
+        return 0
+    return conn.execute(
+        """INSERT INTO catalog_directory_rollups AS r
+               (directory_id, recursive_file_count, recursive_bytes)
+           SELECT directory_id, recursive_file_count, recursive_bytes
+           FROM local_manifest_catalog_aggregates
+           WHERE export_id = %s
+           ORDER BY directory_id
+           ON CONFLICT (directory_id) DO UPDATE SET
+               recursive_file_count =
+                   r.recursive_file_count + EXCLUDED.recursive_file_count,
+               recursive_bytes = r.recursive_bytes + EXCLUDED.recursive_bytes""",
+        (int(export_id),),
+    ).rowcount
+
+
+def rollups_built(conn):
+    """True once :func:`rebuild` has filled the rollups."""
+    if not _table_exists(conn, ROLLUP_STATE_TABLE):
+        return False
+    return conn.execute(
+        "SELECT 1 FROM catalog_directory_rollup_state").fetchone() is not None
+
+
+def subtree_totals(conn, directory_ids):
+    """``{directory_id: totals}`` from the rollups; a directory with no row
+    has nothing below it."""
+    ids = [int(directory_id) for directory_id in directory_ids]
+    totals = {directory_id: {
+        "recursive_bytes": 0, "recursive_file_count": 0,
+        "last_backup_date": None} for directory_id in ids}
+    for row in conn.execute(
+            """SELECT directory_id, recursive_bytes, recursive_file_count,
+                      last_backup_date
+               FROM catalog_directory_rollups
+               WHERE directory_id = ANY(%s)""", (ids,)).fetchall():
+        totals[row["directory_id"]] = {
+            "recursive_bytes": row["recursive_bytes"] or 0,
+            "recursive_file_count": row["recursive_file_count"] or 0,
+            "last_backup_date": row["last_backup_date"],
+        }
+    return totals
+
+
+def _connect(conninfo):
+    require_psycopg()
+    return cast(Any, psycopg.connect(
+        conninfo, autocommit=True, row_factory=cast(Any, dict_row)))
+
+
+def rebuild(conninfo):
+    """Recompute every rollup row and mark the rollups built.
+
+    The rollup table is locked for the rebuild, so a catalog write that
+    commits meanwhile applies its deltas on top of the fresh rows.
+    """
+    started = time.monotonic()
+    with _connect(conninfo) as conn:
+        if not _table_exists(conn, ROLLUP_TABLE):
+            raise RuntimeError(
+                "[DB] catalog_directory_rollups is missing. Apply "
+                "scripts/sql/019_postgres_directory_rollups.sql first.")
+        with conn.transaction():
+            conn.execute("LOCK TABLE catalog_directory_rollups "
+                         "IN ACCESS EXCLUSIVE MODE")
+            conn.execute("TRUNCATE catalog_directory_rollups")
+            written = conn.execute(
+                _EXPECTED_SQL + """
+                INSERT INTO catalog_directory_rollups
+                    (directory_id, recursive_file_count, recursive_bytes,
+                     last_backup_date)
+                SELECT directory_id, recursive_file_count, recursive_bytes,
+                       last_backup_date
+                FROM expected""").rowcount
+            conn.execute(
+                """INSERT INTO catalog_directory_rollup_state (built_at)
+                   VALUES (now())
+                   ON CONFLICT (singleton) DO UPDATE SET built_at = now()""")
+    return {"directories": int(written or 0),
+            "seconds": round(time.monotonic() - started, 3)}
+
+
+def verify(conninfo, *, limit=100):
+    """Compare stored rollups with a fresh computation (read-only).
+
+    Counts and bytes must match exactly. ``last_backup_date`` is not
+    compared, because deletes leave it alone until the next rebuild.
+    """
+    with _connect(conninfo) as conn:
+        built = rollups_built(conn)
+        rows = conn.execute(
+            _EXPECTED_SQL + """
+            SELECT COALESCE(e.directory_id, r.directory_id) AS directory_id,
+                   COALESCE(e.recursive_file_count, 0) AS expected_files,
+                   COALESCE(r.recursive_file_count, 0) AS stored_files,
+                   COALESCE(e.recursive_bytes, 0) AS expected_bytes,
+                   COALESCE(r.recursive_bytes, 0) AS stored_bytes,
+                   COUNT(*) OVER () AS mismatches
+            FROM expected e
+            FULL JOIN catalog_directory_rollups r
+              ON r.directory_id = e.directory_id
+            WHERE COALESCE(e.recursive_file_count, 0)
+                      <> COALESCE(r.recursive_file_count, 0)
+               OR COALESCE(e.recursive_bytes, 0)
+                      <> COALESCE(r.recursive_bytes, 0)
+            ORDER BY 1
+            LIMIT %s""", (max(1, int(limit)),)).fetchall()
+    mismatches = int(rows[0]["mismatches"]) if rows else 0
+    return {
+        "built": built,
+        "passed": built and not mismatches,
+        "mismatches": mismatches,
+        "examples": [
+            {key: row[key] for key in (
+                "directory_id", "expected_files", "stored_files",
+                "expected_bytes", "stored_bytes")}
+            for row in rows],
+    }
+
+
+__all__ = [
+    "ROLLUP_STATE_TABLE", "ROLLUP_TABLE", "add_export_aggregates",
+    "apply_deltas", "file_deltas", "rebuild", "rollups_built",
+    "subtree_totals", "verify",
+]
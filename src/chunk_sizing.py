@@ -0,0 +1,158 @@
+"""Chunk and write-group sizing from measured tape-write overhead.
+
+Every chunk write pays a fixed cost on top of streaming its bytes: the
+robocopy open, the flush and file mark, the LTFS ``time@5`` index sync and
+the catalog commit. A write of ``B`` bytes at streaming rate ``R`` with fixed
+cost ``O`` runs at ``B / (O + B / R)``, a fraction ``B / (B + O * R)`` of the
+drive's rate, which is why small chunks collapse effective throughput. To
+reach a target fraction ``f`` a write needs ``B = f / (1 - f) * O * R``.
+
+:func:`load_tape_write_model` derives ``O`` and ``R`` from the newest backup
+rows of SUMMARY.csv (``tape_stream_mbs`` is the profiler's clean streaming
+rate; whatever the row's writer time spent beyond streaming its bytes is
+fixed cost), and :func:`size_chunks` turns them into a chunk budget and a
+ready-queue start threshold. Both stay bounded by staging: a chunk's fetch
+and pack copies must still fit beside a full ready queue.
+
+A write group also pays a fixed cost of its own (taking LTFS ownership, the
+tape I/O lock) once for all of its chunks. The write-group history in
+:mod:`~src.tape_write_log` fits that per-group term beside the per-chunk one
+into the same :class:`TapeWriteModel`, and the ready queue holds a group
+until :meth:`TapeWriteModel.group_amortization` reaches the target.
+"""
+import statistics
+from dataclasses import dataclass
+from typing import Optional
+
+from .constants import LOCAL_STAGING_RESERVE_BYTES
+from .reporting import _float_or_none, recent_summary_rows
+
+
+#: Fewer usable rows than this is no model: the static sizes stay in force.
+MIN_MODEL_SAMPLES = 3
+
+#: Never plan chunks smaller than this, however cheap the writes look.
+MIN_CHUNK_BYTES = 1024**3
+
+
+@dataclass(frozen=True)
+class TapeWriteModel:
+    """Fixed costs and streaming rate of recent tape writes.
+
+    ``overhead_seconds`` is paid by every chunk write, and
+    ``group_overhead_seconds`` once per write group (0 when fitted from
+    SUMMARY.csv, whose rows are single chunk writes).
+    """
+    overhead_seconds: float
+    stream_bytes_per_second: float
+    samples: int
+    group_overhead_seconds: float = 0.0
+
+    def _fixed_seconds(self, chunks, group=True):
+        return (self.overhead_seconds * max(1, int(chunks))
+                + (self.group_overhead_seconds if group else 0.0))
+
+    def efficiency(self, nbytes, chunks=1):
+        """Fraction of the streaming rate ``nbytes`` written as one group of
+        ``chunks`` chunk writes achieves."""
+        fixed = self._fixed_seconds(chunks) * self.stream_bytes_per_second
+        return nbytes / (nbytes + fixed) if nbytes > 0 else 0.0
+
+    def predict_mbs(self, nbytes, chunks=1):
+        """Effective MB/s of a write group of ``nbytes`` in ``chunks``."""
+        return (self.efficiency(nbytes, chunks)
+                * self.stream_bytes_per_second / 1024**2)
+
+    def group_amortization(self, nbytes, chunks=1):
+        """Share of the rate these chunks could reach without the per-group
+        cost that one group of them reaches. It rises toward 1 as the group
+        grows, whatever the chunks' size."""
+        if nbytes <= 0:
+            return 0.0
+        rate = self.stream_bytes_per_second
+        per_chunk = nbytes + self._fixed_seconds(chunks, group=False) * rate
+        return per_chunk / (per_chunk + self.group_overhead_seconds * rate)
+
+    def bytes_for_efficiency(self, fraction):
+        """Smallest write reaching ``fraction`` of the streaming rate."""
+        fraction = min(max(float(fraction), 0.0), 0.99)
+        return int(fraction / (1.0 - fraction)
+                   * self.overhead_seconds * self.stream_bytes_per_second)
+
+
+@dataclass(frozen=True)
+class ChunkSizing:
+    """What the planner and the ready queue use for this session."""
+    chunk_bytes: int
+    min_start_bytes: int
+    source: str                     # 'model' or 'static'
+    model: Optional[TapeWriteModel] = None
+    predicted_efficiency: Optional[float] = None
+
+
+def load_tape_write_model(log_dir=None, rows=20, tape_label=None):
+    """A :class:`TapeWriteModel` from the last ``rows`` SUMMARY.csv backup
+    rows, or None without :data:`MIN_MODEL_SAMPLES` completed tape writes.
+
+    With ``tape_label``, that tape's own writes are used when there are
+    enough of them; otherwise every recent write is.
+    """
+    samples = []
+    for row in recent_summary_rows(log_dir, limit=rows):
+        if not str(row.get('status') or '').startswith('completed'):
+            continue
+        copied = _float_or_none(row.get('copied_bytes'))
+        stream_mbs = _float_or_none(row.get('tape_stream_mbs'))
+        elapsed = _float_or_none(row.get('total_time_seconds'))
+        if not copied or not stream_mbs or not elapsed or copied <= 0 \
+                or stream_mbs <= 0:
+            continue
+        rate = stream_mbs * 1024**2
+        samples.append((row.get('tape_label'),
+                        max(0.0, elapsed - copied / rate), rate))
+    own = [s for s in samples if tape_label and s[0] == tape_label]
+    if len(own) >= MIN_MODEL_SAMPLES:
+        samples = own
+    if len(samples) < MIN_MODEL_SAMPLES:
+        return None
+    return TapeWriteModel(
+        overhead_seconds=statistics.median(s[1] for s in samples),
+        stream_bytes_per_second=statistics.median(s[2] for s in samples),
+        samples=len(samples))
+
+
+def max_chunk_bytes_for_staging(effective_staging_bytes, max_ready_bytes):
+    """Largest chunk whose fetch and pack copies fit beside a full ready
+    queue and the fixed staging reserve."""
+    room = (int(effective_staging_bytes) - int(max_ready_bytes)
+            - LOCAL_STAGING_RESERVE_BYTES)
+    return max(0, room // 2)
+
+
+def size_chunks(model, *, target_efficiency, static_chunk_bytes, limits,
+                effective_staging_bytes):
+    """Chunk budget and ready-queue start bytes for ``target_efficiency``.
+
+    Without a model, or with the target at 0, the configured chunk cap and
+    ``limits.min_start_bytes`` are returned unchanged. Otherwise the chunk is
+    sized to reach the target, at least :data:`MIN_CHUNK_BYTES` and at most
+    what staging can hold, and a write group waits for at least one such
+    chunk (never past ``limits.target_bytes``).
+    """
+    static = ChunkSizing(int(static_chunk_bytes), limits.min_start_bytes,
+                         'static', model)
+    if model is None or not target_efficiency or target_efficiency <= 0:
+        return static
+    ceiling = max(int(static_chunk_bytes), max_chunk_bytes_for_staging(
+        effective_staging_bytes, limits.max_bytes))
+    chunk = min(max(model.bytes_for_efficiency(target_efficiency),
+                    MIN_CHUNK_BYTES), ceiling)
+    min_start = min(limits.target_bytes, max(limits.min_start_bytes, chunk))
+    return ChunkSizing(chunk, min_start, 'model', model,
+                       round(model.efficiency(chunk), 3))
+
+
+__all__ = [
+    "ChunkSizing", "MIN_CHUNK_BYTES", "MIN_MODEL_SAMPLES", "TapeWriteModel",
+    "load_tape_write_model", "max_chunk_bytes_for_staging", "size_chunks",
+]
@@ -401,7 +401,14 @@ def main():
     tape_mgr  = TapeManager(db, cfg.lto_drive, cfg.ibm_eject_cmd)
     retriever = LTORetriever(
         db, cfg.lto_drive, cfg.staging_dir, cfg.restore_dir,
-        manifest_archive_root=cfg.local_manifest_archive_root)
+        manifest_archive_root=cfg.local_manifest_archive_root,
+        byte_range_tar_restore=getattr(
+            cfg, "stored_tar_byte_range_restore", True),
+        tape_stream_mbs=getattr(cfg, "restore_tape_stream_mbs", 300),
+        tape_seek_seconds=getattr(cfg, "restore_tape_seek_seconds", 60),
+        probe_ltfs_start_blocks=getattr(
+            cfg, "restore_ltfs_start_block_probe", False),
+        stream_zip_restore=getattr(cfg, "zip_stream_restore", True))
 
     # The last terminal result from a sub-flow (e.g. the remote archiver). If
     # stdin closes at the menu prompt after a sub-flow already produced a
@@ -135,11 +135,16 @@ class ConfigManager:
             # staging_max_gb before a run; a conflict falls back atomically to
             # the documented default limits (never a silent single-value clamp).
             'ready_queue_staging_reserve_bytes':   '0',
+            # Fetched chunks that may wait for the packer while the next
+            # chunk fetches. 0 => fetch and pack each chunk in turn.
+            'fetch_ahead_chunks':                  '1',
         }
         self.config['PERFORMANCE'] = {
             'pipeline_profile':      'tape_first_controlled',
             'chunk_cap_gb':          '50',
             'chunk_max_files':       '100000',
+            'chunk_target_tape_efficiency': '0.9',
+            'chunk_sizing_history_rows': '20',
             'prefetch_chunks_ahead': '1',
             'staging_max_gb':        '350',
             'ram_soft_limit_pct':    '70',
@@ -155,9 +160,13 @@ class ConfigManager:
             'governor_soft_relax_factor': '0.75',
             'governor_status_interval_seconds': '60',
             'governor_memory_sample_interval_seconds': '5',
+            'governor_resource_sample_interval_seconds': '1',
+            'governor_memory_model': 'psutil',
+            'governor_memory_psi_limit_pct': '10',
             'governor_metadata_batch_size': '10000',
             'governor_pack_file_batch_size': '10000',
             'pack_parallel_workers': '1',
+            'pack_parallel_backend': 'thread',
             'tape_write_exclusive':  'true',
             'allow_fetch_during_tape_write':   'false',
             'allow_pack_during_tape_write':    'false',
@@ -170,6 +179,18 @@ class ConfigManager:
             'cpu_affinity':          'auto',
             'ssh_cipher':            'aes128-gcm@openssh.com',
             'ssh_command_timeout_seconds': '3600',
+            'scan_persistent_session': 'true',
+            'scan_directory_batch_size': '1',
+            'scan_workers': '1',
+            'stored_tar_inline_validation': 'true',
+            'stored_tar_member_digest': 'sha256',
+            'stored_tar_byte_range_restore': 'true',
+            'restore_tape_stream_mbs': '300',
+            'restore_tape_seek_seconds': '60',
+            'restore_ltfs_start_block_probe': 'false',
+            'zip_stream_restore': 'true',
+            'zip_stream_transcode': 'false',
+            'fetch_adaptive_streams': 'true',
             'use_mbuffer':           'false',
             'mbuffer_size':          '512M',
             'staging_padding_factor':      '1.15',
@@ -450,6 +471,21 @@ class ConfigManager:
     def chunk_max_files(self):
         return self._get_int('PERFORMANCE', 'chunk_max_files', 100000,
                              minimum=1)
+    @property
+    def chunk_target_tape_efficiency(self):
+        """Fraction of the drive's streaming rate each chunk write should
+        reach once SUMMARY.csv holds a few tape writes: chunks are sized from
+        their measured fixed cost (see src.chunk_sizing), bounded by staging,
+        and write groups wait until ``tape_write/history.jsonl`` predicts
+        their per-group cost amortized to it (see src.tape_write_log). 0 keeps
+        chunk_cap_gb and min_ready_bytes_before_writer_start as set."""
+        value = self._get_float('PERFORMANCE', 'chunk_target_tape_efficiency',
+                                0.9)
+        return min(max(value, 0.0), 0.99)
+    @property
+    def chunk_sizing_history_rows(self):
+        return self._get_int('PERFORMANCE', 'chunk_sizing_history_rows', 20,
+                             minimum=1)
     # -- Phase 4 byte-bounded ready queue --------------------------------
     _READY_QUEUE_DEFAULTS = {
         'min_ready_bytes_before_writer_start': 20 * 1024**3,
@@ -524,6 +560,18 @@ class ConfigManager:
         return self._get_int('PIPELINE', 'max_unstaged_backlog_chunks', 64,
                              minimum=1)
 
+    @property
+    def fetch_ahead_chunks(self):
+        """Fetched chunks that may wait for the packer (remote staging).
+
+        With ``1`` or more the stager fetches chunk N+1 while a separate pack
+        thread packs chunk N, so the WAN link and the local disk/CPU work at
+        the same time. Each fetched chunk keeps its fetch+pack staging
+        reservation until it is packed, so the staging cap still bounds the
+        total. ``0`` fetches and packs each chunk in turn.
+        """
+        return self._get_int('PIPELINE', 'fetch_ahead_chunks', 1, minimum=0)
+
     def validated_ready_queue_limits(self):
         """Ready-queue limits proven to leave room for fetch/pack (Phase 4.5).
 
@@ -628,6 +676,34 @@ class ConfigManager:
         return self._get_float(
             'PERFORMANCE', 'governor_memory_sample_interval_seconds', 5)
     @property
+    def governor_resource_sample_interval_seconds(self):
+        """Cadence of the governor's shared resource snapshot (RAM, process
+        RSS, staging free space). Start decisions always resample; 0 samples
+        on every read, as before the shared sampler."""
+        return max(0.0, self._get_float(
+            'PERFORMANCE', 'governor_resource_sample_interval_seconds', 1))
+    @property
+    def governor_memory_model(self):
+        """What the RAM limits measure: 'psutil' (default; percent counts
+        reclaimable file cache as used), 'meminfo' (Linux: anonymous, dirty,
+        writeback and unreclaimable kernel memory, plus PSI; psutil where
+        /proc is missing) or 'auto' (meminfo where /proc/meminfo exists).
+        Unknown values fall back to 'psutil'."""
+        value = self.config.get(
+            'PERFORMANCE', 'governor_memory_model',
+            fallback='psutil').strip().lower()
+        if value not in ('psutil', 'meminfo', 'auto'):
+            print(f"[CONFIG] [PERFORMANCE] governor_memory_model={value!r} is "
+                  f"not 'psutil', 'meminfo' or 'auto'; using 'psutil'.")
+            return 'psutil'
+        return value
+    @property
+    def governor_memory_psi_limit_pct(self):
+        """Hold fetch and tape starts while PSI memory 'some avg10' is at or
+        above this share (meminfo model only; 0 = off)."""
+        return max(0.0, self._get_float(
+            'PERFORMANCE', 'governor_memory_psi_limit_pct', 10))
+    @property
     def governor_metadata_batch_size(self):
         return self._get_int(
             'PERFORMANCE', 'governor_metadata_batch_size', 10000,
@@ -637,10 +713,18 @@ class ConfigManager:
         """Number of concurrent SSH/tar fetch streams per chunk (default 1 =
         legacy single-stream). Small-file chunks are per-file-latency bound on a
         single stream; 2-3 parallel streams overlap those stalls up to the WAN
-        ceiling. Bounded by cores/RAM — keep modest on small hosts."""
+        ceiling. Bounded by cores/RAM — keep modest on small hosts.
+
+        A Stored TAR chunk with several containers builds up to this many of
+        them concurrently, one stream each, and publishes them in order."""
         return self._get_int(
             'PERFORMANCE', 'fetch_parallel_streams', 1, minimum=1)
     @property
+    def fetch_adaptive_streams(self):
+        """With fetch_parallel_streams > 1, park streams that add no measured
+        throughput (see src.fetch_scheduler). Off keeps every stream busy."""
+        return self._get_bool('PERFORMANCE', 'fetch_adaptive_streams', True)
+    @property
     def fetch_transient_retries(self):
         """How many times to retry a fetch batch that failed on a *transient*
         network error (DNS resolution, ssh exit 255, connection reset/refused/
@@ -678,6 +762,21 @@ class ConfigManager:
         return self._get_int(
             'PERFORMANCE', 'pack_parallel_workers', 1, minimum=1)
     @property
+    def pack_parallel_backend(self):
+        """How pack_parallel_workers > 1 runs its shards: 'thread' (default)
+        or 'process'. Worker processes each have their own GIL, so CRC-32 and
+        ZIP bookkeeping on small files scale with cores; they share the staging
+        budget and governor pause through a manager process. Unknown values
+        fall back to 'thread'."""
+        value = self.config.get(
+            'PERFORMANCE', 'pack_parallel_backend',
+            fallback='thread').strip().lower()
+        if value not in ('thread', 'process'):
+            print(f"[CONFIG] [PERFORMANCE] pack_parallel_backend={value!r} is "
+                  f"not 'thread' or 'process'; using 'thread'.")
+            return 'thread'
+        return value
+    @property
     def tape_write_exclusive(self):
         return self._get_bool('PERFORMANCE', 'tape_write_exclusive', True)
     @property
@@ -728,6 +827,85 @@ class ConfigManager:
             return 3600
         return max(1, value)
     @property
+    def scan_persistent_session(self):
+        """Serve every frontier directory listing over ONE long-lived SSH
+        connection instead of one connection per directory. The handshake,
+        not the remote ``find``, dominates a tree of small directories. Falls
+        back to per-directory SSH automatically when the remote host cannot
+        run the listing loop (it needs ``bash``)."""
+        return self._get_bool('PERFORMANCE', 'scan_persistent_session', True)
+    @property
+    def scan_directory_batch_size(self):
+        """How many frontier directories one scanner round trip claims, lists
+        and commits together. ``1`` keeps the one-directory round trip; a
+        larger batch suits trees of many tiny directories, at the cost of
+        replaying up to that many directories after a crash."""
+        return self._get_int('PERFORMANCE', 'scan_directory_batch_size', 1,
+                             minimum=1)
+    @property
+    def scan_workers(self):
+        """Frontier scan workers listing directories concurrently, each over
+        its own SSH connection. Claims are leased in PostgreSQL, so workers
+        never list the same directory; more than one pays off when WAN
+        latency, not the source disk, bounds the scan."""
+        return self._get_int('PERFORMANCE', 'scan_workers', 1, minimum=1)
+    @property
+    def stored_tar_inline_validation(self):
+        """Validate a direct Stored TAR while it streams into its part file
+        instead of reading the finished part back from disk."""
+        return self._get_bool(
+            'PERFORMANCE', 'stored_tar_inline_validation', True)
+    @property
+    def stored_tar_member_digest(self):
+        """Digest recorded for every Stored TAR member while the container is
+        validated, and checked again on restore: 'sha256' (default; hardware
+        accelerated on current CPUs), 'blake2b', 'crc32c' (needs the optional
+        crc32c package) or 'none'. Returns None for 'none'; unknown values
+        fall back to 'sha256'."""
+        value = self.config.get(
+            'PERFORMANCE', 'stored_tar_member_digest',
+            fallback='sha256').strip().lower()
+        if value == 'none':
+            return None
+        if value not in ('crc32c', 'blake2b', 'sha256'):
+            print(f"[CONFIG] [PERFORMANCE] stored_tar_member_digest={value!r} "
+                  f"is not 'none', 'crc32c', 'blake2b' or 'sha256'; "
+                  f"using 'sha256'.")
+            return 'sha256'
+        return value
+    @property
+    def stored_tar_byte_range_restore(self):
+        """Restore Stored TAR members from tape by seeking to the byte offsets
+        their sidecar records instead of staging the whole container. Only
+        sidecars that carry offsets qualify; others are copied whole as before."""
+        return self._get_bool(
+            'PERFORMANCE', 'stored_tar_byte_range_restore', True)
+    @property
+    def restore_tape_stream_mbs(self):
+        """Sustained tape read rate (MB/s) used for the pre-restore estimate."""
+        return self._get_float('PERFORMANCE', 'restore_tape_stream_mbs', 300)
+    @property
+    def restore_tape_seek_seconds(self):
+        """Average locate time (seconds) per restore pass in the estimate."""
+        return self._get_float('PERFORMANCE', 'restore_tape_seek_seconds', 60)
+    @property
+    def restore_ltfs_start_block_probe(self):
+        """Order restore reads by each file's LTFS ``ltfs.startblock`` rather
+        than catalog write order. Off by default: it reads one index attribute
+        per restored file or container from the mounted volume."""
+        return self._get_bool(
+            'PERFORMANCE', 'restore_ltfs_start_block_probe', False)
+    @property
+    def zip_stream_restore(self):
+        """Extract bundle members by reading the ZIP in place on tape instead
+        of copying the whole bundle to staging first."""
+        return self._get_bool('PERFORMANCE', 'zip_stream_restore', True)
+    @property
+    def zip_stream_transcode(self):
+        """Pack ZIP-format remote chunks straight off the SSH tar stream
+        instead of extracting them to a fetch directory and packing that."""
+        return self._get_bool('PERFORMANCE', 'zip_stream_transcode', False)
+    @property
     def use_mbuffer(self):
         return self.config.get('PERFORMANCE', 'use_mbuffer', fallback='false').strip().lower() in ('1', 'true', 'yes', 'on')
     @property
@@ -159,7 +159,7 @@ class TarCatalogAdapter:
                     raise RuntimeError(
                         "Stored TAR staged metadata size disagrees with plan")
                 emitted.add(staged_key)
-                yield {
+                record = {
                     "file_name": os.path.basename(canonical),
                     "original_path": canonical,
                     "canonical_source_path": canonical,
@@ -181,6 +181,10 @@ class TarCatalogAdapter:
                     "artifact_version": artifact.artifact_version,
                     "actual_artifact_bytes": int(container.data_size_bytes),
                 }
+                if item.get("digest"):
+                    record["tar_digest_algorithm"] = item["digest_algorithm"]
+                    record["tar_digest"] = item["digest"]
+                yield record
 
         if emitted != set(staged):
             raise RuntimeError(
@@ -0,0 +1,420 @@
+"""Maintained tape-coverage totals for the Storage Map web app (migration 020).
+
+``coverage_prefix_totals`` holds the rows storage_map's ``COVERAGE_SQL``
+returns: merged tape bytes, file count and latest backup per ``(host,
+dir_prefix)``. ``coverage_directory_totals`` keeps the same figures per
+directory, so a change can be applied as a difference instead of re-summing a
+whole prefix.
+
+Catalog commit points call :func:`refresh_directories` (through the chunk,
+export and delete helpers below) in their own transaction. It recomputes the
+touched directories exactly, with the same per-file dedup and small-file
+merge as the full query, and adds new minus old to their prefixes. Every
+refresh takes the state row's lock first, so writers apply in commit order
+and each prefix row carries the ``change_seq`` of its last change. Readers
+fold in ``change_seq > watermark`` only. ``last_backup`` only moves forward
+on a prefix; a shrinking directory leaves it alone until the next rebuild.
+
+Prefixes depend on the web app's ``max_segs`` and the ``index_min_file_mb``
+threshold, which :func:`rebuild` records in the state row. Until it has run,
+writers skip the tables and readers get ``None`` from :func:`rollup_state`.
+"""
+import time
+from typing import Any, cast
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+except ImportError:  # pragma: no cover - runtime dependency path
+    psycopg = None
+    dict_row = None
+
+from .catalog_rollups import _table_exists
+from .pg_bulk import require_psycopg
+
+
+DIRECTORY_TABLE = "coverage_directory_totals"
+PREFIX_TABLE = "coverage_prefix_totals"
+STATE_TABLE = "coverage_rollup_state"
+
+_HOST = "lower(split_part({alias}source_host, '.', 1))"
+_DIRNAME = "regexp_replace({alias}original_path, '/[^/]*$', '')"
+
+# The directory stages of COVERAGE_SQL (per_file .. merged), optionally joined
+# to a ``target`` list of (host, dirname) pairs, plus each directory's prefix.
+_DIRECTORY_SQL = """
+WITH {target}per_file AS (
+    SELECT {host}                                       AS host,
+           {dirname}                                    AS dirname,
+           MAX(f.file_size_bytes)                       AS bytes,
+           bool_or(f.is_packed)                         AS is_packed,
+           MAX(f.catalog_backup_date)                   AS last_backup
+    FROM files_index f{files_join}
+    WHERE f.original_path LIKE '/%%'
+    GROUP BY 1, f.source_host, f.original_path, 2
+),
+idx AS (
+    SELECT host, dirname,
+           SUM(bytes)                                              AS bytes,
+           COUNT(*)                                                AS files,
+           COALESCE(SUM(bytes) FILTER (
+               WHERE is_packed AND bytes < %(threshold_bytes)s), 0) AS ps_bytes,
+           COALESCE(COUNT(*)   FILTER (
+               WHERE is_packed AND bytes < %(threshold_bytes)s), 0) AS ps_files,
+           MAX(last_backup)                                        AS last_backup
+    FROM per_file
+    GROUP BY 1, 2
+),
+dir_small_catalog AS ({tree_sql}),
+local_manifest_uncovered AS (
+    SELECT lower(split_part(a.source_host, '.', 1)) AS host,
+           a.original_dir_path                      AS dirname,
+           SUM(a.direct_uncovered_bytes)::bigint    AS bytes,
+           SUM(a.direct_uncovered_file_count)::bigint AS files,
+           MAX(a.backup_date)                       AS last_backup
+    FROM local_manifest_folder_aggregates a
+    JOIN local_manifest_exports e ON e.export_id=a.export_id{folder_join}
+    WHERE a.original_dir_path LIKE '/%%' AND e.status='pruned'
+    GROUP BY 1, 2
+),
+dir_small AS (
+    SELECT host, dirname, SUM(bytes)::bigint AS bytes,
+           SUM(files)::bigint AS files, MAX(last_backup) AS last_backup
+    FROM (
+        SELECT * FROM dir_small_catalog
+        UNION ALL
+        SELECT * FROM local_manifest_uncovered
+    ) totals
+    GROUP BY host, dirname
+),
+merged AS (
+    SELECT COALESCE(i.host, d.host)       AS host,
+           COALESCE(i.dirname, d.dirname) AS dirname,
+           COALESCE(i.bytes, 0)
+             + GREATEST(0, COALESCE(d.bytes, 0) - COALESCE(i.ps_bytes, 0))
+                                          AS bytes,
+           COALESCE(i.files, 0)
+             + GREATEST(0, COALESCE(d.files, 0) - COALESCE(i.ps_files, 0))
+                                          AS files,
+           GREATEST(i.last_backup, d.last_backup) AS last_backup
+    FROM idx i
+    FULL OUTER JOIN dir_small d USING (host, dirname)
+)
+SELECT host, dirname,
+       COALESCE(NULLIF('/' || array_to_string(
+           (string_to_array(trim(LEADING '/' FROM dirname), '/'))[1:%(max_segs)s],
+           '/'), '/'), '/')       AS dir_prefix,
+       bytes::bigint              AS tape_bytes,
+       files::bigint              AS tape_files,
+       last_backup
+FROM merged
+"""
+
+_TREE_SQL = """
+    SELECT lower(split_part(d.source_host, '.', 1))  AS host,
+           d.original_dir_path                       AS dirname,
+           SUM(d.direct_small_file_bytes)::bigint    AS bytes,
+           SUM(d.direct_small_file_count)::bigint    AS files,
+           MAX(d.backup_date)                        AS last_backup
+    FROM directory_tree_index d{tree_join}
+    WHERE d.original_dir_path LIKE '/%%'
+    GROUP BY 1, 2
+"""
+
+# Before 007 there is no directory catalog and so no small-file totals.
+_NO_TREE_SQL = """
+    SELECT NULL::text AS host, NULL::text AS dirname, 0::bigint AS bytes,
+           0::bigint AS files, NULL::timestamptz AS last_backup
+    WHERE false
+"""
+
+
+def _join(alias, dirname):
+    return (f"\n    JOIN target t ON {_HOST.format(alias=alias)} = t.host"
+            f"\n     AND {dirname} = t.dirname")
+
+
+def _directory_sql(conn, *, targeted):
+    tree = _table_exists(conn, "directory_tree_index")
+    target = ""
+    files_join = folder_join = tree_join = ""
+    if targeted:
+        target = ("target AS (\n    SELECT * FROM unnest("
+                  "%(hosts)s::text[], %(dirnames)s::text[]) AS t(host, dirname)"
+                  "\n),\n")
+        files_join = _join("f.", _DIRNAME.format(alias="f."))
+        folder_join = _join("a.", "a.original_dir_path")
+        tree_join = _join("d.", "d.original_dir_path")
+    return _DIRECTORY_SQL.format(
+        target=target,
+        host=_HOST.format(alias="f."),
+        dirname=_DIRNAME.format(alias="f."),
+        files_join=files_join,
+        folder_join=folder_join,
+        tree_sql=(_TREE_SQL.format(tree_join=tree_join) if tree
+                  else _NO_TREE_SQL),
+    )
+
+
+def rollup_state(conn, *, for_update=False):
+    """The state row (``max_segs``, ``threshold_bytes``, ``change_seq``,
+    ``built_at``), or None before the first :func:`rebuild`."""
+    if not _table_exists(conn, STATE_TABLE):
+        return None
+    return conn.execute(
+        "SELECT max_segs, threshold_bytes, change_seq, built_at "
+        "FROM coverage_rollup_state"
+        + (" FOR UPDATE" if for_update else "")).fetchone()
+
+
+def refresh_directories(conn, pairs):
+    """Recompute the ``(host, dirname)`` directories in ``pairs`` and add the
+    difference to their prefixes, in the caller's transaction.
+
+    Returns the number of prefixes changed; 0 when the totals are not built.
+    """
+    wanted = sorted({(str(host), str(dirname)) for host, dirname in pairs
+                     if host is not None and dirname is not None})
+    if not wanted:
+        return 0
+    state = rollup_state(conn, for_update=True)
+    if state is None:
+        return 0
+    params = {
+        "hosts": [host for host, _ in wanted],
+        "dirnames": [dirname for _, dirname in wanted],
+        "max_segs": int(state["max_segs"]),
+        "threshold_bytes": int(state["threshold_bytes"]),
+    }
+    old = {(row["host"], row["dirname"]): row for row in conn.execute(
+        """SELECT d.host, d.dirname, d.dir_prefix, d.tape_bytes, d.tape_files
+           FROM coverage_directory_totals d
+           JOIN unnest(%(hosts)s::text[], %(dirnames)s::text[])
+                AS t(host, dirname)
+             ON t.host = d.host AND t.dirname = d.dirname""",
+        params).fetchall()}
+    new = {(row["host"], row["dirname"]): row for row in conn.execute(
+        _directory_sql(conn, targeted=True), params).fetchall()}
+
+    deltas = {}  # (host, dir_prefix) -> [bytes, files, latest backup]
+    for key, row in old.items():
+        entry = deltas.setdefault((key[0], row["dir_prefix"]), [0, 0, None])
+        entry[0] -= int(row["tape_bytes"] or 0)
+        entry[1] -= int(row["tape_files"] or 0)
+    for key, row in new.items():
+        entry = deltas.setdefault((key[0], row["dir_prefix"]), [0, 0, None])
+        entry[0] += int(row["tape_bytes"] or 0)
+        entry[1] += int(row["tape_files"] or 0)
+        last = row["last_backup"]
+        if last is not None and (entry[2] is None or last > entry[2]):
+            entry[2] = last
+
+    gone = [key for key in old if key not in new]
+    if gone:
+        conn.execute(
+            """DELETE FROM coverage_directory_totals d
+               USING unnest(%s::text[], %s::text[]) AS t(host, dirname)
+               WHERE d.host = t.host AND d.dirname = t.dirname""",
+            ([host for host, _ in gone], [dirname for _, dirname in gone]))
+    if new:
+        rows = sorted(new.values(), key=lambda row: (row["host"], row["dirname"]))
+        conn.execute(
+            """INSERT INTO coverage_directory_totals
+                   (host, dirname, dir_prefix, tape_bytes, tape_files,
+                    last_backup)
+               SELECT * FROM unnest(%s::text[], %s::text[], %s::text[],
+                                    %s::bigint[], %s::bigint[],
+                                    %s::timestamptz[])
+               ON CONFLICT (host, dirname) DO UPDATE SET
+                   dir_prefix = EXCLUDED.dir_prefix,
+                   tape_bytes = EXCLUDED.tape_bytes,
+                   tape_files = EXCLUDED.tape_files,
+                   last_backup = EXCLUDED.last_backup""",
+            ([row["host"] for row in rows], [row["dirname"] for row in rows],
+             [row["dir_prefix"] for row in rows],
+             [int(row["tape_bytes"] or 0) for row in rows],
+             [int(row["tape_files"] or 0) for row in rows],
+             [row["last_backup"] for row in rows]))
+
+    changed = {key: entry for key, entry in deltas.items()
+               if entry[0] or entry[1] or entry[2] is not None}
+    if not changed:
+        return 0
+    seq = conn.execute(
+        """UPDATE coverage_rollup_state SET change_seq = change_seq + 1
+           RETURNING change_seq""").fetchone()["change_seq"]
+    keys = sorted(changed)
+    return conn.execute(
+        """INSERT INTO coverage_prefix_totals AS p
+               (host, dir_prefix, tape_bytes, tape_files, last_backup,
+                change_seq)
+           SELECT host, dir_prefix, tape_bytes, tape_files, last_backup, %s
+           FROM unnest(%s::text[], %s::text[], %s::bigint[], %s::bigint[],
+                       %s::timestamptz[])
+                AS d(host, dir_prefix, tape_bytes, tape_files, last_backup)
+           ON CONFLICT (host, dir_prefix) DO UPDATE SET
+               tape_bytes = p.tape_bytes + EXCLUDED.tape_bytes,
+               tape_files = p.tape_files + EXCLUDED.tape_files,
+               last_backup = GREATEST(p.last_backup, EXCLUDED.last_backup),
+               change_seq = EXCLUDED.change_seq""",
+        (seq, [host for host, _ in keys], [prefix for _, prefix in keys],
+         [changed[key][0] for key in keys], [changed[key][1] for key in keys],
+         [changed[key][2] for key in keys]),
+    ).rowcount
+
+
+def _pairs(conn, sql, params):
+    return [(row["host"], row["dirname"])
+            for row in conn.execute(sql, params).fetchall()]
+
+
+def refresh_chunk(conn, *, local_session_id=None, remote_session_id=None,
+                  chunk_index):
+    """Refresh every directory a local or remote chunk cataloged."""
+    if not _table_exists(conn, STATE_TABLE):
+        return 0
+    column = "local" if local_session_id is not None else "remote"
+    session_id = (local_session_id if local_session_id is not None
+                  else remote_session_id)
+    params = (int(session_id), int(chunk_index))
+    pairs = _pairs(
+        conn,
+        f"""SELECT DISTINCT {_HOST.format(alias='')} AS host,
+                   {_DIRNAME.format(alias='')} AS dirname
+            FROM files_index
+            WHERE {column}_session_id=%s AND {column}_chunk_index=%s
+              AND original_path LIKE '/%%'""",
+        params)
+    if _table_exists(conn, "directory_tree_index"):
+        pairs += _pairs(
+            conn,
+            f"""SELECT DISTINCT {_HOST.format(alias='')} AS host,
+                       original_dir_path AS dirname
+                FROM directory_tree_index
+                WHERE {column}_session_id=%s AND chunk_index=%s
+                  AND original_dir_path LIKE '/%%'""",
+            params)
+    return refresh_directories(conn, pairs)
+
+
+def refresh_export(conn, export_id):
+    """Refresh the directories of a just-pruned local-manifest export."""
+    if not _table_exists(conn, STATE_TABLE):
+        return 0
+    return refresh_directories(conn, _pairs(
+        conn,
+        f"""SELECT DISTINCT {_HOST.format(alias='')} AS host,
+                   original_dir_path AS dirname
+            FROM local_manifest_folder_aggregates
+            WHERE export_id=%s AND original_dir_path LIKE '/%%'""",
+        (int(export_id),)))
+
+
+def tape_directories(conn, tape_label):
+    """The directories a tape's catalog rows count in.
+
+    Read them before deleting a tape's rows and pass them to
+    :func:`refresh_directories` afterwards, in the same transaction.
+    """
+    if not _table_exists(conn, STATE_TABLE):
+        return []
+    params = (str(tape_label),)
+    pairs = _pairs(
+        conn,
+        f"""SELECT DISTINCT {_HOST.format(alias='')} AS host,
+                   {_DIRNAME.format(alias='')} AS dirname
+            FROM files_index
+            WHERE tape_label=%s AND original_path LIKE '/%%'""",
+        params)
+    for table in ("directory_tree_index", "local_manifest_folder_aggregates"):
+        if _table_exists(conn, table):
+            pairs += _pairs(
+                conn,
+                f"""SELECT DISTINCT {_HOST.format(alias='')} AS host,
+                           original_dir_path AS dirname
+                    FROM {table}
+                    WHERE tape_label=%s AND original_dir_path LIKE '/%%'""",
+                params)
+    return pairs
+
+
+def file_directories(rows):
+    """``(host, dirname)`` pairs of ``(source_host, original_path)`` rows,
+    normalized the way ``COVERAGE_SQL`` groups them."""
+    pairs = set()
+    for source_host, original_path in rows:
+        path = str(original_path or "")
+        if not path.startswith("/"):
+            continue
+        pairs.add((str(source_host or "").split(".")[0].lower(),
+                   path[:path.rfind("/")]))
+    return pairs
+
+
+def prefix_rows_since(conn, change_seq=0):
+    """Prefix rows changed after ``change_seq``, with their ``change_seq``."""
+    return conn.execute(
+        """SELECT host, dir_prefix, tape_bytes, tape_files, last_backup,
+                  change_seq
+           FROM coverage_prefix_totals
+           WHERE change_seq > %s
+           ORDER BY host, dir_prefix""", (int(change_seq),)).fetchall()
+
+
+def _connect(conninfo):
+    require_psycopg()
+    return cast(Any, psycopg.connect(
+        conninfo, autocommit=True, row_factory=cast(Any, dict_row)))
+
+
+def rebuild(conninfo, *, max_segs, threshold_bytes):
+    """Recompute every directory and prefix row for ``max_segs`` and
+    ``threshold_bytes`` and record them in the state row.
+
+    The state row is locked first, like every refresh, so a commit point that
+    lands meanwhile applies its difference on top of the fresh rows.
+    """
+    started = time.monotonic()
+    params = {"max_segs": int(max_segs),
+              "threshold_bytes": int(threshold_bytes)}
+    with _connect(conninfo) as conn:
+        if not _table_exists(conn, STATE_TABLE):
+            raise RuntimeError(
+                "[DB] coverage_rollup_state is missing. Apply "
+                "scripts/sql/020_postgres_coverage_rollups.sql first.")
+        with conn.transaction():
+            seq = conn.execute(
+                """INSERT INTO coverage_rollup_state
+                       (max_segs, threshold_bytes, change_seq, built_at)
+                   VALUES (%(max_segs)s, %(threshold_bytes)s, 1, now())
+                   ON CONFLICT (singleton) DO UPDATE SET
+                       max_segs = EXCLUDED.max_segs,
+                       threshold_bytes = EXCLUDED.threshold_bytes,
+                       change_seq = coverage_rollup_state.change_seq + 1,
+                       built_at = now()
+                   RETURNING change_seq""", params).fetchone()["change_seq"]
+            conn.execute("TRUNCATE coverage_directory_totals, "
+                         "coverage_prefix_totals")
+            directories = conn.execute(
+                "INSERT INTO coverage_directory_totals "
+                "(host, dirname, dir_prefix, tape_bytes, tape_files, "
+                "last_backup) " + _directory_sql(conn, targeted=False),
+                params).rowcount
+            prefixes = conn.execute(
+                """INSERT INTO coverage_prefix_totals
+                       (host, dir_prefix, tape_bytes, tape_files, last_backup,
+                        change_seq)
+                   SELECT host, dir_prefix, SUM(tape_bytes), SUM(tape_files),
+                          MAX(last_backup), %s
+                   FROM coverage_directory_totals
+                   GROUP BY host, dir_prefix""", (seq,)).rowcount
+    return {"directories": int(directories or 0),
+            "prefixes": int(prefixes or 0),
+            "seconds": round(time.monotonic() - started, 3)}
+
+
+__all__ = [
+    "DIRECTORY_TABLE", "PREFIX_TABLE", "STATE_TABLE", "file_directories",
+    "prefix_rows_since", "rebuild", "refresh_chunk", "refresh_directories",
+    "refresh_export", "rollup_state", "tape_directories",
+]
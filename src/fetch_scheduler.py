@@ -0,0 +1,203 @@
+"""Work planning and dispatch for a chunk's parallel fetch streams.
+
+With ``fetch_parallel_streams`` > 1 a chunk's pending files are cut into many
+small :class:`FetchUnit` s, one tar stream each, balanced by bytes plus a
+per-file cost (the model the parallel packer shards by). Streams pull the next
+unit from one shared queue as soon as their previous unit finishes, so a
+stream that drew small files keeps taking work instead of idling while
+another drains a run of large ones. Units go out largest first, leaving the
+small ones to level the tail.
+
+:class:`FetchStreamScheduler` also decides how many streams stay active. Past
+the WAN or remote-disk ceiling another stream only adds ssh/tar start-up and
+remote seeks, so after measuring the aggregate rate it parks one stream at a
+time while the rate holds, and brings the last one back when it drops. The
+settled count seeds the next chunk one above it, so a ceiling that lifts is
+found again. Per-stream MB/s and tail idle time go into the chunk telemetry.
+"""
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from .packer_parallel import SHARD_FILE_COST_BYTES
+
+
+#: Units cut per stream: enough that a stream finishing early always finds
+#: more work, few enough that per-unit ssh/tar start-up stays small.
+UNITS_PER_STREAM = 4
+
+#: A stream stays parked only while the rate without it is at least this
+#: fraction of the rate with it.
+STREAM_KEEP_RATIO = 0.95
+
+
+@dataclass
+class FetchUnit:
+    """One tar stream's worth of files under a single remote base."""
+    remote_base: str
+    batch: list             # [(row, rel, local_path), ...]
+    size_bytes: int
+    cost: int
+
+
+def _item_size(item):
+    return int(item[0]['file_size_bytes'] or 0)
+
+
+def plan_fetch_units(work_items, streams, max_files,
+                     units_per_stream=UNITS_PER_STREAM):
+    """Re-cut ``work_items`` (``(remote_base, batch)`` pairs) into fetch units.
+
+    Each base's files are split, in order, into contiguous runs costing at
+    most ``1 / (streams * units_per_stream)`` of the chunk and holding at most
+    ``max_files`` files. Returns the units largest-cost first.
+    """
+    by_base = {}
+    for remote_base, batch in work_items:
+        by_base.setdefault(remote_base, []).extend(batch)
+    total = sum(_item_size(item) + SHARD_FILE_COST_BYTES
+                for batch in by_base.values() for item in batch)
+    share = max(1, math.ceil(
+        total / max(1, int(streams) * int(units_per_stream))))
+    max_files = max(1, int(max_files))
+
+    units = []
+    for remote_base, items in by_base.items():
+        run, run_bytes, run_cost = [], 0, 0
+        for item in items:
+            size = _item_size(item)
+            cost = size + SHARD_FILE_COST_BYTES
+            if run and (run_cost + cost > share or len(run) >= max_files):
+                units.append(FetchUnit(remote_base, run, run_bytes, run_cost))
+                run, run_bytes, run_cost = [], 0, 0
+            run.append(item)
+            run_bytes += size
+            run_cost += cost
+        if run:
+            units.append(FetchUnit(remote_base, run, run_bytes, run_cost))
+    # Stable: equal-cost units keep their base and file order.
+    units.sort(key=lambda unit: -unit.cost)
+    return units
+
+
+class FetchStreamScheduler:
+    """Hand fetch units to stream workers and size the active stream set.
+
+    Workers are numbered ``0 .. streams - 1``; one numbered at or above
+    :attr:`limit` is parked in :meth:`next_unit` until the limit comes back
+    up or the queue runs dry. The rate is measured over windows of ``limit``
+    completed units (at least two). With ``adaptive`` the limit then steps
+    down one stream per window while the rate holds within
+    :data:`STREAM_KEEP_RATIO` of the wider setting, and steps back up and
+    stays there the first time it does not.
+    """
+
+    def __init__(self, units, streams, *, limit=None, adaptive=True,
+                 should_stop=None, clock=time.monotonic):
+        self._queue = deque(units)
+        self.units = len(self._queue)
+        self.streams = max(1, min(int(streams), self.units or 1))
+        self.limit = self.streams if limit is None else max(
+            1, min(int(limit), self.streams))
+        self._adaptive = adaptive and self.limit > 1
+        self._settled = not self._adaptive
+        self._should_stop = should_stop or (lambda: False)
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._rates = {}
+        self._window_start = None
+        self._window_units = 0
+        self._window_bytes = 0
+        self._started = None
+        self._bytes = [0] * self.streams
+        self._busy = [0.0] * self.streams
+        self._last_finish = [None] * self.streams
+
+    def next_unit(self, stream):
+        """The next unit for worker ``stream``, or None when it should exit."""
+        with self._cond:
+            while True:
+                if self._stopped or not self._queue or self._should_stop():
+                    return None
+                if stream < self.limit:
+                    break
+                self._cond.wait(0.5)
+            now = self.clock()
+            if self._started is None:
+                self._started = now
+            if self._window_start is None:
+                self._window_start = now
+            return self._queue.popleft()
+
+    def finished(self, stream, unit, started, ok):
+        """Record that worker ``stream`` finished ``unit`` it began at
+        ``started`` (a :attr:`clock` reading)."""
+        now = self.clock()
+        with self._cond:
+            self._busy[stream] += max(0.0, now - started)
+            self._last_finish[stream] = now
+            if ok:
+                self._bytes[stream] += unit.size_bytes
+                self._window_bytes += unit.size_bytes
+                self._window_units += 1
+                if self._window_units >= max(2, self.limit):
+                    self._close_window(now)
+            if not self._queue:
+                self._cond.notify_all()
+
+    def stop(self):
+        """Hand out no more units (a stream failed or the fetch aborted)."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _close_window(self, now):
+        elapsed = max(now - self._window_start, 1e-6)
+        rate = self._window_bytes / elapsed
+        self._window_start = now
+        self._window_units = self._window_bytes = 0
+        self._rates[self.limit] = rate
+        if self._settled:
+            return
+        wider = self._rates.get(self.limit + 1)
+        if wider is not None and rate < wider * STREAM_KEEP_RATIO:
+            self.limit += 1
+            self._settled = True
+            self._cond.notify_all()
+        elif self.limit > 1:
+            self.limit -= 1
+        else:
+            self._settled = True
+
+    def telemetry(self):
+        """Per-stream figures for the chunk's telemetry row."""
+        with self._cond:
+            finishes = [last for last in self._last_finish if last is not None]
+            end = max(finishes) if finishes else None
+            mbs, idle = [], []
+            for stream in range(self.streams):
+                busy = self._busy[stream]
+                mbs.append(self._bytes[stream] / busy / 1024**2 if busy else 0.0)
+                if end is None:
+                    idle.append(0.0)
+                else:
+                    # A stream that never ran idled for the whole fetch.
+                    last = self._last_finish[stream]
+                    idle.append(end - (self._started if last is None else last))
+            return {
+                'fetch_streams': self.streams,
+                'fetch_streams_active': self.limit,
+                'fetch_units': self.units,
+                'fetch_stream_mbs': ';'.join(f"{value:.1f}" for value in mbs),
+                'fetch_stream_tail_idle_seconds': ';'.join(
+                    f"{value:.3f}" for value in idle),
+            }
+
+
+__all__ = [
+    "FetchStreamScheduler", "FetchUnit", "STREAM_KEEP_RATIO",
+    "UNITS_PER_STREAM", "plan_fetch_units",
+]
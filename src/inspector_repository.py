@@ -21,7 +21,10 @@ except ImportError:  # pragma: no cover - requirements includes zstandard
     zstd = None
 
 from .catalog_query import prefix_pattern, substring_pattern
+from .catalog_rollups import rollups_built, subtree_totals
 from .db import _derived_file_name
+from .manifest_search import (
+    bundle_haystack, candidate_frames, line_literals, pattern_keys)
 
 
 DEFAULT_PAGE_SIZE = 250
@@ -298,6 +301,8 @@ class InspectorRepository:
             params,
         ).fetchall()
         needle = (query or "").lower()
+        keys = pattern_keys(needle, glob=False)
+        literals = line_literals(needle, glob=False)
         hits = []
         for bundle in bundles:
             if len(hits) >= page_size:
@@ -305,20 +310,21 @@ class InspectorRepository:
             path = bundle["manifest_path"]
             if not path or not os.path.exists(path):
                 continue
+            if candidate_frames(path, keys) == []:
+                continue
             handle = self._open_manifest(path, bundle["manifest_compression"])
             try:
                 for line in handle[-1]:
                     if len(hits) >= page_size:
                         break
+                    lowered = line.lower()
+                    if not all(run in lowered for run in literals):
+                        continue
                     try:
                         item = json.loads(line)
                     except json.JSONDecodeError:
                         continue
-                    text = (
-                        str(item.get("file_name") or "") + "\n"
-                        + str(item.get("relative_path") or "")
-                    ).lower()
-                    if needle in text:
+                    if needle in bundle_haystack(item):
                         row = dict(item)
                         row.update({
                             "bundle_id": bundle["bundle_id"],
@@ -431,8 +437,9 @@ class InspectorRepository:
     def subtree_sizes(self, directory_ids):
         """Recursive file-byte and file-count totals per directory subtree.
 
-        Sizes are not stored on catalog_directories, so each directory's total
-        is the sum of files_index rows across the directory and all of its
+        Once the directory rollups are built (migration 019) this is one
+        primary-key lookup per page. Before that, each directory's total is
+        the sum of files_index rows across the directory and all of its
         descendants. The recursive descent rides idx_catalog_dirs_parent_id and
         the per-directory sum rides the (directory_id, file_size_bytes) index,
         so one batched query covers a whole page of sibling directories.
@@ -441,6 +448,8 @@ class InspectorRepository:
         ids = [int(directory_id) for directory_id in (directory_ids or [])]
         if not ids:
             return {}
+        if rollups_built(self.conn):
+            return subtree_totals(self.conn, ids)
         rows = self._execute(
             """WITH RECURSIVE subtree AS (
                    SELECT directory_id AS root_id, directory_id
@@ -453,7 +462,8 @@ class InspectorRepository:
                )
                SELECT s.root_id,
                       COALESCE(SUM(f.file_size_bytes), 0) AS recursive_bytes,
-                      COUNT(f.file_id) AS recursive_file_count
+                      COUNT(f.file_id) AS recursive_file_count,
+                      MAX(f.catalog_backup_date) AS last_backup_date
                FROM subtree s
                LEFT JOIN files_index f ON f.directory_id = s.directory_id
                GROUP BY s.root_id""",
@@ -463,6 +473,7 @@ class InspectorRepository:
             row["root_id"]: {
                 "recursive_bytes": row["recursive_bytes"] or 0,
                 "recursive_file_count": row["recursive_file_count"] or 0,
+                "last_backup_date": row["last_backup_date"],
             }
             for row in rows
         }
@@ -477,7 +488,8 @@ class InspectorRepository:
                GROUP BY a.directory_id""", (ids,)).fetchall()
         for row in manifest_rows:
             total = totals.setdefault(row["root_id"], {
-                "recursive_bytes": 0, "recursive_file_count": 0})
+                "recursive_bytes": 0, "recursive_file_count": 0,
+                "last_backup_date": None})
             total["recursive_bytes"] += row["recursive_bytes"] or 0
             total["recursive_file_count"] += (
                 row["recursive_file_count"] or 0)
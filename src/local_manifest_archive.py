@@ -33,7 +33,15 @@ try:
 except ImportError:  # pragma: no cover
     zstd = None
 
+from .catalog_rollups import add_export_aggregates, apply_deltas
+from .coverage_rollups import refresh_export
 from .cli_errors import OperationalError
+from .manifest_index import (
+    FrameWriter, ManifestIndexWriter, indexed_segments, lookup, read_frame,
+    segment_frames, segment_key, segment_relpath, segment_table)
+from .manifest_search import (
+    SearchIndexBuilder, archive_haystack, candidate_frames, line_literals,
+    pattern_keys, sidecar_path)
 from .pg_bulk import copy_rows, require_psycopg
 from .pg_core import PgConnectionCore
 
@@ -434,7 +442,13 @@ def _segment_relpath(row):
     return os.path.join(tape, session, name)
 
 
-def _write_segment(root, relpath, rows):
+def _write_segment(root, relpath, rows, *, index=None):
+    """Write one seekable segment and add its rows to the lookup index.
+
+    ``index`` is the export's shared ManifestIndexWriter; without one the
+    segment is indexed on its own before returning. The segment's trigram
+    search sidecar is written next to it.
+    """
     if zstd is None:
         raise OperationalError("[MANIFEST] zstandard is required.")
     final_path = os.path.abspath(os.path.join(root, relpath))
@@ -447,18 +461,26 @@ def _write_segment(root, relpath, rows):
     count = total_bytes = covered_rows = covered_bytes = 0
     try:
         with open(temp_path, "wb") as raw:
-            with zstd.ZstdCompressor(level=6).stream_writer(raw) as writer:
-                for row in rows:
-                    payload = dict(row)
-                    writer.write((json.dumps(
-                        payload, default=_json_default, ensure_ascii=False,
-                        separators=(",", ":")) + "\n").encode("utf-8"))
-                    count += 1
-                    size = int(row["file_size_bytes"] or 0)
-                    total_bytes += size
-                    if row.get("covered_by_directory_catalog", False):
-                        covered_rows += 1
-                        covered_bytes += size
+            writer = FrameWriter(raw, level=6)
+            search = SearchIndexBuilder()
+            for row in rows:
+                payload = dict(row)
+                search.add(archive_haystack(payload), writer.frame_count)
+                writer.write((json.dumps(
+                    payload, default=_json_default, ensure_ascii=False,
+                    separators=(",", ":")) + "\n").encode("utf-8"),
+                    key=row.get("source_file_id"))
+                count += 1
+                size = int(row["file_size_bytes"] or 0)
+                total_bytes += size
+                if row.get("covered_by_directory_catalog", False):
+                    covered_rows += 1
+                    covered_bytes += size
+            writer.close()
+        try:
+            os.remove(sidecar_path(final_path))
+        except FileNotFoundError:
+            pass
         os.replace(temp_path, final_path)
     except Exception:
         try:
@@ -466,10 +488,17 @@ def _write_segment(root, relpath, rows):
         except OSError:
             pass
         raise
+    search.write(sidecar_path(final_path), writer.frame_table(),
+                 os.path.getsize(final_path))
     digest = hashlib.sha256()
     with open(final_path, "rb") as handle:
         for block in iter(lambda: handle.read(1024 * 1024), b""):
             digest.update(block)
+    if index is None:
+        with ManifestIndexWriter(root) as own_index:
+            own_index.add_segment(relpath, writer.entries)
+    else:
+        index.add_segment(relpath, writer.entries)
     return {
         "manifest_relpath": relpath.replace("\\", "/"),
         "row_count": count,
@@ -659,7 +688,8 @@ def execute_export(conninfo, archive_root, hot_backup_path, *,
 
         segments = []
         try:
-            with conn.cursor(name=f"local_manifest_export_{export_id}") as cur:
+            with ManifestIndexWriter(root) as index, conn.cursor(
+                    name=f"local_manifest_export_{export_id}") as cur:
                 cur.itersize = 5000
                 cur.execute(
                     """SELECT f.file_id AS source_file_id, f.original_path,
@@ -684,7 +714,7 @@ def execute_export(conninfo, archive_root, hot_backup_path, *,
                                 f.file_id""", (export_id,))
                 for rel, group in itertools.groupby(cur, key=_segment_relpath):
                     segments.append(_write_segment(
-                        root, rel, (dict(row) for row in group)))
+                        root, rel, (dict(row) for row in group), index=index))
             with conn.transaction():
                 with conn.cursor() as cur:
                     cur.executemany(
@@ -767,7 +797,8 @@ def validate_export(conninfo, export_id):
                 ids = []
                 seg_rows = seg_bytes = 0
                 with open(path, "rb") as raw:
-                    reader = zstd.ZstdDecompressor().stream_reader(raw)
+                    reader = zstd.ZstdDecompressor().stream_reader(
+                        raw, read_across_frames=True)
                     with io.TextIOWrapper(reader, encoding="utf-8") as text:
                         for line in text:
                             item = json.loads(line)
@@ -1067,10 +1098,18 @@ def prune_export(conninfo, export_id, hot_backup_path, *, execute=False,
                                  AND er.source_file_id=pb.source_file_id
                                  AND f.file_id=er.source_file_id
                                  AND f.record_key=er.source_record_key
-                               RETURNING f.file_size_bytes
-                           ) SELECT COUNT(*) AS rows,
+                               RETURNING f.directory_id, f.file_size_bytes
+                           ) SELECT directory_id, COUNT(*) AS rows,
                                     COALESCE(SUM(file_size_bytes),0) AS bytes
-                             FROM gone""", (export_id,)).fetchone()
+                             FROM gone GROUP BY directory_id""",
+                        (export_id,)).fetchall()
+                    deltas = {int(row["directory_id"]): [
+                        -int(row["rows"]), -int(row["bytes"]), None]
+                        for row in deleted}
+                    apply_deltas(conn, deltas)
+                    deleted = {
+                        "rows": sum(int(row["rows"]) for row in deleted),
+                        "bytes": sum(int(row["bytes"]) for row in deleted)}
                     deleted_rows = int(deleted["rows"] or 0)
                     if deleted_rows != int(selected):
                         raise OperationalError(
@@ -1129,6 +1168,8 @@ def prune_export(conninfo, export_id, hot_backup_path, *, execute=False,
                 conn.execute(
                     """UPDATE local_manifest_exports SET status='pruned',
                          pruned_at=now() WHERE export_id=%s""", (export_id,))
+                add_export_aggregates(conn, export_id)
+                refresh_export(conn, export_id)
                 after_accounting = _used_space_by_tape(conn, tapes)
                 report["per_tape_accounting"] = {
                     "before": before_accounting, "after": after_accounting,
@@ -1293,12 +1334,8 @@ def export_legacy_cold_database(cold_conninfo, archive_root, cold_backup_path):
     return report
 
 
-def iter_manifest_records(archive_root, *, query=None, tape_label=None,
-                          date_from=None, date_to=None, allowed_paths=None):
-    """Stream local archive matches without requiring the retired cold DB."""
-    if zstd is None:
-        raise OperationalError("[MANIFEST] zstandard is required.")
-    root = os.path.abspath(archive_root)
+def _segment_filter(root, allowed_paths):
+    """Predicate for segment paths a manifest read may open."""
     allowed = ({os.path.normcase(os.path.abspath(path))
                 for path in allowed_paths} if allowed_paths is not None else None)
     legacy_report = os.path.join(root, "cold_db_export", "export_report.json")
@@ -1308,39 +1345,88 @@ def iter_manifest_records(archive_root, *, query=None, tape_label=None,
             legacy_allowed = bool(json.load(handle).get("passed"))
     except (OSError, ValueError, TypeError):
         pass
-    pattern = (query or "*").lower()
-    if not any(ch in pattern for ch in "*?"):
-        pattern = f"*{pattern}*"
+
+    def permitted(path):
+        if allowed is None or os.path.normcase(os.path.abspath(path)) in allowed:
+            return True
+        return (legacy_allowed and os.path.dirname(path) ==
+                os.path.join(root, "cold_db_export"))
+    return permitted
+
+
+def _segment_paths(root, permitted):
     for dirpath, _, names in os.walk(root):
         for name in sorted(names):
             if not name.endswith(".jsonl.zst"):
                 continue
             path = os.path.join(dirpath, name)
-            if allowed is not None and os.path.normcase(os.path.abspath(path)) not in allowed:
-                if not (legacy_allowed and os.path.dirname(path) ==
-                        os.path.join(root, "cold_db_export")):
+            if permitted(path):
+                yield path
+
+
+def _manifest_row(row):
+    row["file_id"] = row.get(
+        "manifest_record_id", "M:" + str(row["source_file_id"]))
+    row["backup_date"] = row.get("backup_date")
+    row["container_name"] = row.get("container_name")
+    return row
+
+
+def iter_manifest_records(archive_root, *, query=None, tape_label=None,
+                          date_from=None, date_to=None, allowed_paths=None,
+                          skip_segments=None):
+    """Stream local archive matches without requiring the retired cold DB.
+
+    ``skip_segments`` holds relpaths (``/`` separated) not to open. Segments
+    with a search sidecar are skipped, or read only at the frames that can
+    match, when the query has a literal run of three characters or more.
+    """
+    if zstd is None:
+        raise OperationalError("[MANIFEST] zstandard is required.")
+    root = os.path.abspath(archive_root)
+    permitted = _segment_filter(root, allowed_paths)
+    pattern = (query or "*").lower()
+    if not any(ch in pattern for ch in "*?"):
+        pattern = f"*{pattern}*"
+    keys = pattern_keys(pattern, glob=True)
+    literals = line_literals(pattern, glob=True)
+    for path in _segment_paths(root, permitted):
+        if (skip_segments and os.path.relpath(path, root).replace("\\", "/")
+                in skip_segments):
+            continue
+        frames = candidate_frames(path, keys)
+        if frames == []:
+            continue
+        for line in _segment_lines(path, frames):
+            if literals:
+                lowered = line.lower()
+                if not all(run in lowered for run in literals):
                     continue
-            with open(path, "rb") as raw:
-                reader = zstd.ZstdDecompressor().stream_reader(raw)
-                with io.TextIOWrapper(reader, encoding="utf-8") as text:
-                    for line in text:
-                        row = json.loads(line)
-                        hay = (str(row.get("file_name") or "") + " " +
-                               str(row.get("original_path") or "")).lower()
-                        if not fnmatch.fnmatchcase(hay, pattern):
-                            continue
-                        if tape_label and row.get("tape_label") != tape_label:
-                            continue
-                        stamp = str(row.get("backup_date") or "")[:10]
-                        if date_from and stamp < str(date_from):
-                            continue
-                        if date_to and stamp > str(date_to):
-                            continue
-                        row["file_id"] = row.get(
-                            "manifest_record_id", "M:" + str(row["source_file_id"]))
-                        row["backup_date"] = row.get("backup_date")
-                        row["container_name"] = row.get("container_name")
-                        yield row
+            row = json.loads(line)
+            if not fnmatch.fnmatchcase(archive_haystack(row), pattern):
+                continue
+            if tape_label and row.get("tape_label") != tape_label:
+                continue
+            stamp = str(row.get("backup_date") or "")[:10]
+            if date_from and stamp < str(date_from):
+                continue
+            if date_to and stamp > str(date_to):
+                continue
+            yield _manifest_row(row)
+
+
+def _segment_lines(path, frames=None):
+    """JSONL lines of a segment; only those in ``frames`` when given."""
+    if frames is not None:
+        for offset, length in frames:
+            yield from read_frame(path, offset, length).decode(
+                "utf-8").splitlines()
+        return
+    with open(path, "rb") as raw:
+        reader = zstd.ZstdDecompressor().stream_reader(
+            raw, read_across_frames=True)
+        with io.TextIOWrapper(reader, encoding="utf-8") as text:
+            yield from text
 
 
 def search_manifests(archive_root, query=None, *, limit=100, **filters):
@@ -1352,15 +1438,87 @@ def search_manifests(archive_root, query=None, *, limit=100, **filters):
     return rows
 
 
+def build_manifest_index(archive_root):
+    """Add every segment the lookup index does not list yet.
+
+    Segments written before the index existed are single-frame, so their
+    entries name the whole file; a lookup then decompresses that segment only.
+    """
+    if zstd is None:
+        raise OperationalError("[MANIFEST] zstandard is required.")
+    root = os.path.abspath(archive_root)
+    listed = indexed_segments(root)
+    added = rows = 0
+    with ManifestIndexWriter(root) as index:
+        for path in _segment_paths(root, lambda _path: True):
+            relpath = os.path.relpath(path, root).replace("\\", "/")
+            if segment_key(relpath) in listed:
+                continue
+            entries = []
+            for offset, length in segment_frames(path):
+                for line in read_frame(path, offset, length).splitlines():
+                    source_file_id = json.loads(line).get("source_file_id")
+                    if source_file_id is not None:
+                        entries.append((int(source_file_id), offset, length))
+            index.add_segment(relpath, entries)
+            added += 1
+            rows += len(entries)
+    return {"archive_root": root, "segments_indexed": added,
+            "rows_indexed": rows, "segments_already_indexed": len(listed)}
+
+
 def find_manifest_record(archive_root, source_file_id, *, allowed_paths=None):
+    """Resolve one ``M:<id>`` or exact ``manifest_record_id``.
+
+    The lookup index answers for every segment it lists, decompressing only
+    the frames that hold the id; segments it does not list yet are scanned.
+    """
     requested = str(source_file_id)
     numeric = None
     if requested.startswith("M:"):
         numeric = int(requested.removeprefix("M:"))
-    for row in iter_manifest_records(
-            archive_root, allowed_paths=allowed_paths):
-        if (str(row.get("manifest_record_id")) == requested
+
+    def matches(row):
+        return (str(row.get("manifest_record_id")) == requested
                 or (numeric is not None
-                    and int(row["source_file_id"]) == numeric)):
+                    and int(row["source_file_id"]) == numeric))
+
+    root = os.path.abspath(archive_root)
+    key_id = numeric
+    if key_id is None and requested.startswith("C:"):
+        # Legacy cold ids are C:<migration_id>:<source_hot_row_id>.
+        try:
+            key_id = int(requested.rsplit(":", 1)[1])
+        except ValueError:
+            key_id = None
+    table = segment_table(root)
+    if key_id is not None and table:
+        permitted = _segment_filter(root, allowed_paths)
+        digits = str(key_id).encode("ascii")
+        seen = set()
+        for key, offset, length in lookup(root, key_id):
+            relpath = segment_relpath(table, key)
+            if relpath is None or (key, offset) in seen:
+                continue
+            seen.add((key, offset))
+            path = os.path.join(root, *relpath.split("/"))
+            if not permitted(path):
+                continue
+            try:
+                # Only lines that mention the id's digits can match; parsing
+                # just those keeps a lookup well under a frame's JSON cost.
+                rows = [json.loads(line) for line in
+                        read_frame(path, offset, length).splitlines()
+                        if digits in line]
+            except (OSError, ValueError, zstd.ZstdError):
+                continue  # stale entry for a segment written again since
+            for row in rows:
+                if matches(row):
+                    return _manifest_row(row)
+    for row in iter_manifest_records(
+            root, allowed_paths=allowed_paths,
+            skip_segments=(set(indexed_segments(root, table).values())
+                           if key_id is not None else None)):
+        if matches(row):
             return row
     return None
@@ -45,6 +45,7 @@ class LocalOrchestrator:
         )
 
     def run(self):
+        self.governor.sampler.start()
         try:
             source_dir = os.path.abspath(self.source_dir)
             existing = self.db.get_active_local_session(source_dir)
@@ -69,6 +70,7 @@ class LocalOrchestrator:
 
             self._start_new_session(source_dir)
         finally:
+            self.governor.sampler.stop()
             self.skipped_tracker.print_summary(self.ui, self.cfg.backup_log_dir)
 
     def _start_new_session(self, source_dir):
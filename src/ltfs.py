@@ -293,6 +293,26 @@ def get_volume_label(drive_path):
         _release_tape_io_lock()
 
 
+def read_ltfs_start_block_unlocked(path):
+    """Return the ``ltfs.startblock`` of a file on LTFS, or None.
+
+    Caller must hold the tape I/O lock. LTFS serves this virtual attribute from
+    its in-memory index (a Windows alternate data stream, or a ``user.`` xattr
+    under FUSE), so no tape motion results; it is still a filesystem access,
+    which is why only an opted-in restore planner asks for it.
+    """
+    require_ownership("start block read")
+    try:
+        if hasattr(os, "getxattr"):
+            value = os.getxattr(path, "user.ltfs.startblock")
+        else:
+            with open(f"{path}:ltfs.startblock", "rb") as handle:
+                value = handle.read(64)
+        return int(value.strip(b"\0 \r\n"))
+    except (OSError, ValueError):
+        return None
+
+
 def _eject_tape_unlocked(tape_drive, ibm_eject_cmd=None):
     """Run LtfsCmdEject.exe for a drive. Caller must hold the tape I/O lock."""
     require_ownership("eject")
@@ -0,0 +1,323 @@
+"""Trigram search sidecars for small-file manifests.
+
+Name searches over manifests used to decompress and match every row of every
+manifest, so a search cost the same whether or not a manifest could match.
+Each manifest now gets a ``<manifest>.trgm`` sidecar when it is written: the
+set of lowercase trigrams of its searchable text, as a Bloom filter for the
+whole file and as trigram postings per zstd frame.
+
+A search reduces its pattern to the trigrams every match must contain. The
+Bloom filter alone, read from the head of the sidecar, rejects most manifests
+without touching them. For a manifest that may match, the postings name the
+frames that hold every trigram, and only those frames are read. A query with
+no trigram of three characters, a missing or stale sidecar, or one that
+cannot be parsed all mean "scan as before", so the sidecar can only skip work
+and never hide a match.
+
+Layout (little-endian)::
+
+    header   magic, version, source size, Bloom bits, hashes, keys, frames,
+             postings
+    bloom    ceil(bits / 8) bytes
+    frames   (offset u64, length u32) per frame
+    keys     sorted trigram keys, u32
+    starts   u32 posting start per key, plus the end
+    postings frame numbers, u32
+"""
+import bisect
+import json
+import os
+import struct
+import tempfile
+import zlib
+from array import array
+
+
+SIDECAR_SUFFIX = ".trgm"
+_MAGIC = b"LTOTRGM"
+_VERSION = 1
+_HEADER = struct.Struct("<7sBQIIIII")
+_FRAME = struct.Struct("<QI")
+_BLOOM_BITS_PER_KEY = 10
+_BLOOM_HASHES = 7
+
+
+def sidecar_path(manifest_path):
+    return str(manifest_path) + SIDECAR_SUFFIX
+
+
+def archive_haystack(row):
+    """Text ``iter_manifest_records`` matches a pattern against."""
+    return (str(row.get("file_name") or "") + " " +
+            str(row.get("original_path") or "")).lower()
+
+
+def bundle_haystack(item):
+    """Text the bundle-manifest searches match a substring against."""
+    return (str(item.get("file_name") or "") + "\n" +
+            str(item.get("relative_path") or "")).lower()
+
+
+def _key(trigram):
+    return zlib.crc32(trigram.encode("utf-8", errors="surrogatepass"))
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def pattern_keys(pattern, *, glob):
+    """Trigram keys every match of ``pattern`` must contain.
+
+    ``glob`` patterns are cut at ``*`` and ``?``; nothing after a ``[`` is
+    used, since where a set ends depends on its contents. Returns an empty
+    set when no literal run is three characters long.
+    """
+    pattern = (pattern or "").lower()
+    runs = [pattern]
+    if glob:
+        runs = pattern.split("[", 1)[0].replace("?", "*").split("*")
+    return {_key(trigram) for run in runs for trigram in _trigrams(run)}
+
+
+def line_literals(pattern, *, glob):
+    """Literal runs of ``pattern`` that must appear in a matching row's
+    lowercased JSON line, so a line can be rejected before it is parsed.
+
+    Runs are split on whitespace, which joins the fields of a haystack, and
+    only printable ASCII runs without ``"`` or ``\\`` are kept: those are
+    the characters JSON writes unescaped.
+    """
+    pattern = (pattern or "").lower()
+    runs = [pattern]
+    if glob:
+        runs = pattern.split("[", 1)[0].replace("?", "*").split("*")
+    return [word for run in runs for word in run.split()
+            if word.isascii() and word.isprintable()
+            and '"' not in word and "\\" not in word]
+
+
+def _bloom_positions(key, bits, hashes=_BLOOM_HASHES):
+    step = ((key * 0x9E3779B1) & 0xFFFFFFFF) | 1
+    return [(key + i * step) % bits for i in range(hashes)]
+
+
+class SearchIndexBuilder:
+    """Collect trigrams per frame and write the sidecar once."""
+
+    def __init__(self):
+        self._frames = {}
+
+    def add(self, text, frame=0):
+        self._frames.setdefault(frame, set()).update(_trigrams(text))
+
+    def write(self, path, frames, source_size):
+        """Write the sidecar for a manifest of ``source_size`` bytes whose
+        frames are ``[(offset, length), ...]`` (one whole-file frame for a
+        manifest that is not seekable)."""
+        postings = {}
+        for frame, trigrams in sorted(self._frames.items()):
+            for key in {_key(trigram) for trigram in trigrams}:
+                postings.setdefault(key, []).append(frame)
+        keys = array("I", sorted(postings))
+        bits = max(64, len(keys) * _BLOOM_BITS_PER_KEY)
+        bloom = bytearray((bits + 7) // 8)
+        starts = array("I", [0])
+        flat = array("I")
+        for key in keys:
+            for position in _bloom_positions(key, bits):
+                bloom[position >> 3] |= 1 << (position & 7)
+            flat.extend(postings[key])
+            starts.append(len(flat))
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(
+            prefix=".trgm_", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(_HEADER.pack(
+                    _MAGIC, _VERSION, int(source_size), bits, _BLOOM_HASHES,
+                    len(keys), len(frames), len(flat)))
+                handle.write(bloom)
+                for offset, length in frames:
+                    handle.write(_FRAME.pack(int(offset), int(length)))
+                handle.write(keys.tobytes())
+                handle.write(starts.tobytes())
+                handle.write(flat.tobytes())
+            os.replace(temp_path, path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+class SearchIndex:
+    """A manifest's sidecar; the Bloom filter is read up front, the rest on
+    demand."""
+
+    def __init__(self, path, header, bloom):
+        (_magic, _version, self.source_size, self._bits, self._hashes,
+         self._key_count, self._frame_count, self._posting_count) = header
+        self._path = path
+        self._bloom = bloom
+        self._frames = self._keys = self._starts = self._postings = None
+
+    @classmethod
+    def load(cls, manifest_path):
+        """The sidecar of ``manifest_path``, or None when it is missing, not
+        a sidecar, or was written for a different version of the file."""
+        path = sidecar_path(manifest_path)
+        try:
+            with open(path, "rb") as handle:
+                head = handle.read(_HEADER.size)
+                if len(head) != _HEADER.size:
+                    return None
+                header = _HEADER.unpack(head)
+                if header[0] != _MAGIC or header[1] != _VERSION:
+                    return None
+                if header[2] != os.path.getsize(manifest_path):
+                    return None
+                bloom = handle.read((header[3] + 7) // 8)
+        except OSError:
+            return None
+        if len(bloom) != (header[3] + 7) // 8:
+            return None
+        return cls(path, header, bloom)
+
+    def may_contain(self, keys):
+        for key in keys:
+            for position in _bloom_positions(key, self._bits, self._hashes):
+                if not self._bloom[position >> 3] & (1 << (position & 7)):
+                    return False
+        return True
+
+    def _load_postings(self):
+        offset = _HEADER.size + len(self._bloom)
+        with open(self._path, "rb") as handle:
+            handle.seek(offset)
+            frames = handle.read(self._frame_count * _FRAME.size)
+            self._frames = [
+                _FRAME.unpack_from(frames, index * _FRAME.size)
+                for index in range(self._frame_count)]
+            self._keys = array("I")
+            self._keys.frombytes(handle.read(self._key_count * 4))
+            self._starts = array("I")
+            self._starts.frombytes(handle.read((self._key_count + 1) * 4))
+            self._postings = array("I")
+            self._postings.frombytes(handle.read(self._posting_count * 4))
+        if (len(self._frames) != self._frame_count
+                or len(self._postings) != self._posting_count):
+            raise ValueError(f"truncated search sidecar {self._path!r}")
+
+    def frames_for(self, keys):
+        """``(offset, length)`` of each frame holding every key, in file
+        order."""
+        if not self.may_contain(keys):
+            return []
+        if self._keys is None:
+            self._load_postings()
+        candidates = None
+        for key in keys:
+            index = bisect.bisect_left(self._keys, key)
+            if index == len(self._keys) or self._keys[index] != key:
+                return []
+            frames = set(self._postings[
+                self._starts[index]:self._starts[index + 1]])
+            candidates = frames if candidates is None else candidates & frames
+            if not candidates:
+                return []
+        if candidates is None:
+            return list(self._frames)
+        return [self._frames[frame] for frame in sorted(candidates)]
+
+
+def candidate_frames(manifest_path, keys):
+    """Frames of ``manifest_path`` a search must read, or None to scan it
+    whole because there is nothing to narrow with."""
+    if not keys:
+        return None
+    try:
+        index = SearchIndex.load(manifest_path)
+        return None if index is None else index.frames_for(keys)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def _read_lines(path):
+    """Frame table of a JSONL, .jsonl.gz or .jsonl.zst manifest, and an
+    iterator of its ``(frame number, line)`` pairs."""
+    if path.endswith(".zst"):
+        from .manifest_index import read_frame, segment_frames
+        frames = segment_frames(path)
+        lines = ((number, line)
+                 for number, (offset, length) in enumerate(frames)
+                 for line in read_frame(path, offset, length).decode(
+                     "utf-8").splitlines())
+        return frames, lines
+    frames = [(0, os.path.getsize(path))]
+    if path.endswith(".gz"):
+        import gzip
+        handle = gzip.open(path, "rt", encoding="utf-8")
+    else:
+        handle = open(path, "r", encoding="utf-8")
+
+    def lines():
+        with handle:
+            for line in handle:
+                yield 0, line
+    return frames, lines()
+
+
+def build_sidecar(manifest_path):
+    """(Re)write the sidecar of an existing manifest from its contents.
+
+    Bundle manifests (``*.manifest.jsonl*``) index what the bundle search
+    matches; local-archive segments index what the archive search matches.
+    """
+    haystack = (bundle_haystack if ".manifest.jsonl" in
+                os.path.basename(manifest_path) else archive_haystack)
+    size = os.path.getsize(manifest_path)
+    frames, lines = _read_lines(manifest_path)
+    builder = SearchIndexBuilder()
+    rows = 0
+    for frame, line in lines:
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            continue
+        builder.add(haystack(item), frame)
+        rows += 1
+    builder.write(sidecar_path(manifest_path), frames, size)
+    return rows
+
+
+def rebuild_sidecars(roots, *, force=False):
+    """Write missing or stale sidecars for every manifest under ``roots``."""
+    report = {"manifests": 0, "rebuilt": 0, "current": 0, "rows": 0,
+              "errors": []}
+    for root in roots:
+        for dirpath, _, names in os.walk(os.path.abspath(root)):
+            for name in sorted(names):
+                if not name.endswith((".jsonl", ".jsonl.gz", ".jsonl.zst")):
+                    continue
+                path = os.path.join(dirpath, name)
+                report["manifests"] += 1
+                if not force and SearchIndex.load(path) is not None:
+                    report["current"] += 1
+                    continue
+                try:
+                    report["rows"] += build_sidecar(path)
+                    report["rebuilt"] += 1
+                except Exception as exc:  # noqa: BLE001 - reported per file
+                    report["errors"].append({"path": path, "error": str(exc)})
+    return report
+
+
+__all__ = [
+    "SIDECAR_SUFFIX", "SearchIndex", "SearchIndexBuilder", "archive_haystack",
+    "build_sidecar", "bundle_haystack", "candidate_frames", "line_literals",
+    "pattern_keys", "rebuild_sidecars", "sidecar_path",
+]
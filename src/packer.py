@@ -4,7 +4,6 @@ import io
 import json
 import os
 import shutil
-import tempfile
 import threading
 import zipfile
 from typing import List, Optional
@@ -17,10 +16,18 @@ except ImportError:  # pragma: no cover - requirements includes zstandard
 from .constants import (LOCAL_STAGING_RESERVE_BYTES, LOCAL_TAPE_BUDGET_BYTES,
                         ROOT_FILES_GROUP, TAPE_BUDGET_LABEL,
                         ZIP_BUNDLE_FILL_FACTOR, _auto_pack_decision)
+from .manifest_search import SearchIndexBuilder, bundle_haystack, sidecar_path
+from .paths import _long
 from .pipeline_types import FileRecord
 from .robocopy import _robocopy_file
 from .runtime import _progress_done, _progress_line
 from .skipped import SkippedFileTracker
+from .zip_container import write_stored_entry
+
+
+# One reusable read buffer per pack call; each small file is read through it
+# exactly once on its way into the bundle.
+ZIP_COPY_BUFFER_BYTES = 16 * 1024 * 1024
 
 
 def _gib(value):
@@ -35,6 +42,10 @@ class StagingSpaceError(RuntimeError):
     pass
 
 
+class PackSourceError(RuntimeError):
+    """A shared source stream broke; no later entry of it can be read."""
+
+
 def ensure_staging_space(staging_dir, required_bytes, context="staging"):
     """Refuse a staging write unless the current disk free space is safe."""
     os.makedirs(staging_dir, exist_ok=True)
@@ -102,6 +113,26 @@ class StagingSpaceBudget:
             self.available -= required_bytes
 
 
+def _write_stream_file(opener, dst_path, copy_buffer):
+    """Write a streamed source to ``dst_path``; a partial file is removed."""
+    dst_path = _long(dst_path)
+    os.makedirs(os.path.dirname(dst_path) or ".", exist_ok=True)
+    view = memoryview(copy_buffer)
+    try:
+        with opener() as fsrc, open(dst_path, 'wb') as fdst:
+            while True:
+                count = fsrc.readinto(copy_buffer)
+                if not count:
+                    break
+                fdst.write(view[:count])
+    except BaseException:
+        try:
+            os.remove(dst_path)
+        except OSError:
+            pass
+        raise
+
+
 class LTOAnalyzer:
     def analyze(self, folder_path, threshold_mb):
         print(f"\n[ANALYZER] Scanning: {folder_path}...")
@@ -281,6 +312,36 @@ class LTOAnalyzer:
         print("-" * 60)
 
 
+class _ManifestWriter:
+    """An open bundle manifest; its search sidecar is written on close."""
+
+    def __init__(self, path, target, closers=()):
+        self.path = path
+        self._target = target
+        self._closers = closers
+        self._search = SearchIndexBuilder()
+
+    def write(self, payload):
+        json.dump(payload, self._target, ensure_ascii=False,
+                  separators=(",", ":"))
+        self._target.write("\n")
+        self._search.add(bundle_haystack(payload))
+
+    def close(self):
+        if self._closers:
+            text, writer, raw = self._closers
+            text.flush()
+            text.detach()
+            writer.close()
+            raw.close()
+        else:
+            self._target.close()
+        # The manifest is one compressed stream, so the sidecar can only
+        # tell a search to skip the whole file.
+        size = os.path.getsize(self.path)
+        self._search.write(sidecar_path(self.path), [(0, size)], size)
+
+
 class LTOPacker:
     def __init__(self, max_zip_size_gb, *, index_min_file_mb=10,
                  index_packed_small_files=False, manifest_enabled=True,
@@ -316,32 +377,33 @@ class LTOPacker:
             raw = open(path, "wb")
             writer = zstd.ZstdCompressor().stream_writer(raw)
             text = io.TextIOWrapper(writer, encoding="utf-8")
-            return name, path, (text, writer, raw)
+            return name, path, _ManifestWriter(path, text, (text, writer, raw))
         if self.manifest_compression == "gzip":
             import gzip
-            return name, path, gzip.open(path, "wt", encoding="utf-8")
-        return name, path, open(path, "w", encoding="utf-8")
+            return name, path, _ManifestWriter(
+                path, gzip.open(path, "wt", encoding="utf-8"))
+        return name, path, _ManifestWriter(
+            path, open(path, "w", encoding="utf-8"))
 
     @staticmethod
     def _close_manifest(handle):
-        if handle is None:
-            return
-        if isinstance(handle, tuple):
-            text, writer, raw = handle
-            text.flush()
-            text.detach()
-            writer.close()
-            raw.close()
-            return
-        handle.close()
+        if handle is not None:
+            handle.close()
+
+    @classmethod
+    def _abandon_bundle(cls, zipf, manifest_handle):
+        """Best-effort close of an open bundle on the way out of a failure."""
+        try:
+            if zipf is not None:
+                zipf.close()
+            cls._close_manifest(manifest_handle)
+        except Exception:
+            pass
 
     @staticmethod
     def _write_manifest_record(handle, payload):
-        if handle is None:
-            return
-        target = handle[0] if isinstance(handle, tuple) else handle
-        json.dump(payload, target, ensure_ascii=False, separators=(",", ":"))
-        target.write("\n")
+        if handle is not None:
+            handle.write(payload)
 
     def run_manifest(self, source_root, dest, threshold_mb, file_entries,
                      bundle_prefix="Bundle", skipped_tracker=None,
@@ -370,6 +432,40 @@ class LTOPacker:
             done_label="Sub-chunk done",
         )
 
+    def run_stream(self, dest, threshold_mb, file_entries, planned_bytes,
+                   source_root=None, bundle_prefix="Bundle",
+                   skipped_tracker=None, source_name='remote',
+                   session_id=None, chunk_index=None, governor=None,
+                   pack_file_batch_size=10000) -> List[FileRecord]:
+        """Pack entries that arrive one at a time from a single stream.
+
+        Each entry is a ``{'path', 'rel', 'size', 'open'}`` dict whose
+        ``open()`` returns a reader that is only valid until the next entry
+        is taken, so ``file_entries`` is consumed once, in order, and never
+        materialized. ``path`` is only a label here. Small files become
+        bundle entries and large ones are written loose, exactly as
+        :meth:`run` lays them out, but nothing is read back from a fetch
+        directory. A :class:`PackSourceError` from a reader ends the pack.
+        """
+        if os.path.exists(dest):
+            shutil.rmtree(dest)
+        os.makedirs(dest, exist_ok=True)
+        return self._pack_entries(
+            dest, threshold_mb, file_entries,
+            source_root=source_root,
+            bundle_prefix=bundle_prefix,
+            skipped_tracker=skipped_tracker,
+            source_name=source_name,
+            session_id=session_id,
+            chunk_index=chunk_index,
+            governor=governor,
+            pack_file_batch_size=pack_file_batch_size,
+            heading="Streaming tar -> ZIP",
+            done_label="Stream done",
+            budget=StagingSpaceBudget(
+                dest, planned_bytes, context="Streaming tar -> ZIP"),
+        )
+
     def _pack_entries(self, dest, threshold_mb, file_entries,
                       source_root=None,
                       bundle_prefix="Bundle", skipped_tracker=None,
@@ -407,146 +503,150 @@ class LTOPacker:
                   f"Max ZIP: {self.max_zip_size_gb:.0f} GB)")
 
         pack_file_batch_size = max(1, int(pack_file_batch_size or 10000))
-        for entry_index, entry in enumerate(file_entries):
-            if entry_index and entry_index % pack_file_batch_size == 0:
-                # Reclaim per-batch garbage (closed file objects, spool buffers,
-                # metadata churn) proactively so a long pack of millions of
-                # small files does not let the Python heap drift upward between
-                # governor checkpoints.
-                gc.collect()
-            if (governor is not None and
-                    entry_index % pack_file_batch_size == 0):
-                governor.wait_or_pause("pack", "continue")
-            src = entry['path']
-            rel = entry['rel']
-            file = os.path.basename(src)
-            try:
-                fsize = entry.get('size')
-                if fsize is None:
-                    fsize = os.path.getsize(src)
-                fsize_mb = fsize / (1024 * 1024)
-
-                if fsize_mb < threshold_mb:
-                    budget.consume(fsize, context=file)
-                    zip_rel = rel.replace('\\', '/')
-                    if zipf is None:
-                        zip_path = os.path.join(
-                            dest, f"{bundle_prefix}_{zip_idx:03d}.zip")
-                        zipf = zipfile.ZipFile(
-                            zip_path, 'w', zipfile.ZIP_STORED, allowZip64=True)
-                        manifest_name, manifest_path, manifest_handle = (
-                            self._open_manifest(dest, bundle_prefix, zip_idx))
-                    if (files_in_current_zip > 0 and
-                            current_zip_size + fsize >
-                            self.max_zip_size_gb * 1024**3 *
-                            ZIP_BUNDLE_FILL_FACTOR):
-                        zipf.close()
-                        self._close_manifest(manifest_handle)
-                        _progress_done()
-                        print(f"\n -> Sealed {bundle_prefix}_{zip_idx:03d}.zip ({files_in_current_zip} files)")
-                        zip_idx += 1
-                        zip_path = os.path.join(dest, f"{bundle_prefix}_{zip_idx:03d}.zip")
-                        zipf = zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED, allowZip64=True)
-                        manifest_name, manifest_path, manifest_handle = (
-                            self._open_manifest(dest, bundle_prefix, zip_idx))
-                        current_zip_size     = 0
-                        files_in_current_zip = 0
-
-                    container = f"{bundle_prefix}_{zip_idx:03d}.zip"
-                    # Spool the whole file BEFORE opening the zip entry: a
-                    # mid-read I/O error must fail before any bytes are
-                    # committed under the entry's real name. Writing straight
-                    # from the source used to leave a truncated entry sealed
-                    # into the bundle, which could later satisfy the restore
-                    # path's unique-basename fallback with corrupt data.
-                    # Small files are threshold-bounded, so the spool stays in
-                    # RAM up to 64 MiB and spills to disk above that.
-                    with open(src, 'rb') as fsrc, \
-                            tempfile.SpooledTemporaryFile(
-                                max_size=64 * 1024 * 1024,
-                                dir=dest) as spool:
-                        shutil.copyfileobj(
-                            fsrc, spool, length=16 * 1024 * 1024)
-                        spool.seek(0)
-                        with zipf.open(zip_rel, 'w',
-                                       force_zip64=True) as zdst:
-                            shutil.copyfileobj(
-                                spool, zdst, length=16 * 1024 * 1024)
-                    self._write_manifest_record(manifest_handle, {
-                        "relative_path": zip_rel,
-                        "file_name": file,
-                        "size_bytes": int(fsize),
-                        "mtime": None,
-                        "source_host": source_name,
-                        "original_root_dir": source_root or "",
-                        "bundle_id": container,
-                        "stored_bundle_path": container,
-                        "tape_label": None,
-                    })
-                    current_zip_size     += fsize
-                    files_in_current_zip += 1
-                    total_packed         += 1
-                    manifest_only = (
-                        not self.index_packed_small_files and
-                        fsize_mb < self.index_min_file_mb)
-
-                    metadata.append({
-                        'file_name':       file,
-                        'original_path':   src,
-                        'file_size_bytes': fsize,
-                        'is_packed':       True,
-                        'container_name':  container,
-                        'stored_path':     zip_rel,
-                        'catalog_policy': (
-                            'manifest_only' if manifest_only else 'index'),
-                        'manifest_name': manifest_name,
-                        'manifest_path': manifest_path,
-                        'manifest_format': self.manifest_format,
-                        'manifest_compression': self.manifest_compression,
-                        'original_root_dir': source_root or '',
-                    })
-
-                    if not quiet_progress and total_packed % 500 == 0:
-                        _progress_line(f"[PACKING] {total_packed} files packed")
-
-                else:
-                    # Large/loose files are copied without an extra full-file
-                    # read so the tape does not wait on Python I/O.
-                    dst_path = os.path.join(dest, rel)
-                    budget.consume(fsize, context=file)
-
-                    if not _robocopy_file(src, dst_path, display_name=file):
-                        skipped_tracker.add(
-                            source_name, src, "robocopy failed", "pack",
-                            session_id=session_id, chunk_index=chunk_index)
-                        continue
-                    total_loose += 1
-                    budget.refresh()
-
-                    metadata.append({
-                        'file_name':       file,
-                        'original_path':   src,
-                        'file_size_bytes': fsize,
-                        'is_packed':       False,
-                        'container_name':  None,
-                        'stored_path':     rel,
-                    })
-
-            except StagingSpaceError:
-                _progress_done()
+        copy_buffer = bytearray(ZIP_COPY_BUFFER_BYTES)
+        try:
+            for entry_index, entry in enumerate(file_entries):
+                if entry_index and entry_index % pack_file_batch_size == 0:
+                    # Reclaim per-batch garbage (closed file objects, spool buffers,
+                    # metadata churn) proactively so a long pack of millions of
+                    # small files does not let the Python heap drift upward between
+                    # governor checkpoints.
+                    gc.collect()
+                if (governor is not None and
+                        entry_index % pack_file_batch_size == 0):
+                    governor.wait_or_pause("pack", "continue")
+                src = entry['path']
+                rel = entry['rel']
+                opener = entry.get('open')
+                file = os.path.basename(src)
                 try:
-                    if zipf is not None:
-                        zipf.close()
-                    self._close_manifest(manifest_handle)
-                except Exception:
-                    pass
-                raise
-            except Exception as e:
-                _progress_done()
-                print(f"\n[ERROR] {file}: {e}")
-                skipped_tracker.add(
-                    source_name, src, e, "pack",
-                    session_id=session_id, chunk_index=chunk_index)
+                    fsize = entry.get('size')
+                    if fsize is None:
+                        fsize = os.path.getsize(src)
+                    fsize_mb = fsize / (1024 * 1024)
+
+                    if fsize_mb < threshold_mb:
+                        budget.consume(fsize, context=file)
+                        zip_rel = rel.replace('\\', '/')
+                        if zipf is None:
+                            zip_path = os.path.join(
+                                dest, f"{bundle_prefix}_{zip_idx:03d}.zip")
+                            zipf = zipfile.ZipFile(
+                                zip_path, 'w', zipfile.ZIP_STORED, allowZip64=True)
+                            manifest_name, manifest_path, manifest_handle = (
+                                self._open_manifest(dest, bundle_prefix, zip_idx))
+                        if (files_in_current_zip > 0 and
+                                current_zip_size + fsize >
+                                self.max_zip_size_gb * 1024**3 *
+                                ZIP_BUNDLE_FILL_FACTOR):
+                            zipf.close()
+                            self._close_manifest(manifest_handle)
+                            _progress_done()
+                            print(f"\n -> Sealed {bundle_prefix}_{zip_idx:03d}.zip ({files_in_current_zip} files)")
+                            zip_idx += 1
+                            zip_path = os.path.join(dest, f"{bundle_prefix}_{zip_idx:03d}.zip")
+                            zipf = zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED, allowZip64=True)
+                            manifest_name, manifest_path, manifest_handle = (
+                                self._open_manifest(dest, bundle_prefix, zip_idx))
+                            current_zip_size     = 0
+                            files_in_current_zip = 0
+
+                        container = f"{bundle_prefix}_{zip_idx:03d}.zip"
+                        # Stream the source straight into the entry, read once.
+                        # A mid-read I/O error truncates the bundle back to the
+                        # entry's local header, so no truncated entry is ever
+                        # sealed under the real name (it could otherwise satisfy
+                        # the restore path's unique-basename fallback with corrupt
+                        # data). This used to take a full spool copy per file.
+                        with (opener() if opener is not None
+                              else open(src, 'rb')) as fsrc:
+                            location = write_stored_entry(
+                                zipf, zip_rel, fsrc, copy_buffer, size=fsize)
+                        self._write_manifest_record(manifest_handle, {
+                            "relative_path": zip_rel,
+                            "file_name": file,
+                            "size_bytes": int(fsize),
+                            "mtime": None,
+                            "source_host": source_name,
+                            "original_root_dir": source_root or "",
+                            "bundle_id": container,
+                            "stored_bundle_path": container,
+                            "tape_label": None,
+                        })
+                        current_zip_size     += fsize
+                        files_in_current_zip += 1
+                        total_packed         += 1
+                        manifest_only = (
+                            not self.index_packed_small_files and
+                            fsize_mb < self.index_min_file_mb)
+
+                        metadata.append({
+                            'file_name':       file,
+                            'original_path':   src,
+                            'file_size_bytes': fsize,
+                            'is_packed':       True,
+                            'container_name':  container,
+                            'stored_path':     zip_rel,
+                            'catalog_policy': (
+                                'manifest_only' if manifest_only else 'index'),
+                            'manifest_name': manifest_name,
+                            'manifest_path': manifest_path,
+                            'manifest_format': self.manifest_format,
+                            'manifest_compression': self.manifest_compression,
+                            'original_root_dir': source_root or '',
+                            'zip_header_offset': location.header_offset,
+                            'zip_data_offset': location.data_offset,
+                            'zip_stored_size': location.stored_size,
+                            'zip_crc32': location.crc32,
+                        })
+
+                        if not quiet_progress and total_packed % 500 == 0:
+                            _progress_line(f"[PACKING] {total_packed} files packed")
+
+                    else:
+                        # Large/loose files are copied without an extra full-file
+                        # read so the tape does not wait on Python I/O.
+                        dst_path = os.path.join(dest, rel)
+                        budget.consume(fsize, context=file)
+
+                        if opener is not None:
+                            # A streamed source has no file to copy from: write
+                            # it to its loose path as it arrives.
+                            _write_stream_file(opener, dst_path, copy_buffer)
+                        elif not _robocopy_file(src, dst_path, display_name=file):
+                            skipped_tracker.add(
+                                source_name, src, "robocopy failed", "pack",
+                                session_id=session_id, chunk_index=chunk_index)
+                            continue
+                        total_loose += 1
+                        budget.refresh()
+
+                        metadata.append({
+                            'file_name':       file,
+                            'original_path':   src,
+                            'file_size_bytes': fsize,
+                            'is_packed':       False,
+                            'container_name':  None,
+                            'stored_path':     rel,
+                        })
+
+                except (StagingSpaceError, PackSourceError):
+                    _progress_done()
+                    self._abandon_bundle(zipf, manifest_handle)
+                    zipf = manifest_handle = None
+                    raise
+                except Exception as e:
+                    _progress_done()
+                    print(f"\n[ERROR] {file}: {e}")
+                    skipped_tracker.add(
+                        source_name, src, e, "pack",
+                        session_id=session_id, chunk_index=chunk_index)
+        except PackSourceError:
+            # The source failed between entries (the handler above covers
+            # a failure inside one).
+            _progress_done()
+            self._abandon_bundle(zipf, manifest_handle)
+            raise
 
         if zipf is not None:
             zipf.close()
@@ -562,11 +662,12 @@ class LTOPacker:
                     os.remove(zip_path)
                 except OSError:
                     pass
-                try:
-                    if manifest_path:
-                        os.remove(manifest_path)
-                except OSError:
-                    pass
+                for path in ((manifest_path, sidecar_path(manifest_path))
+                             if manifest_path else ()):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
 
         _progress_done()
         print(f"\n[PACKER] {done_label}: {total_packed} packed | {total_loose} loose.")
@@ -576,7 +677,8 @@ class LTOPacker:
             source_name='local', session_id=None, chunk_index=None,
             on_existing='ask', governor=None,
             pack_file_batch_size=10000,
-            pack_parallel_workers=1) -> Optional[List[FileRecord]]:
+            pack_parallel_workers=1,
+            pack_parallel_backend="thread") -> Optional[List[FileRecord]]:
         """
         Pack small files into ZIP bundles; copy large files loose.
 
@@ -590,7 +692,8 @@ class LTOPacker:
         pack_parallel_workers > 1 shards the file list across that many worker
         threads, each writing its own uniquely-named bundle(s)/manifest(s) via
         the identical per-file logic (see packer_parallel.pack_entries_parallel).
-        The default 1 keeps the unchanged serial path.
+        pack_parallel_backend="process" runs the shards in worker processes
+        instead. The default 1 keeps the unchanged serial path.
 
         Returns:
             list of dicts  — full metadata (staged backup ready for DB)
@@ -653,6 +756,7 @@ class LTOPacker:
                 chunk_index=chunk_index,
                 governor=governor,
                 pack_file_batch_size=pack_file_batch_size,
+                backend=pack_parallel_backend,
             )
 
         return self._pack_entries(
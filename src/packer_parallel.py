@@ -3,13 +3,25 @@
 The default serial packer (``LTOPacker._pack_entries``) is single-threaded and,
 for chunks of hundreds of thousands of ~KB files, is per-file-latency bound: the
 box sits mostly idle while one thread opens/reads/zips each file in turn. This
-module keeps that exact per-file logic — the same truncation-safe spool, the
-same manifest writer, the same StagingSpaceBudget accounting, the same governor
-checkpoints — and merely fans it out across a small pool of worker threads, each
-owning a **disjoint shard** of the file list and its **own uniquely-named**
+module keeps that exact per-file logic — the same rollback-safe entry writer,
+the same manifest writer, the same StagingSpaceBudget accounting, the same
+governor checkpoints — and merely fans it out across a small pool of workers,
+each owning a **disjoint shard** of the file list and its **own uniquely-named**
 bundle(s)/manifest(s). Nothing about integrity, restore, or the tape path
 changes; only dispatch and the shared-resource plumbing live here.
 
+Two backends (``[PERFORMANCE] pack_parallel_backend``):
+
+* ``thread`` (default): worker threads in this process. The file I/O releases
+  the GIL, but CRC-32, ZIP header encoding and the per-file bookkeeping do not,
+  so small-file packs stop scaling after two or three threads.
+* ``process``: one spawned worker process per shard, each with its own GIL.
+  The shared budget lives in a manager process; each worker leases space from
+  it in slabs rather than per file. The governor stays in this process: a relay
+  thread mirrors its ``pack``/``continue`` decision into a manager event that
+  the workers wait on at every checkpoint. Each worker returns its metadata and
+  skipped files through the pool's result pipe when its shard is done.
+
 Safety invariants (verified against resource_governor.ResourceGovernor and
 packer.LTOPacker):
 
@@ -22,42 +34,304 @@ packer.LTOPacker):
 * One shared, thread-safe ``StagingSpaceBudget`` backs all workers, so the disk
   free-space guard accounts for every worker's writes (no independent
   over-commit).
-* ``SkippedFileTracker`` is already lock-guarded; workers share it.
+* ``SkippedFileTracker`` is already lock-guarded; thread workers share it and
+  process workers hand their skips back for the caller's tracker.
 * Every worker passes through the shared ``ResourceGovernor`` at each
   ``pack_file_batch_size`` checkpoint via ``wait_or_pause("pack", "continue")``.
   A pending/active tape write therefore pauses **all** workers exactly as it
   pauses the serial packer — the tape's exclusivity and RAM reserve are intact.
+  Process workers follow a relayed gate instead; if the relay fails, the gate
+  is opened rather than left to hold the workers forever.
 * A worker that raises (StagingSpaceError, or any unexpected error the per-file
   loop does not already funnel into the skipped tracker) aborts the whole chunk
   by re-raising, so the caller cleans staging and the chunk stays resumable —
   identical to the serial contract.
 """
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import posixpath
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import get_context
+from multiprocessing.managers import SyncManager
 
-from .packer import StagingSpaceBudget
+from .packer import StagingSpaceBudget, StagingSpaceError
 from .skipped import SkippedFileTracker
 
 
+PACK_PARALLEL_BACKENDS = ("thread", "process")
+#: Staging space a process worker reserves from the shared budget at a time, so
+#: a shard of small files costs one manager round trip per slab, not per file.
+PROCESS_BUDGET_LEASE_BYTES = 256 * 1024 * 1024
+#: How often the relay re-asks the governor whether packing may continue.
+PAUSE_RELAY_INTERVAL_SECONDS = 1.0
+
+
+class _PackManager(SyncManager):
+    """Manager process that owns the one StagingSpaceBudget of a process pack."""
+
+
+_PackManager.register("StagingSpaceBudget", StagingSpaceBudget)
+
+
+class _LeasedBudget:
+    """Worker-side budget that reserves from the shared one in slabs.
+
+    A worker holds at most one unused slab, so the shared budget over-counts
+    by no more than ``workers * slab``; when a full slab no longer fits it
+    falls back to reserving exactly what the file needs.
+    """
+
+    def __init__(self, shared, slab_bytes=PROCESS_BUDGET_LEASE_BYTES):
+        self._shared = shared
+        self._slab_bytes = max(1, int(slab_bytes))
+        self.available = 0
+
+    def consume(self, required_bytes, context="staging"):
+        required_bytes = max(0, int(required_bytes or 0))
+        if required_bytes > self.available:
+            shortfall = required_bytes - self.available
+            try:
+                lease = max(self._slab_bytes, shortfall)
+                self._shared.consume(lease, context)
+            except StagingSpaceError:
+                lease = shortfall
+                self._shared.consume(lease, context)
+            self.available += lease
+        self.available -= required_bytes
+
+
+class _PauseSignal:
+    """Stands in for the governor inside a worker process."""
+
+    def __init__(self, gate, abort=None,
+                 interval=PAUSE_RELAY_INTERVAL_SECONDS):
+        self._gate = gate
+        self._abort = abort
+        self._interval = interval
+
+    def wait_or_pause(self, stage, action="start", **_kwargs):
+        while not self._gate.wait(self._interval):
+            if self._abort is not None and self._abort.is_set():
+                break
+        return True
+
+
+def _relay_pause(governor, gate, done, abort=None,
+                 interval=PAUSE_RELAY_INTERVAL_SECONDS):
+    """Open ``gate`` while the governor lets packing continue; close it while
+    the governor would pause the serial packer.
+
+    However the relay ends, the gate is left open so no worker waits on it
+    forever; a governor error also sets ``abort``.
+    """
+    try:
+        while not done.is_set():
+            if not governor.decision("pack", "continue").allowed:
+                gate.clear()
+                if not governor.wait_or_pause("pack", "continue",
+                                              stop_evt=done):
+                    break
+            gate.set()
+            done.wait(interval)
+    except Exception as exc:  # noqa: BLE001 - the pack must not deadlock
+        if abort is not None:
+            abort.set()
+        print(f"[PACKER] Pause relay failed, workers continue without "
+              f"governor pauses: {exc}")
+    finally:
+        gate.set()
+
+
+def _pack_shard_in_process(packer, dest, threshold_mb, shard, worker_id,
+                           budget, gate, abort, options):
+    """Process-pool entry point: pack one shard, return metadata and skips."""
+    skipped_tracker = SkippedFileTracker()
+    metadata = packer._pack_entries(
+        dest, threshold_mb, shard,
+        skipped_tracker=skipped_tracker,
+        governor=None if gate is None else _PauseSignal(gate, abort),
+        heading=f"Parallel pack worker {worker_id:02d}",
+        done_label=f"Parallel pack worker {worker_id:02d} done",
+        budget=_LeasedBudget(budget),
+        quiet_progress=True,
+        **options,
+    )
+    return metadata, skipped_tracker.items()
+
+
+#: Per-file cost, in byte-equivalents, when balancing shards: opening,
+#: CRC-ing and cataloguing a file costs about as much as streaming 64 KiB.
+SHARD_FILE_COST_BYTES = 64 * 1024
+
+
+def _directory(entry):
+    return posixpath.dirname(entry['rel'].replace('\\', '/'))
+
+
+def _cost(entries):
+    return sum(int(entry.get('size') or 0) + SHARD_FILE_COST_BYTES
+               for entry in entries)
+
+
 def _shard(entries, workers):
-    """Round-robin split so loose (large) files and directory locality spread
-    evenly across workers instead of piling onto one shard."""
-    buckets = [[] for _ in range(workers)]
-    for index, entry in enumerate(entries):
-        buckets[index % workers].append(entry)
-    return [bucket for bucket in buckets if bucket]
+    """Split ``entries`` into at most ``workers`` shards of whole directories.
+
+    Each directory's files stay together, in scan order, so one worker reads
+    them back to back and they land in as few bundles as possible. Shards are
+    balanced by bytes plus a per-file cost, greedily placing the most
+    expensive directory run on the least-loaded worker (LPT). A directory
+    costing more than a fair share is first cut into contiguous runs of at
+    most that share, so one huge directory cannot serialise the pack.
+    """
+    groups = {}
+    for entry in entries:
+        groups.setdefault(_directory(entry), []).append(entry)
+    share = max(1, -(-_cost(entries) // max(1, workers)))
+
+    runs = []
+    for order, (_name, group) in enumerate(groups.items()):
+        run, run_cost = [], 0
+        for entry in group:
+            cost = int(entry.get('size') or 0) + SHARD_FILE_COST_BYTES
+            if run and run_cost + cost > share:
+                runs.append((run_cost, (order, len(runs)), run))
+                run, run_cost = [], 0
+            run.append(entry)
+            run_cost += cost
+        runs.append((run_cost, (order, len(runs)), run))
+
+    loads = [[0, index, []] for index in range(workers)]
+    for run_cost, order, run in sorted(runs, key=lambda item: -item[0]):
+        target = min(loads, key=lambda load: (load[0], load[1]))
+        target[0] += run_cost
+        target[2].append((order, run))
+    shards = []
+    for _load, _index, placed in loads:
+        if placed:
+            # (directory, run): split runs of one directory keep their order.
+            placed.sort(key=lambda item: item[0])
+            shards.append([entry for _order, run in placed for entry in run])
+    return shards
+
+
+def bundle_spread(metadata):
+    """Map each packed file's directory to the number of bundles holding it."""
+    bundles = {}
+    for record in metadata:
+        if record.get('is_packed'):
+            bundles.setdefault(
+                posixpath.dirname(record['stored_path']), set()).add(
+                    record.get('container_name'))
+    return {directory: len(names) for directory, names in bundles.items()}
+
+
+def _format_spread(spread):
+    if not spread:
+        return "no packed directories"
+    counts = list(spread.values())
+    split = sum(1 for count in counts if count > 1)
+    return (f"{len(counts):,} director(ies) span {sum(counts) / len(counts):.2f} "
+            f"bundle(s) on average, max {max(counts)}; {split:,} split "
+            f"across bundles")
+
+
+def _worker_options(options, worker_id):
+    # Distinct Bundle_wNN prefix per worker → distinct ZIP/manifest names.
+    return dict(options,
+                bundle_prefix=f"{options['bundle_prefix']}_w{worker_id:02d}")
+
+
+def _run_threads(packer, dest, threshold_mb, shards, budget, skipped_tracker,
+                 governor, options):
+    def _run_shard(worker_id, shard):
+        return packer._pack_entries(
+            dest, threshold_mb, shard,
+            skipped_tracker=skipped_tracker,
+            governor=governor,
+            heading=f"Parallel pack worker {worker_id:02d}",
+            done_label=f"Parallel pack worker {worker_id:02d} done",
+            budget=budget,
+            quiet_progress=True,
+            **_worker_options(options, worker_id),
+        )
+
+    results = [None] * len(shards)
+    errors = []
+    with ThreadPoolExecutor(max_workers=len(shards),
+                            thread_name_prefix="pack") as pool:
+        future_to_id = {
+            pool.submit(_run_shard, worker_id, shard): worker_id
+            for worker_id, shard in enumerate(shards)
+        }
+        for future in as_completed(future_to_id):
+            worker_id = future_to_id[future]
+            try:
+                results[worker_id] = future.result()
+            except Exception as exc:  # noqa: BLE001 - surfaced by the caller
+                errors.append((worker_id, exc))
+    return results, errors
+
+
+def _run_processes(packer, dest, threshold_mb, shards, total_bytes,
+                   skipped_tracker, governor, options):
+    ctx = get_context("spawn")
+    results = [None] * len(shards)
+    errors = []
+    with _PackManager(ctx=ctx) as manager:
+        # Created inside the manager, so StagingSpaceError for a chunk that
+        # cannot fit at all is raised here, before any worker starts.
+        budget = manager.StagingSpaceBudget(
+            dest, total_bytes, "Parallel pack (tape idle)")
+        gate = abort = done = relay = None
+        if governor is not None:
+            gate = manager.Event()
+            abort = manager.Event()
+            done = threading.Event()
+            relay = threading.Thread(
+                target=_relay_pause, args=(governor, gate, done, abort),
+                name="pack-pause-relay", daemon=True)
+            relay.start()
+        try:
+            with ProcessPoolExecutor(max_workers=len(shards),
+                                     mp_context=ctx) as pool:
+                future_to_id = {}
+                for worker_id, shard in enumerate(shards):
+                    future = pool.submit(
+                        _pack_shard_in_process, packer, dest, threshold_mb,
+                        shard, worker_id, budget, gate, abort,
+                        _worker_options(options, worker_id))
+                    future_to_id[future] = worker_id
+                for future in as_completed(future_to_id):
+                    worker_id = future_to_id[future]
+                    try:
+                        metadata, skipped = future.result()
+                    except Exception as exc:  # noqa: BLE001 - surfaced by the caller
+                        errors.append((worker_id, exc))
+                        continue
+                    skipped_tracker.extend(skipped)
+                    results[worker_id] = metadata
+        finally:
+            if relay is not None:
+                done.set()
+                relay.join()
+    return results, errors
 
 
 def pack_entries_parallel(packer, dest, threshold_mb, entries, *, workers,
                           source_root=None, bundle_prefix="Bundle",
                           skipped_tracker=None, source_name='local',
                           session_id=None, chunk_index=None, governor=None,
-                          pack_file_batch_size=10000):
-    """Pack ``entries`` into ``dest`` using ``workers`` worker threads.
+                          pack_file_batch_size=10000, backend="thread"):
+    """Pack ``entries`` into ``dest`` using ``workers`` worker threads, or
+    worker processes when ``backend`` is ``"process"``.
 
     Returns the merged metadata list (concatenation of each worker's records).
     Order is not significant downstream: ``db._apply_canonical_remote_paths``
     matches by ``stored_path`` and the DB sync is set-based.
     """
+    if backend not in PACK_PARALLEL_BACKENDS:
+        raise ValueError(
+            f"[PACKER] unknown parallel pack backend {backend!r}; expected "
+            f"one of {', '.join(PACK_PARALLEL_BACKENDS)}")
     workers = max(1, int(workers or 1))
     entries = list(entries)
     skipped_tracker = skipped_tracker or SkippedFileTracker()
@@ -84,45 +358,30 @@ def pack_entries_parallel(packer, dest, threshold_mb, entries, *, workers,
     # same disk). Sized from the full chunk, not a shard, so the reserve/overhead
     # is enforced once against real free space.
     total_bytes = sum(int(entry.get('size') or 0) for entry in entries)
-    budget = StagingSpaceBudget(
-        dest, total_bytes, context="Parallel pack (tape idle)")
 
     print(f"\n[PACKER] Parallel pack: {len(entries):,} file(s) across "
-          f"{len(shards)} worker(s). "
+          f"{len(shards)} worker {backend}(s). "
           f"(Threshold: {threshold_mb:.0f} MB | "
           f"Max ZIP: {packer.max_zip_size_gb:.0f} GB)")
 
-    def _run_shard(worker_id, shard):
-        return packer._pack_entries(
-            dest, threshold_mb, shard,
-            source_root=source_root,
-            bundle_prefix=f"{bundle_prefix}_w{worker_id:02d}",
-            skipped_tracker=skipped_tracker,
-            source_name=source_name,
-            session_id=session_id,
-            chunk_index=chunk_index,
-            governor=governor,
-            pack_file_batch_size=pack_file_batch_size,
-            heading=f"Parallel pack worker {worker_id:02d}",
-            done_label=f"Parallel pack worker {worker_id:02d} done",
-            budget=budget,
-            quiet_progress=True,
-        )
-
-    results = [None] * len(shards)
-    errors = []
-    with ThreadPoolExecutor(max_workers=len(shards),
-                            thread_name_prefix="pack") as pool:
-        future_to_id = {
-            pool.submit(_run_shard, worker_id, shard): worker_id
-            for worker_id, shard in enumerate(shards)
-        }
-        for future in as_completed(future_to_id):
-            worker_id = future_to_id[future]
-            try:
-                results[worker_id] = future.result()
-            except Exception as exc:  # noqa: BLE001 - surfaced below
-                errors.append((worker_id, exc))
+    options = {
+        'source_root': source_root,
+        'bundle_prefix': bundle_prefix,
+        'source_name': source_name,
+        'session_id': session_id,
+        'chunk_index': chunk_index,
+        'pack_file_batch_size': pack_file_batch_size,
+    }
+    if backend == "process":
+        results, errors = _run_processes(
+            packer, dest, threshold_mb, shards, total_bytes, skipped_tracker,
+            governor, options)
+    else:
+        budget = StagingSpaceBudget(
+            dest, total_bytes, context="Parallel pack (tape idle)")
+        results, errors = _run_threads(
+            packer, dest, threshold_mb, shards, budget, skipped_tracker,
+            governor, options)
 
     if errors:
         # Match the serial packer's fail-hard contract: a worker that raised
@@ -142,4 +401,5 @@ def pack_entries_parallel(packer, dest, threshold_mb, entries, *, workers,
     total_loose = len(metadata) - total_packed
     print(f"\n[PACKER] Parallel pack done: {total_packed:,} packed | "
           f"{total_loose:,} loose across {len(shards)} worker(s).")
+    print(f"[PACKER] Directory spread: {_format_spread(bundle_spread(metadata))}.")
     return metadata
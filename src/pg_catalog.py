@@ -9,9 +9,13 @@ import posixpath
 from typing import Any, Iterable, List
 
 from .catalog_query import contains_pattern, prefix_pattern, substring_pattern
+from .catalog_rollups import apply_deltas, file_deltas
+from .coverage_rollups import file_directories, refresh_directories
 from .catalog_v3 import catalog_directory_chain, catalog_file_name
 from .constants import DB_UPSERT_BATCH_SIZE, LEGACY_DEFAULT_SOURCE_HOST
 from .db import _derived_file_name, _file_record_key, _short_source_host
+from .manifest_search import (
+    bundle_haystack, candidate_frames, line_literals, pattern_keys)
 from .pg_bulk import copy_rows
 from .pg_core import _as_utc, _now_utc, _rows
 from .pipeline_types import FileRecord
@@ -143,10 +147,22 @@ class PgCatalogMixin:
                          NULL::TEXT AS local_sidecar_locator,
                          NULL::TEXT AS tape_sidecar_locator,
                          NULL::BIGINT AS expected_member_count,
-                         NULL::BIGINT AS expected_logical_bytes
+                         NULL::BIGINT AS expected_logical_bytes,
+                         NULL::INTEGER AS restore_chunk_index,
+                         NULL::INTEGER AS restore_container_ordinal,
+                         z.header_offset AS zip_header_offset,
+                         z.data_offset AS zip_data_offset,
+                         z.stored_size AS zip_stored_size,
+                         z.crc32 AS zip_crc32,
+                         td.digest_algorithm AS tar_digest_algorithm,
+                         td.digest AS tar_digest
                   FROM files_index AS f
                   LEFT JOIN archive_bundles AS b ON b.bundle_id = f.bundle_id
-                  LEFT JOIN archive_runs AS r ON r.run_id = f.archive_run_id"""
+                  LEFT JOIN archive_runs AS r ON r.run_id = f.archive_run_id
+                  LEFT JOIN zip_entry_index AS z
+                    ON z.file_id = f.file_id AND z.bundle_id = f.bundle_id
+                  LEFT JOIN tar_member_digests AS td
+                    ON td.file_id = f.file_id AND td.bundle_id = f.bundle_id"""
         return """SELECT f.*, b.tape_path AS bundle_tape_path,
                          r.started_at AS run_started_at,
                          c.container_id AS restore_container_id,
@@ -180,10 +196,22 @@ class PgCatalogMixin:
                              AS local_sidecar_locator,
                          sidecar.tape_locator AS tape_sidecar_locator,
                          c.expected_member_count,
-                         c.expected_logical_bytes
+                         c.expected_logical_bytes,
+                         c.chunk_index AS restore_chunk_index,
+                         c.container_ordinal AS restore_container_ordinal,
+                         z.header_offset AS zip_header_offset,
+                         z.data_offset AS zip_data_offset,
+                         z.stored_size AS zip_stored_size,
+                         z.crc32 AS zip_crc32,
+                         td.digest_algorithm AS tar_digest_algorithm,
+                         td.digest AS tar_digest
                   FROM files_index AS f
                   LEFT JOIN archive_bundles AS b ON b.bundle_id = f.bundle_id
                   LEFT JOIN archive_runs AS r ON r.run_id = f.archive_run_id
+                  LEFT JOIN zip_entry_index AS z
+                    ON z.file_id = f.file_id AND z.bundle_id = f.bundle_id
+                  LEFT JOIN tar_member_digests AS td
+                    ON td.file_id = f.file_id AND td.bundle_id = f.bundle_id
                   LEFT JOIN archive_containers AS c
                     ON c.container_id = b.container_id
                   LEFT JOIN tape_generations AS tg
@@ -459,9 +487,34 @@ class PgCatalogMixin:
                 "catalog_name": catalog_file_name(
                     record.get("stored_path"), original_path),
                 "catalog_backup_date": backup_date,
+                "zip_entry": self._zip_entry_row(record, bundle_id),
+                "tar_digest": self._tar_digest_row(record, bundle_id),
             }
         return normalized
 
+    @staticmethod
+    def _zip_entry_row(record, bundle_id):
+        """``zip_entry_index`` values for a packed ZIP member, else None."""
+        if not record.get("is_packed") or bundle_id is None:
+            return None
+        values = tuple(record.get(name) for name in (
+            "zip_header_offset", "zip_data_offset", "zip_stored_size",
+            "zip_crc32"))
+        if any(value is None for value in values):
+            return None
+        return tuple(int(value) for value in values)
+
+    @staticmethod
+    def _tar_digest_row(record, bundle_id):
+        """``tar_member_digests`` values for a digested TAR member, else None."""
+        if not record.get("is_packed") or bundle_id is None:
+            return None
+        algorithm = record.get("tar_digest_algorithm")
+        digest = record.get("tar_digest")
+        if not algorithm or not digest:
+            return None
+        return str(algorithm), str(digest)
+
     def _ensure_archive_runs(self, conn, run_specs):
         has_remote_identity = self._column_exists_conn(
             conn, "archive_runs", "remote_chunk_index")
@@ -531,6 +584,18 @@ class PgCatalogMixin:
             ))
         conflict = (
             f"DO UPDATE SET {update_sql}" if update_existing else "DO NOTHING")
+        # Directory rollups move by the rows this batch replaces or adds.
+        # Only an update replaces anything; the old values are read (and
+        # locked) before the upsert overwrites them.
+        deltas = {}
+        if update_existing:
+            file_deltas(((row["directory_id"], row["file_size_bytes"], None)
+                         for row in conn.execute(
+                             """SELECT f.directory_id, f.file_size_bytes
+                                FROM files_index f
+                                JOIN _stage s ON s.record_key = f.record_key
+                                FOR UPDATE OF f""").fetchall()),
+                        sign=-1, deltas=deltas)
         # RETURNING (xmax = 0) distinguishes freshly inserted rows (xmax 0) from
         # updated ones without a second membership scan. With DO NOTHING, only
         # inserted rows are returned, so anything not returned was a skip.
@@ -538,9 +603,18 @@ class PgCatalogMixin:
             f"""INSERT INTO files_index ({col_sql})
                 SELECT {col_sql} FROM _stage
                 ON CONFLICT (record_key) {conflict}
-                RETURNING (xmax = 0) AS inserted"""
+                RETURNING (xmax = 0) AS inserted, directory_id,
+                          file_size_bytes, catalog_backup_date"""
         ).fetchall()
         inserted = sum(1 for row in affected if row["inserted"])
+        apply_deltas(conn, file_deltas(
+            ((row["directory_id"], row["file_size_bytes"],
+              row["catalog_backup_date"]) for row in affected),
+            deltas=deltas))
+        self._upsert_zip_entries(
+            conn, normalized_by_key.values(), update_existing)
+        self._upsert_tar_member_digests(
+            conn, normalized_by_key.values(), update_existing)
         if update_existing:
             return {
                 "inserted": inserted,
@@ -553,6 +627,80 @@ class PgCatalogMixin:
             "skipped": total - inserted,
         }
 
+    @staticmethod
+    def _upsert_zip_entries(conn, rows, update_existing):
+        """Index the ZIP location of every packed member in this batch.
+
+        Joined back through record_key and bundle_id, so a location is only
+        attached to a files_index row that really points at that bundle (a
+        row the upsert skipped keeps its old bundle and gets nothing new).
+        """
+        columns = ("record_key", "bundle_id", "header_offset", "data_offset",
+                   "stored_size", "crc32")
+        entries = [(row["record_key"], row["bundle_id"]) + row["zip_entry"]
+                   for row in rows if row.get("zip_entry")]
+        if not entries:
+            return
+        conflict = (
+            """DO UPDATE SET
+                   bundle_id=EXCLUDED.bundle_id,
+                   header_offset=EXCLUDED.header_offset,
+                   data_offset=EXCLUDED.data_offset,
+                   stored_size=EXCLUDED.stored_size,
+                   crc32=EXCLUDED.crc32""" if update_existing
+            else "DO NOTHING")
+        conn.execute(
+            "CREATE TEMP TABLE _zip_stage (record_key BYTEA, "
+            "bundle_id BIGINT, header_offset BIGINT, data_offset BIGINT, "
+            "stored_size BIGINT, crc32 BIGINT) ON COMMIT DROP")
+        with conn.cursor() as cur:
+            copy_rows(cur, "_zip_stage", columns, entries)
+        conn.execute(
+            """INSERT INTO zip_entry_index
+                   (file_id, bundle_id, header_offset, data_offset,
+                    stored_size, crc32)
+               SELECT f.file_id, f.bundle_id, z.header_offset, z.data_offset,
+                      z.stored_size, z.crc32
+               FROM _zip_stage AS z
+               JOIN files_index AS f
+                 ON f.record_key = z.record_key
+                AND f.bundle_id = z.bundle_id
+               ON CONFLICT (file_id) """ + conflict)
+
+    @staticmethod
+    def _upsert_tar_member_digests(conn, rows, update_existing):
+        """Record the sidecar digest of every digested TAR member in this batch.
+
+        Attached the same way as ZIP locations: only to a files_index row that
+        really points at the member's bundle.
+        """
+        columns = ("record_key", "bundle_id", "digest_algorithm", "digest")
+        entries = [(row["record_key"], row["bundle_id"]) + row["tar_digest"]
+                   for row in rows if row.get("tar_digest")]
+        if not entries:
+            return
+        conflict = (
+            """DO UPDATE SET
+                   bundle_id=EXCLUDED.bundle_id,
+                   digest_algorithm=EXCLUDED.digest_algorithm,
+                   digest=EXCLUDED.digest""" if update_existing
+            else "DO NOTHING")
+        conn.execute(
+            "CREATE TEMP TABLE _tar_digest_stage (record_key BYTEA, "
+            "bundle_id BIGINT, digest_algorithm TEXT, digest TEXT) "
+            "ON COMMIT DROP")
+        with conn.cursor() as cur:
+            copy_rows(cur, "_tar_digest_stage", columns, entries)
+        conn.execute(
+            """INSERT INTO tar_member_digests
+                   (file_id, bundle_id, digest_algorithm, digest)
+               SELECT f.file_id, f.bundle_id, t.digest_algorithm, t.digest
+               FROM _tar_digest_stage AS t
+               JOIN files_index AS f
+                 ON f.record_key = t.record_key
+                AND f.bundle_id = t.bundle_id
+               ON CONFLICT (file_id) """ + conflict)
+
     def bulk_upsert_files(self, records: Iterable[FileRecord],
                           batch_size=DB_UPSERT_BATCH_SIZE,
                           update_existing=True):
@@ -1213,7 +1361,8 @@ class PgCatalogMixin:
                 "       c.tar_dialect, c.temporary_data_locator, "
                 "       c.permanent_local_metadata_locator, c.tape_path, "
                 "       c.tape_generation_id, c.expected_member_count, "
-                "       c.expected_logical_bytes, tg.generation, "
+                "       c.expected_logical_bytes, c.chunk_index, "
+                "       c.container_ordinal, tg.generation, "
                 "       a.artifact_id, a.artifact_version, a.local_locator, "
                 "       a.tape_locator AS sidecar_tape_locator "
                 "FROM directory_tree_index t "
@@ -1275,6 +1424,8 @@ class PgCatalogMixin:
                     "tape_sidecar_locator": row["sidecar_tape_locator"],
                     "expected_member_count": row["expected_member_count"],
                     "expected_logical_bytes": row["expected_logical_bytes"],
+                    "restore_chunk_index": row["chunk_index"],
+                    "restore_container_ordinal": row["container_ordinal"],
                 })
         return out
 
@@ -1395,6 +1546,8 @@ class PgCatalogMixin:
                 " ORDER BY backup_date DESC",
                 params,
             ).fetchall()
+        keys = pattern_keys(needle, glob=False)
+        literals = line_literals(needle, glob=False)
         matches = []
         for bundle in bundles:
             path = bundle["manifest_path"]
@@ -1409,6 +1562,8 @@ class PgCatalogMixin:
                     "is required; refusing to scan tape.")
             if not path or not os.path.exists(path):
                 continue
+            if candidate_frames(path, keys) == []:
+                continue
             handle = self._open_manifest_reader(
                 path, bundle["manifest_compression"])
             try:
@@ -1416,15 +1571,14 @@ class PgCatalogMixin:
                 for line in text:
                     if len(matches) >= int(limit or 100):
                         return matches
+                    lowered = line.lower()
+                    if not all(run in lowered for run in literals):
+                        continue
                     try:
                         item = json.loads(line)
                     except json.JSONDecodeError:
                         continue
-                    haystack = (
-                        str(item.get("file_name") or "") + "\n"
-                        + str(item.get("relative_path") or "")
-                    ).lower()
-                    if needle in haystack:
+                    if needle in bundle_haystack(item):
                         hit = dict(item)
                         hit.update({
                             "bundle_id": bundle["bundle_id"],
@@ -1616,9 +1770,15 @@ class PgCatalogMixin:
         def operation(conn):
             rows = conn.execute(
                 "DELETE FROM files_index WHERE file_id = ANY(%s) "
-                "RETURNING tape_label",
+                "RETURNING tape_label, directory_id, file_size_bytes, "
+                "source_host, original_path",
                 (ids,),
             ).fetchall()
+            apply_deltas(conn, file_deltas(
+                ((row["directory_id"], row["file_size_bytes"], None)
+                 for row in rows), sign=-1))
+            refresh_directories(conn, file_directories(
+                (row["source_host"], row["original_path"]) for row in rows))
             labels = sorted({row["tape_label"] for row in rows})
             if labels:
                 for label in labels:
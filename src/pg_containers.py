@@ -12,6 +12,7 @@ from dataclasses import asdict, is_dataclass
 
 from .pipeline_types import (ArtifactReadiness, ContainerFormat,
                              ContainerValidationState, SourceDisposition)
+from .coverage_rollups import refresh_chunk
 from .pg_core import _row, _rows
 from .session_reconcile import classify_session37_format_boundary_category
 from .stored_tar_planning import (build_stored_tar_chunk_plan,
@@ -1644,6 +1645,8 @@ class PgContainerMixin:
                    WHERE session_id=%s AND chunk_index=%s""",
                 (int(session_id), int(chunk_index)),
             )
+            refresh_chunk(conn, remote_session_id=session_id,
+                          chunk_index=chunk_index)
             return True
         return self._transaction(operation, "finish remote catalog commit")
 
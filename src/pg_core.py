@@ -112,6 +112,10 @@ class PgConnectionCore:
             "010_postgres_local_manifest_archive.sql",
             "011_postgres_tape_status.sql",
             "013_postgres_tape_reset_safety.sql",
+            "018_postgres_zip_entry_index.sql",
+            "019_postgres_directory_rollups.sql",
+            "020_postgres_coverage_rollups.sql",
+            "021_postgres_tar_member_digests.sql",
         )
         with self._pool.connection() as conn:
             with conn.cursor() as cur:
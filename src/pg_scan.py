@@ -43,6 +43,128 @@ class SegmentRangeConflict(ScanFrontierError):
     """A chunk asked for ordinals that are not the segment's next unconsumed."""
 
 
+# ----------------------------------------------------------------------
+# Statement bodies shared by the one-directory methods and the batched
+# commit. Each takes an open connection and never commits: the caller's
+# ``_transaction`` decides what one atomic unit is.
+# ----------------------------------------------------------------------
+def _check_segment_range(locator, first_scan_ordinal, last_scan_ordinal):
+    if str(locator).endswith(".part"):
+        raise ScanFrontierError(
+            f"refusing to persist a .part locator as ready: {locator!r}")
+    if last_scan_ordinal < first_scan_ordinal:
+        raise ScanFrontierError("segment ordinal range is inverted")
+
+
+def _insert_scan_directories(conn, scan_scope_id, entries,
+                             parent_directory_id, now):
+    inserted = 0
+    for canonical_path, traversal_ordinal in entries:
+        cur = conn.execute(
+            """INSERT INTO remote_scan_directories
+               (scan_scope_id, canonical_path, parent_directory_id,
+                traversal_ordinal, listing_state,
+                subtree_coverage_state, planning_state,
+                created_at, updated_at)
+               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+               ON CONFLICT (scan_scope_id, canonical_path)
+                   DO NOTHING""",
+            (scan_scope_id, canonical_path, parent_directory_id,
+             int(traversal_ordinal), ScanDirectoryState.PENDING.value,
+             ScanCoverageState.PROVISIONAL.value,
+             ScanPlanningState.UNPLANNED.value, now, now),
+        )
+        inserted += cur.rowcount
+    if parent_directory_id is not None:
+        conn.execute(
+            """UPDATE remote_scan_directories
+               SET child_directory_count=%s, updated_at=%s
+               WHERE scan_directory_id=%s""",
+            (len(entries), now, parent_directory_id),
+        )
+    return inserted
+
+
+def _complete_directory(conn, scan_directory_id, owner_token, *,
+                        direct_file_count, direct_byte_count,
+                        observation_after, error_count, now):
+    state = (ScanDirectoryState.ERROR.value if error_count
+             else ScanDirectoryState.COMPLETE.value)
+    cur = conn.execute(
+        """UPDATE remote_scan_directories
+           SET listing_state=%s, direct_file_count=%s,
+               direct_byte_count=%s, observation_after=%s,
+               error_count=%s, owner_token=NULL, attempt_id=NULL,
+               lease_expires_at=NULL, updated_at=%s
+           WHERE scan_directory_id=%s AND owner_token=%s""",
+        (state, int(direct_file_count), int(direct_byte_count),
+         observation_after, int(error_count), now,
+         scan_directory_id, owner_token),
+    )
+    return cur.rowcount == 1
+
+
+def _insert_scan_segment(conn, scan_directory_id, *, first_scan_ordinal,
+                         last_scan_ordinal, locator, file_count, byte_count,
+                         artifact_size_bytes=None, first_canonical_path=None,
+                         last_canonical_path=None,
+                         artifact_version="scan-segment-v1", now):
+    row = conn.execute(
+        """INSERT INTO remote_scan_segments
+           (scan_directory_id, first_scan_ordinal, last_scan_ordinal,
+            next_unconsumed_ordinal, locator, artifact_version,
+            artifact_size_bytes, file_count, byte_count,
+            first_canonical_path, last_canonical_path, state,
+            created_at, updated_at)
+           VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                   %s, %s)
+           ON CONFLICT (scan_directory_id, first_scan_ordinal)
+               DO UPDATE SET
+                   last_scan_ordinal = EXCLUDED.last_scan_ordinal,
+                   locator = EXCLUDED.locator,
+                   file_count = EXCLUDED.file_count,
+                   byte_count = EXCLUDED.byte_count,
+                   updated_at = EXCLUDED.updated_at
+               WHERE remote_scan_segments.state = %s
+           RETURNING *""",
+        (scan_directory_id, int(first_scan_ordinal),
+         int(last_scan_ordinal), int(first_scan_ordinal), str(locator),
+         artifact_version, artifact_size_bytes, int(file_count),
+         int(byte_count), first_canonical_path, last_canonical_path,
+         ScanSegmentState.READY.value, now, now,
+         ScanSegmentState.WRITING.value),
+    ).fetchone()
+    if row is None:
+        # A ready/consumed segment already occupies this range. That is
+        # idempotent re-publication, not a conflict to resolve.
+        row = conn.execute(
+            """SELECT * FROM remote_scan_segments
+               WHERE scan_directory_id=%s AND first_scan_ordinal=%s""",
+            (scan_directory_id, int(first_scan_ordinal)),
+        ).fetchone()
+    conn.execute(
+        """UPDATE remote_scan_directories
+           SET last_committed_segment_id=%s, updated_at=%s
+           WHERE scan_directory_id=%s""",
+        (row["scan_segment_id"], now, scan_directory_id),
+    )
+    return _row(row)
+
+
+def _insert_scan_error(conn, *, scan_scope_id=None, scan_directory_id=None,
+                       category, path=None, message=None,
+                       disposition="unresolved", now):
+    return conn.execute(
+        """INSERT INTO remote_scan_errors
+           (scan_scope_id, scan_directory_id, category, path, message,
+            disposition, created_at)
+           VALUES (%s, %s, %s, %s, %s, %s, %s)
+           RETURNING scan_error_id""",
+        (scan_scope_id, scan_directory_id, category, path, message,
+         disposition, now),
+    ).fetchone()["scan_error_id"]
+
+
 class PgScanMixin:
     """Scopes, directories, segments, chunk membership and worker attempts."""
 
@@ -155,31 +277,8 @@ class PgScanMixin:
         now = _now_utc()
 
         def operation(conn):
-            inserted = 0
-            for canonical_path, traversal_ordinal in entries:
-                cur = conn.execute(
-                    """INSERT INTO remote_scan_directories
-                       (scan_scope_id, canonical_path, parent_directory_id,
-                        traversal_ordinal, listing_state,
-                        subtree_coverage_state, planning_state,
-                        created_at, updated_at)
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                       ON CONFLICT (scan_scope_id, canonical_path)
-                           DO NOTHING""",
-                    (scan_scope_id, canonical_path, parent_directory_id,
-                     int(traversal_ordinal), ScanDirectoryState.PENDING.value,
-                     ScanCoverageState.PROVISIONAL.value,
-                     ScanPlanningState.UNPLANNED.value, now, now),
-                )
-                inserted += cur.rowcount
-            if parent_directory_id is not None:
-                conn.execute(
-                    """UPDATE remote_scan_directories
-                       SET child_directory_count=%s, updated_at=%s
-                       WHERE scan_directory_id=%s""",
-                    (len(entries), now, parent_directory_id),
-                )
-            return inserted
+            return _insert_scan_directories(
+                conn, scan_scope_id, entries, parent_directory_id, now)
 
         return self._transaction(
             operation, f"enqueue {len(entries)} scan directories")
@@ -212,46 +311,96 @@ class PgScanMixin:
         has nothing available.
 
         ``partial`` is claimable on purpose — it is the single directory a
-        crash may replay. ``complete`` never is.
+        crash may replay. So is a ``scanning`` row whose lease has expired: its
+        holder stopped renewing, and the owner-token checks on completion
+        refuse anything that holder might still try to write. ``complete``
+        never is.
+        """
+        claimed = self.claim_directories(
+            session_id, owner_token, attempt_id, limit=1,
+            lease_seconds=lease_seconds)
+        return claimed[0] if claimed else None
+
+    def claim_directories(self, session_id, owner_token, attempt_id, limit,
+                          lease_seconds=900):
+        """Claim up to ``limit`` directories at once, in traversal order.
+
+        The same compare-and-swap as :meth:`claim_next_directory`, applied to
+        the first ``limit`` claimable rows in one statement. ``SKIP LOCKED``
+        means a concurrent claimant takes the next rows rather than waiting, so
+        two workers never hold the same directory. Returns the claimed rows
+        (possibly fewer than ``limit``, possibly none).
         """
         self._require_incremental_scan_schema()
+        limit = max(1, int(limit))
         now = _now_utc()
 
         def operation(conn):
-            row = conn.execute(
+            candidates = conn.execute(
                 """SELECT d.scan_directory_id
                    FROM remote_scan_directories d
                    JOIN remote_scan_scopes s
                        ON s.scan_scope_id = d.scan_scope_id
                    WHERE s.session_id=%s
-                     AND d.listing_state IN (%s, %s)
-                     AND (d.lease_expires_at IS NULL OR d.lease_expires_at < %s)
+                     AND ((d.listing_state IN (%s, %s)
+                           AND (d.lease_expires_at IS NULL
+                                OR d.lease_expires_at < %s))
+                          OR (d.listing_state=%s
+                              AND d.lease_expires_at < %s))
                    ORDER BY s.scope_ordinal, d.traversal_ordinal
                    FOR UPDATE OF d SKIP LOCKED
-                   LIMIT 1""",
+                   LIMIT %s""",
                 (session_id, ScanDirectoryState.PENDING.value,
-                 ScanDirectoryState.PARTIAL.value, now),
-            ).fetchone()
-            if row is None:
-                return None
-            cur = conn.execute(
+                 ScanDirectoryState.PARTIAL.value, now,
+                 ScanDirectoryState.SCANNING.value, now, limit),
+            ).fetchall()
+            order = [row["scan_directory_id"] for row in candidates]
+            if not order:
+                return []
+            claimed = conn.execute(
                 """UPDATE remote_scan_directories
                    SET listing_state=%s, owner_token=%s, attempt_id=%s,
                        lease_expires_at=%s + make_interval(secs => %s),
                        updated_at=%s
-                   WHERE scan_directory_id=%s
-                     AND listing_state IN (%s, %s)
+                   WHERE scan_directory_id = ANY(%s)
+                     AND (listing_state IN (%s, %s)
+                          OR (listing_state=%s AND lease_expires_at < %s))
                    RETURNING *""",
                 (ScanDirectoryState.SCANNING.value, owner_token, attempt_id,
-                 now, float(lease_seconds), now, row["scan_directory_id"],
+                 now, float(lease_seconds), now, order,
                  ScanDirectoryState.PENDING.value,
-                 ScanDirectoryState.PARTIAL.value),
-            )
-            claimed = cur.fetchone()
-            return _row(claimed) if claimed else None
+                 ScanDirectoryState.PARTIAL.value,
+                 ScanDirectoryState.SCANNING.value, now),
+            ).fetchall()
+            # RETURNING has no order; hand rows back in traversal order.
+            by_id = {row["scan_directory_id"]: _row(row) for row in claimed}
+            return [by_id[d] for d in order if d in by_id]
 
         return self._transaction(
-            operation, f"claim next scan directory (session {session_id})")
+            operation,
+            f"claim {limit} scan director{'y' if limit == 1 else 'ies'} "
+            f"(session {session_id})")
+
+    def renew_directory_leases(self, owner_token, lease_seconds=900):
+        """Extend every live claim ``owner_token`` holds; return how many.
+
+        The claimant's heartbeat. A worker that stops calling this — because
+        its process died or hung — lets its leases expire, and
+        :meth:`claim_directories` then hands those directories to another
+        worker instead of leaving them stranded in ``scanning`` forever.
+        """
+        self._require_incremental_scan_schema()
+        now = _now_utc()
+        return self._transaction(
+            lambda conn: conn.execute(
+                """UPDATE remote_scan_directories
+                   SET lease_expires_at=%s + make_interval(secs => %s),
+                       updated_at=%s
+                   WHERE owner_token=%s AND listing_state=%s""",
+                (now, float(lease_seconds), now, owner_token,
+                 ScanDirectoryState.SCANNING.value),
+            ).rowcount,
+            "renew scan directory leases")
 
     def complete_directory_listing(self, scan_directory_id, owner_token, *,
                                    direct_file_count, direct_byte_count,
@@ -266,22 +415,14 @@ class PgScanMixin:
         """
         self._require_incremental_scan_schema()
         now = _now_utc()
-        state = (ScanDirectoryState.ERROR.value if error_count
-                 else ScanDirectoryState.COMPLETE.value)
 
         def operation(conn):
-            cur = conn.execute(
-                """UPDATE remote_scan_directories
-                   SET listing_state=%s, direct_file_count=%s,
-                       direct_byte_count=%s, observation_after=%s,
-                       error_count=%s, owner_token=NULL, attempt_id=NULL,
-                       lease_expires_at=NULL, updated_at=%s
-                   WHERE scan_directory_id=%s AND owner_token=%s""",
-                (state, int(direct_file_count), int(direct_byte_count),
-                 observation_after, int(error_count), now,
-                 scan_directory_id, owner_token),
-            )
-            return cur.rowcount == 1
+            return _complete_directory(
+                conn, scan_directory_id, owner_token,
+                direct_file_count=direct_file_count,
+                direct_byte_count=direct_byte_count,
+                observation_after=observation_after, error_count=error_count,
+                now=now)
 
         return self._transaction(
             operation, f"complete directory listing {scan_directory_id}")
@@ -313,6 +454,80 @@ class PgScanMixin:
         return self._transaction(
             operation, f"mark directory partial {scan_directory_id}")
 
+    def commit_directory_listings(self, owner_token, listings):
+        """Commit several directories' listings as ONE transaction.
+
+        ``listings`` is a sequence of mappings, one per claimed directory:
+        ``scan_directory_id``, ``scan_scope_id``, ``segment`` (the
+        :meth:`publish_scan_segment` keyword arguments, or ``None`` for a
+        directory without files), ``children`` (``(canonical_path,
+        traversal_ordinal)`` pairs), ``errors`` (``(category, path, message)``
+        triples), ``direct_file_count``, ``direct_byte_count`` and
+        ``observation_after``.
+
+        Exactly what :meth:`publish_scan_segment`,
+        :meth:`enqueue_scan_directories`, :meth:`record_scan_error` and
+        :meth:`complete_directory_listing` do for one directory, in that order,
+        for all of them — so a batch is covered entirely or not at all. Every segment artifact must already be on
+        disk. Returns one completion flag per directory, in input order.
+
+        Ownership is checked first, under the row locks: a directory whose
+        lease expired and was reclaimed by another worker is skipped entirely
+        (its flag is ``False``) rather than having a stale listing's segment
+        and children written over the new claimant's.
+        """
+        self._require_incremental_scan_schema()
+        listings = list(listings)
+        for listing in listings:
+            segment = listing.get("segment")
+            if segment:
+                _check_segment_range(segment["locator"],
+                                     segment["first_scan_ordinal"],
+                                     segment["last_scan_ordinal"])
+        now = _now_utc()
+
+        def operation(conn):
+            owned = {row["scan_directory_id"] for row in conn.execute(
+                """SELECT scan_directory_id FROM remote_scan_directories
+                   WHERE scan_directory_id = ANY(%s) AND owner_token=%s
+                   FOR UPDATE""",
+                ([listing["scan_directory_id"] for listing in listings],
+                 owner_token),
+            ).fetchall()}
+            completed = []
+            for listing in listings:
+                directory_id = listing["scan_directory_id"]
+                if directory_id not in owned:
+                    get_logger().warning(
+                        "scan_directory_lease_lost: directory=%s owner=%s",
+                        directory_id, owner_token)
+                    completed.append(False)
+                    continue
+                if listing.get("segment"):
+                    _insert_scan_segment(conn, directory_id,
+                                         now=now, **listing["segment"])
+                children = list(listing.get("children") or ())
+                if children:
+                    _insert_scan_directories(
+                        conn, listing["scan_scope_id"], children,
+                        directory_id, now)
+                errors = list(listing.get("errors") or ())
+                for category, path, message in errors:
+                    _insert_scan_error(
+                        conn, scan_directory_id=directory_id,
+                        category=category, path=path, message=message,
+                        now=now)
+                completed.append(_complete_directory(
+                    conn, directory_id, owner_token,
+                    direct_file_count=listing["direct_file_count"],
+                    direct_byte_count=listing["direct_byte_count"],
+                    observation_after=listing.get("observation_after"),
+                    error_count=len(errors), now=now))
+            return completed
+
+        return self._transaction(
+            operation, f"commit {len(listings)} directory listing(s)")
+
     def invalidate_directory(self, scan_directory_id, reason):
         """A source change invalidates a directory AND its ancestors.
 
@@ -500,54 +715,19 @@ class PgScanMixin:
         keep.
         """
         self._require_incremental_scan_schema()
-        if str(locator).endswith(".part"):
-            raise ScanFrontierError(
-                f"refusing to persist a .part locator as ready: {locator!r}")
-        if last_scan_ordinal < first_scan_ordinal:
-            raise ScanFrontierError("segment ordinal range is inverted")
+        _check_segment_range(locator, first_scan_ordinal, last_scan_ordinal)
         now = _now_utc()
 
         def operation(conn):
-            row = conn.execute(
-                """INSERT INTO remote_scan_segments
-                   (scan_directory_id, first_scan_ordinal, last_scan_ordinal,
-                    next_unconsumed_ordinal, locator, artifact_version,
-                    artifact_size_bytes, file_count, byte_count,
-                    first_canonical_path, last_canonical_path, state,
-                    created_at, updated_at)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                           %s, %s)
-                   ON CONFLICT (scan_directory_id, first_scan_ordinal)
-                       DO UPDATE SET
-                           last_scan_ordinal = EXCLUDED.last_scan_ordinal,
-                           locator = EXCLUDED.locator,
-                           file_count = EXCLUDED.file_count,
-                           byte_count = EXCLUDED.byte_count,
-                           updated_at = EXCLUDED.updated_at
-                       WHERE remote_scan_segments.state = %s
-                   RETURNING *""",
-                (scan_directory_id, int(first_scan_ordinal),
-                 int(last_scan_ordinal), int(first_scan_ordinal), str(locator),
-                 artifact_version, artifact_size_bytes, int(file_count),
-                 int(byte_count), first_canonical_path, last_canonical_path,
-                 ScanSegmentState.READY.value, now, now,
-                 ScanSegmentState.WRITING.value),
-            ).fetchone()
-            if row is None:
-                # A ready/consumed segment already occupies this range. That is
-                # idempotent re-publication, not a conflict to resolve.
-                row = conn.execute(
-                    """SELECT * FROM remote_scan_segments
-                       WHERE scan_directory_id=%s AND first_scan_ordinal=%s""",
-                    (scan_directory_id, int(first_scan_ordinal)),
-                ).fetchone()
-            conn.execute(
-                """UPDATE remote_scan_directories
-                   SET last_committed_segment_id=%s, updated_at=%s
-                   WHERE scan_directory_id=%s""",
-                (row["scan_segment_id"], now, scan_directory_id),
-            )
-            return _row(row)
+            return _insert_scan_segment(
+                conn, scan_directory_id,
+                first_scan_ordinal=first_scan_ordinal,
+                last_scan_ordinal=last_scan_ordinal, locator=locator,
+                file_count=file_count, byte_count=byte_count,
+                artifact_size_bytes=artifact_size_bytes,
+                first_canonical_path=first_canonical_path,
+                last_canonical_path=last_canonical_path,
+                artifact_version=artifact_version, now=now)
 
         return self._transaction(
             operation, f"publish scan segment for dir {scan_directory_id}")
@@ -877,15 +1057,10 @@ class PgScanMixin:
         self._require_incremental_scan_schema()
         now = _now_utc()
         return self._transaction(
-            lambda conn: conn.execute(
-                """INSERT INTO remote_scan_errors
-                   (scan_scope_id, scan_directory_id, category, path, message,
-                    disposition, created_at)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s)
-                   RETURNING scan_error_id""",
-                (scan_scope_id, scan_directory_id, category, path, message,
-                 disposition, now),
-            ).fetchone()["scan_error_id"],
+            lambda conn: _insert_scan_error(
+                conn, scan_scope_id=scan_scope_id,
+                scan_directory_id=scan_directory_id, category=category,
+                path=path, message=message, disposition=disposition, now=now),
             f"record scan error {category}")
 
     # ------------------------------------------------------------------
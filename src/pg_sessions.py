@@ -3,6 +3,7 @@ import hashlib
 import os
 
 from .cli_errors import OperationalError
+from .coverage_rollups import refresh_chunk
 from .logsetup import get_logger
 from .pipeline_types import ChunkStatus
 from .pg_bulk import copy_rows
@@ -171,15 +172,22 @@ class PgSessionMixin:
 
     def update_local_chunk_status(self, session_id, chunk_index, status):
         kwargs = {"status": status, "updated_at": _now_utc()}
+        after = None
         if status == "backed_up":
             kwargs["completed_at"] = _now_utc()
+
+            def after(conn):
+                refresh_chunk(conn, local_session_id=session_id,
+                              chunk_index=chunk_index)
         self._update_local_manifest(
             kwargs, "session_id=%s AND chunk_index=%s",
             [session_id, chunk_index],
             f"[DB] Local chunk not found: session {session_id}, chunk {chunk_index}",
+            after=after,
         )
 
-    def _update_local_manifest(self, kwargs, where, params, missing):
+    def _update_local_manifest(self, kwargs, where, params, missing,
+                               after=None):
         _valid_columns(kwargs)
         sets = ", ".join(f"{key}=%s" for key in kwargs)
         values = list(kwargs.values()) + params
@@ -190,6 +198,8 @@ class PgSessionMixin:
                 values,
             )
             self._require_updated(cur, missing)
+            if after is not None:
+                after(conn)
 
         self._transaction(operation, "update local manifest")
 
@@ -947,6 +957,55 @@ class PgSessionMixin:
             "normalized manifest fetch-failure batch",
         )
 
+    def apply_remote_file_states(self, session_id, states):
+        """Write a batch of per-file states in one transaction.
+
+        ``states`` are ``(plan_file_id, status, local_rel_path, keep_path,
+        error_msg)`` with at most one entry per file (see
+        :class:`~src.remote_state_journal.RemoteStateJournal`); ``keep_path``
+        leaves an existing ``local_rel_path`` as it is. The rows are COPYed
+        into a temp table and merged with one INSERT ... SELECT, so a chunk's
+        worth of transitions costs a few round-trips, not one per row.
+        """
+        if session_id is None:
+            raise RuntimeError("[DB] session_id required for normalized remote state")
+        states = list(states)
+        if not states:
+            return
+        now = _now_utc()
+
+        def operation(conn):
+            conn.execute(
+                """CREATE TEMP TABLE _remote_state_stage (
+                       plan_file_id BIGINT, status TEXT, local_rel_path TEXT,
+                       keep_path BOOLEAN, error_msg TEXT) ON COMMIT DROP""")
+            with conn.cursor() as cur:
+                copy_rows(
+                    cur, "_remote_state_stage",
+                    ("plan_file_id", "status", "local_rel_path", "keep_path",
+                     "error_msg"),
+                    states)
+            conn.execute(
+                """INSERT INTO remote_file_state
+                   (session_id, plan_file_id, status, local_rel_path,
+                    error_msg, updated_at)
+                   SELECT %s, s.plan_file_id, s.status,
+                          CASE WHEN s.keep_path THEN f.local_rel_path
+                               ELSE s.local_rel_path END,
+                          s.error_msg, %s
+                   FROM _remote_state_stage s
+                   LEFT JOIN remote_file_state f
+                     ON f.session_id=%s AND f.plan_file_id=s.plan_file_id
+                   ON CONFLICT (session_id, plan_file_id) DO UPDATE SET
+                     status=EXCLUDED.status,
+                     local_rel_path=EXCLUDED.local_rel_path,
+                     error_msg=EXCLUDED.error_msg,
+                     updated_at=EXCLUDED.updated_at""",
+                (session_id, now, session_id))
+
+        self._transaction(
+            operation, f"normalized remote state journal ({len(states)} rows)")
+
     def transition_chunk(self, session_id, chunk_index, to_status, *,
                          expected_from=None, owner_token=None, attempt_id=None,
                          error_msg=None, clear_error=False, validate=True):
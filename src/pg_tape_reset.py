@@ -1,5 +1,6 @@
 """Transactional database half of an explicitly authorized tape reset."""
 import json
+from .coverage_rollups import refresh_directories, tape_directories
 from .pg_core import _now_utc, _row
 
 
@@ -196,6 +197,7 @@ class PgTapeResetMixin:
                         f"{item['session_id']}/{item['chunk_index']} is "
                         f"{row['status']}, expected {item['before']}")
 
+            coverage = tape_directories(conn, label)
             deleted = {}
             # Children and storage locators first.  The tape row is never
             # deleted, so no tape FK cascade participates in this operation.
@@ -228,6 +230,7 @@ class PgTapeResetMixin:
             deleted["archive_runs"] = conn.execute(
                 "DELETE FROM archive_runs WHERE tape_label=%s", (label,)
             ).rowcount
+            refresh_directories(conn, coverage)
 
             now = _now_utc()
             affected_sessions = set()
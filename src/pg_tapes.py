@@ -1,6 +1,7 @@
 """Tape-registry method group: tapes table and label-wide maintenance."""
 from .constants import TAPE_STATUS_ACTIVE, TAPE_STATUSES
 from .db import _file_record_key
+from .coverage_rollups import refresh_directories, tape_directories
 from .pg_core import _now_utc, _row, _rows
 
 
@@ -149,6 +150,7 @@ class PgTapeMixin:
             "<LABEL> --delete-catalog --yes ...` workflow instead.")
 
     def _delete_tape_records(self, conn, volume_label):
+        coverage = tape_directories(conn, volume_label)
         stats = {}
         stats["file_records"] = conn.execute(
             "DELETE FROM files_index WHERE tape_label=%s", (volume_label,)
@@ -183,6 +185,7 @@ class PgTapeMixin:
         stats["directories"] = conn.execute(
             "DELETE FROM catalog_directories WHERE tape_label=%s", (volume_label,)
         ).rowcount
+        refresh_directories(conn, coverage)
         return stats
 
     def _calculate_tape_used_space_conn(self, conn, volume_label):
@@ -232,7 +232,14 @@ class StoredTarExpectedMember:
 
 @dataclass(frozen=True)
 class StoredTarMember:
-    """Observed regular-file member returned by the strict streaming reader."""
+    """Observed regular-file member returned by the strict streaming reader.
+
+    ``header_offset`` is the archive byte offset of the member's first header
+    block (its PAX extended header when one precedes it); ``data_offset`` is
+    where its stored data begins. ``digest`` is the hex digest of the logical
+    file bytes (holes of a sparse member read as zeros) when the validation
+    was asked for one.
+    """
 
     name: str
     normalized_name: str
@@ -241,6 +248,9 @@ class StoredTarMember:
     ordinal: int
     sparse: bool = False
     sparse_extent_count: int = 0
+    header_offset: Optional[int] = None
+    data_offset: Optional[int] = None
+    digest: Optional[str] = None
 
 
 @dataclass(frozen=True)
@@ -248,7 +258,8 @@ class StoredTarContainer:
     """Successful full-container validation result.
 
     ``archive_size`` includes the two end blocks and GNU ``-b 512`` zero
-    padding.  Content hashes are intentionally absent from this contract.
+    padding.  Member digests are present only when the validation named a
+    ``member_digest_algorithm``.
     """
 
     container_format: ContainerFormat
@@ -258,6 +269,24 @@ class StoredTarContainer:
     member_count: int
     logical_bytes: int
     archive_size: int
+    member_digest_algorithm: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class StoredTarStreamScan:
+    """Structural validation of a Stored TAR done while it was received.
+
+    Every header, PAX record, sparse map, padding block and the end marker
+    were checked as the bytes arrived; only the plan match is left, because
+    which members the source excused is known once the stream has ended.
+    ``members`` carry ``ordinal=None`` until that match assigns them.
+    """
+
+    format_version: str
+    tar_dialect: str
+    members: Tuple[StoredTarMember, ...]
+    archive_size: int
+    member_digest_algorithm: Optional[str] = None
 
 
 @dataclass(frozen=True)
@@ -281,6 +310,7 @@ class StoredTarValidationSummary:
     plan_ordinal_count: int
     disposition_counts: Dict[str, int]
     members: Tuple[StoredTarMember, ...]
+    member_digest_algorithm: Optional[str] = None
 
 
 #: Allowed chunk transitions. Anything not listed is refused and leaves the old
@@ -504,6 +534,12 @@ class FileRecord(TypedDict, total=False):
     actual_artifact_bytes: Optional[int]
     tape_generation_id: Optional[int]
     archive_run_id: Optional[int]
+    zip_header_offset: Optional[int]
+    zip_data_offset: Optional[int]
+    zip_stored_size: Optional[int]
+    zip_crc32: Optional[int]
+    tar_digest_algorithm: Optional[str]
+    tar_digest: Optional[str]
 
 
 class ScanMetrics:
@@ -538,7 +574,8 @@ class ScanMetrics:
                  "plan_insert_seconds", "plan_insert_rows", "plan_insert_calls",
                  "sql_executions", "sql_rows", "seconds_to_first_sealed_chunk",
                  "seconds_to_first_staged_chunk",
-                 "seconds_to_first_writer_group")
+                 "seconds_to_first_writer_group", "listing_sessions_opened",
+                 "scan_workers", "worker_progress")
 
     def __init__(self):
         self._lock = threading.Lock()
@@ -560,6 +597,10 @@ class ScanMetrics:
         self.seconds_to_first_sealed_chunk = None
         self.seconds_to_first_staged_chunk = None
         self.seconds_to_first_writer_group = None
+        self.listing_sessions_opened = 0
+        self.scan_workers = 0
+        #: ``{worker_index: [directories, busy_seconds]}`` — counts only.
+        self.worker_progress = {}
 
     # -- exploration ------------------------------------------------------
     def note_listing_start(self):
@@ -577,6 +618,34 @@ class ScanMetrics:
         with self._lock:
             self.discarded_partial_entries += max(0, int(count or 0))
 
+    def note_listing_session_connect(self):
+        """One persistent listing SSH connection was opened. More than one per
+        run means the session was lost and reconnected."""
+        with self._lock:
+            self.listing_sessions_opened += 1
+
+    def note_scan_workers(self, count):
+        """How many frontier scan workers this run started."""
+        with self._lock:
+            self.scan_workers = max(0, int(count or 0))
+
+    def note_worker_directories(self, worker, directories, seconds):
+        """``directories`` listed by one worker in ``seconds`` of work."""
+        with self._lock:
+            progress = self.worker_progress.setdefault(int(worker or 0),
+                                                       [0, 0.0])
+            progress[0] += max(0, int(directories or 0))
+            progress[1] += max(0.0, float(seconds or 0))
+
+    def _worker_rates(self):
+        """Per-worker directories/second, ``;``-joined in worker order."""
+        rates = []
+        for worker in sorted(self.worker_progress):
+            directories, seconds = self.worker_progress[worker]
+            rates.append(f"{directories / seconds:.3f}" if seconds > 0
+                         else "0.000")
+        return ";".join(rates) or None
+
     # -- database membership ---------------------------------------------
     def note_membership_query(self, seconds, path_count, duplicates):
         with self._lock:
@@ -638,6 +707,9 @@ class ScanMetrics:
                     self.seconds_to_first_staged_chunk,
                 "scan_seconds_to_first_writer_group":
                     self.seconds_to_first_writer_group,
+                "scan_listing_sessions_opened": self.listing_sessions_opened,
+                "scan_workers": self.scan_workers,
+                "scan_worker_directories_per_second": self._worker_rates(),
             }
 
 
@@ -26,11 +26,18 @@ def _process_tree_rss_mb():
 
 
 class RamStageSampler:
-    """Sample system/process memory while one pipeline stage is active."""
+    """Sample system/process memory while one pipeline stage is active.
 
-    def __init__(self, stage, interval_seconds=5.0):
+    With a ``source`` (the governor's
+    :class:`~src.resource_governor.ResourceSampler`) it reads the shared
+    snapshot instead of sampling psutil itself, so every stage records the
+    same RAM series the governor decides on.
+    """
+
+    def __init__(self, stage, interval_seconds=5.0, source=None):
         self.stage = stage
         self.interval_seconds = max(0.5, float(interval_seconds or 5.0))
+        self.source = source
         self._stop = threading.Event()
         self._thread = None
         self.peak_pct = None
@@ -56,20 +63,37 @@ class RamStageSampler:
             self._sample()
 
     def _sample(self):
+        if self.source is not None:
+            self._sample_snapshot()
+            return
+        pct = available = None
         if psutil is not None:
             try:
                 vm = psutil.virtual_memory()
                 pct = float(vm.percent)
-                avail_gb = int(vm.available) / 1024**3
-                self.peak_pct = pct if self.peak_pct is None else max(
-                    self.peak_pct, pct)
-                self.min_available_gb = (
-                    avail_gb if self.min_available_gb is None else
-                    min(self.min_available_gb, avail_gb)
-                )
+                available = int(vm.available)
             except Exception:
-                pass
-        rss_mb = _process_tree_rss_mb()
+                pct = available = None
+        self._record(pct, available, _process_tree_rss_mb())
+
+    def _sample_snapshot(self):
+        try:
+            snap = self.source.snapshot(max_age=self.interval_seconds)
+        except Exception:
+            return
+        self._record(snap.memory_pct, snap.available_bytes,
+                     snap.process_tree_rss_mb)
+
+    def _record(self, pct, available_bytes, rss_mb):
+        if pct is not None:
+            self.peak_pct = pct if self.peak_pct is None else max(
+                self.peak_pct, pct)
+        if available_bytes is not None:
+            avail_gb = int(available_bytes) / 1024**3
+            self.min_available_gb = (
+                avail_gb if self.min_available_gb is None else
+                min(self.min_available_gb, avail_gb)
+            )
         if rss_mb is not None:
             self.process_peak_mb = (
                 rss_mb if self.process_peak_mb is None else
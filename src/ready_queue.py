@@ -20,6 +20,16 @@ Two invariants shape the design:
 * A write group is **finite at acquisition time**. The writer snapshots what is
   ready, takes ownership, drains exactly that snapshot and releases. It never
   holds LTFS ownership while waiting for the producer to make more work.
+
+With a write model (:meth:`ReadyQueue.set_write_model`, a
+:class:`~src.chunk_sizing.TapeWriteModel` fitted from the write-group history
+in :mod:`~src.tape_write_log`) a group past the byte threshold also waits
+until its per-group fixed cost is predicted to be amortized to the target
+share (:meth:`~src.chunk_sizing.TapeWriteModel.group_amortization`), unless
+waiting longer would stall a producer. Every added chunk raises that share,
+so undersized chunks delay a group but never strand it. Each group's
+predicted and measured rates are kept in :meth:`ReadyQueue.metrics` so the
+model can be checked over a mount.
 """
 import threading
 import time
@@ -33,6 +43,10 @@ STATE_FAILED = "failed"
 STATE_PRESERVED = "preserved"
 
 
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
 class ReadyQueueLimits:
     """Validated byte/count bounds for the ready queue."""
 
@@ -120,6 +134,12 @@ class ReadyQueue:
         self.bytes_written = 0
         self.chunks_failed = 0
         self.groups_started = 0
+        self._producers_blocked = 0
+        # write model (None = byte thresholds only)
+        self._write_model = None
+        self._target_efficiency = None
+        self._group_predicted_mbs = None
+        self._group_results = []    # [(predicted_mbs, actual_mbs)]
 
     # -- counters ---------------------------------------------------------
     @property
@@ -165,8 +185,47 @@ class ReadyQueue:
                 "groups_started": self.groups_started,
                 "producer_closed": self._closed,
                 "staging_pressure": self._staging_pressure,
+                **self._model_metrics_locked(),
             }
 
+    def _model_metrics_locked(self):
+        measured = [(p, a) for p, a in self._group_results if p is not None]
+        last = self._group_results[-1] if self._group_results else (None, None)
+        error = (sum(abs(p - a) / a for p, a in measured if a > 0)
+                 / len(measured) * 100) if measured else None
+        return {
+            "write_model": self._write_model is not None,
+            "target_group_efficiency": self._target_efficiency,
+            "groups_measured": len(self._group_results),
+            "last_group_predicted_mbs": _round(last[0]),
+            "last_group_actual_mbs": _round(last[1]),
+            "prediction_mean_abs_error_pct": _round(error),
+        }
+
+    # -- write model ------------------------------------------------------
+    def set_write_model(self, model, target_efficiency):
+        """Start groups on predicted throughput (see the module docstring).
+
+        ``model`` needs ``predict_mbs`` and ``group_amortization``; None (or
+        no target) restores the byte thresholds.
+        """
+        with self._cv:
+            self._write_model = model if target_efficiency else None
+            self._target_efficiency = (
+                float(target_efficiency) if model and target_efficiency
+                else None)
+            self._cv.notify_all()
+
+    def record_group_result(self, group_bytes, seconds):
+        """The measured duration of the group last handed out."""
+        with self._cv:
+            actual = (group_bytes / seconds / 1024**2
+                      if seconds and seconds > 0 else None)
+            if actual is not None:
+                self._group_results.append(
+                    (self._group_predicted_mbs, actual))
+            self._group_predicted_mbs = None
+
     # -- producer side ----------------------------------------------------
     def _has_capacity(self, item):
         if len(self._ready) + len(self._writing) >= self.limits.max_chunks:
@@ -185,15 +244,23 @@ class ReadyQueue:
         started = time.monotonic()
         blocked = False
         with self._cv:
-            while not self._has_capacity(item):
-                if stop_event is not None and stop_event.is_set():
-                    if blocked:
-                        self.producer_blocked_seconds += (
-                            time.monotonic() - started)
-                    return False
-                blocked = True
-                if not self._cv.wait(timeout=timeout or 1.0):
-                    continue
+            try:
+                while not self._has_capacity(item):
+                    if stop_event is not None and stop_event.is_set():
+                        if blocked:
+                            self.producer_blocked_seconds += (
+                                time.monotonic() - started)
+                        return False
+                    if not blocked:
+                        blocked = True
+                        # The writer may start early rather than stall us.
+                        self._producers_blocked += 1
+                        self._cv.notify_all()
+                    if not self._cv.wait(timeout=timeout or 1.0):
+                        continue
+            finally:
+                if blocked:
+                    self._producers_blocked -= 1
             if blocked:
                 self.producer_blocked_seconds += time.monotonic() - started
             item.state = STATE_READY
@@ -240,7 +307,12 @@ class ReadyQueue:
             return None
         ready_bytes = sum(i.prepared_bytes for i in self._ready)
         if ready_bytes >= self.limits.min_start_bytes:
-            return "min_ready_bytes_reached"
+            if self._write_model is None:
+                return "min_ready_bytes_reached"
+            if (self._write_model.group_amortization(
+                    ready_bytes, len(self._ready))
+                    >= self._target_efficiency):
+                return "predicted_throughput_reached"
         if len(self._ready) >= self.limits.max_chunks:
             return "max_ready_chunks_reached"
         if ready_bytes >= self.limits.max_bytes:
@@ -253,6 +325,8 @@ class ReadyQueue:
             return "staging_pressure_drain"
         if self._drain_requested:
             return "explicit_drain_requested"
+        if self._producers_blocked:
+            return "producer_blocked"
         return None
 
     def wait_for_group(self, stop_event=None, poll=0.5, timeout=None):
@@ -279,6 +353,10 @@ class ReadyQueue:
                         it.state = STATE_WRITING
                     self._writing.extend(items)
                     self.groups_started += 1
+                    self._group_predicted_mbs = (
+                        self._write_model.predict_mbs(
+                            sum(i.prepared_bytes for i in items), len(items))
+                        if self._write_model is not None else None)
                     self.writer_waiting_seconds += time.monotonic() - started
                     self._cv.notify_all()
                     return items, reason
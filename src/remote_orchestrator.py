@@ -119,6 +119,7 @@ from .backup import LTOBackup, _NoEjectBackup
 from .constants import (DEFAULT_TAPE_CAPACITY_GB, LOCAL_STAGING_RESERVE_BYTES,
                         LTFS_WRITE_WARNING, tape_budget_bytes, tape_is_full,
                         tape_status_reason_suffix)
+from .chunk_sizing import load_tape_write_model, size_chunks
 from .db import _apply_canonical_remote_paths
 from .exit_codes import (
     ExitCode, StopResult,
@@ -140,6 +141,7 @@ from .exit_codes import (
     CLASS_NETWORK_UNREACHABLE, CLASS_TEMPORARY_TRANSPORT_FAILURE)
 from .logsetup import get_logger
 from .status_file import write_status, write_last_failure
+from .tape_write_log import TapeWriteHistory
 from .windows_update_guard import (RebootSentinel, assess_reboot_state,
                                    ltfs_current_mount_status,
                                    ltfs_media_health,
@@ -158,7 +160,7 @@ from .paths import (_LEGACY_PATH_LIMIT, _dir_tree_size,
                     _winsafe_extracted_rel)
 from .pipeline_types import ScanMetrics, StagedChunk, StreamState
 from .pg_containers import stored_tar_reader_contract_version
-from .ready_queue import ReadyQueue
+from .ready_queue import ReadyQueue, ReadyQueueLimits
 from .remote_pipeline import RemotePipelineCoordinator
 from .ram_telemetry import RamStageSampler
 from .remote_transport import _remote_tar_fetch
@@ -266,6 +268,12 @@ class RemoteOrchestrator:
         (self.ready_limits, self.ready_queue_reserve_bytes,
          self.effective_staging_bytes, self.ready_limits_source) = (
             cfg.validated_ready_queue_limits())
+        # Measured-overhead sizing (see _apply_chunk_sizing); 0 keeps the
+        # configured chunk cap and ready-queue start threshold.
+        self.chunk_target_efficiency = getattr(
+            cfg, "chunk_target_tape_efficiency", 0.0)
+        self.chunk_sizing_history_rows = getattr(
+            cfg, "chunk_sizing_history_rows", 20)
         # Staging-pressure drain state (Phase 4.5). The single authoritative
         # model is need-based: engage when the next chunk's fetch+pack footprint
         # cannot fit under the staging cap, clear only once there is comfortable
@@ -287,7 +295,16 @@ class RemoteOrchestrator:
         self.metadata_batch_size = cfg.governor_metadata_batch_size
         self.pack_file_batch_size = cfg.governor_pack_file_batch_size
         self.pack_parallel_workers = cfg.pack_parallel_workers
+        self.pack_parallel_backend = getattr(
+            cfg, "pack_parallel_backend", "thread")
         self.fetch_parallel_streams = cfg.fetch_parallel_streams
+        self.zip_stream_transcode = getattr(cfg, "zip_stream_transcode", False)
+        self.stored_tar_inline_validation = getattr(
+            cfg, "stored_tar_inline_validation", False)
+        self.stored_tar_member_digest = getattr(
+            cfg, "stored_tar_member_digest", None)
+        self.fetch_adaptive_streams = getattr(
+            cfg, "fetch_adaptive_streams", True)
         self.ram_sample_interval = cfg.governor_memory_sample_interval_seconds
         self.heartbeat_secs    = cfg.telegram_heartbeat_minutes * 60
         self.ssh_cipher        = cfg.ssh_cipher
@@ -309,6 +326,10 @@ class RemoteOrchestrator:
         # Classification of the last fetch failure, so a stop caused by an
         # exhausted retry / permanent auth failure carries the precise reason.
         self._last_fetch_failure = None
+        # Parallel fetch: the stream count the last chunk settled on, and
+        # that chunk's per-stream telemetry (see src.fetch_scheduler).
+        self._fetch_stream_hint = None
+        self._last_fetch_streams = None
         self.governor = ResourceGovernor(cfg, self.staging_dir)
 
     def _eject_after_session(self):
@@ -381,6 +402,12 @@ class RemoteOrchestrator:
     def _stage_chunk(self, session_id, chunk_index, chunk_files):
         return self._stager()._stage_chunk(session_id, chunk_index, chunk_files)
 
+    def _fetch_stage(self, session_id, chunk_index, chunk_files):
+        return self._stager()._fetch_stage(session_id, chunk_index, chunk_files)
+
+    def _pack_stage(self, fetched):
+        return self._stager()._pack_stage(fetched)
+
     def _discard_desc(self, desc):
         return self._stager()._discard_desc(desc)
 
@@ -411,9 +438,9 @@ class RemoteOrchestrator:
             err, retry_attempt=retry_attempt, next_retry_delay=next_retry_delay)
 
     def _fetch_batches_parallel(self, work_items, fetch_dir, fetch_abort,
-                                streams):
+                                session_id, streams):
         return self._stager()._fetch_batches_parallel(
-            work_items, fetch_dir, fetch_abort, streams)
+            work_items, fetch_dir, fetch_abort, session_id, streams)
 
     def _fetch_collisions(self, session_id, collisions, fetch_dir,
                           fetch_abort, *args, **kwargs):
@@ -461,6 +488,7 @@ class RemoteOrchestrator:
         headless callers map ``result.exit_code`` to the process exit code.
         ``non_interactive=True`` never prompts and never calls ``input()``.
         """
+        self.governor.sampler.start()
         try:
             self._validate_config()
             if non_interactive:
@@ -500,6 +528,7 @@ class RemoteOrchestrator:
                 resumable=False, source="config", detailed_reason=str(e)),
                 phase="config")
         finally:
+            self.governor.sampler.stop()
             self.skipped_tracker.print_summary(self.ui, self.cfg.backup_log_dir)
 
     def _run_non_interactive(self, resume=False):
@@ -758,6 +787,64 @@ class RemoteOrchestrator:
     # Staging budget
     # ------------------------------------------------------------------
 
+    def _apply_chunk_sizing(self, tape_label=None):
+        """Size this session's chunks and write-group start threshold from
+        recent tape writes, preferring ``tape_label``'s own (see
+        :mod:`~src.chunk_sizing`).
+
+        The configured values are kept aside on the first call, so each
+        session sizes from them and from the latest SUMMARY.csv rows rather
+        than from the previous session's result. Returns None when sizing is
+        off."""
+        target = getattr(self, 'chunk_target_efficiency', 0.0)
+        self._chunk_sizing = None
+        if not target:
+            return None
+        if not hasattr(self, '_static_chunk_cap_bytes'):
+            self._static_chunk_cap_bytes = self.chunk_cap_bytes
+            self._static_ready_limits = self.ready_limits
+        static_limits = self._static_ready_limits
+        model = load_tape_write_model(
+            getattr(self.cfg, 'backup_log_dir', None),
+            rows=getattr(self, 'chunk_sizing_history_rows', 20),
+            tape_label=tape_label)
+        sizing = size_chunks(
+            model, target_efficiency=target,
+            static_chunk_bytes=self._static_chunk_cap_bytes,
+            limits=static_limits,
+            effective_staging_bytes=self.effective_staging_bytes)
+        self.chunk_cap_bytes = sizing.chunk_bytes
+        self.ready_limits = static_limits
+        if sizing.min_start_bytes != static_limits.min_start_bytes:
+            self.ready_limits = ReadyQueueLimits(
+                sizing.min_start_bytes, static_limits.target_bytes,
+                static_limits.max_bytes, static_limits.max_chunks)
+        if sizing.source == 'model':
+            print(f"  Chunk sizing: {sizing.chunk_bytes / 1024**3:.1f} GiB "
+                  f"for {target:.0%} of the tape's streaming rate "
+                  f"(fixed cost {model.overhead_seconds:.0f} s at "
+                  f"{model.stream_bytes_per_second / 1024**2:.0f} MB/s over "
+                  f"{model.samples} write(s); predicted "
+                  f"{sizing.predicted_efficiency:.0%})")
+        self._chunk_sizing = sizing
+        return sizing
+
+    def _ready_write_model(self, tape_label):
+        """``(model, target_efficiency)`` for the ready queue's group start:
+        the per-group and per-chunk costs fitted from the write-group history
+        of this tape at its current fill level (see
+        :class:`~src.tape_write_log.TapeWriteHistory`), or ``(None, None)``
+        (byte thresholds only) when sizing is off or there is no history."""
+        target = getattr(self, 'chunk_target_efficiency', 0.0)
+        log_dir = getattr(self.cfg, 'backup_log_dir', None)
+        if not target or not log_dir:
+            return None, None
+        model = TapeWriteHistory(log_dir).model(
+            tape_label, getattr(self, '_tape_fill_fraction', None))
+        if model is None:
+            return None, None
+        return model, target
+
     def _chunk_budget(self):
         # Cap each chunk at chunk_cap_gb so the deep-prefetch pipeline can keep
         # 2+ chunks resident on the NVMe staging disk under the staging_max cap.
@@ -1012,6 +1099,7 @@ class RemoteOrchestrator:
             scan_coordinator=scan_coordinator,
             backlog_limit=getattr(
                 self.cfg, 'max_unstaged_backlog_chunks', 64),
+            fetch_ahead=getattr(self.cfg, 'fetch_ahead_chunks', 0),
             observation_worker=self._build_observation_worker(),
             writer_path=writer_path,
             scan_complete=scan_complete,
@@ -1084,6 +1172,7 @@ class RemoteOrchestrator:
                 source="streaming", session_id=session_id,
                 detailed_reason="LTFS mount is not time@5"))
 
+        self._apply_chunk_sizing(tape_label)
         # Phase 4: byte-bounded ready queue. The producer keeps preparing while
         # several chunks wait on NVMe; the writer then drains a finite group
         # under one ownership period instead of one chunk per acquisition.
@@ -1187,7 +1276,11 @@ class RemoteOrchestrator:
                 remote_password=self.remote_password,
                 skipped_tracker=self.skipped_tracker,
                 ui=self.ui,
+                persistent_session=(getattr(
+                    self.cfg, "scan_persistent_session", False) is True),
             ),
+            batch_size=getattr(self.cfg, "scan_directory_batch_size", 1),
+            workers=getattr(self.cfg, "scan_workers", 1),
             ui=self.ui,
             on_budget_exceeded=_on_budget_exceeded,
             on_scan_error=_on_scan_error,
@@ -1399,6 +1492,7 @@ class RemoteOrchestrator:
         # group as a still-scanning session. The old group-of-one bypass here
         # (one ownership period per chunk) is gone: a scan-complete resume is
         # just this pipeline with no scanner attached.
+        self._apply_chunk_sizing(tape_label)
         ready_q       = ReadyQueue(self.ready_limits, name=f"session{session_id}")
         stop_pipeline = threading.Event()
 
@@ -30,11 +30,23 @@ every scheduling decision rather than tracked in a second counter that can
 drift. Old pending staging therefore bounds how far ahead the scanner may run;
 it can never stop it from running.
 
+Overlapped staging
+------------------
+With ``fetch_ahead`` above zero the stager only fetches: each fetched chunk
+goes through a bounded hand-off to a pack thread, which packs it and enqueues
+the :class:`~src.ready_queue.ReadyItem`. The WAN link fetches chunk N+1 while
+the local disk and CPU pack chunk N. There is one fetch thread and one pack
+thread, both first-in first-out, so items still reach the ready queue in chunk
+order. A chunk holds its staging reservation (the same ``2 x`` fetch+pack
+footprint ``_await_staging_capacity`` admits it with) in ``_staged_bytes``
+from admission until it has been packed, so the next admission sees it.
+
 Durable per-chunk claims are deliberately NOT here — they arrive in Task 3.1
 once migration 014 provides the owner/lease columns. Until then the only
 in-process guard is the taken-set below, and the cross-process guard remains the
 archiver advisory lock.
 """
+import queue
 import threading
 import time
 import uuid
@@ -44,6 +56,7 @@ from typing import List, Optional
 from .exit_codes import ExitCode, StopResult, REASON_USER_REQUESTED_STOP
 from .logsetup import get_logger
 from .ready_queue import ReadyItem
+from .remote_staging import FetchedChunk
 from .runtime import CANCEL, _status
 
 #: How long the stager waits before re-asking for work while the scanner is
@@ -77,7 +90,7 @@ class RemotePipelineCoordinator:
     def __init__(self, *, host, session_id, tape_label, ready_q, stop_event,
                  metrics, scan_coordinator=None, backlog_limit=64,
                  poll_seconds=DEFAULT_POLL_SECONDS, observation_worker=None,
-                 writer_path="pipeline", scan_complete=False):
+                 writer_path="pipeline", scan_complete=False, fetch_ahead=0):
         self.host = host
         self.session_id = session_id
         self.tape_label = tape_label
@@ -90,6 +103,9 @@ class RemotePipelineCoordinator:
         self.observation_worker = observation_worker
         self.writer_path = writer_path
         self.scan_complete = scan_complete
+        #: Fetched chunks allowed to wait for the pack thread; 0 fetches and
+        #: packs each chunk in turn on the stager thread.
+        self.fetch_ahead = max(0, int(fetch_ahead or 0))
 
         #: Chunks this process has already picked up for staging. Purely
         #: in-process de-duplication on top of authoritative status — never a
@@ -99,6 +115,9 @@ class RemotePipelineCoordinator:
         self._scanner_done = threading.Event()
         self._scanner_thread = None
         self._stager_thread = None
+        self._packer_thread = None
+        self._fetched_q = queue.Queue(maxsize=max(1, self.fetch_ahead))
+        self._fetch_done = threading.Event()
         self.outcome = PipelineOutcome()
 
     # ------------------------------------------------------------------
@@ -191,8 +210,13 @@ class RemotePipelineCoordinator:
                 and not self._scanner_done.is_set())
 
     def _run_stager(self):
-        """Take sealed chunks in index order, stage them, enqueue them."""
+        """Take sealed chunks in index order, stage them, enqueue them.
+
+        In overlapped mode this thread only fetches and hands each chunk to
+        :meth:`_run_packer`, which enqueues it.
+        """
         host = self.host
+        overlapped = self.fetch_ahead > 0
         try:
             while not self._stopping():
                 chunk_index = self.next_chunk_to_stage()
@@ -211,50 +235,146 @@ class RemotePipelineCoordinator:
                     self.session_id, chunk_index, planned_files)
                 chunk_files = host.db.get_chunk_files(
                     self.session_id, chunk_index)
-                host._await_staging_capacity(
+                reservation = host._await_staging_capacity(
                     planned_bytes, planned_files, self.stop_event,
                     ready_q=self.ready_q, session_id=self.session_id,
                     chunk_index=chunk_index, chunk_files=chunk_files)
                 if self._stopping():
                     break
 
-                desc = host._stage_chunk(
-                    self.session_id, chunk_index, chunk_files)
-                if desc is None:
-                    if not CANCEL.is_set():
-                        host._producer_err = (
-                            f"chunk {chunk_index + 1} could not be staged")
-                        host._record_fetch_failure_stop(
-                            self.session_id, chunk_index)
-                    self.stop_event.set()
+                if not overlapped:
+                    desc = host._stage_chunk(
+                        self.session_id, chunk_index, chunk_files)
+                    if desc is None:
+                        self._staging_failed(chunk_index)
+                        break
+                    if not self._enqueue(chunk_index, planned_files, desc):
+                        break
+                    continue
+
+                # Hold this chunk's footprint until it is packed, so the next
+                # admission counts it while both stages are busy.
+                reserved = int(getattr(reservation, 'needed_bytes', 0) or 0)
+                with host._staged_lock:
+                    host._staged_bytes += reserved
+                entry = (chunk_index, planned_files, reserved, None)
+                try:
+                    staged = host._fetch_stage(
+                        self.session_id, chunk_index, chunk_files)
+                    entry = (chunk_index, planned_files, reserved, staged)
+                finally:
+                    if entry[3] is None:
+                        self._release(entry)
+                if staged is None:
+                    self._staging_failed(chunk_index)
                     break
-                self.metrics.mark_first_staged_chunk()
-                desc.scan_stats = self.metrics.snapshot()
-
-                item = ReadyItem(
-                    chunk_index=chunk_index,
-                    pack_dir=desc.pack_dir,
-                    prepared_bytes=int(getattr(desc, 'staged_bytes', 0) or 0),
-                    file_count=planned_files,
-                    desc=desc)
-                # Blocks (without touching LTFS) at the queue's byte/count
-                # ceiling; that backpressure is what keeps staging bounded.
-                if not self.ready_q.put(item, stop_event=self.stop_event):
-                    host._discard_desc(desc)
+                if not self._hand_off(entry):
+                    self._release(entry, discard=True)
                     break
         except Exception as exc:
-            get_logger().exception("chunk stager failed")
-            host._producer_err = str(exc)
-            host._record_stop(StopResult(
-                exit_code=ExitCode.TRANSIENT_RESUMABLE,
-                reason=_boundary_reason(), resumable=True, source="stager",
-                session_id=self.session_id, detailed_reason=str(exc)))
-            self.stop_event.set()
+            self._stager_crashed(exc)
+        finally:
+            if overlapped:
+                self._fetch_done.set()
+            else:
+                # Translate WHY the producer stopped into ready-queue
+                # completion state: only a genuine end-of-work may force a
+                # final partial group.
+                host._signal_producer_completion(self.ready_q, self.stop_event)
+
+    def _run_packer(self):
+        """Pack fetched chunks in hand-off order and enqueue them."""
+        host = self.host
+        try:
+            while True:
+                try:
+                    entry = self._fetched_q.get(timeout=self.poll_seconds)
+                except queue.Empty:
+                    if self._fetch_done.is_set():
+                        break
+                    continue
+                chunk_index, planned_files, _reserved, staged = entry
+                if self._stopping():
+                    self._release(entry, discard=True)
+                    continue
+                try:
+                    desc = (host._pack_stage(staged)
+                            if isinstance(staged, FetchedChunk) else staged)
+                finally:
+                    self._release(entry)
+                if desc is None:
+                    self._staging_failed(chunk_index)
+                    continue
+                self._enqueue(chunk_index, planned_files, desc)
+        except Exception as exc:
+            self._stager_crashed(exc)
+            # Leave nothing fetched behind the failure.
+            while True:
+                try:
+                    self._release(self._fetched_q.get_nowait(), discard=True)
+                except queue.Empty:
+                    break
         finally:
-            # Translate WHY the producer stopped into ready-queue completion
-            # state: only a genuine end-of-work may force a final partial group.
             host._signal_producer_completion(self.ready_q, self.stop_event)
 
+    def _hand_off(self, entry):
+        """Queue a fetched chunk for the packer; False once stopping."""
+        while True:
+            try:
+                self._fetched_q.put(entry, timeout=self.poll_seconds)
+                return True
+            except queue.Full:
+                if self._stopping():
+                    return False
+
+    def _release(self, entry, discard=False):
+        """Return a hand-off entry's staging reservation; ``discard`` also
+        drops whatever it staged."""
+        _chunk_index, _planned_files, reserved, staged = entry
+        host = self.host
+        with host._staged_lock:
+            host._staged_bytes = max(0, host._staged_bytes - reserved)
+        if not discard or staged is None:
+            return
+        if isinstance(staged, FetchedChunk):
+            host._cleanup_dir(staged.fetch_dir)
+            host._cleanup_dir(staged.pack_dir)
+        else:
+            host._discard_desc(staged)
+
+    def _enqueue(self, chunk_index, planned_files, desc):
+        """Put a staged chunk on the ready queue; False when stopping."""
+        self.metrics.mark_first_staged_chunk()
+        desc.scan_stats = self.metrics.snapshot()
+        item = ReadyItem(
+            chunk_index=chunk_index,
+            pack_dir=desc.pack_dir,
+            prepared_bytes=int(getattr(desc, 'staged_bytes', 0) or 0),
+            file_count=planned_files,
+            desc=desc)
+        # Blocks (without touching LTFS) at the queue's byte/count ceiling;
+        # that backpressure is what keeps staging bounded.
+        if not self.ready_q.put(item, stop_event=self.stop_event):
+            self.host._discard_desc(desc)
+            return False
+        return True
+
+    def _staging_failed(self, chunk_index):
+        if not CANCEL.is_set():
+            self.host._producer_err = (
+                f"chunk {chunk_index + 1} could not be staged")
+            self.host._record_fetch_failure_stop(self.session_id, chunk_index)
+        self.stop_event.set()
+
+    def _stager_crashed(self, exc):
+        get_logger().exception("chunk stager failed")
+        self.host._producer_err = str(exc)
+        self.host._record_stop(StopResult(
+            exit_code=ExitCode.TRANSIENT_RESUMABLE,
+            reason=_boundary_reason(), resumable=True, source="stager",
+            session_id=self.session_id, detailed_reason=str(exc)))
+        self.stop_event.set()
+
     # ------------------------------------------------------------------
     # The single writer loop
     # ------------------------------------------------------------------
@@ -271,8 +391,13 @@ class RemotePipelineCoordinator:
         self._stager_thread = threading.Thread(
             target=self._run_stager, name='pipeline-stager', daemon=True)
         self._stager_thread.start()
+        if self.fetch_ahead > 0:
+            self._packer_thread = threading.Thread(
+                target=self._run_packer, name='pipeline-packer', daemon=True)
+            self._packer_thread.start()
 
         outcome = self.outcome
+        self._refresh_write_model()
         try:
             while True:
                 if self._stopping():
@@ -298,9 +423,11 @@ class RemotePipelineCoordinator:
                 correlation_id, counts0, group_start = self._observe_start(
                     items, reason)
 
+                write_start = time.monotonic()
                 stop_block = host._write_chunk_group(
                     self.session_id, [i.desc for i in items], self.tape_label,
                     False, self.stop_event)
+                write_seconds = time.monotonic() - write_start
 
                 self._observe_finish(items, stop_block, correlation_id,
                                      counts0, group_start)
@@ -309,6 +436,8 @@ class RemotePipelineCoordinator:
                     for item in items:
                         self.ready_q.mark_written(item)
                     outcome.completed_chunks += len(items)
+                    self.ready_q.record_group_result(group_bytes, write_seconds)
+                    self._refresh_write_model()
                     continue
 
                 self._settle_aborted_group(items, stop_block)
@@ -327,6 +456,14 @@ class RemotePipelineCoordinator:
         outcome.scanner_finished = self._scanner_done.is_set()
         return outcome
 
+    def _refresh_write_model(self):
+        """Hand the ready queue the latest write-group model for this tape."""
+        model_for = getattr(self.host, '_ready_write_model', None)
+        if model_for is None:
+            return
+        model, target_efficiency = model_for(self.tape_label)
+        self.ready_q.set_write_model(model, target_efficiency)
+
     def _settle_aborted_group(self, items, stop_block):
         """Per-chunk failure isolation, unchanged from the streaming loop."""
         failing = stop_block.chunk_index
@@ -391,7 +528,8 @@ class RemotePipelineCoordinator:
                 self.session_id, leftover.desc, "queued at shutdown")
         get_logger().info("ready_queue_final_metrics: %s",
                           self.ready_q.metrics())
-        for thread in (self._scanner_thread, self._stager_thread):
+        for thread in (self._scanner_thread, self._stager_thread,
+                       self._packer_thread):
             if thread is not None:
                 thread.join(timeout=15)
 
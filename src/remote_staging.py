@@ -22,11 +22,14 @@ Every cross-method call routes back through it, so the orchestrator stays the
 single place session state, configuration and stop decisions live — and so a
 caller (or a test) that overrides one hook still sees that override honoured.
 """
+import contextlib
+import functools
 import gc
 import json
 import os
 import random
 import shutil
+import tarfile
 import threading
 import time
 import uuid
@@ -42,20 +45,23 @@ from .exit_codes import (
     CLASS_TEMPORARY_TRANSPORT_FAILURE, REASON_BAD_CONFIG,
     REASON_MISSING_NONINTERACTIVE_CREDENTIAL, REASON_SSH_AUTHENTICATION_FAILED,
     REASON_SSH_HOST_KEY_MISMATCH, REASON_SSH_PERMISSION_DENIED)
+from .fetch_scheduler import FetchStreamScheduler, plan_fetch_units
 from .logsetup import get_logger
 from .archive_artifacts import (
     publish_stored_tar_pair, resolve_locator, tar_sidecar_locator)
-from .packer import LTOPacker, StagingSpaceError
+from .packer import LTOPacker, PackSourceError, StagingSpaceError
 from .paths import (_LEGACY_PATH_LIMIT, _dir_tree_size,
                      _disambiguate_local_rel, _exceeds_legacy_path_limit,
-                     _long, _remote_fetch_base_and_rel,
+                     _long, _remote_fetch_base_and_rel, _safe_remote_relpath,
                      remote_store_base_and_rel,
                     _reserved_name_component, _winsafe_extracted_rel)
 from .pipeline_types import (
     ArtifactKind, ArtifactReadiness, ChunkStatus, ContainerFormat,
     ContainerValidationState, StagedArtifact, StagedChunk, StagedContainer)
 from .ram_telemetry import RamStageSampler
-from .remote_transport import _remote_tar_fetch, _remote_tar_store
+from .remote_state_journal import RemoteStateJournal
+from .remote_transport import (RemoteTarStreamError, _iter_remote_tar_members,
+                               _remote_tar_fetch, _remote_tar_store)
 from .tar_container import validate_stored_tar_part
 from .runtime import (CANCEL, _fmt_eta, _phase, _progress_done, _progress_line,
                       _status)
@@ -392,12 +398,109 @@ def _serialize_staged_artifact(item):
     return data
 
 
+class _StreamMember:
+    """One tar member's data as a pack source.
+
+    Read errors mean the shared stream itself broke, so they surface as
+    :class:`PackSourceError` and end the pack rather than skip one file.
+    """
+
+    def __init__(self, reader, name):
+        self._reader = reader
+        self._name = name
+
+    def readinto(self, buffer):
+        try:
+            return self._reader.readinto(buffer)
+        except (tarfile.TarError, OSError, EOFError) as e:
+            raise PackSourceError(
+                f"remote tar stream broke inside {self._name!r}: {e}") from e
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _OrdinalTurns:
+    """Let concurrent container builds publish strictly in ordinal order.
+
+    Builder ``i`` calls :meth:`wait` before it publishes and :meth:`done`
+    once it has; :meth:`fail` releases every waiter with an error, so no
+    container publishes after an earlier one failed.
+    """
+
+    def __init__(self):
+        self._next = 0
+        self._failed = False
+        self._cond = threading.Condition()
+
+    def wait(self, index):
+        with self._cond:
+            self._cond.wait_for(lambda: self._failed or self._next == index)
+            if self._failed:
+                raise RuntimeError(
+                    "an earlier Stored TAR container of this chunk failed")
+
+    def done(self, index):
+        with self._cond:
+            if self._next == index:
+                self._next += 1
+                self._cond.notify_all()
+
+    def fail(self):
+        with self._cond:
+            self._failed = True
+            self._cond.notify_all()
+
+
+@dataclass
+class FetchedChunk:
+    """A ZIP-format chunk whose fetch finished and whose pack has not run.
+
+    The hand-off from :meth:`RemoteChunkStager._fetch_stage` to
+    :meth:`RemoteChunkStager._pack_stage`; the overlapped staging pipeline
+    queues these between its fetch and pack threads.
+    """
+    session_id: int
+    chunk_index: int
+    packaging_format: ContainerFormat
+    fetch_dir: str
+    pack_dir: str
+    fetch_seconds: float
+    fetch_bytes: int
+    ram_stats: dict
+    source_missing_files: list
+
+
 class RemoteChunkStager:
     """Fetch + pack one chunk onto local staging. Never touches the tape."""
 
     def __init__(self, host):
         #: The RemoteOrchestrator façade that owns session state and config.
         self.host = host
+        #: The chunk fetch's write-behind file-state journal, while one runs.
+        self._journal = None
+
+    def _state_db(self):
+        """Where per-file fetch states go: the running chunk's journal, or
+        straight to the database outside a chunk fetch."""
+        journal = getattr(self, '_journal', None)
+        return self.host.db if journal is None else journal
+
+    @contextlib.contextmanager
+    def _state_journal(self, session_id):
+        """Journal a chunk fetch's per-file states (see
+        :mod:`~src.remote_state_journal`); flushed when the fetch returns, so
+        the states are durable before the chunk's status moves on."""
+        journal = RemoteStateJournal(self.host.db, session_id)
+        self._journal = journal
+        try:
+            with journal:
+                yield journal
+        finally:
+            self._journal = None
 
     def _start_stored_tar_attempt(self, owner, session_id, chunk_index):
         """Persist process identity so a restart can prove this owner dead."""
@@ -437,13 +540,15 @@ class RemoteChunkStager:
     def _build_stored_tar_container(
             self, session_id, chunk_index, container_plan, plan_members,
             pack_dir, *, owner_token=None, abort_evt=None, crash_hook=None,
-            progress_part_paths=None, progress_lock=None):
+            progress_part_paths=None, progress_lock=None, before_publish=None):
         """Build and publish one Task-2.2/2.3/2.4 container pair.
 
         Task 2.5 routes TAR-assigned chunks here while ZIP chunks stay on the
-        existing extraction/packer path.
+        existing extraction/packer path. ``before_publish`` is called once the
+        part is validated (or recovered) and before the pair is published.
         """
         owner = str(owner_token or uuid.uuid4().hex)
+        member_digest = getattr(self.host, "stored_tar_member_digest", None)
         members = sorted(plan_members, key=lambda item: int(item.plan_ordinal))
         remote_bases = []
         sidecar_plan = []
@@ -519,6 +624,8 @@ class RemoteChunkStager:
                     container_id, owner, part_path)
                 existing_state = "building"
             else:
+                if before_publish is not None:
+                    before_publish()
                 publication = publish_stored_tar_pair(
                     self.host.cfg.local_manifest_archive_root,
                     part_path, final_tar, sidecar_plan, diagnostics,
@@ -526,7 +633,7 @@ class RemoteChunkStager:
                     chunk_index=chunk_index, container_id=container_id,
                     container_ordinal=container_plan.container_ordinal,
                     owner_token=owner, db=self.host.db, pack_dir=pack_dir,
-                    crash_hook=crash_hook)
+                    crash_hook=crash_hook, member_digest=member_digest)
                 self._finish_stored_tar_attempt(attempt_id)
                 return publication
 
@@ -552,7 +659,10 @@ class RemoteChunkStager:
                 password=self.host.remote_password, cipher=self.host.ssh_cipher,
                 use_mbuffer=self.host.use_mbuffer,
                 mbuffer_size=self.host.mbuffer_size,
-                fetch_cores=self.host.fetch_cores, abort_evt=abort_evt)
+                fetch_cores=self.host.fetch_cores, abort_evt=abort_evt,
+                inline_validation=bool(getattr(
+                    self.host, "stored_tar_inline_validation", False)),
+                member_digest=member_digest)
             if result.ok:
                 break
             detail = "\n".join(filter(None, (result.error, result.stderr)))
@@ -570,17 +680,27 @@ class RemoteChunkStager:
                 raise RuntimeError("direct Stored TAR stream cancelled")
         assert result is not None and result.ok
 
+        inline_scan = getattr(result, "inline_scan", None)
+        if inline_scan is None and getattr(result, "inline_error", ""):
+            # The re-read below reports the part's own failure, or proves
+            # the inline parse wrong; either way it is authoritative.
+            get_logger().warning(
+                "inline Stored TAR validation failed for %s; re-reading the "
+                "part: %s", part_path, result.inline_error)
         validation = validate_stored_tar_part(
             part_path, sidecar_plan,
             container_ordinal=container_plan.container_ordinal,
             source_diagnostics=result.diagnostics,
             tar_dialect=container_plan.tar_dialect,
-            format_version=container_plan.format_version)
+            format_version=container_plan.format_version,
+            inline_scan=inline_scan, member_digest=member_digest)
         self.host.db.mark_stored_tar_validated_part(
             container_id, owner, part_path, validation,
             result.diagnostics)
         if crash_hook is not None:
             crash_hook("after_validated_part_state")
+        if before_publish is not None:
+            before_publish()
         publication = publish_stored_tar_pair(
             self.host.cfg.local_manifest_archive_root,
             part_path, final_tar, sidecar_plan, result.diagnostics,
@@ -588,7 +708,7 @@ class RemoteChunkStager:
             chunk_index=chunk_index, container_id=container_id,
             container_ordinal=container_plan.container_ordinal,
             owner_token=owner, db=self.host.db, pack_dir=pack_dir,
-            crash_hook=crash_hook)
+            crash_hook=crash_hook, member_digest=member_digest)
         self._finish_stored_tar_attempt(attempt_id)
         return publication
 
@@ -706,6 +826,72 @@ class RemoteChunkStager:
         return self._stored_tar_rows_after_publication(
             session_id, chunk_index, int(match["container_id"]))
 
+    def _build_stored_tar_containers(
+            self, session_id, chunk_index, containers, members_by_container,
+            pack_dir, *, abort_evt=None, progress_part_paths=None,
+            progress_lock=None):
+        """Build and publish every container of a chunk; return publications.
+
+        With ``fetch_parallel_streams`` > 1 up to that many containers stream
+        at once, each over its own SSH tar stream into its own ``.part`` with
+        its own claim and validation; they still publish in ordinal order. On
+        the first failure ``abort_evt`` is set (killing the sibling streams),
+        no later container publishes, and that failure is raised. The default
+        (1) builds them one after another exactly as before.
+        """
+        containers = list(containers)
+        streams = min(len(containers), max(1, int(getattr(
+            self.host, 'fetch_parallel_streams', 1))))
+        progress_lock = progress_lock or threading.Lock()
+
+        def build(container_plan, before_publish=None):
+            return self._build_stored_tar_container(
+                session_id, chunk_index, container_plan,
+                members_by_container[int(container_plan.container_ordinal)],
+                pack_dir, abort_evt=abort_evt,
+                progress_part_paths=progress_part_paths,
+                progress_lock=progress_lock, before_publish=before_publish)
+
+        if streams <= 1:
+            return [build(container_plan) for container_plan in containers]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        abort_evt = abort_evt if abort_evt is not None else threading.Event()
+        governor = getattr(self.host, 'governor', None)
+        turns = _OrdinalTurns()
+        failure = {}
+        failure_lock = threading.Lock()
+
+        def worker(index, container_plan):
+            try:
+                if CANCEL.is_set() or abort_evt.is_set():
+                    raise RuntimeError("direct Stored TAR stream cancelled")
+                if governor:
+                    governor.wait_or_pause("fetch", "continue")
+                publication = build(
+                    container_plan, functools.partial(turns.wait, index))
+            except BaseException as exc:
+                with failure_lock:
+                    if not failure:
+                        failure['error'] = exc
+                        abort_evt.set()  # stop the sibling streams
+                turns.fail()
+                raise
+            turns.done(index)
+            return publication
+
+        _status('PACK', f"Parallel Stored TAR build: {streams} concurrent "
+                        f"stream(s) over {len(containers)} container(s).")
+        # Submitted in ordinal order, so every container a builder waits on
+        # to publish is already running: the pool cannot deadlock.
+        with ThreadPoolExecutor(max_workers=streams) as pool:
+            futures = [pool.submit(worker, index, container_plan)
+                       for index, container_plan in enumerate(containers)]
+        if failure:
+            raise failure['error']
+        return [fut.result() for fut in futures]
+
     def _stage_stored_tar_chunk(
             self, session_id, chunk_index, chunk_files, chunk_plan,
             fetch_dir, pack_dir, ram_stats, fetch_seconds, fetch_bytes,
@@ -742,13 +928,14 @@ class RemoteChunkStager:
             members_by_container[int(member.container_ordinal)].append(member)
 
         try:
-            for container_plan in chunk_plan.containers:
+            publications = self._build_stored_tar_containers(
+                session_id, chunk_index, chunk_plan.containers,
+                members_by_container, pack_dir, abort_evt=abort_evt,
+                progress_part_paths=progress_part_paths,
+                progress_lock=progress_lock)
+            for container_plan, publication in zip(
+                    chunk_plan.containers, publications):
                 members = members_by_container[int(container_plan.container_ordinal)]
-                publication = self._build_stored_tar_container(
-                    session_id, chunk_index, container_plan, members, pack_dir,
-                    abort_evt=abort_evt,
-                    progress_part_paths=progress_part_paths,
-                    progress_lock=progress_lock)
                 container_row, artifact_row = (
                     self._stored_tar_rows_after_publication_by_ordinal(
                         session_id, chunk_index,
@@ -1017,6 +1204,18 @@ class RemoteChunkStager:
 
     def _stage_chunk(self, session_id, chunk_index, chunk_files):
         """Fetch then pack one chunk. Returns a ready-descriptor or None."""
+        fetched = self._fetch_stage(session_id, chunk_index, chunk_files)
+        if not isinstance(fetched, FetchedChunk):
+            return fetched
+        return self._pack_stage(fetched)
+
+    def _fetch_stage(self, session_id, chunk_index, chunk_files):
+        """Fetch one chunk for the pack stage.
+
+        Returns a :class:`FetchedChunk`, or the finished ready-descriptor when
+        there is nothing left to pack (a stored TAR chunk, a resumed pack, a
+        chunk whose sources are all missing), or None when the fetch failed.
+        """
         self.host._producer_chunk = chunk_index
         format_reader = getattr(
             self.host.db, "get_chunk_packaging_format", None)
@@ -1063,7 +1262,9 @@ class RemoteChunkStager:
                     remote_base=getattr(self.host, "remote_path", None),
                     owner_probe=getattr(
                         self.host, "stored_tar_owner_probe", None),
-                    plan=chunk_plan)
+                    plan=chunk_plan,
+                    member_digest=getattr(
+                        self.host, "stored_tar_member_digest", None))
             else:
                 # All-source-missing/loose-only plans have no TAR artifact pair
                 # to reconcile.  Their existing skip/loose path remains the
@@ -1109,7 +1310,8 @@ class RemoteChunkStager:
                 tar_part_paths_lock=progress_lock,
                 label="STORED_TAR")
             with RamStageSampler(
-                    "fetch", self.host.ram_sample_interval) as fetch_sampler:
+                    "fetch", self.host.ram_sample_interval,
+                    source=self._resource_sampler()) as fetch_sampler:
                 try:
                     if fetch_guard:
                         with fetch_guard:
@@ -1160,8 +1362,16 @@ class RemoteChunkStager:
             fetch_guard = governor.mark_fetch_active()
         else:
             fetch_guard = None
+        if getattr(self.host, 'zip_stream_transcode', False):
+            # One pass: members are packed as they arrive, so there is no
+            # fetched copy for a separate pack stage to read.
+            return self._stream_stage_chunk(
+                session_id, chunk_index, chunk_files, fetch_dir, pack_dir,
+                chunk_format, fetch_guard, fetch_start)
+        self.host._last_fetch_streams = None
         with RamStageSampler(
-                "fetch", self.host.ram_sample_interval) as fetch_sampler:
+                "fetch", self.host.ram_sample_interval,
+                source=self._resource_sampler()) as fetch_sampler:
             if fetch_guard:
                 with fetch_guard:
                     fetch_ok, source_missing_files, fetched_file_count = (
@@ -1172,6 +1382,7 @@ class RemoteChunkStager:
                     self.host._fetch_chunk(
                         session_id, chunk_index, chunk_files, fetch_dir))
         ram_stats.update(fetch_sampler.as_details("fetch"))
+        ram_stats.update(getattr(self.host, '_last_fetch_streams', None) or {})
         if not fetch_ok:
             if not CANCEL.is_set():
                 self.host.db.update_chunk_status(session_id, chunk_index,
@@ -1205,6 +1416,25 @@ class RemoteChunkStager:
                 session_id=session_id,
                 packaging_format=chunk_format,
             )
+        return FetchedChunk(
+            session_id=session_id,
+            chunk_index=chunk_index,
+            packaging_format=chunk_format,
+            fetch_dir=fetch_dir,
+            pack_dir=pack_dir,
+            fetch_seconds=fetch_seconds,
+            fetch_bytes=fetch_bytes,
+            ram_stats=ram_stats,
+            source_missing_files=source_missing_files,
+        )
+
+    def _pack_stage(self, fetched):
+        """Pack a :class:`FetchedChunk`. Returns a ready-descriptor or None."""
+        session_id = fetched.session_id
+        chunk_index = fetched.chunk_index
+        fetch_dir, pack_dir = fetched.fetch_dir, fetched.pack_dir
+        ram_stats = fetched.ram_stats
+        governor = getattr(self.host, 'governor', None)
 
         # --- PACK (small files -> ZIP, large files staged loose) ---
         self.host.db.update_chunk_status(session_id, chunk_index,
@@ -1216,7 +1446,7 @@ class RemoteChunkStager:
         try:
             if governor:
                 governor.wait_or_pause(
-                    "pack", "start", needed_bytes=fetch_bytes,
+                    "pack", "start", needed_bytes=fetched.fetch_bytes,
                     queued_bytes=getattr(self.host, '_staged_bytes', 0))
                 pack_guard = governor.mark_pack_active()
             else:
@@ -1235,7 +1465,8 @@ class RemoteChunkStager:
                     self.host.cfg.small_file_manifest_compression),
             )
             with RamStageSampler(
-                    "pack", self.host.ram_sample_interval) as pack_sampler:
+                    "pack", self.host.ram_sample_interval,
+                    source=self._resource_sampler()) as pack_sampler:
                 if pack_guard:
                     with pack_guard:
                         metadata = packer.run(
@@ -1250,6 +1481,8 @@ class RemoteChunkStager:
                             governor=governor,
                             pack_file_batch_size=self.host.pack_file_batch_size,
                             pack_parallel_workers=self.host.pack_parallel_workers,
+                            pack_parallel_backend=getattr(
+                                self.host, "pack_parallel_backend", "thread"),
                         )
                 else:
                     metadata = packer.run(
@@ -1264,6 +1497,8 @@ class RemoteChunkStager:
                         governor=governor,
                         pack_file_batch_size=self.host.pack_file_batch_size,
                         pack_parallel_workers=self.host.pack_parallel_workers,
+                        pack_parallel_backend=getattr(
+                            self.host, "pack_parallel_backend", "thread"),
                     )
             ram_stats.update(pack_sampler.as_details("pack"))
         except Exception as e:
@@ -1285,21 +1520,8 @@ class RemoteChunkStager:
             self.host._cleanup_dir(pack_dir)
             return None
 
-        # LTOPacker necessarily sees temporary Windows staging paths. Replace
-        # them before logging/indexing with the durable canonical remote paths
-        # persisted in the remote manifest.
-        canonical_count = _apply_canonical_remote_paths(
-            metadata, self.host.db.get_chunk_files(session_id, chunk_index))
-        if canonical_count != len(metadata):
-            self.host.db.update_chunk_status(session_id, chunk_index,
-                ChunkStatus.FETCH_FAILED.value)
-            self.host._cleanup_dir(fetch_dir)
-            self.host._cleanup_dir(pack_dir)
-            raise RuntimeError(
-                "[DB] Refusing to index temporary staging paths: canonical "
-                f"SOURCE paths mapped for only {canonical_count:,}/"
-                f"{len(metadata):,} staged file(s)."
-            )
+        self._apply_canonical_paths(
+            session_id, chunk_index, metadata, fetch_dir, pack_dir)
 
         pack_seconds = time.perf_counter() - pack_start
 
@@ -1325,9 +1547,248 @@ class RemoteChunkStager:
             # Per-phase producer timings, surfaced in the per-pack log. Fetch and
             # pack overlap the *previous* chunk's tape write, so they need not sum
             # to the consumer-measured Total time.
+            fetch_seconds=fetched.fetch_seconds,
+            fetch_bytes=fetched.fetch_bytes,
+            pack_seconds=pack_seconds,
+            pack_bytes=staged_bytes,
+            ram_stats=ram_stats,
+            source_missing_files=fetched.source_missing_files,
+            skip_tape=False,
+            session_id=session_id,
+            packaging_format=fetched.packaging_format,
+        )
+
+    def _apply_canonical_paths(self, session_id, chunk_index, metadata,
+                               fetch_dir, pack_dir):
+        """Swap packer staging paths for the persisted remote SOURCE paths.
+
+        LTOPacker necessarily sees temporary Windows staging paths. Replace
+        them before logging/indexing with the durable canonical remote paths
+        persisted in the remote manifest; any file left unmapped fails the
+        chunk.
+        """
+        canonical_count = _apply_canonical_remote_paths(
+            metadata, self.host.db.get_chunk_files(session_id, chunk_index))
+        if canonical_count != len(metadata):
+            self.host.db.update_chunk_status(session_id, chunk_index,
+                ChunkStatus.FETCH_FAILED.value)
+            self.host._cleanup_dir(fetch_dir)
+            self.host._cleanup_dir(pack_dir)
+            raise RuntimeError(
+                "[DB] Refusing to index temporary staging paths: canonical "
+                f"SOURCE paths mapped for only {canonical_count:,}/"
+                f"{len(metadata):,} staged file(s)."
+            )
+
+    def _stream_stage_chunk(self, session_id, chunk_index, chunk_files,
+                            fetch_dir, pack_dir, chunk_format, fetch_guard,
+                            fetch_start):
+        with self._state_journal(session_id):
+            return self._stream_stage_files(
+                session_id, chunk_index, chunk_files, fetch_dir, pack_dir,
+                chunk_format, fetch_guard, fetch_start)
+
+    def _stream_stage_files(self, session_id, chunk_index, chunk_files,
+                            fetch_dir, pack_dir, chunk_format, fetch_guard,
+                            fetch_start):
+        """Fetch and pack a ZIP chunk in one pass over the remote tar stream.
+
+        The ``zip_stream_transcode`` mode. Members are read in-process and
+        written straight into the bundle (or to their loose path in
+        ``pack_dir``) under the same collision-free Windows-safe names the
+        extract-then-pack path gives them, so nothing lands in ``fetch_dir``
+        and no file is read back from disk. A broken or partial stream cannot
+        be resumed into a half-written bundle, so it fails the chunk (which
+        stays resumable) instead of being retried. Returns a ready-descriptor
+        or None.
+        """
+        host = self.host
+        source_missing_files = []
+        claimed = {}
+        requested = []          # (row, remote_base, rel, local_rel)
+        for row in chunk_files:
+            if row['status'] == 'source_missing':
+                self._skip_known_missing(
+                    row, session_id, chunk_index, source_missing_files)
+                continue
+            remote_base, rel = self._fetch_base_and_rel(row, session_id)
+            if rel is None:
+                return self._stream_failed(session_id, chunk_index, pack_dir)
+            # A collision needs no separate fetch here: each member is named
+            # by its manifest row, not by where an extractor would put it.
+            local_rel, _collided = self._claim_local_rel(rel, claimed)
+            requested.append((row, remote_base, rel, local_rel))
+
+        fetching_ids = [row['manifest_id'] for row, *_ in requested]
+        batch_size = host.metadata_batch_size
+        for start in range(0, len(fetching_ids), batch_size):
+            if governor := getattr(host, 'governor', None):
+                governor.wait_or_pause("fetch", "continue")
+            self._state_db().update_manifest_rows_fetching(
+                fetching_ids[start:start + batch_size], session_id=session_id)
+
+        by_base = defaultdict(list)
+        for row, remote_base, rel, local_rel in requested:
+            by_base[remote_base].append((row, rel, local_rel))
+        work_items = [
+            (remote_base, base_rows[start:start + batch_size])
+            for remote_base, base_rows in by_base.items()
+            for start in range(0, len(base_rows), batch_size)]
+        todo_bytes = sum(int(row['file_size_bytes']) for row, *_ in requested)
+        arrived = []            # (local_rel, manifest_id)
+        unseen = []             # rows the remote tar did not send
+        fetch_abort = threading.Event()
+
+        def members(remote_base, batch):
+            try:
+                yield from _iter_remote_tar_members(
+                    host.remote_user, host.remote_host, remote_base,
+                    [rel for _, rel, _ in batch],
+                    password=host.remote_password,
+                    cipher=host.ssh_cipher,
+                    use_mbuffer=host.use_mbuffer,
+                    mbuffer_size=host.mbuffer_size,
+                    fetch_cores=host.fetch_cores,
+                    abort_evt=fetch_abort)
+            except RemoteTarStreamError as e:
+                raise PackSourceError(str(e)) from e
+
+        def entries():
+            for remote_base, batch in work_items:
+                wanted = {}
+                for row, rel, local_rel in batch:
+                    wanted[_safe_remote_relpath(rel)] = (row, rel, local_rel)
+                for member, reader in members(remote_base, batch):
+                    hit = wanted.pop(member.name, None)
+                    if hit is None:
+                        raise PackSourceError(
+                            f"remote tar sent an unrequested member "
+                            f"{member.name!r}")
+                    row, rel, local_rel = hit
+                    if member.size != int(row['file_size_bytes']):
+                        raise PackSourceError(
+                            f"size mismatch for {rel}: expected "
+                            f"{row['file_size_bytes']} B, got {member.size} B")
+                    arrived.append((local_rel, row['manifest_id']))
+                    yield {
+                        'path': os.path.join(
+                            fetch_dir, local_rel.replace('/', os.sep)),
+                        'rel': local_rel.replace('/', os.sep),
+                        'size': member.size,
+                        'open': functools.partial(
+                            _StreamMember, reader, member.name),
+                    }
+                unseen.extend(row for row, _, _ in wanted.values())
+
+        _phase('FETCH', f"Remote -> ZIP | chunk {chunk_index + 1} | "
+                        f"{len(requested)} file(s), "
+                        f"{todo_bytes / 1024**3:.2f} GB, streamed")
+        packer = LTOPacker(
+            host.cfg.max_zip_size_gb,
+            index_min_file_mb=host.cfg.index_min_file_mb,
+            index_packed_small_files=host.cfg.index_packed_small_files,
+            manifest_enabled=host.cfg.small_file_manifest_enabled,
+            manifest_format=host.cfg.small_file_manifest_format,
+            manifest_compression=host.cfg.small_file_manifest_compression,
+        )
+        ram_stats = {}
+        fetch_stop = threading.Event()
+        # The stream grows pack_dir, so that is what the watchdog measures.
+        host._start_fetch_monitor(fetch_stop, fetch_abort, pack_dir,
+                                  todo_bytes)
+        try:
+            with RamStageSampler(
+                    "fetch", host.ram_sample_interval,
+                    source=self._resource_sampler()) as fetch_sampler, \
+                    (fetch_guard or contextlib.nullcontext()):
+                metadata = packer.run_stream(
+                    pack_dir, host.cfg.zip_threshold_mb, entries(),
+                    todo_bytes,
+                    skipped_tracker=host.skipped_tracker,
+                    source_name='remote',
+                    session_id=session_id,
+                    chunk_index=chunk_index,
+                    governor=getattr(host, 'governor', None),
+                    pack_file_batch_size=host.pack_file_batch_size,
+                )
+            ram_stats.update(fetch_sampler.as_details("fetch"))
+        except Exception as e:
+            if CANCEL.is_set():
+                return self._stream_failed(session_id, chunk_index, pack_dir)
+            err = str(e)
+            print(f"\n[REMOTE] Streamed fetch failed:\n{err}")
+            if isinstance(e.__cause__, RemoteTarStreamError):
+                host._note_fetch_failure(err)
+            self._state_db().update_manifest_rows_fetch_failed(
+                fetching_ids, err[:500], session_id=session_id)
+            return self._stream_failed(session_id, chunk_index, pack_dir)
+        finally:
+            fetch_stop.set()
+            _progress_done()
+        if CANCEL.is_set():
+            return self._stream_failed(session_id, chunk_index, pack_dir)
+
+        for row in unseen:
+            source_missing_files.append({
+                'manifest_id': row['manifest_id'],
+                'remote_path': row['remote_path'],
+                'file_size_bytes': row['file_size_bytes'],
+            })
+            host.skipped_tracker.add(
+                'remote', row['remote_path'], "missing after tar fetch",
+                'fetch', session_id=session_id, chunk_index=chunk_index)
+            print(f"[REMOTE] Source missing; skipped: {row['remote_path']}")
+            self._state_db().update_manifest_row(
+                row['manifest_id'],
+                session_id=session_id,
+                status='source_missing',
+                local_rel_path=None,
+                error_msg="missing after tar fetch",
+            )
+        for start in range(0, len(arrived), batch_size):
+            if governor := getattr(host, 'governor', None):
+                governor.wait_or_pause("fetch", "continue")
+            self._state_db().update_manifest_rows_fetched(
+                arrived[start:start + batch_size], session_id=session_id)
+
+        fetch_seconds = time.perf_counter() - fetch_start
+        fetch_bytes = sum(int(item['file_size_bytes']) for item in metadata)
+        if not arrived:
+            host._cleanup_dir(pack_dir)
+            _status('REMOTE', f"Chunk {chunk_index + 1}: all source files are "
+                               "missing; no tape write is required.")
+            return StagedChunk(
+                chunk_index=chunk_index, fetch_dir=fetch_dir,
+                pack_dir=pack_dir, metadata=[], staged_bytes=0,
+                fetch_seconds=fetch_seconds, fetch_bytes=0,
+                pack_seconds=0, pack_bytes=0, ram_stats=ram_stats,
+                source_missing_files=source_missing_files, skip_tape=True,
+                session_id=session_id, packaging_format=chunk_format)
+        if not metadata:
+            print(f"[REMOTE] Chunk {chunk_index + 1}: nothing was packed from "
+                  f"the stream. Marking failed.")
+            return self._stream_failed(session_id, chunk_index, pack_dir)
+
+        # The canonical paths are read back from the rows just journaled.
+        self._journal.flush()
+        self._apply_canonical_paths(
+            session_id, chunk_index, metadata, fetch_dir, pack_dir)
+        gc.collect()
+        staged_bytes = _dir_tree_size(pack_dir)
+        with host._staged_lock:
+            host._staged_bytes += staged_bytes
+        _status('PIPELINE', f"Chunk {chunk_index + 1} streamed & ready "
+                            f"({staged_bytes / 1024**3:.1f} GB) — queued for tape.")
+        return StagedChunk(
+            chunk_index=chunk_index,
+            fetch_dir=fetch_dir,
+            pack_dir=pack_dir,
+            metadata=metadata,
+            staged_bytes=staged_bytes,
+            # Fetch and pack are one pass here; the pass is reported as fetch.
             fetch_seconds=fetch_seconds,
             fetch_bytes=fetch_bytes,
-            pack_seconds=pack_seconds,
+            pack_seconds=0,
             pack_bytes=staged_bytes,
             ram_stats=ram_stats,
             source_missing_files=source_missing_files,
@@ -1336,6 +1797,15 @@ class RemoteChunkStager:
             packaging_format=chunk_format,
         )
 
+    def _stream_failed(self, session_id, chunk_index, pack_dir):
+        if self._journal is not None:
+            self._journal.flush()
+        if not CANCEL.is_set():
+            self.host.db.update_chunk_status(session_id, chunk_index,
+                ChunkStatus.FETCH_FAILED.value)
+        self.host._cleanup_dir(pack_dir)
+        return None
+
     def _discard_desc(self, desc):
         """Drop a staged-but-unused chunk: clean its dirs and free its budget."""
         self.host._cleanup_dir(desc.fetch_dir)
@@ -1552,6 +2022,12 @@ class RemoteChunkStager:
         return desc
 
     def _fetch_chunk(self, session_id, chunk_index, chunk_files, fetch_dir):
+        with self._state_journal(session_id):
+            return self._fetch_chunk_files(
+                session_id, chunk_index, chunk_files, fetch_dir)
+
+    def _fetch_chunk_files(self, session_id, chunk_index, chunk_files,
+                           fetch_dir):
         os.makedirs(_long(fetch_dir), exist_ok=True)
         total_chunks = self.host.db.count_chunks(session_id)
         source_missing_files = []
@@ -1563,51 +2039,18 @@ class RemoteChunkStager:
         fetching_ids = []
 
         for row in chunk_files:
-            remote_fpath = row['remote_path']
             fsize        = row['file_size_bytes']
             manifest_id  = row['manifest_id']
 
             if row['status'] == 'source_missing':
-                source_missing_files.append({
-                    'manifest_id': manifest_id,
-                    'remote_path': remote_fpath,
-                    'file_size_bytes': fsize,
-                })
-                self.host.skipped_tracker.add(
-                    'remote', remote_fpath, row['error_msg'] or 'source missing',
-                    'fetch', session_id=session_id, chunk_index=chunk_index)
-                print(f"[REMOTE] Skip (source already missing): {remote_fpath}")
+                self._skip_known_missing(
+                    row, session_id, chunk_index, source_missing_files)
                 continue
 
-            try:
-                remote_base, rel = _remote_fetch_base_and_rel(
-                    self.host.remote_path, remote_fpath
-                )
-            except ValueError as e:
-                self.host.db.update_manifest_row(
-                    manifest_id,
-                    session_id=session_id,
-                    status='fetch_failed',
-                    error_msg=str(e),
-                )
-                print(f"[REMOTE] Invalid remote path: {e}")
+            remote_base, rel = self._fetch_base_and_rel(row, session_id)
+            if rel is None:
                 return False, source_missing_files, fetched_file_count
-
-            # rel is the true remote path (sent verbatim to remote tar); the
-            # local copy lands under the name the Windows extractor can write.
-            local_rel = _winsafe_extracted_rel(rel)
-            key = local_rel.casefold()
-            collided = key in claimed
-            if collided:
-                # Two distinct remote names map to the same on-disk path —
-                # rename this one so neither file is silently overwritten.
-                clash_with = claimed[key]
-                local_rel  = _disambiguate_local_rel(local_rel, claimed)
-                key        = local_rel.casefold()
-                print(f"[REMOTE] Name collision: '{rel}' and '{clash_with}' map "
-                      f"to the same Windows path — fetching the former as "
-                      f"'{local_rel}'.")
-            claimed[key] = rel
+            local_rel, collided = self._claim_local_rel(rel, claimed)
 
             local_path = os.path.join(fetch_dir, local_rel.replace('/', os.sep))
             records.append((row, remote_base, rel, local_rel, local_path))
@@ -1630,7 +2073,7 @@ class RemoteChunkStager:
             if governor := getattr(self.host, 'governor', None):
                 governor.wait_or_pause("fetch", "continue")
             batch_ids = fetching_ids[start:start + self.host.metadata_batch_size]
-            self.host.db.update_manifest_rows_fetching(
+            self._state_db().update_manifest_rows_fetching(
                 batch_ids, session_id=session_id)
 
         if pending or collisions:
@@ -1653,9 +2096,10 @@ class RemoteChunkStager:
             for row, remote_base, rel, local_rel, local_path in pending:
                 pending_by_base[remote_base].append((row, rel, local_path))
 
-            # One work item per (base, metadata-sized batch). Streams > 1 run
-            # these concurrently to overlap per-file stalls; the default (1)
-            # keeps the exact legacy single-stream behaviour.
+            # One work item per (base, metadata-sized batch). Streams > 1
+            # re-cut these into size-balanced units fetched concurrently to
+            # overlap per-file stalls; the default (1) keeps the exact legacy
+            # single-stream behaviour.
             work_items = []
             for remote_base, base_pending in pending_by_base.items():
                 for start in range(
@@ -1667,7 +2111,7 @@ class RemoteChunkStager:
             streams = max(1, int(getattr(self.host, 'fetch_parallel_streams', 1)))
 
             try:
-                if streams <= 1 or len(work_items) <= 1:
+                if streams <= 1 or not work_items:
                     for remote_base, base_batch in work_items:
                         if CANCEL.is_set():
                             return False, source_missing_files, fetched_file_count
@@ -1679,7 +2123,7 @@ class RemoteChunkStager:
                             if CANCEL.is_set():
                                 return False, source_missing_files, fetched_file_count
                             print(f"\n[REMOTE] Tar fetch failed:\n{err}")
-                            self.host.db.update_manifest_rows_fetch_failed(
+                            self._state_db().update_manifest_rows_fetch_failed(
                                 (row['manifest_id'] for row, _, _ in base_batch),
                                 err, session_id=session_id)
                             return False, source_missing_files, fetched_file_count
@@ -1728,7 +2172,7 @@ class RemoteChunkStager:
                            f"not be written locally ({reason}). "
                            f"Target: {local_path}")
                     print(f"\n[REMOTE] {msg}")
-                    self.host.db.update_manifest_row(
+                    self._state_db().update_manifest_row(
                         manifest_id, session_id=session_id,
                         status='fetch_failed', error_msg=msg[:500])
                     return False, source_missing_files, fetched_file_count
@@ -1743,7 +2187,7 @@ class RemoteChunkStager:
                     'remote', row['remote_path'], "missing after tar fetch",
                     'fetch', session_id=session_id, chunk_index=chunk_index)
                 print(f"[REMOTE] Source missing; skipped: {row['remote_path']}")
-                self.host.db.update_manifest_row(
+                self._state_db().update_manifest_row(
                     manifest_id,
                     session_id=session_id,
                     status='source_missing',
@@ -1755,7 +2199,7 @@ class RemoteChunkStager:
             try:
                 actual = os.path.getsize(_long(local_path))
             except OSError as e:
-                self.host.db.update_manifest_row(
+                self._state_db().update_manifest_row(
                     manifest_id,
                     session_id=session_id,
                     status='fetch_failed',
@@ -1770,7 +2214,7 @@ class RemoteChunkStager:
                     os.remove(_long(local_path))
                 except OSError:
                     pass
-                self.host.db.update_manifest_row(
+                self._state_db().update_manifest_row(
                     manifest_id,
                     session_id=session_id,
                     status='fetch_failed',
@@ -1782,12 +2226,62 @@ class RemoteChunkStager:
         for start in range(0, len(fetched_updates), self.host.metadata_batch_size):
             if governor := getattr(self.host, 'governor', None):
                 governor.wait_or_pause("fetch", "continue")
-            self.host.db.update_manifest_rows_fetched(
+            self._state_db().update_manifest_rows_fetched(
                 fetched_updates[start:start + self.host.metadata_batch_size],
                 session_id=session_id)
         fetched_file_count = len(fetched_updates)
         return True, source_missing_files, fetched_file_count
 
+    def _skip_known_missing(self, row, session_id, chunk_index,
+                            source_missing_files):
+        """Carry a row the scan already found missing into the chunk result."""
+        source_missing_files.append({
+            'manifest_id': row['manifest_id'],
+            'remote_path': row['remote_path'],
+            'file_size_bytes': row['file_size_bytes'],
+        })
+        self.host.skipped_tracker.add(
+            'remote', row['remote_path'], row['error_msg'] or 'source missing',
+            'fetch', session_id=session_id, chunk_index=chunk_index)
+        print(f"[REMOTE] Skip (source already missing): {row['remote_path']}")
+
+    def _fetch_base_and_rel(self, row, session_id):
+        """(remote_base, rel) for a row; ``(None, None)`` after marking an
+        invalid remote path fetch_failed."""
+        try:
+            return _remote_fetch_base_and_rel(
+                self.host.remote_path, row['remote_path'])
+        except ValueError as e:
+            self._state_db().update_manifest_row(
+                row['manifest_id'],
+                session_id=session_id,
+                status='fetch_failed',
+                error_msg=str(e),
+            )
+            print(f"[REMOTE] Invalid remote path: {e}")
+            return None, None
+
+    @staticmethod
+    def _claim_local_rel(rel, claimed):
+        """The local name for remote ``rel``, unique (case-folded) within
+        ``claimed``; returns ``(local_rel, collided)``."""
+        # rel is the true remote path (sent verbatim to remote tar); the
+        # local copy lands under the name the Windows extractor can write.
+        local_rel = _winsafe_extracted_rel(rel)
+        key = local_rel.casefold()
+        collided = key in claimed
+        if collided:
+            # Two distinct remote names map to the same on-disk path —
+            # rename this one so neither file is silently overwritten.
+            clash_with = claimed[key]
+            local_rel  = _disambiguate_local_rel(local_rel, claimed)
+            key        = local_rel.casefold()
+            print(f"[REMOTE] Name collision: '{rel}' and '{clash_with}' map "
+                  f"to the same Windows path — fetching the former as "
+                  f"'{local_rel}'.")
+        claimed[key] = rel
+        return local_rel, collided
+
     def _fetch_one_batch(self, remote_base, base_batch, fetch_dir, fetch_abort):
         """Fetch one metadata-sized batch as a single tar stream.
 
@@ -1874,49 +2368,74 @@ class RemoteChunkStager:
                                 session_id, streams):
         """Fetch work items with up to ``streams`` concurrent tar streams.
 
-        Batches are disjoint file lists extracted into the same fetch dir, so
-        concurrency is safe. On the first non-cancel failure the shared
-        ``fetch_abort`` is set (killing the other streams' ssh/tar trees) and
-        the failing batch's rows are marked fetch_failed. Returns True on full
-        success, False on failure (caller re-fetches the chunk on resume)."""
+        The items are re-cut into size-balanced units (see
+        :mod:`~src.fetch_scheduler`) that each stream pulls as it frees up,
+        and ``fetch_adaptive_streams`` lets the scheduler park streams that
+        add no throughput. Units are disjoint file lists extracted into the
+        same fetch dir, so concurrency is safe. On the first non-cancel
+        failure the shared ``fetch_abort`` is set (killing the other streams'
+        ssh/tar trees) and the failing unit's rows are marked fetch_failed.
+        Returns True on full success, False on failure (caller re-fetches the
+        chunk on resume)."""
         from concurrent.futures import ThreadPoolExecutor
 
         governor = getattr(self.host, 'governor', None)
+        adaptive = getattr(self.host, 'fetch_adaptive_streams', True)
+        hint = getattr(self.host, '_fetch_stream_hint', None)
+        units = plan_fetch_units(
+            work_items, streams, self.host.metadata_batch_size)
+        scheduler = FetchStreamScheduler(
+            units, streams,
+            limit=hint + 1 if adaptive and hint is not None else None,
+            adaptive=adaptive,
+            should_stop=lambda: CANCEL.is_set() or fetch_abort.is_set())
         failure = {}
         failure_lock = threading.Lock()
 
-        def _worker(item):
-            remote_base, base_batch = item
-            if CANCEL.is_set() or fetch_abort.is_set():
-                return item, False, "cancelled"
-            ok, err = self.host._fetch_one_batch(
-                remote_base, base_batch, fetch_dir, fetch_abort)
-            if not ok and not CANCEL.is_set():
-                with failure_lock:
-                    if not failure:
-                        failure['err'] = err
-                        failure['batch'] = base_batch
-                        fetch_abort.set()  # stop the sibling streams
-            return item, ok, err
-
-        _status('FETCH', f"Parallel fetch: {streams} concurrent stream(s) over "
-                         f"{len(work_items)} batch(es).")
-        with ThreadPoolExecutor(max_workers=streams) as pool:
-            futures = []
-            for item in work_items:
-                if CANCEL.is_set() or fetch_abort.is_set():
-                    break
+        def _worker(stream):
+            while not (CANCEL.is_set() or fetch_abort.is_set()):
                 if governor:
                     governor.wait_or_pause("fetch", "continue")
-                futures.append(pool.submit(_worker, item))
+                unit = scheduler.next_unit(stream)
+                if unit is None:
+                    return
+                started = scheduler.clock()
+                ok, err = self.host._fetch_one_batch(
+                    unit.remote_base, unit.batch, fetch_dir, fetch_abort)
+                scheduler.finished(stream, unit, started, ok)
+                if not ok:
+                    if not CANCEL.is_set():
+                        with failure_lock:
+                            if not failure:
+                                failure['err'] = err
+                                failure['batch'] = unit.batch
+                                fetch_abort.set()  # stop the sibling streams
+                    scheduler.stop()
+                    return
+
+        _status('FETCH', f"Parallel fetch: {scheduler.streams} concurrent "
+                         f"stream(s) over {scheduler.units} unit(s).")
+        with ThreadPoolExecutor(max_workers=scheduler.streams) as pool:
+            futures = [pool.submit(_worker, stream)
+                       for stream in range(scheduler.streams)]
             for fut in futures:
                 fut.result()
 
+        if adaptive:
+            self.host._fetch_stream_hint = scheduler.limit
+        self.host._last_fetch_streams = telemetry = scheduler.telemetry()
+        get_logger().info(
+            "fetch streams: %s of %s active over %s unit(s); MB/s %s; "
+            "tail idle s %s", telemetry['fetch_streams_active'],
+            telemetry['fetch_streams'], telemetry['fetch_units'],
+            telemetry['fetch_stream_mbs'],
+            telemetry['fetch_stream_tail_idle_seconds'])
+
         if failure:
             if CANCEL.is_set():
                 return False
             print(f"\n[REMOTE] Tar fetch failed:\n{failure['err']}")
-            self.host.db.update_manifest_rows_fetch_failed(
+            self._state_db().update_manifest_rows_fetch_failed(
                 (row['manifest_id'] for row, _, _ in failure['batch']),
                 failure['err'], session_id=session_id)
             return False
@@ -1958,7 +2477,7 @@ class RemoteChunkStager:
                     if CANCEL.is_set():
                         return False
                     print(f"\n[REMOTE] Tar fetch failed (renamed file):\n{err}")
-                    self.host.db.update_manifest_row(
+                    self._state_db().update_manifest_row(
                         row['manifest_id'], session_id=session_id,
                         status='fetch_failed',
                         error_msg=err[:500])
@@ -1982,7 +2501,7 @@ class RemoteChunkStager:
                         msg = (f"refusing to skip '{row['remote_path']}': it "
                                f"could not be written locally ({reason}).")
                         print(f"\n[REMOTE] {msg}")
-                        self.host.db.update_manifest_row(
+                        self._state_db().update_manifest_row(
                             row['manifest_id'], session_id=session_id,
                             status='fetch_failed',
                             error_msg=msg[:500])
@@ -1997,7 +2516,7 @@ class RemoteChunkStager:
                         'remote', row['remote_path'], "missing after tar fetch",
                         'fetch', session_id=session_id, chunk_index=None)
                     print(f"[REMOTE] Source missing; skipped: {row['remote_path']}")
-                    self.host.db.update_manifest_row(
+                    self._state_db().update_manifest_row(
                         row['manifest_id'], session_id=session_id,
                         status='source_missing',
                         local_rel_path=None,
@@ -2009,7 +2528,7 @@ class RemoteChunkStager:
                     os.replace(_long(natural), _long(local_path))
                 except OSError as e:
                     print(f"[REMOTE] Could not place renamed file {rel}: {e}")
-                    self.host.db.update_manifest_row(
+                    self._state_db().update_manifest_row(
                         row['manifest_id'], session_id=session_id,
                         status='fetch_failed',
                         error_msg=f"move failed: {e}")
@@ -2018,6 +2537,10 @@ class RemoteChunkStager:
         finally:
             shutil.rmtree(_long(collide_root), ignore_errors=True)
 
+    def _resource_sampler(self):
+        """The governor's shared resource sampler, or ``None`` without one."""
+        return getattr(getattr(self.host, 'governor', None), 'sampler', None)
+
     def _start_fetch_monitor(
             self, stop_evt, abort_evt, fetch_dir, total_bytes,
             tar_part_paths=None, tar_part_paths_lock=None, label="FETCH"):
@@ -2033,6 +2556,7 @@ class RemoteChunkStager:
         up here first)."""
         abort_factor = getattr(self.host, "fetch_abort_factor", 2.0)
         stall_timeout = getattr(self.host, "fetch_stall_timeout", 600)
+        sampler = self._resource_sampler()
 
         def _alarm(msg):
             print(f"\n[FETCH][ALERT] {msg}")
@@ -2096,10 +2620,19 @@ class RemoteChunkStager:
                         "but is watched for a hard overrun."
                     )
 
-                try:
-                    free = shutil.disk_usage(self.host.staging_dir).free
-                except OSError:
-                    free = None
+                free = None
+                if sampler is not None:
+                    # The shared snapshot, at most one watchdog cycle old.
+                    try:
+                        free = sampler.snapshot(
+                            max_age=interval).disk_free_bytes
+                    except Exception:
+                        free = None
+                if free is None:
+                    try:
+                        free = shutil.disk_usage(self.host.staging_dir).free
+                    except OSError:
+                        free = None
                 if snapshot is None:
                     action = _fetch_watchdog_action(
                         cur=cur, last_growth_at=last_growth_at, now=now,
@@ -0,0 +1,181 @@
+"""Write-behind journal for a chunk's per-file fetch states.
+
+Fetching a chunk moves every file through ``fetching`` and on to
+``fetched``, ``fetch_failed`` or ``source_missing``. Written as they happen,
+each ``metadata_batch_size`` slice is its own transaction: hundreds of
+round-trips for a 400k-file chunk. :class:`RemoteStateJournal` takes the same
+calls as the database (``update_manifest_rows_fetching`` and friends), keeps
+only each file's latest state in a bounded in-memory buffer, and writes the
+buffer with :meth:`~src.pg_sessions.PgSessionMixin.apply_remote_file_states`
+(one COPY and one set-based merge) when it fills and at the chunk boundary.
+
+Nothing here is needed for correctness on a crash: a state that never reached
+the database leaves the file at its previous state, and a chunk is re-fetched
+from whatever its rows say. What the journal must guarantee is order: every
+buffered state is written before the chunk's status moves on and before
+anything reads the rows back, which is why the stager flushes it at exactly
+those points (see ``RemoteChunkStager._state_journal``).
+"""
+import threading
+
+from .logsetup import get_logger
+
+
+#: Buffered files before the journal writes itself out mid-chunk.
+JOURNAL_MAX_ROWS = 100_000
+
+_ROW_FIELDS = {"status", "local_rel_path", "error_msg"}
+
+
+class RemoteStateJournal:
+    """Buffer per-file state writes for one session and flush them in bulk.
+
+    Thread-safe: parallel fetch streams may record failures concurrently.
+    Used as a context manager it flushes on exit, exception or not.
+    """
+
+    def __init__(self, db, session_id, max_rows=JOURNAL_MAX_ROWS):
+        self.db = db
+        self.session_id = session_id
+        self.max_rows = max(1, int(max_rows))
+        #: plan_file_id -> (status, local_rel_path, keep_path, error_msg)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.flushes = 0
+        self.rows_written = 0
+
+    # -- the database's fetch-state API ----------------------------------
+    def update_manifest_rows_fetching(self, manifest_ids, session_id=None):
+        self._record(((mid, 'fetching', None, True, None)
+                      for mid in manifest_ids), session_id)
+
+    def update_manifest_rows_fetched(self, rows, session_id=None):
+        self._record(((mid, 'fetched', local_rel, False, None)
+                      for local_rel, mid in rows), session_id)
+
+    def update_manifest_rows_fetch_failed(self, manifest_ids, error_msg,
+                                          session_id=None):
+        error_msg = (error_msg or "")[:500]
+        self._record(((mid, 'fetch_failed', None, True, error_msg)
+                      for mid in manifest_ids), session_id)
+
+    def update_manifest_row(self, manifest_id, session_id=None, **kwargs):
+        unknown = set(kwargs) - _ROW_FIELDS
+        if unknown:
+            raise RuntimeError(
+                f"[DB] Invalid remote state field(s): {sorted(unknown)}")
+        if 'status' not in kwargs or 'error_msg' not in kwargs:
+            # A partial update keeps fields the journal does not know:
+            # write through, after everything buffered before it.
+            self.flush()
+            return self.db.update_manifest_row(
+                manifest_id, session_id=self._session(session_id), **kwargs)
+        self._record([(manifest_id, kwargs['status'],
+                       kwargs.get('local_rel_path'),
+                       'local_rel_path' not in kwargs, kwargs['error_msg'])],
+                     session_id)
+        return None
+
+    # -- buffering --------------------------------------------------------
+    def _session(self, session_id):
+        if session_id is not None and session_id != self.session_id:
+            raise RuntimeError(
+                f"[DB] state journal for session {self.session_id} "
+                f"got a write for session {session_id}")
+        return self.session_id
+
+    def _record(self, entries, session_id):
+        self._session(session_id)
+        full = False
+        with self._lock:
+            for manifest_id, status, local_rel, keep_path, error in entries:
+                if keep_path and manifest_id in self._pending:
+                    # Keep the path an earlier buffered state already set.
+                    _, prev_rel, prev_keep, _ = self._pending[manifest_id]
+                    local_rel, keep_path = prev_rel, prev_keep
+                self._pending[manifest_id] = (
+                    status, local_rel, keep_path, error)
+            full = len(self._pending) >= self.max_rows
+        if full:
+            self.flush()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    # -- writing ----------------------------------------------------------
+    def flush(self):
+        """Write every buffered state. Returns how many files were written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            try:
+                self._write(pending)
+            except Exception:
+                # Put back what was not durably written; newer states win.
+                with self._lock:
+                    pending.update(self._pending)
+                    self._pending = pending
+                raise
+            self.flushes += 1
+            self.rows_written += len(pending)
+            return len(pending)
+
+    def _write(self, pending):
+        apply = getattr(self.db, 'apply_remote_file_states', None)
+        if callable(apply):
+            apply(self.session_id, [
+                (mid, status, local_rel, keep_path, error)
+                for mid, (status, local_rel, keep_path, error)
+                in pending.items()])
+            return
+        # A database without the bulk path takes the per-status batch calls.
+        fetching, fetched, failed, other = [], [], {}, []
+        for mid, (status, local_rel, keep_path, error) in pending.items():
+            if status == 'fetching' and keep_path:
+                fetching.append(mid)
+            elif status == 'fetched' and not keep_path and error is None:
+                fetched.append((local_rel, mid))
+            elif status == 'fetch_failed' and keep_path:
+                failed.setdefault(error, []).append(mid)
+            else:
+                other.append((mid, status, local_rel, keep_path, error))
+        sid = self.session_id
+        if fetching:
+            self.db.update_manifest_rows_fetching(fetching, session_id=sid)
+        if fetched:
+            self.db.update_manifest_rows_fetched(fetched, session_id=sid)
+        for error, ids in failed.items():
+            self.db.update_manifest_rows_fetch_failed(ids, error,
+                                                      session_id=sid)
+        for mid, status, local_rel, keep_path, error in other:
+            fields = {'status': status, 'error_msg': error}
+            if not keep_path:
+                fields['local_rel_path'] = local_rel
+            self.db.update_manifest_row(mid, session_id=sid, **fields)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.flush()
+        except Exception as e:
+            if exc_type is None:
+                raise
+            # Already failing: the rows keep their earlier states, which the
+            # chunk's resume handles; do not mask the original error.
+            get_logger().warning(
+                "state journal flush failed during %s: %s",
+                exc_type.__name__, e)
+        if self.flushes:
+            get_logger().info(
+                "fetch state journal: session=%s rows=%d flushes=%d",
+                self.session_id, self.rows_written, self.flushes)
+        return False
+
+
+__all__ = ["JOURNAL_MAX_ROWS", "RemoteStateJournal"]
@@ -5,6 +5,7 @@ import threading
 import subprocess
 import tempfile
 import shlex
+import tarfile
 import atexit
 import time
 from dataclasses import dataclass
@@ -12,8 +13,12 @@ from typing import Optional, Tuple
 
 from .constants import PROJECT_ROOT
 from .paths import _safe_remote_relpath, validate_remote_posix_relpath
-from .pipeline_types import SourceDisposition, StoredTarSourceDiagnostic
+from .pipeline_types import (
+    SourceDisposition, StoredTarSourceDiagnostic, StoredTarStreamScan)
 from .runtime import CANCEL, _apply_proc_tuning, _kill_proc_tree, register_proc, unregister_proc
+from .tar_container import (
+    STORED_TAR_DIALECT, STORED_TAR_FORMAT_VERSION, StoredTarError,
+    StoredTarStreamValidator)
 
 
 def _has_command(name):
@@ -75,6 +80,33 @@ class RemoteTarStoreResult:
     tar_exit_verified: bool = True
     cancelled: bool = False
     error: str = ""
+    # Set by inline validation: the parse of the bytes as they were written
+    # (``inline_scan``), or why it failed (``inline_error``).
+    inline_scan: Optional[StoredTarStreamScan] = None
+    inline_error: str = ""
+
+
+#: Read size of the inline-validation tee between ssh and the part file.
+_TAR_STORE_TEE_BYTES = 1024 * 1024
+
+
+def _tee_stored_tar(pipe, output, validator, state):
+    """Copy ssh stdout to the part file and feed the same bytes to the
+    inline validator; one pass, no second read of the part.
+
+    A failure (ENOSPC on the part, say) is recorded in ``state`` and the tee
+    stops reading; the caller must then kill ssh, which would otherwise
+    block forever on its full stdout pipe."""
+    read = getattr(pipe, 'read1', pipe.read)
+    try:
+        while True:
+            block = read(_TAR_STORE_TEE_BYTES)
+            if not block:
+                break
+            output.write(block)
+            validator.feed(block)
+    except Exception as exc:
+        state["error"] = str(exc) or type(exc).__name__
 
 
 def _stored_tar_command(remote_base):
@@ -266,11 +298,18 @@ def _remote_source_status_probe(remote_user, remote_host, remote_base, members,
 def _remote_tar_store(remote_user, remote_host, remote_base, rel_paths,
                       local_part_path, *, plan_ordinals=None, password='',
                       cipher='', use_mbuffer=False, mbuffer_size='2G',
-                      fetch_cores=None, abort_evt=None):
+                      fetch_cores=None, abort_evt=None,
+                      inline_validation=False, member_digest=None):
     """Stream one GNU Stored TAR directly into a unique local ``.tar.part``.
 
     The function performs one attempt.  Its caller owns bounded retry policy;
     every retry must supply a new/truncated part and starts at byte zero.
+
+    With ``inline_validation`` the stream is read through a pipe, written to
+    the part and parsed by a :class:`StoredTarStreamValidator` as it arrives;
+    the result carries the scan (or its failure) so the part need not be
+    read back; ``member_digest`` has that parse hash every member too.
+    Without it ssh writes straight into the part's descriptor.
     """
     paths = []
     try:
@@ -317,17 +356,38 @@ def _remote_tar_store(remote_user, remote_host, remote_base, rel_paths,
     stderr_chunks = []
     stderr_state = {}
     feed_state = {}
+    tee_state = {}
+    validator = None
+    inline_error = ""
+    if inline_validation:
+        try:
+            validator = StoredTarStreamValidator(
+                tar_dialect=STORED_TAR_DIALECT,
+                format_version=STORED_TAR_FORMAT_VERSION,
+                member_digest=member_digest)
+        except StoredTarError as exc:
+            # The caller's re-read reports this against the part.
+            inline_error = str(exc)
+    tee = None
     archive_size = 0
     try:
         # Exclusive creation means two build owners can never share a byte
         # stream.  Popen writes stdout to the file descriptor directly, so TAR
-        # payload size cannot increase Python memory use.
+        # payload size cannot increase Python memory use; the inline tee holds
+        # at most the validator's bounded hand-off.
         with open(part_path, "xb") as output:
             proc = subprocess.Popen(
-                ssh_cmd, stdin=subprocess.PIPE, stdout=output,
+                ssh_cmd, stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE if validator is not None else output,
                 stderr=subprocess.PIPE, env=ssh_env)
             register_proc(proc)
             _apply_proc_tuning(proc, affinity=fetch_cores, label='ssh-tar-store')
+            if validator is not None:
+                tee = threading.Thread(
+                    target=_tee_stored_tar,
+                    args=(proc.stdout, output, validator, tee_state),
+                    daemon=True)
+                tee.start()
             stderr_thread = threading.Thread(
                 target=_bounded_stderr_reader,
                 args=(proc.stderr, stderr_chunks, stderr_state), daemon=True)
@@ -341,8 +401,16 @@ def _remote_tar_store(remote_user, remote_host, remote_base, rel_paths,
                         abort_evt is not None and abort_evt.is_set()):
                     _kill_proc_tree(proc)
                     break
+                if tee_state.get("error"):
+                    # Nothing drains ssh's stdout any more.
+                    _kill_proc_tree(proc)
+                    break
                 time.sleep(0.05)
             rc = proc.wait()
+            if tee is not None:
+                # Unbounded: the tee ends at ssh's EOF, and every byte it
+                # has taken must be in the part before it is measured.
+                tee.join()
             feeder.join(timeout=2)
             stderr_thread.join(timeout=2)
             output.flush()
@@ -353,6 +421,8 @@ def _remote_tar_store(remote_user, remote_host, remote_base, rel_paths,
     except (FileExistsError, OSError) as exc:
         if proc is not None:
             _kill_proc_tree(proc)
+        if validator is not None:
+            validator.abort()
         return RemoteTarStoreResult(
             False, part_path, archive_size, None, "",
             transport_mode=transport_mode, error=str(exc))
@@ -361,6 +431,21 @@ def _remote_tar_store(remote_user, remote_host, remote_base, rel_paths,
 
     cancelled = CANCEL.is_set() or (
         abort_evt is not None and abort_evt.is_set())
+    inline_scan = None
+    if validator is not None:
+        if cancelled or rc != 0 or tee_state.get("error"):
+            validator.abort()
+            inline_error = tee_state.get("error") or "stream did not complete"
+        else:
+            try:
+                inline_scan = validator.finish()
+            except StoredTarError as exc:
+                inline_error = str(exc)
+            if inline_scan is not None and (
+                    inline_scan.archive_size != archive_size
+                    or validator.bytes_fed != archive_size):
+                inline_scan = None
+                inline_error = "inline scan does not cover the whole part"
     unresolved = []
     diagnostics = ()
     if stderr_state.get("truncated"):
@@ -423,23 +508,33 @@ def _remote_tar_store(remote_user, remote_host, remote_base, rel_paths,
         return RemoteTarStoreResult(
             False, part_path, archive_size, rc, stderr_text,
             diagnostics=diagnostics, unresolved=tuple(unresolved),
-            transport_mode=transport_mode, cancelled=True, error="cancelled")
+            transport_mode=transport_mode, cancelled=True, error="cancelled",
+            inline_error=inline_error)
+    if tee_state.get("error"):
+        return RemoteTarStoreResult(
+            False, part_path, archive_size, rc, stderr_text,
+            diagnostics=diagnostics, unresolved=tuple(unresolved),
+            transport_mode=transport_mode,
+            error=f"writing the part failed: {tee_state['error']}",
+            inline_error=inline_error)
     if rc != 0:
         return RemoteTarStoreResult(
             False, part_path, archive_size, rc, stderr_text,
             diagnostics=diagnostics, unresolved=tuple(unresolved),
             transport_mode=transport_mode,
-            error=f"remote TAR/SSH exited with status {rc}")
+            error=f"remote TAR/SSH exited with status {rc}",
+            inline_error=inline_error)
     if unresolved:
         return RemoteTarStoreResult(
             False, part_path, archive_size, rc, stderr_text,
             diagnostics=diagnostics, unresolved=tuple(unresolved),
             transport_mode=transport_mode,
-            error="remote TAR outcome is unresolved")
+            error="remote TAR outcome is unresolved",
+            inline_scan=inline_scan, inline_error=inline_error)
     return RemoteTarStoreResult(
         True, part_path, archive_size, rc, stderr_text,
-        diagnostics=diagnostics, transport_mode=transport_mode)
-
+        diagnostics=diagnostics, transport_mode=transport_mode,
+        inline_scan=inline_scan, inline_error=inline_error)
 
 _ASKPASS_HELPERS = set()
 _ASKPASS_HELPER_PATH = None
@@ -739,6 +834,59 @@ def _is_recoverable_remote_tar_warning(line):
     )
 
 
+def _remote_tar_fetch_command(remote_base, use_mbuffer=False, mbuffer_size='2G'):
+    """The remote producer both tar fetch paths run; paths arrive on stdin."""
+    # -b 512 -> 256 KiB records: fewer syscalls than tar's tiny default block.
+    # --sparse keeps hole regions out of the stream so a sparse remote file
+    # is not shipped (and locally written) at its fully-expanded size.
+    # --no-recursion: every -T entry is a scanned regular file; without it a
+    # corrupt entry that names a directory makes tar mirror that entire tree
+    # (a one-line truncated scan record once ballooned a 100 GB chunk to
+    # ~900 GB of unplanned data this way).
+    # --hard-dereference: GNU tar otherwise sends the second of two
+    # hard-linked planned files as a data-less link member, which the
+    # streaming transcoder cannot pack; every planned file must arrive as a
+    # regular member carrying its own bytes.
+    # Missing/unreadable inputs are reported on stderr but do not abort the
+    # stream; the caller verifies every expected local file and records exact
+    # omissions.
+    # LC_ALL=C pins tar's diagnostics to English: the recoverable-warning
+    # filter below matches literal English diagnostics, and a localized remote
+    # would otherwise turn every legitimately-missing/unreadable file into a
+    # fatal fetch error.
+    tar_core = (
+        f"LC_ALL=C tar -C {shlex.quote(remote_base)} -b 512 --sparse "
+        "--hard-dereference --no-recursion --ignore-failed-read "
+        "-cf - --null -T -"
+    )
+    if not use_mbuffer:
+        return tar_core
+    # Use mbuffer only if it exists on the remote; otherwise fall back to a
+    # plain tar so a missing binary never fails the fetch. stdin (the NUL
+    # file list) flows to whichever tar runs.
+    return (
+        f"if command -v mbuffer >/dev/null 2>&1; then "
+        f"{tar_core} | mbuffer -q -m {shlex.quote(mbuffer_size)}; "
+        f"else {tar_core}; fi"
+    )
+
+
+def _fatal_remote_tar_warnings(ssh_err_text):
+    """The remote tar diagnostics a fetch may not tolerate.
+
+    --ignore-failed-read also suppresses nonzero exits for some failed inputs.
+    Only per-file missing/unreadable warnings are recoverable; the caller then
+    verifies every expected file and records exact omissions. Other GNU tar
+    warnings remain fatal. Non-tar SSH diagnostics are ignored when the SSH
+    process itself succeeded.
+    """
+    return [
+        line for line in ssh_err_text.splitlines()
+        if line.startswith('tar: ')
+        and not _is_recoverable_remote_tar_warning(line)
+    ]
+
+
 def _remote_tar_fetch(remote_user, remote_host, remote_base, rel_paths, local_dest_dir,
                       password='', cipher='', use_mbuffer=False, mbuffer_size='2G',
                       fetch_cores=None, abort_evt=None):
@@ -772,36 +920,8 @@ def _remote_tar_fetch(remote_user, remote_host, remote_base, rel_paths, local_de
     except ValueError as e:
         return False, str(e)
 
-    # -b 512 -> 256 KiB records: fewer syscalls than tar's tiny default block.
-    # --sparse keeps hole regions out of the stream so a sparse remote file
-    # is not shipped (and locally written) at its fully-expanded size.
-    # --no-recursion: every -T entry is a scanned regular file; without it a
-    # corrupt entry that names a directory makes tar mirror that entire tree
-    # (a one-line truncated scan record once ballooned a 100 GB chunk to
-    # ~900 GB of unplanned data this way).
-    # Missing/unreadable inputs are reported on stderr but do not abort the
-    # stream; the caller verifies every expected local file and records exact
-    # omissions.
-    # LC_ALL=C pins tar's diagnostics to English: the recoverable-warning
-    # filter below matches literal English diagnostics, and a localized remote
-    # would otherwise turn every legitimately-missing/unreadable file into a
-    # fatal fetch error.
-    tar_core = (
-        f"LC_ALL=C tar -C {shlex.quote(remote_base)} -b 512 --sparse "
-        "--no-recursion --ignore-failed-read -cf - --null -T -"
-    )
-    if use_mbuffer:
-        # Use mbuffer only if it exists on the remote; otherwise fall back to a
-        # plain tar so a missing binary never fails the fetch. stdin (the NUL
-        # file list) flows to whichever tar runs.
-        remote_cmd = (
-            f"if command -v mbuffer >/dev/null 2>&1; then "
-            f"{tar_core} | mbuffer -q -m {shlex.quote(mbuffer_size)}; "
-            f"else {tar_core}; fi"
-        )
-    else:
-        remote_cmd = tar_core
-
+    remote_cmd = _remote_tar_fetch_command(
+        remote_base, use_mbuffer=use_mbuffer, mbuffer_size=mbuffer_size)
     ssh_cmd, ssh_env, err = _ssh_stream_command(
         remote_user, remote_host, remote_cmd, password=password, cipher=cipher
     )
@@ -907,19 +1027,121 @@ def _remote_tar_fetch(remote_user, remote_host, remote_base, rel_paths, local_de
             parts.append(f"local tar exit {tar_rc}: {tar_err_text}")
         return False, '\n'.join(parts)
 
-    # --ignore-failed-read also suppresses nonzero exits for some failed inputs.
-    # Only per-file missing/unreadable warnings are recoverable; the caller then
-    # verifies every expected file and records exact omissions. Other GNU tar
-    # warnings remain fatal. Non-tar SSH diagnostics retain their previous
-    # behavior and are ignored when the SSH process itself succeeded.
-    tar_diagnostics = [
-        line for line in ssh_err_text.splitlines()
-        if line.startswith('tar: ')
-    ]
-    fatal_warnings = [
-        line for line in tar_diagnostics
-        if not _is_recoverable_remote_tar_warning(line)
-    ]
+    fatal_warnings = _fatal_remote_tar_warnings(ssh_err_text)
     if fatal_warnings:
         return False, "remote tar warning:\n" + '\n'.join(fatal_warnings)
     return True, ''
+
+
+class RemoteTarStreamError(RuntimeError):
+    """A remote tar stream ended short, failed, or reported a fatal warning."""
+
+
+def _iter_remote_tar_members(remote_user, remote_host, remote_base, rel_paths,
+                             password='', cipher='', use_mbuffer=False,
+                             mbuffer_size='2G', fetch_cores=None,
+                             abort_evt=None):
+    """Yield ``(member, fileobj)`` for each regular file of a remote tar stream.
+
+    The same remote producer as :func:`_remote_tar_fetch`, read in-process
+    instead of by a local ``tar -x``: nothing is written to the local disk
+    here. ``fileobj`` is only readable until the next member is requested.
+    Files the remote could not read are simply absent from the stream (the
+    caller compares what arrived with what it asked for). Any other failure —
+    ssh/tar exit status, a fatal tar warning, a short stream, a cancel or an
+    ``abort_evt`` — raises :class:`RemoteTarStreamError`.
+    """
+    if not rel_paths:
+        return
+    if CANCEL.is_set():
+        raise RemoteTarStreamError("cancelled")
+    try:
+        safe_paths = [_safe_remote_relpath(rel) for rel in rel_paths]
+    except ValueError as e:
+        raise RemoteTarStreamError(str(e)) from e
+
+    ssh_cmd, ssh_env, err = _ssh_stream_command(
+        remote_user, remote_host,
+        _remote_tar_fetch_command(
+            remote_base, use_mbuffer=use_mbuffer, mbuffer_size=mbuffer_size),
+        password=password, cipher=cipher)
+    if err:
+        raise RemoteTarStreamError(err)
+    assert ssh_cmd is not None
+
+    ssh_stderr = []
+    ssh_proc = subprocess.Popen(
+        ssh_cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=ssh_env,
+    )
+    register_proc(ssh_proc)
+    finished = threading.Event()
+    try:
+        _apply_proc_tuning(ssh_proc, affinity=fetch_cores, label='ssh-fetch')
+        stderr_thread = threading.Thread(
+            target=_bounded_stderr_reader,
+            args=(ssh_proc.stderr, ssh_stderr, {}), daemon=True)
+        stderr_thread.start()
+        if abort_evt is not None:
+            # Same watchdog contract as _remote_tar_fetch: an abort kills the
+            # stream, which unblocks the reader below.
+            def _abort_watch():
+                while not abort_evt.wait(1):
+                    if finished.is_set() or ssh_proc.poll() is not None:
+                        return
+                _kill_proc_tree(ssh_proc)
+            threading.Thread(target=_abort_watch, name='fetch-abort-watch',
+                             daemon=True).start()
+
+        feeder = threading.Thread(
+            target=_feed_nul_paths, args=(ssh_proc.stdin, safe_paths, {}),
+            daemon=True)
+        feeder.start()
+
+        try:
+            with tarfile.open(fileobj=ssh_proc.stdout, mode='r|',
+                              encoding='utf-8',
+                              errors='surrogateescape') as stream:
+                for member in stream:
+                    if CANCEL.is_set():
+                        raise RemoteTarStreamError("cancelled")
+                    if not member.isfile():
+                        continue
+                    yield member, stream.extractfile(member)
+            # The producer pads its last record past the end-of-archive
+            # blocks; drain it so the remote side can exit.
+            while ssh_proc.stdout.read(65536):
+                pass
+        except (tarfile.TarError, OSError, EOFError) as e:
+            if abort_evt is not None and abort_evt.is_set():
+                raise RemoteTarStreamError(
+                    "fetch aborted by the staging watchdog") from e
+            raise RemoteTarStreamError(f"remote tar stream: {e}") from e
+        ssh_rc = ssh_proc.wait()
+        feeder.join(timeout=2)
+        stderr_thread.join(timeout=2)
+    finally:
+        finished.set()
+        if ssh_proc.poll() is None:
+            _kill_proc_tree(ssh_proc)
+            ssh_proc.wait()
+        unregister_proc(ssh_proc)
+
+    if CANCEL.is_set():
+        raise RemoteTarStreamError("cancelled")
+    if abort_evt is not None and abort_evt.is_set():
+        raise RemoteTarStreamError(
+            "fetch aborted by the staging watchdog (chunk overran its plan or "
+            "staging disk space ran low)")
+    ssh_err_text = b''.join(ssh_stderr).decode(
+        'utf-8', errors='replace').strip()
+    if ssh_rc != 0:
+        raise RemoteTarStreamError(
+            f"remote tar/ssh exit {ssh_rc}: {ssh_err_text}")
+    fatal_warnings = _fatal_remote_tar_warnings(ssh_err_text)
+    if fatal_warnings:
+        raise RemoteTarStreamError(
+            "remote tar warning:\n" + '\n'.join(fatal_warnings))
@@ -38,6 +38,7 @@ from .pipeline_types import (ChunkStatus,
 from .ltfs_ownership import LtfsOwnershipError, writer_timeout_seconds
 from .reporting import _write_source_missing_only_log
 from .runtime import CANCEL, _acquire_tape_io_lock, _release_tape_io_lock, _status
+from .tape_write_log import TapeWriteHistory, chunk_stream_seconds
 from .telegram_notify import send_best_effort
 
 
@@ -47,6 +48,8 @@ class RemoteChunkWriter:
     def __init__(self, host):
         #: The RemoteOrchestrator façade that owns the gate, stop state and DB.
         self.host = host
+        #: ``LTOBackup.last_tape_write`` of each chunk of the current group.
+        self._group_writes = []
 
     def _write_chunk_group(self, session_id, descs, tape_label, eject_after,
                            stop_pipeline):
@@ -109,6 +112,8 @@ class RemoteChunkWriter:
                     "database tape safety budget")))
 
         group_started = time.time()
+        self._group_writes = []
+        group_block = None
         get_logger().info(
             "tape_write_group_start: chunks=%d indices=%s bytes=%d "
             "group_correlation_id=%s",
@@ -164,15 +169,43 @@ class RemoteChunkWriter:
                 block = self.host._write_one_chunk_owned(
                     session_id, desc, tape_label, eject_after)
                 if block is not None:
+                    group_block = block
                     return block
             return None
         finally:
             _release_tape_io_lock()
+            duration = time.time() - group_started
             get_logger().info(
                 "tape_write_group_end: chunks=%d bytes=%d duration_s=%.1f "
                 "group_correlation_id=%s",
-                len(tape_descs), group_bytes, time.time() - group_started,
+                len(tape_descs), group_bytes, duration,
                 getattr(self.host, '_obs_correlation_id', None))
+            if group_block is None:
+                self._record_group_history(tape_label, tape_descs, duration)
+
+    def _record_group_history(self, tape_label, tape_descs, duration):
+        """Add a fully written group to the write-group history.
+
+        Only when every chunk reported a profiled streaming rate; a group
+        with a gap would put its unmeasured streaming time into overhead."""
+        log_dir = getattr(self.host.cfg, 'backup_log_dir', None)
+        writes = self._group_writes
+        if not log_dir or not writes or len(writes) != len(tape_descs):
+            return
+        seconds = [chunk_stream_seconds(w.get('copied_bytes'), w)
+                   for w in writes]
+        if any(value is None for value in seconds):
+            return
+        try:
+            TapeWriteHistory(log_dir).record(
+                tape_label=tape_label,
+                fill_fraction=getattr(self.host, '_tape_fill_fraction', None),
+                chunks=len(writes),
+                group_bytes=sum(int(w.get('copied_bytes') or 0)
+                                for w in writes),
+                duration_seconds=duration, stream_seconds=sum(seconds))
+        except OSError as e:
+            get_logger().warning("could not record write-group history: %s", e)
 
     def _write_skip_tape_chunk(self, session_id, desc, tape_label, eject_after):
         """A chunk whose files were all source-missing: no tape I/O at all."""
@@ -228,9 +261,10 @@ class RemoteChunkWriter:
                 ChunkStatus.BACKING.value)
 
             try:
+                writer = self.host._backup_writer(backup_cls)
                 if tape_pending:
                     with tape_pending:
-                        self.host._backup_writer(backup_cls).run(
+                        writer.run(
                             source=pack_dir,
                             tape_drive=self.host.cfg.lto_drive,
                             tape_label=tape_label,
@@ -243,7 +277,7 @@ class RemoteChunkWriter:
                             on_write_start=_mark_write_started,
                         )
                 else:
-                    self.host._backup_writer(backup_cls).run(
+                    writer.run(
                         source=pack_dir,
                         tape_drive=self.host.cfg.lto_drive,
                         tape_label=tape_label,
@@ -320,6 +354,9 @@ class RemoteChunkWriter:
         # chunk ambiguous — it is committed.
         self.host.db.update_chunk_status(session_id, chunk_index,
                 ChunkStatus.DONE.value)
+        last_write = getattr(writer, 'last_tape_write', None)
+        if isinstance(last_write, dict):
+            self._group_writes.append(last_write)
 
         # --- FLUSH staged files for this chunk ---
         _status('REMOTE', f"Flushing staged files for chunk {chunk_index + 1}...")
@@ -355,8 +392,11 @@ class RemoteChunkWriter:
                   "the selected remote write group.")
             return False
         used_bytes = self.host.db.recalculate_tape_used_space(tape_label)
-        _, available_bytes = tape_budget_bytes(
+        capacity_bytes, available_bytes = tape_budget_bytes(
             tape['total_capacity'], used_bytes, status=tape.get('status'))
+        # Fill level of the group about to be written, for its history entry.
+        self.host._tape_fill_fraction = (
+            int(used_bytes or 0) / capacity_bytes if capacity_bytes else None)
         if staged_bytes > available_bytes:
             indices = (list(chunk_index) if isinstance(
                 chunk_index, (list, tuple, set)) else [chunk_index])
@@ -110,6 +110,20 @@ SUMMARY_COLUMNS = [
     'scan_seconds_to_first_sealed_chunk',
     'scan_seconds_to_first_staged_chunk',
     'scan_seconds_to_first_writer_group',
+    'scan_listing_sessions_opened',
+    'scan_workers',
+    'scan_worker_directories_per_second',
+    # Parallel fetch streams (src.fetch_scheduler), appended after the scan
+    # block. The per-stream values are ';'-joined in stream order.
+    'fetch_streams',
+    'fetch_streams_active',
+    'fetch_units',
+    'fetch_stream_mbs',
+    'fetch_stream_tail_idle_seconds',
+    # Shared resource sampler (src.resource_governor): governor decisions
+    # served vs. resource samples actually taken, appended at the end.
+    'governor_decisions',
+    'governor_resource_samples',
 ]
 
 #: The Task 0.2 columns, in schema order. Kept as its own list so the writer
@@ -358,6 +372,15 @@ def append_backup_summary_row(log_dir=None, details=None, robocopy_result=None):
         'tape_close_seconds': details.get('tape_close_seconds', ''),
         'tape_stall_seconds': details.get('tape_stall_seconds', ''),
         'tape_stall_count': details.get('tape_stall_count', ''),
+        'fetch_streams': details.get('fetch_streams', ''),
+        'fetch_streams_active': details.get('fetch_streams_active', ''),
+        'fetch_units': details.get('fetch_units', ''),
+        'fetch_stream_mbs': details.get('fetch_stream_mbs', ''),
+        'fetch_stream_tail_idle_seconds': details.get(
+            'fetch_stream_tail_idle_seconds', ''),
+        'governor_decisions': details.get('governor_decisions', ''),
+        'governor_resource_samples': details.get(
+            'governor_resource_samples', ''),
     })
     # Scan telemetry is optional and non-fatal: a run without a scanner (a
     # scan-complete resume, a local backup) simply leaves these blank, and a
@@ -368,6 +391,22 @@ def append_backup_summary_row(log_dir=None, details=None, robocopy_result=None):
     return _append_row(log_dir, row)
 
 
+def recent_summary_rows(log_dir=None, limit=50):
+    """The last ``limit`` backup rows of SUMMARY.csv, oldest first.
+
+    A missing or unreadable file is no history, not an error.
+    """
+    path = os.path.join(os.path.abspath(log_dir or BACKUP_LOG_DIR),
+                        SUMMARY_CSV)
+    try:
+        with open(path, newline='', encoding='utf-8') as handle:
+            rows = [row for row in csv.DictReader(handle)
+                    if row.get('record_type') == 'backup']
+    except (OSError, csv.Error, UnicodeDecodeError):
+        return []
+    return rows[-max(1, int(limit)):]
+
+
 def _write_source_missing_only_log(log_dir, session_id, chunk_index,
                                    tape_label, missing_files,
                                    source_host='', source_path='',
@@ -1,10 +1,12 @@
 """Resource Governor for heavy local archive pipeline work."""
 import contextlib
 from dataclasses import dataclass, field
+import itertools
 import os
 import shutil
 import threading
 import time
+from typing import Optional
 
 try:
     import psutil
@@ -42,6 +44,295 @@ class GovernorDecision:
         return ",".join(self.reasons)
 
 
+def _process_tree_rss_bytes():
+    if psutil is None:
+        return None
+    try:
+        proc = psutil.Process()
+        procs = [proc] + proc.children(recursive=True)
+        total = 0
+        for item in procs:
+            try:
+                total += item.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+def parse_meminfo(text):
+    """``/proc/meminfo`` text -> ``{field: bytes}`` (``kB`` values scaled)."""
+    fields = {}
+    for line in text.splitlines():
+        name, sep, rest = line.partition(":")
+        parts = rest.split()
+        if not sep or not parts:
+            continue
+        try:
+            value = int(parts[0])
+        except ValueError:
+            continue
+        if len(parts) > 1 and parts[1] == "kB":
+            value *= 1024
+        fields[name.strip()] = value
+    return fields
+
+
+def parse_psi_some_avg10(text):
+    """The ``some avg10`` share from ``/proc/pressure/memory``, or ``None``."""
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts or parts[0] != "some":
+            continue
+        for item in parts[1:]:
+            key, _, value = item.partition("=")
+            if key == "avg10":
+                try:
+                    return float(value)
+                except ValueError:
+                    return None
+    return None
+
+
+@dataclass(frozen=True)
+class MemoryReading:
+    """What a memory-pressure model reports to the governor.
+
+    ``memory_pct``/``available_bytes`` are what the RAM limits gate on;
+    ``psi_some_avg10`` is the share of the last 10 s in which some task
+    stalled on memory (Linux PSI), ``None`` where PSI is unavailable.
+    """
+    memory_pct: float
+    available_bytes: int
+    total_bytes: int
+    model: str
+    psi_some_avg10: Optional[float] = None
+
+
+class PsutilMemoryModel:
+    """The original gate: psutil's ``percent`` and ``available``.
+
+    Portable, but on a busy staging host it counts reclaimable file cache as
+    used (docs/incidents/001), which is why the RAM limits are hand-tuned.
+    """
+
+    name = "psutil"
+
+    def read(self):
+        if psutil is None:
+            return None
+        vm = psutil.virtual_memory()
+        return MemoryReading(
+            memory_pct=float(vm.percent), available_bytes=int(vm.available),
+            total_bytes=int(vm.total), model=self.name)
+
+
+class MeminfoPressureModel:
+    """Pressure from memory the kernel cannot simply drop (Linux).
+
+    Counts anonymous and shared memory, dirty and writeback pages, and
+    unreclaimable kernel memory as used; clean file cache stays available,
+    so a chunk freshly extracted into staging no longer reads as pressure.
+    Under strict overcommit (``vm.overcommit_memory`` = 2) the commit charge
+    is what makes allocations fail, so it bounds the reading there too. PSI
+    ``some avg10`` is reported alongside. Falls back to ``fallback`` (the
+    psutil model) where ``/proc/meminfo`` cannot be read.
+    """
+
+    name = "meminfo"
+    _PINNED_FIELDS = ("AnonPages", "Shmem", "Dirty", "Writeback",
+                      "SUnreclaim", "PageTables", "KernelStack")
+
+    def __init__(self, meminfo_path="/proc/meminfo",
+                 psi_path="/proc/pressure/memory",
+                 overcommit_path="/proc/sys/vm/overcommit_memory",
+                 fallback=None):
+        self.meminfo_path = meminfo_path
+        self.psi_path = psi_path
+        self.overcommit_path = overcommit_path
+        self.fallback = fallback or PsutilMemoryModel()
+
+    @staticmethod
+    def _read_text(path):
+        try:
+            with open(path, "r", encoding="ascii") as handle:
+                return handle.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def read(self):
+        text = self._read_text(self.meminfo_path)
+        fields = parse_meminfo(text) if text else {}
+        if not fields.get("MemTotal"):
+            return self.fallback.read()
+        psi_text = self._read_text(self.psi_path)
+        overcommit = self._read_text(self.overcommit_path)
+        return self.evaluate(
+            fields,
+            psi_some_avg10=(None if psi_text is None
+                            else parse_psi_some_avg10(psi_text)),
+            strict_commit=(overcommit or "").strip() == "2")
+
+    @classmethod
+    def evaluate(cls, fields, psi_some_avg10=None, strict_commit=False):
+        """Pure reading from parsed meminfo fields (bytes)."""
+        total = int(fields.get("MemTotal", 0))
+        pinned = min(total, sum(int(fields.get(name, 0))
+                                for name in cls._PINNED_FIELDS))
+        available = total - pinned
+        pct = pinned / total * 100.0 if total else 0.0
+        limit = int(fields.get("CommitLimit", 0))
+        if strict_commit and limit > 0:
+            committed = int(fields.get("Committed_AS", 0))
+            pct = max(pct, committed / limit * 100.0)
+            available = min(available, max(0, limit - committed))
+        return MemoryReading(
+            memory_pct=pct, available_bytes=available, total_bytes=total,
+            model=cls.name, psi_some_avg10=psi_some_avg10)
+
+
+MEMORY_MODELS = ("psutil", "meminfo", "auto")
+
+
+def memory_model_from_config(cfg):
+    """The memory model ``governor_memory_model`` names.
+
+    ``auto`` uses the meminfo model where ``/proc/meminfo`` exists and the
+    psutil model elsewhere (the Windows archive host).
+    """
+    name = str(getattr(cfg, "governor_memory_model", "psutil")
+               or "psutil").strip().lower()
+    if name == "auto":
+        name = "meminfo" if os.path.exists("/proc/meminfo") else "psutil"
+    if name == "meminfo":
+        return MeminfoPressureModel()
+    return PsutilMemoryModel()
+
+
+@dataclass(frozen=True)
+class ResourceSnapshot:
+    """One consistent sample of host memory, process RSS and staging space.
+
+    A field is ``None`` when it could not be measured (no psutil, or the
+    staging volume was unreadable). ``sampled_at`` is ``time.monotonic()``.
+    """
+    sampled_at: float
+    memory_pct: Optional[float] = None
+    available_bytes: Optional[int] = None
+    total_bytes: Optional[int] = None
+    process_tree_rss_mb: Optional[float] = None
+    disk_free_bytes: Optional[int] = None
+    memory_model: Optional[str] = None
+    memory_psi_some_avg10: Optional[float] = None
+
+
+class ResourceSampler:
+    """Shared source of :class:`ResourceSnapshot` for every RAM/disk reader.
+
+    One ``virtual_memory()`` call, one process-tree walk and one
+    ``disk_usage()`` make a snapshot; the governor, the stage RAM samplers and
+    the staging watchdog all read the published one instead of sampling for
+    themselves. Readers never lock: the snapshot is immutable and replaced by
+    a single attribute store. ``start()`` refreshes it every
+    ``interval_seconds`` in the background; without that thread a read older
+    than the interval samples in place. ``interval_seconds`` = 0 samples on
+    every read (the pre-sampler behaviour).
+    """
+
+    def __init__(self, staging_dir, interval_seconds=1.0, memory_model=None):
+        self.staging_dir = staging_dir
+        self.interval_seconds = max(0.0, float(interval_seconds or 0))
+        self.memory_model = memory_model or PsutilMemoryModel()
+        self._snapshot = None
+        self._sample_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._reads = itertools.count(1)
+        self.reads_served = 0
+        self.samples_taken = 0
+
+    def _sample(self):
+        reading = self.memory_model.read()
+        rss = _process_tree_rss_bytes()
+        try:
+            os.makedirs(self.staging_dir, exist_ok=True)
+            disk_free = shutil.disk_usage(self.staging_dir).free
+        except OSError:
+            disk_free = None
+        return ResourceSnapshot(
+            sampled_at=time.monotonic(),
+            memory_pct=None if reading is None else reading.memory_pct,
+            available_bytes=None if reading is None else reading.available_bytes,
+            total_bytes=None if reading is None else reading.total_bytes,
+            process_tree_rss_mb=None if rss is None else rss / 1024**2,
+            disk_free_bytes=disk_free,
+            memory_model=None if reading is None else reading.model,
+            memory_psi_some_avg10=(
+                None if reading is None else reading.psi_some_avg10),
+        )
+
+    def refresh(self):
+        """Take, publish and return a fresh snapshot.
+
+        Concurrent callers coalesce: one that waited for another's sample
+        taken after it asked reuses that sample instead of taking its own.
+        """
+        requested = time.monotonic()
+        with self._sample_lock:
+            snap = self._snapshot
+            if snap is None or snap.sampled_at < requested:
+                snap = self._sample()
+                self._snapshot = snap
+                self.samples_taken += 1
+        return snap
+
+    def snapshot(self, max_age=None):
+        """The published snapshot, refreshed first if older than ``max_age``
+        seconds (default: the sampling interval)."""
+        self.reads_served = next(self._reads)
+        snap = self._snapshot
+        limit = self.interval_seconds if max_age is None else max_age
+        if snap is None or time.monotonic() - snap.sampled_at >= limit:
+            return self.refresh()
+        return snap
+
+    def start(self):
+        """Refresh the snapshot in a background thread (idempotent)."""
+        if self.interval_seconds <= 0:
+            return self
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self.refresh()
+        self._thread = threading.Thread(
+            target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.refresh()
+            except Exception:
+                # A failed sample leaves the last snapshot in place; the next
+                # stale read samples in place and surfaces the error there.
+                continue
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, _exc_type, _exc, _tb):
+        self.stop()
+        return False
+
+
 class ResourceGovernor:
     """Central go/no-go checks for heavy local pipeline resources."""
 
@@ -49,6 +340,11 @@ class ResourceGovernor:
         self.cfg = cfg
         self.staging_dir = staging_dir or getattr(cfg, "staging_dir", ".")
         self.sleep_seconds = sleep_seconds
+        self.sampler = ResourceSampler(
+            self.staging_dir,
+            getattr(cfg, "governor_resource_sample_interval_seconds", 1.0),
+            memory_model_from_config(cfg))
+        self.decisions_served = 0
         self._lock = threading.RLock()
         self.tape_write_active = False
         self.tape_write_pending = False
@@ -86,6 +382,10 @@ class ResourceGovernor:
         gb = float(getattr(self.cfg, "governor_tape_min_free_ram_gb", 3.0))
         return int(max(0.5, gb) * GB)
 
+    @property
+    def memory_psi_limit_pct(self):
+        return float(getattr(self.cfg, "governor_memory_psi_limit_pct", 10))
+
     @property
     def status_interval_seconds(self):
         return float(getattr(self.cfg, "governor_status_interval_seconds", 60))
@@ -108,48 +408,34 @@ class ResourceGovernor:
             self.cfg, "local_staging_reserve_bytes",
             LOCAL_STAGING_RESERVE_BYTES))
 
-    def _virtual_memory(self):
-        if psutil is None:
-            return None
-        return psutil.virtual_memory()
+    def _resource_snapshot(self, action):
+        # A start commits a new heavy stage, so it is decided on a fresh
+        # sample; mid-stage checkpoints read the shared snapshot.
+        if action == "start":
+            return self.sampler.refresh()
+        return self.sampler.snapshot()
 
-    def _disk_free(self):
+    def _disk_free(self, snap):
+        if snap.disk_free_bytes is not None:
+            return snap.disk_free_bytes
         os.makedirs(self.staging_dir, exist_ok=True)
         return shutil.disk_usage(self.staging_dir).free
 
-    def _memory_pct(self):
-        vm = self._virtual_memory()
-        return 0.0 if vm is None else float(vm.percent)
-
-    def _memory_available(self):
-        vm = self._virtual_memory()
-        return None if vm is None else int(vm.available)
+    @staticmethod
+    def _memory_pct(snap):
+        return 0.0 if snap.memory_pct is None else snap.memory_pct
 
-    def _memory_total(self):
-        vm = self._virtual_memory()
-        return None if vm is None else int(vm.total)
+    def _hard_memory_ok(self, snap):
+        return self._memory_pct(snap) < self.ram_hard_limit_pct
 
-    def _process_tree_rss_mb(self):
-        if psutil is None:
-            return 0.0
-        try:
-            proc = psutil.Process()
-            procs = [proc] + proc.children(recursive=True)
-            total = 0
-            for item in procs:
-                try:
-                    total += item.memory_info().rss
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            return total / 1024**2
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            return 0.0
+    def _soft_memory_ok(self, snap):
+        return self._memory_pct(snap) < self.ram_soft_limit_pct
 
-    def _hard_memory_ok(self):
-        return self._memory_pct() < self.ram_hard_limit_pct
-
-    def _soft_memory_ok(self):
-        return self._memory_pct() < self.ram_soft_limit_pct
+    def _memory_stalling(self, snap):
+        """Whether PSI shows tasks stalling on memory (0 limit = off)."""
+        limit = self.memory_psi_limit_pct
+        psi = snap.memory_psi_some_avg10
+        return limit > 0 and psi is not None and psi >= limit
 
     def _tape_blocks(self, action):
         """Tape-gate blocking state for a stage decision.
@@ -173,13 +459,13 @@ class ResourceGovernor:
             return True
         return _bool_config(self.cfg, flag_name, False)
 
-    def _staging_ok(self, needed_bytes=0, queued_bytes=0):
+    def _staging_ok(self, snap, needed_bytes=0, queued_bytes=0):
         needed = max(0, int(needed_bytes or 0)) + max(0, int(queued_bytes or 0))
-        return (self._disk_free() - needed) >= self.staging_reserve_bytes
+        return (self._disk_free(snap) - needed) >= self.staging_reserve_bytes
 
-    def _effective_fetch_min_free_bytes(self, wait_seconds=0):
+    def _effective_fetch_min_free_bytes(self, snap, wait_seconds=0):
         target = self.fetch_min_free_ram_bytes
-        total = self._memory_total()
+        total = snap.total_bytes
         if total:
             cap_pct = float(getattr(
                 self.cfg, "governor_fetch_total_ram_cap_pct", 25))
@@ -203,26 +489,26 @@ class ResourceGovernor:
     # still free so we never push the box into hard thrashing.
     _DRAIN_STAGE_MIN_FREE_BYTES = 512 * 1024**2
 
-    def _drain_stage_relaxed(self, stage, wait_seconds):
+    def _drain_stage_relaxed(self, snap, stage, wait_seconds):
         if stage not in ("pack", "db_sync"):
             return False
         window = self.soft_relax_after_seconds
         if window <= 0 or wait_seconds < window:
             return False
-        available = self._memory_available()
+        available = snap.available_bytes
         return (available is None or
                 available >= self._DRAIN_STAGE_MIN_FREE_BYTES)
 
-    def _base_decision(self, stage, action, wait_seconds=0):
-        available = self._memory_available()
+    def _base_decision(self, snap, stage, action, wait_seconds=0):
+        available = snap.available_bytes
         available_gb = 0.0 if available is None else available / GB
         return GovernorDecision(
             allowed=True,
             action=action,
             stage=stage,
-            memory_pct=self._memory_pct(),
+            memory_pct=self._memory_pct(snap),
             available_gb=available_gb,
-            process_tree_rss_mb=self._process_tree_rss_mb(),
+            process_tree_rss_mb=snap.process_tree_rss_mb or 0.0,
             hard_limit_pct=self.ram_hard_limit_pct,
             tape_active=self.tape_write_active or self.tape_write_pending,
             wait_seconds=wait_seconds,
@@ -230,26 +516,42 @@ class ResourceGovernor:
 
     def decision(self, stage, action="start", needed_bytes=0, queued_bytes=0,
                  wait_seconds=0):
+        snap = self._resource_snapshot(str(action))
+        return self.decision_for(
+            snap, stage, action, needed_bytes=needed_bytes,
+            queued_bytes=queued_bytes, wait_seconds=wait_seconds)
+
+    def decision_for(self, snap, stage, action="start", needed_bytes=0,
+                     queued_bytes=0, wait_seconds=0):
+        """The gate over a given :class:`ResourceSnapshot`.
+
+        :meth:`decision` passes the shared snapshot; the memory replay
+        harness passes recorded ones.
+        """
+        stage = str(stage)
+        action = str(action)
         with self._lock:
-            stage = str(stage)
-            action = str(action)
-            dec = self._base_decision(stage, action, wait_seconds)
-            available = self._memory_available()
-            drain_relaxed = self._drain_stage_relaxed(stage, wait_seconds)
-            if not self._hard_memory_ok() and not drain_relaxed:
+            self.decisions_served += 1
+            dec = self._base_decision(snap, stage, action, wait_seconds)
+            available = snap.available_bytes
+            drain_relaxed = self._drain_stage_relaxed(snap, stage, wait_seconds)
+            if not self._hard_memory_ok(snap) and not drain_relaxed:
                 dec.reasons.append("hard_ram_limit")
 
             if stage == "fetch":
-                min_free = self._effective_fetch_min_free_bytes(wait_seconds)
+                min_free = self._effective_fetch_min_free_bytes(
+                    snap, wait_seconds)
                 dec.effective_min_free_gb = min_free / GB
                 if available is not None and available < min_free:
                     dec.reasons.append("fetch_min_free_ram")
+                if action == "start" and self._memory_stalling(snap):
+                    dec.reasons.append("memory_psi")
                 if not self._tape_allows("allow_fetch_during_tape_write",
                                          action):
                     dec.reasons.append("tape_active")
                 if action == "start" and self.db_sync_active:
                     dec.reasons.append("db_sync_active")
-                if self.pack_active and not self._soft_memory_ok():
+                if self.pack_active and not self._soft_memory_ok(snap):
                     dec.reasons.append("pack_memory_pressure")
             elif stage == "pack":
                 if not self._tape_allows("allow_pack_during_tape_write",
@@ -261,7 +563,7 @@ class ResourceGovernor:
                         str(getattr(self.cfg, "allow_pack_during_fetch",
                                     "conditional")).strip().lower() == "false"):
                     dec.reasons.append("fetch_active")
-                if (not self._soft_memory_ok() and
+                if (not self._soft_memory_ok(snap) and
                         not _bool_config(self.cfg, "allow_pack_above_ram_soft",
                                          False) and
                         not drain_relaxed):
@@ -270,6 +572,8 @@ class ResourceGovernor:
                 dec.effective_min_free_gb = self.tape_min_free_ram_bytes / GB
                 if available is not None and available < self.tape_min_free_ram_bytes:
                     dec.reasons.append("tape_min_free_ram")
+                if action == "start" and self._memory_stalling(snap):
+                    dec.reasons.append("memory_psi")
                 if self.tape_write_active or self.fetch_active or self.pack_active or self.db_sync_active:
                     dec.reasons.append("heavy_stage_active")
             elif stage == "db_sync":
@@ -318,7 +622,7 @@ class ResourceGovernor:
                     self.tape_min_free_ram_bytes / GB)
                 dec.reasons.append("tape_ram_reserve")
 
-            if not self._staging_ok(needed_bytes, queued_bytes):
+            if not self._staging_ok(snap, needed_bytes, queued_bytes):
                 dec.reasons.append("staging_reserve")
 
             dec.allowed = not dec.reasons
@@ -389,6 +693,8 @@ class ResourceGovernor:
         return {
             "governor_wait_seconds": f"{self.total_wait_seconds:.3f}",
             "governor_wait_reasons": ";".join(sorted(self.wait_reasons)),
+            "governor_decisions": str(self.decisions_served),
+            "governor_resource_samples": str(self.sampler.samples_taken),
         }
 
     @contextlib.contextmanager
@@ -8,22 +8,27 @@ import zipfile
 import posixpath
 import ntpath
 from collections import defaultdict
+from contextlib import contextmanager
 from typing import TYPE_CHECKING
 
-from .archive_artifacts import (TAR_SIDECAR_VERSION, ArtifactError,
-                                is_ltfs_locator,
+from .archive_artifacts import (ArtifactError, is_ltfs_locator,
                                 resolve_local_metadata_locator,
                                 search_tar_sidecar)
 from .db import _fmt_ts
-from .ltfs import get_volume_label
+from .ltfs import get_volume_label, read_ltfs_start_block_unlocked
 from .local_manifest_archive import find_manifest_record, search_manifests
 from .packer import StagingSpaceError, ensure_staging_space
 from .robocopy import _robocopy_file
 from .runtime import CANCEL, _acquire_tape_io_lock, _release_tape_io_lock
 from .pipeline_types import ContainerFormat
+from .restore_planner import (DEFAULT_TAPE_SEEK_SECONDS,
+                              DEFAULT_TAPE_STREAM_MBS, format_estimate,
+                              plan_tape_restore, write_order_key)
 from .tar_container import (STORED_TAR_DIALECT, STORED_TAR_FORMAT_VERSION,
                             StoredTarError, StoredTarReader,
+                            new_member_digest, open_stored_tar_member,
                             validate_tar_member_name)
+from .zip_container import ZipMemberError, open_zip_member
 
 if TYPE_CHECKING:
     from .pg_db import PgDatabaseManager
@@ -32,15 +37,41 @@ if TYPE_CHECKING:
 RESTORE_PAGE_SIZE = 250
 
 
+class _DigestingReader:
+    """Hash what a TAR member copy reads, for checking once it completes."""
+
+    def __init__(self, source, algorithm):
+        self._source = source
+        self._digest = new_member_digest(algorithm)
+
+    def read(self, size=-1):
+        data = self._source.read(size)
+        self._digest.update(data)
+        return data
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+
 class LTORetriever:
     def __init__(self, db: "PgDatabaseManager", tape_drive: str,
                  staging_dir: str, restore_dir: str,
-                 manifest_archive_root: str = None):
+                 manifest_archive_root: str = None,
+                 byte_range_tar_restore: bool = True,
+                 tape_stream_mbs: float = DEFAULT_TAPE_STREAM_MBS,
+                 tape_seek_seconds: float = DEFAULT_TAPE_SEEK_SECONDS,
+                 probe_ltfs_start_blocks: bool = False,
+                 stream_zip_restore: bool = True):
         self.db          = db
         self.tape_drive  = tape_drive
         self.staging_dir = staging_dir
         self.restore_dir = restore_dir
         self.manifest_archive_root = manifest_archive_root
+        self.byte_range_tar_restore = byte_range_tar_restore
+        self.tape_stream_mbs = tape_stream_mbs
+        self.tape_seek_seconds = tape_seek_seconds
+        self.probe_ltfs_start_blocks = probe_ltfs_start_blocks
+        self.stream_zip_restore = stream_zip_restore
 
     @staticmethod
     def _source_path_module(path):
@@ -466,47 +497,79 @@ class LTORetriever:
 
         for tape_label, tape_records in by_tape.items():
             self._check_cancelled()
-            if any(self._record_needs_tape(r) for r in tape_records):
+            needs_tape = any(self._record_needs_tape(r) for r in tape_records)
+            if needs_tape:
                 self._verify_tape(tape_label)
 
-            loose = []
-            contained = []
-            for record in tape_records:
-                route = self._route_container_format(record)
-                (loose if route is None else contained).append(record)
-
-            for record in loose:
-                self._check_cancelled()
-                self._restore_loose(record, restore_base=restore_base)
-                done += 1
-                print(f"[RESTORE] Progress: {done}/{total}")
-
-            # Group by persisted format + durable identity so one request can
-            # span legacy ZIP, Stored TAR and loose records safely.
-            by_container = defaultdict(list)
-            for r in contained:
-                route = self._route_container_format(r)
-                identity = (r.get("container_id")
-                            or r.get("tape_container_locator")
-                            or r.get("container_name"))
-                by_container[(route.value, identity)].append(r)
-
-            for (_format, _identity), container_records in by_container.items():
+            # Loose files and containers (legacy ZIP, Stored TAR) are read in
+            # the order they were written, so the restore is one forward pass
+            # instead of a locate per record.
+            plan = plan_tape_restore(
+                tape_label, tape_records, route=self._route_container_format)
+            if needs_tape and self.probe_ltfs_start_blocks:
+                blocks = self._probe_start_blocks(plan.reads)
+                if blocks:
+                    plan = plan_tape_restore(
+                        tape_label, tape_records,
+                        route=self._route_container_format,
+                        start_blocks=blocks)
+            if any(self._read_on_tape(read) for read in plan.reads):
+                print(format_estimate(
+                    plan, stream_mbs=self.tape_stream_mbs,
+                    seek_seconds=self.tape_seek_seconds))
+
+            for restore_pass in plan.passes:
                 self._check_cancelled()
-                if self._route_container_format(
-                        container_records[0]) is ContainerFormat.ZIP:
-                    path = (container_records[0].get("tape_container_locator")
-                            or container_records[0].get("container_name"))
-                    self._restore_packed_bulk(
-                        path, container_records, restore_base=restore_base)
-                else:
-                    self._restore_container(
-                        container_records, restore_base=restore_base)
-                done += len(container_records)
-                print(f"[RESTORE] Progress: {done}/{total}")
+                # One ownership period per pass: adjacent loose files stream
+                # without releasing the drive between them.
+                hold = len(restore_pass.reads) > 1
+                if hold:
+                    _acquire_tape_io_lock(
+                        f"restore {len(restore_pass.reads)} adjacent file(s)")
+                try:
+                    for read in restore_pass.reads:
+                        self._check_cancelled()
+                        self._restore_read(read, restore_base=restore_base)
+                        done += len(read.records)
+                        print(f"[RESTORE] Progress: {done}/{total}")
+                finally:
+                    if hold:
+                        _release_tape_io_lock()
 
         print(f"\n[RESTORE] Complete. {total} file(s) restored to: {self.restore_dir}")
 
+    def _restore_read(self, read, restore_base=None):
+        if read.kind == "loose":
+            return self._restore_loose(read.records[0], restore_base=restore_base)
+        if read.kind == ContainerFormat.ZIP.value:
+            return self._restore_packed_bulk(
+                read.locator, read.records, restore_base=restore_base)
+        return self._restore_container(read.records, restore_base=restore_base)
+
+    def _read_on_tape(self, read):
+        if read.kind != ContainerFormat.STORED_TAR.value:
+            return True
+        local = self._local_container_path(read.records[0])
+        return not (local and os.path.isfile(local))
+
+    def _probe_start_blocks(self, reads):
+        """LTFS start blocks for the reads that will touch tape."""
+        blocks = {}
+        targets = [read.locator for read in reads
+                   if read.locator and self._read_on_tape(read)]
+        if not targets:
+            return blocks
+        _acquire_tape_io_lock(f"locate {len(targets)} restore read(s)")
+        try:
+            for locator in targets:
+                block = read_ltfs_start_block_unlocked(
+                    self._resolve_tape_path(locator))
+                if block is not None:
+                    blocks[locator] = block
+        finally:
+            _release_tape_io_lock()
+        return blocks
+
     def _verify_tape(self, required_label):
         while True:
             mounted = get_volume_label(self.tape_drive)
@@ -610,12 +673,11 @@ class LTORetriever:
                           or record.get("container_name")))
         # The artifact identity and JSON header carry the same contract
         # version. Legacy/synthetic callers without the identity still have to
-        # satisfy the one Phase-1 sidecar version.
-        expected_version = artifact_version or TAR_SIDECAR_VERSION
+        # satisfy one of the supported sidecar versions.
         try:
             return search_tar_sidecar(
                 path, directory=directory, limit=limit,
-                expected_version=expected_version,
+                expected_version=artifact_version,
                 expected_container_id=record.get("container_id"),
                 expected_member_count=record.get("expected_member_count"))
         except ArtifactError:
@@ -660,6 +722,38 @@ class LTORetriever:
                 f"extracted TAR member size mismatch: {written} != {expected_size}")
         return written
 
+    def _copy_verified_tar_stream(self, source, output, expected_size, digest):
+        """Copy one member, hashing it on the way when ``digest`` is set.
+
+        ``digest`` is the (algorithm, hex) pair the member must hash to; the
+        caller publishes nothing unless this returns.
+        """
+        if digest is None:
+            return self._copy_tar_stream(source, output, expected_size)
+        reader = _DigestingReader(source, digest[0])
+        written = self._copy_tar_stream(reader, output, expected_size)
+        if reader.hexdigest() != digest[1]:
+            raise StoredTarError(
+                f"extracted TAR member {digest[0]} digest mismatch")
+        return written
+
+    @staticmethod
+    def _tar_member_digest(record, item):
+        """The (algorithm, hex) a restored member must hash to, or None.
+
+        The sidecar is authoritative; a catalog digest, when present, must
+        agree with it.
+        """
+        expected = None
+        if item is not None and item.get("digest"):
+            expected = (item["digest_algorithm"], item["digest"])
+        catalog = (record.get("tar_digest_algorithm"), record.get("tar_digest"))
+        if catalog[1] and expected is not None and catalog != expected:
+            name = item.get("name")
+            raise StoredTarError(
+                f"catalog/sidecar digest mismatch for {name!r}")
+        return expected
+
     def _restore_tar_members(self, local_tar, records, restore_base=None,
                              sidecar=None):
         """Validate the full TAR, then extract selected members atomically."""
@@ -677,6 +771,8 @@ class LTORetriever:
                     expected_member_count=first.get("expected_member_count"),
                     expected_logical_bytes=first.get("expected_logical_bytes"))
             expected_by_name = {item.name: item for item in validated.members}
+            sidecar_items = {item["name"]: item
+                             for item in sidecar.expected_members}
             wanted = {}
             for record in records:
                 name = validate_tar_member_name(
@@ -690,7 +786,9 @@ class LTORetriever:
                 if size is not None and int(size) != member.logical_size:
                     raise StoredTarError(
                         f"catalog/sidecar size mismatch for {name!r}")
-                wanted[name] = (record, member.logical_size)
+                wanted[name] = (record, member.logical_size,
+                                self._tar_member_digest(
+                                    record, sidecar_items.get(name)))
 
             restored = 0
             seen = set()
@@ -705,7 +803,7 @@ class LTORetriever:
                         raise StoredTarError(
                             "selected TAR member is not a regular file: "
                             f"{info.name!r}")
-                    record, expected_size = wanted[normalized]
+                    record, expected_size, digest = wanted[normalized]
                     if int(info.size) != int(expected_size):
                         raise StoredTarError(
                             f"TAR extraction size disagrees for {info.name!r}")
@@ -721,7 +819,8 @@ class LTORetriever:
                         dst_dir, f".restore_tar_{uuid.uuid4().hex}.part")
                     try:
                         with source, open(temp_path, "xb") as output:
-                            self._copy_tar_stream(source, output, expected_size)
+                            self._copy_verified_tar_stream(
+                                source, output, expected_size, digest)
                         self._check_cancelled()
                         published = self._publish_temp_no_clobber(temp_path, dst)
                         print(f"[OK] {record['file_name']} -> {published}")
@@ -740,6 +839,76 @@ class LTORetriever:
                 f"validated TAR extraction did not encounter: {sorted(missing)!r}")
         return restored
 
+    @staticmethod
+    def _byte_range_selection(records, sidecar):
+        """Pair each record with its sidecar offsets, in archive order.
+
+        Returns None when any selected member lacks offsets (a v1 sidecar) or
+        is GNU sparse; those containers are staged and validated whole.
+        """
+        by_name = {item["name"]: item for item in sidecar.expected_members
+                   if item.get("source_exception") is None}
+        selection = []
+        for record in records:
+            name = validate_tar_member_name(
+                record.get("member_name") or record.get("stored_path"))
+            item = by_name.get(name)
+            if item is None:
+                raise StoredTarError(
+                    "selected TAR member is absent from validated sidecar: "
+                    f"{name!r}")
+            size = record.get("file_size_bytes")
+            if size is not None and int(size) != item["logical_size"]:
+                raise StoredTarError(
+                    f"catalog/sidecar size mismatch for {name!r}")
+            if item.get("data_offset") is None or item.get("sparse"):
+                return None
+            selection.append((record, item))
+        selection.sort(key=lambda pair: pair[1]["data_offset"])
+        return selection
+
+    def _restore_tar_byte_ranges(self, tape_path, selection,
+                                 restore_base=None):
+        """Read only the selected members' bytes from the TAR on tape.
+
+        Each member's headers are reparsed at its sidecar offset and its data
+        is bounded by the sidecar size, so a stale or damaged sidecar fails
+        closed instead of restoring the wrong bytes.
+        """
+        restored = 0
+        _acquire_tape_io_lock(f"restore {os.path.basename(tape_path)}")
+        try:
+            with open(tape_path, "rb") as tar_stream:
+                for record, item in selection:
+                    self._check_cancelled()
+                    source = open_stored_tar_member(
+                        tar_stream, header_offset=item["header_offset"],
+                        data_offset=item["data_offset"], name=item["name"],
+                        logical_size=item["logical_size"])
+                    dst = self._destination_for_record(
+                        record, restore_base=restore_base)
+                    dst_dir = os.path.dirname(os.path.abspath(dst))
+                    os.makedirs(dst_dir, exist_ok=True)
+                    temp_path = os.path.join(
+                        dst_dir, f".restore_tar_{uuid.uuid4().hex}.part")
+                    try:
+                        with source, open(temp_path, "xb") as output:
+                            self._copy_verified_tar_stream(
+                                source, output, item["logical_size"],
+                                self._tar_member_digest(record, item))
+                        self._check_cancelled()
+                        published = self._publish_temp_no_clobber(temp_path, dst)
+                        print(f"[OK] {record['file_name']} -> {published}")
+                        restored += 1
+                    finally:
+                        try:
+                            os.remove(temp_path)
+                        except FileNotFoundError:
+                            pass
+        finally:
+            _release_tape_io_lock()
+        return restored
+
     def _restore_container(self, records, restore_base=None, sidecar=None):
         """Restore one explicitly selected persisted container."""
         if not records:
@@ -770,6 +939,17 @@ class LTORetriever:
                 raise RuntimeError(
                     "[RESTORE] Stored TAR has neither an available local "
                     "locator nor a tape locator")
+            if self.byte_range_tar_restore:
+                try:
+                    selection = self._byte_range_selection(records, sidecar)
+                    if selection is not None:
+                        return self._restore_tar_byte_ranges(
+                            tape_path, selection, restore_base=restore_base)
+                except (StoredTarError, OSError, RuntimeError) as exc:
+                    if CANCEL.is_set():
+                        raise
+                    print(f"[ERROR] Stored TAR restore refused: {exc}")
+                    return 0
             os.makedirs(self.staging_dir, exist_ok=True)
             local_tar = os.path.join(
                 self.staging_dir,
@@ -802,31 +982,141 @@ class LTORetriever:
                 except OSError:
                     pass
 
-    def _restore_packed(self, record, restore_base=None):
-        # Full path of the ZIP on tape, remapped to the current drive letter.
-        tape_zip_path = self._resolve_tape_path(record['container_name'])
-        stored_in_zip = record['stored_path']       # relative path inside the ZIP
-        local_zip     = os.path.join(self.staging_dir, os.path.basename(tape_zip_path))
+    @contextmanager
+    def _bundle_zip(self, tape_zip_path):
+        """Open a bundle ZIP for extraction; yields None if it is unreadable.
 
-        print(f"\n[RESTORE] Packed file inside {os.path.basename(tape_zip_path)}")
-        print("[RESTORE] Step 1/3: Copying ZIP from tape to staging...")
+        Bundles are read in place on tape by default: ``zipfile`` reads the
+        central directory from the end of the file, then seeks to each
+        requested local header and streams only that payload, checking its
+        CRC-32. The tape I/O lock is held for the whole extraction. If the
+        bundle cannot be opened in place, the old path copies it whole to
+        staging first.
+        """
+        name = os.path.basename(tape_zip_path)
+        if self.stream_zip_restore:
+            _acquire_tape_io_lock(f"restore {name}")
+            try:
+                try:
+                    zf = zipfile.ZipFile(tape_zip_path, "r")
+                except (OSError, zipfile.BadZipFile) as exc:
+                    print(f"[WARN] Cannot read {name} in place on tape "
+                          f"({exc}); copying it to staging instead.")
+                    zf = None
+                if zf is not None:
+                    print(f"[RESTORE] Reading {name} in place on tape...")
+                    with zf:
+                        yield zf
+                    return
+            finally:
+                _release_tape_io_lock()
 
+        local_zip = os.path.join(self.staging_dir, name)
+        print(f"[RESTORE] Copying {name} from tape to staging...")
         os.makedirs(self.staging_dir, exist_ok=True)
         if not self._bundle_staging_space_ok(tape_zip_path):
+            yield None
             return
-        _acquire_tape_io_lock(f"restore {os.path.basename(tape_zip_path)}")
+        _acquire_tape_io_lock(f"restore {name}")
         try:
             ok = _robocopy_file(tape_zip_path, local_zip)
         finally:
             _release_tape_io_lock()
         if not ok:
             print("[ERROR] Could not copy ZIP from tape: robocopy error")
+            yield None
             return
+        try:
+            with zipfile.ZipFile(local_zip, 'r') as zf:
+                yield zf
+        finally:
+            try:
+                os.remove(local_zip)
+            except OSError:
+                pass
+
+    def _extract_zip_entry(self, zf, entry, dst):
+        """Stream one entry to ``dst``; a failed CRC-32 leaves no file behind."""
+        try:
+            with zf.open(entry) as zf_src, open(dst, 'wb') as out:
+                shutil.copyfileobj(zf_src, out, 1024 * 1024)
+        except BaseException:
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _zip_index_usable(records):
+        """True when the catalog located every record inside its bundle."""
+        return all(record.get(name) is not None for record in records
+                   for name in ("zip_header_offset", "zip_data_offset",
+                                "zip_stored_size", "zip_crc32"))
+
+    def _restore_zip_by_index(self, tape_zip_path, records, restore_base=None):
+        """Read catalog-located members straight from the bundle on tape.
+
+        Members are read in local-header order without touching the central
+        directory. Returns the records that could not be read this way so the
+        caller can retry them through the central directory.
+        """
+        name = os.path.basename(tape_zip_path)
+        print(f"[RESTORE] Reading {len(records)} indexed member(s) of {name}...")
+        failed = []
+        _acquire_tape_io_lock(f"restore {name}")
+        try:
+            try:
+                raw = open(tape_zip_path, "rb")
+            except OSError as exc:
+                print(f"[WARN] Cannot open {name} on tape: {exc}")
+                return list(records)
+            with raw:
+                for record in sorted(
+                        records, key=lambda item: int(item['zip_header_offset'])):
+                    self._check_cancelled()
+                    dst = self._destination_for_record(
+                        record, restore_base=restore_base)
+                    try:
+                        os.makedirs(os.path.dirname(dst), exist_ok=True)
+                        with open_zip_member(
+                                raw, header_offset=record['zip_header_offset'],
+                                data_offset=record['zip_data_offset'],
+                                name=record['stored_path'],
+                                stored_size=record['zip_stored_size'],
+                                crc32=record['zip_crc32']) as member, \
+                                open(dst, 'wb') as out:
+                            shutil.copyfileobj(member, out, 1024 * 1024)
+                    except (OSError, ZipMemberError) as exc:
+                        try:
+                            os.remove(dst)
+                        except OSError:
+                            pass
+                        print(f"[WARN] {record['file_name']}: indexed read "
+                              f"failed ({exc}); using the ZIP directory.")
+                        failed.append(record)
+                        continue
+                    print(f"[OK] {record['file_name']}")
+        finally:
+            _release_tape_io_lock()
+        return failed
+
+    def _restore_packed(self, record, restore_base=None):
+        # Full path of the ZIP on tape, remapped to the current drive letter.
+        tape_zip_path = self._resolve_tape_path(record['container_name'])
+        stored_in_zip = record['stored_path']       # relative path inside the ZIP
 
-        print(f"[RESTORE] Step 2/3: Extracting '{record['file_name']}' from ZIP...")
+        print(f"\n[RESTORE] Packed file inside {os.path.basename(tape_zip_path)}")
+        if (self.stream_zip_restore and self._zip_index_usable([record])
+                and not self._restore_zip_by_index(
+                    tape_zip_path, [record], restore_base)):
+            return
         dst = self._destination_for_record(record, restore_base=restore_base)
         try:
-            with zipfile.ZipFile(local_zip, 'r') as zf:
+            with self._bundle_zip(tape_zip_path) as zf:
+                if zf is None:
+                    return
+                print(f"[RESTORE] Extracting '{record['file_name']}' from ZIP...")
                 entry, warn, err = self._resolve_zip_entry(
                     zf.namelist(), stored_in_zip, record['file_name'])
                 if err:
@@ -838,44 +1128,37 @@ class LTORetriever:
                 if warn:
                     print(f"[WARN] {warn}")
                 os.makedirs(os.path.dirname(dst), exist_ok=True)
-                with zf.open(entry) as zf_src, open(dst, 'wb') as out:
-                    shutil.copyfileobj(zf_src, out)
+                self._extract_zip_entry(zf, entry, dst)
             print(f"[RESTORE] Saved to: {dst}")
         except Exception as e:
             print(f"[ERROR] Extraction failed: {e}")
-        finally:
-            print("[RESTORE] Step 3/3: Removing staging ZIP...")
-            try:
-                os.remove(local_zip)
-            except OSError:
-                pass
 
     def _restore_packed_bulk(self, tape_zip_path, records, restore_base=None):
         """Extract multiple files from a single ZIP bundle in one pass."""
         tape_zip_path = self._resolve_tape_path(tape_zip_path)
-        local_zip = os.path.join(self.staging_dir, os.path.basename(tape_zip_path))
-        print(f"\n[RESTORE] Copying {os.path.basename(tape_zip_path)} from tape to staging...")
-        os.makedirs(self.staging_dir, exist_ok=True)
-        if not self._bundle_staging_space_ok(tape_zip_path):
-            return
-        _acquire_tape_io_lock(f"restore {os.path.basename(tape_zip_path)}")
-        try:
-            ok = _robocopy_file(tape_zip_path, local_zip)
-        finally:
-            _release_tape_io_lock()
-        if not ok:
-            print("[ERROR] Could not copy ZIP from tape: robocopy error")
-            return
-        print(f"[RESTORE] Extracting {len(records)} file(s)...")
+        print(f"\n[RESTORE] Extracting {len(records)} file(s) from "
+              f"{os.path.basename(tape_zip_path)}...")
+        if self.stream_zip_restore:
+            indexed = [record for record in records
+                       if self._zip_index_usable([record])]
+            if indexed:
+                failed = self._restore_zip_by_index(
+                    tape_zip_path, indexed, restore_base)
+                retry = {id(record) for record in failed}
+                records = [record for record in records
+                           if id(record) in retry
+                           or not self._zip_index_usable([record])]
+                if not records:
+                    return
         try:
-            with zipfile.ZipFile(local_zip, 'r') as zf:
+            with self._bundle_zip(tape_zip_path) as zf:
+                if zf is None:
+                    return
                 zip_names = zf.namelist()
+                resolved = []
                 for record in records:
-                    stored_in_zip = record['stored_path']
-                    dst = self._destination_for_record(record,
-                                                       restore_base=restore_base)
                     entry, warn, err = self._resolve_zip_entry(
-                        zip_names, stored_in_zip, record['file_name'])
+                        zip_names, record['stored_path'], record['file_name'])
                     if err:
                         print(f"[ERROR] {err}")
                         continue
@@ -884,20 +1167,24 @@ class LTORetriever:
                         continue
                     if warn:
                         print(f"[WARN] {warn}")
+                    resolved.append((zf.getinfo(entry).header_offset,
+                                     entry, record))
+                # Local headers in file order: one forward pass over the tape.
+                resolved.sort(key=lambda item: item[0])
+                for _offset, entry, record in resolved:
+                    self._check_cancelled()
+                    dst = self._destination_for_record(record,
+                                                       restore_base=restore_base)
                     try:
                         os.makedirs(os.path.dirname(dst), exist_ok=True)
-                        with zf.open(entry) as zf_src, open(dst, 'wb') as out:
-                            shutil.copyfileobj(zf_src, out)
+                        self._extract_zip_entry(zf, entry, dst)
                         print(f"[OK] {record['file_name']}")
                     except Exception as e:
                         print(f"[ERROR] {record['file_name']}: {e}")
         except Exception as e:
+            if CANCEL.is_set():
+                raise
             print(f"[ERROR] ZIP extraction failed: {e}")
-        finally:
-            try:
-                os.remove(local_zip)
-            except OSError:
-                pass
 
     # ------------------------------------------------------------------
     # Bundle-complete directory restore (includes small files with no
@@ -965,7 +1252,8 @@ class LTORetriever:
             self._check_cancelled()
             if any(self._record_needs_tape(b) for b in tape_bundles):
                 self._verify_tape(tape_label)
-            for bundle in tape_bundles:
+            # Visit containers in the order they were written to this tape.
+            for bundle in sorted(tape_bundles, key=write_order_key):
                 total += self._extract_container_subtree(
                     bundle, needle, restore_base)
         print(f"\n[RESTORE] Directory restore complete: {total} file(s) "
@@ -1003,28 +1291,18 @@ class LTORetriever:
 
     def _extract_bundle_subtree(self, tape_zip_path, base_path, dir_path,
                                 restore_base):
-        """Copy one bundle ZIP from tape and extract only the entries whose
+        """Open one bundle ZIP from tape and extract only the entries whose
         reconstructed source path is under ``dir_path``. Returns the count."""
         tape_zip_path = self._resolve_tape_path(tape_zip_path)
-        local_zip = os.path.join(
-            self.staging_dir, os.path.basename(tape_zip_path))
-        print(f"\n[RESTORE] Copying {os.path.basename(tape_zip_path)} "
-              "from tape to staging...")
-        os.makedirs(self.staging_dir, exist_ok=True)
-        if not self._bundle_staging_space_ok(tape_zip_path):
-            return 0
-        _acquire_tape_io_lock(f"restore {os.path.basename(tape_zip_path)}")
-        try:
-            ok = _robocopy_file(tape_zip_path, local_zip)
-        finally:
-            _release_tape_io_lock()
-        if not ok:
-            print("[ERROR] Could not copy ZIP from tape: robocopy error")
-            return 0
+        print(f"\n[RESTORE] Restoring from {os.path.basename(tape_zip_path)}...")
         extracted = 0
         try:
-            with zipfile.ZipFile(local_zip, 'r') as zf:
-                for entry in zf.namelist():
+            with self._bundle_zip(tape_zip_path) as zf:
+                if zf is None:
+                    return 0
+                for info in sorted(zf.infolist(),
+                                   key=lambda item: item.header_offset):
+                    entry = info.filename
                     if entry.endswith("/"):
                         continue
                     canonical = self._canonical_from_zip_entry(base_path, entry)
@@ -1038,19 +1316,13 @@ class LTORetriever:
                         self.restore_dir, self._safe_restore_relpath(rel)))
                     os.makedirs(os.path.dirname(os.path.abspath(dst)),
                                 exist_ok=True)
-                    with zf.open(entry) as zsrc, open(dst, "wb") as out:
-                        shutil.copyfileobj(zsrc, out)
+                    self._extract_zip_entry(zf, entry, dst)
                     extracted += 1
                     if extracted % 500 == 0:
                         print(f"[RESTORE] {extracted} file(s) extracted...")
         except Exception as e:
             print(f"[ERROR] Extraction failed for "
                   f"{os.path.basename(tape_zip_path)}: {e}")
-        finally:
-            try:
-                os.remove(local_zip)
-            except OSError:
-                pass
         print(f"[RESTORE] {os.path.basename(tape_zip_path)}: "
               f"{extracted} file(s) extracted.")
         return extracted
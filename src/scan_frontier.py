@@ -11,6 +11,7 @@ diagnostic support only; no production module imports it.
 """
 import os
 import posixpath
+import threading
 import time
 import uuid
 
@@ -363,7 +364,8 @@ class DirectoryFrontierCoordinator:
 
     def __init__(self, *, db, session_id, scan_paths, archive_root,
                  scanner_factory, stop_event, owner_token=None, ui=None,
-                 metrics=None, max_directories=None):
+                 metrics=None, max_directories=None, batch_size=1, workers=1,
+                 lease_seconds=900):
         self.db = db
         self.session_id = session_id
         self.scan_paths = list(scan_paths)
@@ -375,20 +377,54 @@ class DirectoryFrontierCoordinator:
         self.metrics = metrics
         #: Test/pilot bound on how many directories one run may process.
         self.max_directories = max_directories
+        #: Directories claimed, listed and committed together. ``1`` is the
+        #: original one-directory round trip.
+        self.batch_size = max(1, int(batch_size or 1))
+        #: Threads draining the frontier concurrently, each with its own
+        #: scanner (and so its own SSH channel).
+        self.workers = max(1, int(workers or 1))
+        #: How long a claim survives without a heartbeat. A live run renews
+        #: every third of this; an expired claim is reclaimed by any worker.
+        self.lease_seconds = lease_seconds
 
         self.attempt_id = None
         self.directories_listed = 0
         self.segments_published = 0
-        self._scanner = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._scanners = {}
+        self._busy = 0
+        self._reserved = 0
+        self._halt = threading.Event()
+        self._failure = None
 
     # -- setup ------------------------------------------------------------
     def _stopping(self):
         return CANCEL.is_set() or self.stop_event.is_set()
 
     def scanner(self):
-        if self._scanner is None:
-            self._scanner = self._scanner_factory(self.metrics)
-        return self._scanner
+        """The calling thread's scanner: every worker lists over its own."""
+        key = threading.get_ident()
+        with self._lock:
+            scanner = self._scanners.get(key)
+            if scanner is None:
+                scanner = self._scanners[key] = self._scanner_factory(
+                    self.metrics)
+        return scanner
+
+    def close_scanner(self):
+        """Release every scanner's persistent connection, if it holds one."""
+        with self._lock:
+            scanners, self._scanners = list(self._scanners.values()), {}
+        for scanner in scanners:
+            closer = getattr(scanner, "close", None)
+            if closer is None:
+                continue
+            try:
+                closer()
+            except Exception:
+                get_logger().warning("could not close the scanner session",
+                                     exc_info=True)
 
     def establish_scopes(self):
         """Canonicalize, reject overlap, reconcile against persisted order."""
@@ -427,7 +463,8 @@ class DirectoryFrontierCoordinator:
         frontier had nothing claimable.
         """
         claimed = self.db.claim_next_directory(
-            self.session_id, self.owner_token, self.attempt_id)
+            self.session_id, self.owner_token, self.attempt_id,
+            lease_seconds=self.lease_seconds)
         if claimed is None:
             return False
 
@@ -470,11 +507,112 @@ class DirectoryFrontierCoordinator:
             direct_byte_count=listing.byte_count,
             observation_after=listing.observation,
             error_count=len(listing.errors))
-        self.directories_listed += 1
+        with self._lock:
+            self.directories_listed += 1
         return True
 
+    def process_directories(self):
+        """Process the next batch; return how many directories it covered.
+
+        Dispatches to :meth:`process_directory_batch` when batching is
+        configured and the database can claim several directories at once,
+        otherwise to :meth:`process_one_directory`. Never claims past
+        ``max_directories``, counting what other workers have in flight. ``0``
+        means nothing was claimed.
+        """
+        with self._lock:
+            limit = self.batch_size
+            if self.max_directories is not None:
+                limit = min(limit, self.max_directories
+                            - self.directories_listed - self._reserved)
+            if limit <= 0:
+                return 0
+            self._reserved += limit
+        try:
+            if limit == 1 or not hasattr(self.db, "claim_directories"):
+                return 1 if self.process_one_directory() else 0
+            return self.process_directory_batch(limit)
+        finally:
+            with self._lock:
+                self._reserved -= limit
+
+    def process_directory_batch(self, limit):
+        """Claim, list, publish and commit up to ``limit`` directories at once.
+
+        One claim, one remote listing and one database commit for the whole
+        batch instead of one of each per directory. The crash-safety contract
+        is unchanged: every directory still gets its OWN segment artifact,
+        written before the commit that points at it, and the commit covers the
+        batch atomically — so a crash replays at most the batch that was in
+        flight, every member of which is then ``partial`` or still leased.
+        """
+        claimed = self.db.claim_directories(
+            self.session_id, self.owner_token, self.attempt_id, limit,
+            lease_seconds=self.lease_seconds)
+        if not claimed:
+            return 0
+
+        try:
+            listings = self.scanner().list_directories(
+                [row["canonical_path"] for row in claimed])
+        except Exception as exc:
+            self._release_batch(claimed, "listing_failed", str(exc))
+            raise
+
+        commits = []
+        try:
+            for row, listing in zip(claimed, listings):
+                directory_id = row["scan_directory_id"]
+                segment = (self._write_segment_artifact(directory_id, listing)
+                           if listing.files else None)
+                base = int(row["traversal_ordinal"]) + 1
+                commits.append({
+                    "scan_directory_id": directory_id,
+                    "scan_scope_id": row["scan_scope_id"],
+                    "segment": segment,
+                    "children": [(child, base + offset) for offset, child
+                                 in enumerate(listing.directories)],
+                    "errors": list(listing.errors),
+                    "direct_file_count": listing.file_count,
+                    "direct_byte_count": listing.byte_count,
+                    "observation_after": listing.observation,
+                })
+        except Exception:
+            # The artifact writer has already recorded what failed; the rest
+            # of the batch is released untouched so the next run retries it.
+            self._release_batch(claimed)
+            raise
+
+        self.db.commit_directory_listings(self.owner_token, commits)
+        with self._lock:
+            self.segments_published += sum(
+                1 for commit in commits if commit["segment"] is not None)
+            self.directories_listed += len(claimed)
+        return len(claimed)
+
+    def _release_batch(self, claimed, category=None, message=None):
+        """Mark every claimed directory partial; optionally record why."""
+        for row in claimed:
+            self.db.mark_directory_partial(row["scan_directory_id"],
+                                           self.owner_token)
+            if category is not None:
+                self.db.record_scan_error(
+                    scan_directory_id=row["scan_directory_id"],
+                    category=category, path=row["canonical_path"],
+                    message=message)
+
     def _publish_segment(self, directory_id, listing):
-        """Write the artifact, then record it. In that order, always.
+        """Write the artifact, then record it. In that order, always."""
+        segment = self._write_segment_artifact(directory_id, listing)
+        self.db.publish_scan_segment(directory_id, **segment)
+        with self._lock:
+            self.segments_published += 1
+
+    def _write_segment_artifact(self, directory_id, listing):
+        """Write (or reuse) one directory's artifact; return its range.
+
+        The returned mapping is the keyword arguments
+        :meth:`~src.pg_scan.PgScanMixin.publish_scan_segment` records.
 
         A directory that was invalidated and re-listed will find its previous
         artifact already published. That is reused **only after complete
@@ -514,12 +652,11 @@ class DirectoryFrontierCoordinator:
             first_path = writer.first_path
             last_path = writer.last_path
 
-        self.db.publish_scan_segment(
-            directory_id, first_scan_ordinal=first_ordinal,
-            last_scan_ordinal=last_ordinal, locator=locator,
-            file_count=file_count, byte_count=byte_count,
-            first_canonical_path=first_path, last_canonical_path=last_path)
-        self.segments_published += 1
+        return {"first_scan_ordinal": first_ordinal,
+                "last_scan_ordinal": last_ordinal, "locator": locator,
+                "file_count": file_count, "byte_count": byte_count,
+                "first_canonical_path": first_path,
+                "last_canonical_path": last_path}
 
     def _reuse_equivalent_artifact(self, locator, expected):
         """``(first, last, files, bytes)`` if an identical artifact exists.
@@ -548,22 +685,128 @@ class DirectoryFrontierCoordinator:
                 totals["last_scan_ordinal"] or 0,
                 totals["file_count"], totals["byte_count"])
 
+    # -- the worker pool --------------------------------------------------
+    def _capped(self):
+        return (self.max_directories is not None
+                and self.directories_listed >= self.max_directories)
+
+    def drain(self, between_batches=None):
+        """List directories until the frontier is empty, capped or stopped.
+
+        The calling thread is worker 0; ``workers - 1`` more threads run
+        beside it, each with its own scanner. They claim disjoint directories
+        through the database's ``SKIP LOCKED`` claims, and a heartbeat renews
+        their leases so a slow listing is never mistaken for a dead one.
+
+        An idle worker does not stop while another is still listing: that
+        listing may enqueue children. The run is over when a worker finds
+        nothing claimable and no other worker is mid-batch.
+
+        ``between_batches`` is called by worker 0 only, after each of its
+        batches; returning ``False`` halts every worker. Returns ``False``
+        when it did. The first worker error halts the pool and is re-raised
+        once every worker has stopped.
+        """
+        self._halt.clear()
+        self._failure = None
+        self._note_metrics("note_scan_workers", self.workers)
+        heartbeat_stop = threading.Event()
+        heartbeat = None
+        if hasattr(self.db, "renew_directory_leases"):
+            heartbeat = threading.Thread(
+                target=self._renew_leases, args=(heartbeat_stop,),
+                name="scan-lease-heartbeat", daemon=True)
+            heartbeat.start()
+        helpers = [threading.Thread(target=self._work, args=(index,),
+                                    name=f"scan-worker-{index}", daemon=True)
+                   for index in range(1, self.workers)]
+        for thread in helpers:
+            thread.start()
+        halted_by_caller = False
+        try:
+            halted_by_caller = not self._work(0, between_batches)
+        finally:
+            if halted_by_caller:
+                self._halt.set()
+            for thread in helpers:
+                thread.join()
+            heartbeat_stop.set()
+            if heartbeat is not None:
+                heartbeat.join(timeout=5)
+        if self._failure is not None:
+            raise self._failure
+        return not halted_by_caller
+
+    def _work(self, index, between_batches=None):
+        """One worker's loop. ``False`` when ``between_batches`` halted it."""
+        while not (self._stopping() or self._halt.is_set() or self._capped()):
+            with self._lock:
+                self._busy += 1
+            started = time.monotonic()
+            try:
+                processed = self.process_directories()
+            except BaseException as exc:
+                with self._lock:
+                    if self._failure is None:
+                        self._failure = exc
+                self._halt.set()
+                return True
+            finally:
+                with self._idle:
+                    self._busy -= 1
+                    self._idle.notify_all()
+            if processed:
+                self._note_metrics("note_worker_directories", index,
+                                   processed, time.monotonic() - started)
+            if between_batches is not None:
+                try:
+                    keep_going = between_batches()
+                except BaseException as exc:
+                    with self._lock:
+                        if self._failure is None:
+                            self._failure = exc
+                    self._halt.set()
+                    return True
+                if not keep_going:
+                    return False
+            if processed:
+                continue
+            with self._idle:
+                if self._busy == 0:
+                    return True
+                self._idle.wait(timeout=0.5)
+        return True
+
+    def _renew_leases(self, stop):
+        interval = max(0.05, float(self.lease_seconds) / 3)
+        while not stop.wait(interval):
+            try:
+                self.db.renew_directory_leases(
+                    self.owner_token, lease_seconds=self.lease_seconds)
+            except Exception:
+                get_logger().warning("could not renew scan directory leases",
+                                     exc_info=True)
+
+    def _note_metrics(self, method, *args):
+        if self.metrics is None:
+            return
+        try:
+            getattr(self.metrics, method)(*args)
+        except Exception:               # never fail a scan for a counter
+            pass
+
     # -- the run ----------------------------------------------------------
     def run(self):
         """Drain the directory frontier, then sweep and finalize."""
         self.attempt_id = self._start_attempt()
         try:
             self.establish_scopes()
-            while not self._stopping():
-                if (self.max_directories is not None
-                        and self.directories_listed >= self.max_directories):
-                    break
-                if not self.process_one_directory():
-                    break
+            self.drain()
             if not self._stopping():
                 self.final_mutation_sweep()
                 self.finalize()
         finally:
+            self.close_scanner()
             if self.attempt_id is not None:
                 try:
                     self.db.finish_worker_attempt(
@@ -940,8 +1183,8 @@ class FrontierScanCoordinator:
                  legacy_session=False, publication_gate=None,
                  on_chunk_published=None, on_budget_exceeded=None,
                  on_scan_error=None, on_finished=None, ui=None,
-                 max_directories=None, owner_token=None,
-                 stored_tar_write_enabled=False,
+                 max_directories=None, owner_token=None, batch_size=1,
+                 workers=1, stored_tar_write_enabled=False,
                  stored_tar_reader_contract_version=None):
         self.db = db
         self.session_id = session_id
@@ -957,7 +1200,8 @@ class FrontierScanCoordinator:
             archive_root=archive_root, scanner_factory=scanner_factory,
             stop_event=stop_event, owner_token=owner_token, ui=ui,
             metrics=getattr(state, "metrics", None),
-            max_directories=max_directories)
+            max_directories=max_directories, batch_size=batch_size,
+            workers=workers)
         self.publisher = SegmentChunkPublisher(
             db=db, session_id=session_id, archive_root=archive_root,
             builder_factory=builder_factory, legacy_session=legacy_session,
@@ -1060,16 +1304,8 @@ class FrontierScanCoordinator:
         self.frontier.attempt_id = self.frontier._start_attempt()
         try:
             self.frontier.establish_scopes()
-            while not self._stopping():
-                claimed = self.frontier.process_one_directory()
-                if not self._publish():
-                    return                     # gate or budget stopped us
-                if not claimed:
-                    break
-                if (self.frontier.max_directories is not None
-                        and self.frontier.directories_listed
-                        >= self.frontier.max_directories):
-                    break
+            if not self.frontier.drain(between_batches=self._publish):
+                return                         # gate or budget stopped us
             if self._stopping():
                 return
             self.frontier.final_mutation_sweep()
@@ -1094,6 +1330,7 @@ class FrontierScanCoordinator:
                 raise
             self._on_scan_error(exc)
         finally:
+            self.frontier.close_scanner()
             attempt_id = self.frontier.attempt_id
             if attempt_id is not None:
                 try:
@@ -1109,14 +1346,18 @@ class FrontierScanCoordinator:
 
 def build_frontier_scanner_factory(*, remote_user, remote_host,
                                    remote_password, skipped_tracker, ui,
-                                   timeout=None):
-    """A ``scanner_factory`` producing the immediate-child directory scanner."""
+                                   timeout=None, persistent_session=False):
+    """A ``scanner_factory`` producing the immediate-child directory scanner.
+
+    ``persistent_session`` makes every listing from one scanner share a single
+    SSH connection instead of opening one per directory.
+    """
 
     def factory(metrics):
         return DirectoryFrontierScanner(
             remote_user, remote_host, remote_password=remote_password,
             timeout=timeout, skipped_tracker=skipped_tracker, ui=ui,
-            metrics=metrics)
+            metrics=metrics, persistent_session=persistent_session)
     return factory
 
 
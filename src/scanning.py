@@ -1,13 +1,16 @@
 """Remote find scanners: batch and streaming manifest discovery over SSH."""
 import codecs
 import posixpath
+import queue
 import re
 import shlex
 import subprocess
 import threading
 import time
 
-from .remote_transport import _ssh_run, _ssh_stream_command
+from .logsetup import get_logger
+from .remote_transport import (_bounded_stderr_reader, _ssh_run,
+                               _ssh_stream_command)
 from .runtime import CANCEL, _kill_proc_tree, register_proc, unregister_proc
 from .skipped import SkippedFileTracker
 from .ui import ConsoleUI
@@ -191,6 +194,320 @@ class DirectoryListing:
         return sum(size for _path, size in self.files)
 
 
+#: The same two requests, served by ONE long-lived remote shell instead of one
+#: SSH connection per directory. Requests arrive as ``op\0path\0`` pairs on
+#: stdin; every response is the record stream the one-shot command would have
+#: printed, then an ``END <rc>`` terminator. ``find`` stderr is captured per
+#: request and returned as one ``ERR`` record, so a permission warning is still
+#: attributed to the directory that produced it. Neither prefix can collide
+#: with an entry record, whose second character is always a space.
+_LISTING_SESSION_SCRIPT = (
+    "while IFS= read -r -d '' op && IFS= read -r -d '' dir; do "
+    "case \"$op\" in "
+    "L) printf 'OBS %s\\0' \"$(stat -c %Y:%Z:%i -- \"$dir\" 2>/dev/null || "
+    "printf unknown)\"; "
+    "{ err=$(find \"$dir\" -mindepth 1 -maxdepth 1 -printf '%y %s %p\\0' "
+    "2>&1 >&3 3>&-); rc=$?; } 3>&1; "
+    "if [ -n \"$err\" ]; then printf 'ERR %s\\0' \"$err\"; fi; "
+    "printf 'END %s\\0' \"$rc\";; "
+    "O) printf '%s\\0' \"$(stat -c %Y:%Z:%i -- \"$dir\" 2>/dev/null || "
+    "printf unknown)\"; printf 'END 0\\0';; "
+    "*) printf 'END 2\\0';; "
+    "esac; done"
+)
+
+_SESSION_LIST = 'L'
+_SESSION_OBSERVE = 'O'
+
+#: Several directories in ONE one-shot command: each one produces exactly the
+#: section a session ``L`` request does (``OBS``, entries, ``ERR``, ``END``),
+#: so both transports feed the same per-directory parser and a warning stays
+#: attributed to the directory whose ``find`` printed it.
+_LIST_DIRECTORIES_SCRIPT = (
+    'for dir in "$@"; do '
+    'printf "OBS %s\\0" "$(stat -c %Y:%Z:%i -- "$dir" 2>/dev/null || '
+    'printf unknown)"; '
+    '{ err=$(find "$dir" -mindepth 1 -maxdepth 1 -printf "%y %s %p\\0" '
+    '2>&1 >&3 3>&-); rc=$?; } 3>&1; '
+    'if [ -n "$err" ]; then printf "ERR %s\\0" "$err"; fi; '
+    'printf "END %s\\0" "$rc"; '
+    'done'
+)
+
+
+def _split_listing_sections(stdout):
+    """Split batched listing output into ``(records, rc, stderr)`` sections.
+
+    A trailing section without its ``END`` terminator was cut off and is not
+    returned: the caller compares the count with what it asked for.
+    """
+    sections, records, errors = [], [], []
+    for record in stdout.split('\0'):
+        if not record:
+            continue
+        if record.startswith('END '):
+            try:
+                rc = int(record[4:].strip())
+            except ValueError:
+                rc = 1
+            sections.append((records, rc, '\n'.join(errors)))
+            records, errors = [], []
+        elif record.startswith('ERR '):
+            errors.append(record[4:])
+        else:
+            records.append(record)
+    return sections
+
+
+class ListingSessionUnavailable(RuntimeError):
+    """The remote side cannot run the listing loop (e.g. no ``bash``).
+
+    Raised only when a FRESH session exits before answering anything without
+    an SSH-level failure, so the caller can fall back to one command per
+    directory instead of failing a scan the per-call path would complete.
+    """
+
+
+class RemoteListingSession:
+    """One SSH connection that answers listing requests until it is closed.
+
+    The per-directory scanner pays a full TCP+SSH handshake for every
+    directory and every observation re-check; on a 500k-directory tree that
+    handshake, not ``find``, is the scan. This keeps one ``ssh`` process open
+    running :data:`_LISTING_SESSION_SCRIPT` and sends it one request at a time.
+
+    :meth:`request` returns a :class:`subprocess.CompletedProcess` shaped
+    exactly like :func:`~src.remote_transport._ssh_run`'s, so the caller's
+    parsing and its partial/timeout rules do not change:
+
+    * a request that outlives ``timeout`` returns exit ``124`` with whatever
+      partial output arrived, and the session is discarded — its stream is
+      mid-response and cannot be trusted for the next request;
+    * a session that dies mid-request returns exit ``255``. A session that had
+      already served requests is reconnected and the request retried ONCE,
+      because a long-idle connection dropped by the network is expected; a
+      fresh connection that dies is reported, not retried.
+
+    One request at a time: the lock serialises callers, since the framing has
+    no request identifiers.
+    """
+
+    def __init__(self, remote_user, remote_host, remote_password='',
+                 timeout=None, cipher='', on_connect=None):
+        self.remote_user = remote_user
+        self.remote_host = remote_host
+        self.remote_password = remote_password
+        self.timeout = timeout
+        self.cipher = cipher
+        self._on_connect = on_connect
+        self._lock = threading.Lock()
+        self._proc = None
+        self._records = None
+        self._stderr_chunks = []
+        self._threads = []
+        self._served = 0
+        self.connects = 0
+        self.requests = 0
+
+    @staticmethod
+    def command():
+        return "LC_ALL=C bash -c " + shlex.quote(_LISTING_SESSION_SCRIPT)
+
+    # -- connection -------------------------------------------------------
+    def _connect(self):
+        ssh_cmd, env, err = _ssh_stream_command(
+            self.remote_user, self.remote_host, self.command(),
+            password=self.remote_password, cipher=self.cipher)
+        if err:
+            return err
+        if ssh_cmd is None:
+            return "no SSH command produced"
+        proc = subprocess.Popen(
+            ssh_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, env=env)
+        register_proc(proc)
+        records = queue.Queue()
+        stderr_chunks = []
+
+        def _read_records():
+            pending = bytearray()
+            try:
+                while True:
+                    block = proc.stdout.read1(65536)
+                    if not block:
+                        break
+                    pending.extend(block)
+                    while True:
+                        marker = pending.find(0)
+                        if marker < 0:
+                            break
+                        records.put(bytes(pending[:marker]).decode(
+                            'utf-8', errors='replace'))
+                        del pending[:marker + 1]
+            except (OSError, ValueError):
+                pass
+            finally:
+                records.put(None)
+
+        reader = threading.Thread(target=_read_records,
+                                  name='listing-session-stdout', daemon=True)
+        drainer = threading.Thread(
+            target=_bounded_stderr_reader,
+            args=(proc.stderr, stderr_chunks, {}),
+            name='listing-session-stderr', daemon=True)
+        reader.start()
+        drainer.start()
+        self._proc = proc
+        self._records = records
+        self._stderr_chunks = stderr_chunks
+        self._threads = [reader, drainer]
+        self._served = 0
+        self.connects += 1
+        if self._on_connect is not None:
+            try:
+                self._on_connect()
+            except Exception:           # never fail a scan for a counter
+                pass
+        return None
+
+    def _discard(self, kill=False):
+        """Tear the current connection down; return its exit code."""
+        proc = self._proc
+        if proc is None:
+            return None
+        self._proc = None
+        if kill:
+            _kill_proc_tree(proc)
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            rc = proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            _kill_proc_tree(proc)
+            rc = proc.wait()
+        unregister_proc(proc)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        return rc
+
+    def _stderr_text(self):
+        return b''.join(self._stderr_chunks).decode(
+            'utf-8', errors='replace').strip()
+
+    def close(self):
+        with self._lock:
+            self._discard()
+
+    # -- requests ---------------------------------------------------------
+    def request(self, op, path):
+        """Send one request; return a ``CompletedProcess``-shaped result."""
+        return self.request_many(op, [path])[0]
+
+    def request_many(self, op, paths):
+        """Pipeline one request per path; return one result per path.
+
+        Every frame is written before the first response is read, so a batch
+        of small directories costs one round trip rather than one each. The
+        responses come back in request order. A timeout or a dead connection
+        part-way through fails the request in flight AND every request after
+        it, which the caller sees as non-zero exits; a session that had
+        already answered is reconnected once and only the unanswered suffix is
+        re-sent.
+        """
+        frames = [op.encode('ascii') + b'\0' + path.encode('utf-8') + b'\0'
+                  for path in paths]
+        results = []
+
+        def fail_rest(returncode, stdout, stderr):
+            results.append(subprocess.CompletedProcess(
+                ['ssh'], returncode, stdout, stderr))
+            while len(results) < len(frames):
+                results.append(subprocess.CompletedProcess(
+                    ['ssh'], returncode, '', stderr))
+
+        with self._lock:
+            self.requests += len(frames)
+            retried = False
+            while len(results) < len(frames):
+                if self._proc is None:
+                    error = self._connect()
+                    if error:
+                        fail_rest(255, '', error)
+                        break
+                pending = frames[len(results):]
+                outcome, records, err = 'eof', [], ''
+                try:
+                    self._proc.stdin.write(b''.join(pending))
+                    self._proc.stdin.flush()
+                except (OSError, ValueError):
+                    pass
+                else:
+                    for _frame in pending:
+                        outcome, records, rc, err = self._collect()
+                        if outcome != 'done':
+                            break
+                        self._served += 1
+                        results.append(subprocess.CompletedProcess(
+                            ['ssh'], rc,
+                            ''.join(record + '\0' for record in records),
+                            err))
+                if outcome == 'done':
+                    continue
+                stdout = ''.join(record + '\0' for record in records)
+                if outcome == 'timeout':
+                    self._discard(kill=True)
+                    fail_rest(124, stdout,
+                              f"SSH command timed out after {self.timeout}s")
+                    break
+                # EOF before the terminator: the connection died.
+                stderr = self._stderr_text()
+                was_serving = self._served > 0
+                exit_code = self._discard()
+                if not retried and was_serving:
+                    retried = True
+                    get_logger().warning(
+                        "listing_session_reconnect: exit=%s %s",
+                        exit_code, stderr)
+                    continue
+                if not was_serving and exit_code not in (None, 255):
+                    raise ListingSessionUnavailable(
+                        f"the remote listing loop exited {exit_code} before "
+                        f"answering: {stderr}")
+                fail_rest(255, stdout,
+                          stderr or "listing session closed unexpectedly")
+        return results
+
+    def _collect(self):
+        """``(outcome, records, rc, stderr)`` for the request in flight."""
+        deadline = (None if self.timeout is None
+                    else time.monotonic() + self.timeout)
+        records, errors = [], []
+        while True:
+            wait = None if deadline is None else deadline - time.monotonic()
+            if wait is not None and wait <= 0:
+                return 'timeout', records, None, '\n'.join(errors)
+            try:
+                record = self._records.get(timeout=wait)
+            except queue.Empty:
+                return 'timeout', records, None, '\n'.join(errors)
+            if record is None:
+                return 'eof', records, None, '\n'.join(errors)
+            if record.startswith('END '):
+                try:
+                    rc = int(record[4:].strip())
+                except ValueError:
+                    rc = 1
+                return 'done', records, rc, '\n'.join(errors)
+            if record.startswith('ERR '):
+                errors.append(record[4:])
+                continue
+            records.append(record)
+
+
 class DirectoryFrontierScanner(RemoteScanner):
     """List ONE directory's immediate children at a time.
 
@@ -214,11 +531,16 @@ class DirectoryFrontierScanner(RemoteScanner):
     """
 
     def __init__(self, remote_user, remote_host, remote_password='',
-                 timeout=None, skipped_tracker=None, ui=None, metrics=None):
+                 timeout=None, skipped_tracker=None, ui=None, metrics=None,
+                 persistent_session=False):
         super().__init__(
             remote_user, remote_host, remote_password=remote_password,
             timeout=timeout, skipped_tracker=skipped_tracker, ui=ui)
         self.metrics = metrics
+        #: Reuse one SSH connection for every listing and observation instead
+        #: of one connection per directory (see :class:`RemoteListingSession`).
+        self.persistent_session = persistent_session is True
+        self._session = None
 
     def _note(self, method, *args):
         if self.metrics is None:
@@ -228,6 +550,50 @@ class DirectoryFrontierScanner(RemoteScanner):
         except Exception:               # never fail a scan for a counter
             pass
 
+    def _remote(self, op, root, command):
+        """Run one request over the session when enabled, else one SSH call."""
+        results = self._session_requests(op, [root])
+        if results is not None:
+            return results[0]
+        return _ssh_run(
+            self.remote_user, self.remote_host, command, capture=True,
+            password=self.remote_password, timeout=self.timeout)
+
+    def _session_requests(self, op, roots):
+        """Per-root results from the persistent session, or ``None``.
+
+        ``None`` means the session is disabled or has just been abandoned
+        because the remote host cannot run it; the caller then uses one-shot
+        SSH instead.
+        """
+        if not self.persistent_session:
+            return None
+        if self._session is None:
+            self._session = RemoteListingSession(
+                self.remote_user, self.remote_host,
+                remote_password=self.remote_password,
+                timeout=self.timeout,
+                on_connect=lambda: self._note(
+                    'note_listing_session_connect'))
+        try:
+            return self._session.request_many(op, roots)
+        except ListingSessionUnavailable as exc:
+            get_logger().warning(
+                "listing_session_unavailable: %s; falling back to one "
+                "SSH command per directory", exc)
+            self.ui.warning(
+                "[SCAN] The remote host cannot run the persistent listing "
+                "session; falling back to one SSH command per directory.")
+            self.close()
+            self.persistent_session = False
+        return None
+
+    def close(self):
+        """Close the persistent listing session, if one is open."""
+        session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
     def list_directory(self, dir_path):
         """Return a :class:`DirectoryListing` for one directory.
 
@@ -241,10 +607,67 @@ class DirectoryFrontierScanner(RemoteScanner):
         root = posixpath.normpath(str(dir_path).replace('\\', '/').strip())
         command = ("LC_ALL=C sh -c " + shlex.quote(_LIST_DIRECTORY_SCRIPT)
                    + " " + shlex.quote(root))
+        result = self._remote(_SESSION_LIST, root, command)
+        listing = self._listing_from_result(root, result)
+        self._note('note_enumeration', time.monotonic() - started,
+                   listing.file_count)
+        return listing
+
+    def list_directories(self, dir_paths):
+        """Return one :class:`DirectoryListing` per directory, in order.
+
+        The batched form of :meth:`list_directory`: every directory is listed
+        by ONE remote invocation — pipelined over the persistent session, or a
+        single one-shot command that loops over its arguments — so a tree of
+        tiny directories is no longer one round trip per directory. Each
+        directory still gets its own section, observation token and
+        warnings, and the same per-entry rules.
+
+        Raises if ANY directory could not be listed as a whole, because the
+        caller commits the batch as a unit and must then retry all of it.
+        """
+        roots = [posixpath.normpath(str(path).replace('\\', '/').strip())
+                 for path in dir_paths]
+        if not roots:
+            return []
+        for _root in roots:
+            self._note('note_listing_start')
+        started = time.monotonic()
+        results = self._session_requests(_SESSION_LIST, roots)
+        if results is None:
+            results = self._one_shot_batch(roots)
+        listings = [self._listing_from_result(root, result)
+                    for root, result in zip(roots, results)]
+        self._note('note_enumeration', time.monotonic() - started,
+                   sum(listing.file_count for listing in listings))
+        return listings
+
+    def _one_shot_batch(self, roots):
+        """List ``roots`` with one SSH command; one result per root."""
+        command = ("LC_ALL=C sh -c " + shlex.quote(_LIST_DIRECTORIES_SCRIPT)
+                   + " sh " + " ".join(shlex.quote(root) for root in roots))
         result = _ssh_run(
             self.remote_user, self.remote_host, command, capture=True,
             password=self.remote_password, timeout=self.timeout)
-
+        if result.returncode in (124, 255):
+            # Nothing in a timed-out or failed transport can be trusted for
+            # any directory; let each one raise the way a single listing would.
+            return [subprocess.CompletedProcess(
+                ['ssh'], result.returncode, '', result.stderr or '')
+                for _root in roots]
+        sections = _split_listing_sections(result.stdout or '')
+        if len(sections) != len(roots):
+            raise RuntimeError(
+                f"[SCAN] A batched listing of {len(roots)} directories returned "
+                f"{len(sections)} complete section(s). The output was "
+                "discarded so no directory is recorded as covered on "
+                "truncated evidence.")
+        return [subprocess.CompletedProcess(
+            ['ssh'], rc, ''.join(record + '\0' for record in records), err)
+            for records, rc, err in sections]
+
+    def _listing_from_result(self, root, result):
+        """Parse one directory's ``CompletedProcess`` into a listing."""
         stdout = result.stdout or ''
         stderr = (result.stderr or '').strip()
         if result.returncode == 124:
@@ -293,7 +716,6 @@ class DirectoryFrontierScanner(RemoteScanner):
 
         files.sort(key=lambda item: item[0])
         directories.sort()
-        self._note('note_enumeration', time.monotonic() - started, len(files))
         return DirectoryListing(root, files, directories, errors, observation,
                                 result.returncode)
 
@@ -308,10 +730,8 @@ class DirectoryFrontierScanner(RemoteScanner):
                    + shlex.quote('stat -c %Y:%Z:%i -- "$0" 2>/dev/null '
                                  '|| printf unknown')
                    + " " + shlex.quote(root))
-        result = _ssh_run(
-            self.remote_user, self.remote_host, command, capture=True,
-            password=self.remote_password, timeout=self.timeout)
-        token = (result.stdout or '').strip()
+        result = self._remote(_SESSION_OBSERVE, root, command)
+        token = (result.stdout or '').replace('\0', '').strip()
         if result.returncode != 0 or not token or token == 'unknown':
             return None
         return token
@@ -678,7 +678,7 @@ def _stored_tar_diagnostics(container, sidecar_path, *, session_id,
 def _validate_stored_tar_pair(container, artifacts, plan_members, tar_path,
                               sidecar_path, diagnostics, *, session_id,
                               chunk_index, require_db_ready):
-    from .archive_artifacts import (TAR_SIDECAR_VERSION,
+    from .archive_artifacts import (read_tar_sidecar_version,
                                     tar_sidecar_locator,
                                     validate_tar_sidecar)
     from .tar_container import validate_stored_tar_part
@@ -714,7 +714,7 @@ def _validate_stored_tar_pair(container, artifacts, plan_members, tar_path,
         mismatch = [key for key, expected in checks.items()
                     if _tar_value(container, key) != expected]
         artifact_checks = {
-            "artifact_version": TAR_SIDECAR_VERSION,
+            "artifact_version": read_tar_sidecar_version(sidecar_path),
             "local_locator": locator,
             "artifact_size_bytes": os.path.getsize(sidecar_path),
             "readiness_state": "ready",
@@ -812,7 +812,8 @@ def _validate_tar_resume_marker(db, marker_path, *, session_id, chunk_index,
 def reconcile_tar_artifacts(
         db, session_id, chunk_index, *, archive_root, pack_dir,
         remote_base=None, owner_probe=None, psutil_module=None,
-        remote_probe=None, recovery_owner_token=None, plan=None):
+        remote_probe=None, recovery_owner_token=None, plan=None,
+        member_digest=None):
     """Reconcile every Stored-TAR local/DB combination for one sealed chunk.
 
     The function is intentionally local-filesystem + PostgreSQL only.  All
@@ -822,6 +823,7 @@ def reconcile_tar_artifacts(
     ``owner_probe(token, container_row)`` is tri-state: ``True``/``live``;
     ``False``/``releasable``; or ``None``/``blocked``.  Without conclusive
     absence evidence, an owned part is left untouched and the chunk blocks.
+    A sidecar published here records ``member_digest`` member digests.
     """
     from .archive_artifacts import (resolve_locator, tar_sidecar_locator,
                                     publish_stored_tar_pair)
@@ -1039,7 +1041,8 @@ def reconcile_tar_artifacts(
                 plan_members, diagnostics, validation=validation,
                 session_id=session_id, chunk_index=chunk_index,
                 container_id=container_id, container_ordinal=ordinal,
-                owner_token=recovery_owner, db=db, pack_dir=pack_dir)
+                owner_token=recovery_owner, db=db, pack_dir=pack_dir,
+                member_digest=member_digest)
             state = "ready"
             container["validation_state"] = state
             container["owner_token"] = None
@@ -8,11 +8,24 @@ local backup-log directory.
 
 Layout (kept out of git via the ``backup_logs/`` .gitignore rule):
     <log_dir>/tape_write/session_<session_id>/chunk_<chunk_index>_<timestamp>.log
+    <log_dir>/tape_write/history.jsonl
+
+``history.jsonl`` is the write-group history (:class:`TapeWriteHistory`): one
+JSON line per completed write group with its tape, fill band, chunk count,
+bytes, duration, the streaming time the tape-write profiler measured and the
+fixed overhead left over. Fitted into a
+:class:`~src.chunk_sizing.TapeWriteModel` (per-group plus per-chunk
+overhead), it tells the ready queue when a group is worth starting.
 """
+import json
+import math
 import os
+import statistics
 import threading
 from datetime import datetime
 
+from .chunk_sizing import TapeWriteModel
+
 
 def _sanitize_cmd(cmd):
     """Render the robocopy invocation for the log.
@@ -138,3 +151,147 @@ class TapeWriteRawLog:
     def __exit__(self, exc_type, exc, tb):
         self.close()
         return False
+
+
+HISTORY_FILE = 'history.jsonl'
+
+#: Width of a fill band: groups in the same band share a fill level.
+FILL_BAND = 0.1
+
+#: Fewer matching groups than this is no model.
+MIN_HISTORY_GROUPS = 3
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def fill_band(fill_fraction):
+    """The fill band ``fill_fraction`` falls in (its lower edge), or None."""
+    fill = _float(fill_fraction)
+    if fill is None:
+        return None
+    band = math.floor(round(min(max(fill, 0.0), 1.0) / FILL_BAND, 6))
+    return round(min(band, round(1 / FILL_BAND) - 1) * FILL_BAND, 2)
+
+
+def chunk_stream_seconds(copied_bytes, tape_details):
+    """Seconds a chunk spent streaming, from its ``tape_*`` profiler details
+    (:meth:`~src.ram_telemetry.TapeWriteProfiler.as_details`); None without
+    a measured rate."""
+    rate = _float((tape_details or {}).get('tape_stream_mbs'))
+    copied = _float(copied_bytes)
+    if not rate or rate <= 0 or copied is None:
+        return None
+    return copied / (rate * 1024**2)
+
+
+def _fit_overheads(records):
+    """Least-squares ``overhead = group + chunk * chunks``, both >= 0."""
+    points = [(int(r['chunks']), float(r['overhead_seconds']))
+              for r in records]
+    counts = {n for n, _ in points}
+    if len(counts) < 2:
+        return statistics.median(o for _, o in points), 0.0
+    mean_n = statistics.fmean(n for n, _ in points)
+    mean_o = statistics.fmean(o for _, o in points)
+    spread = sum((n - mean_n) ** 2 for n, _ in points)
+    per_chunk = sum((n - mean_n) * (o - mean_o) for n, o in points) / spread
+    per_group = mean_o - per_chunk * mean_n
+    if per_chunk < 0:
+        return max(0.0, mean_o), 0.0
+    if per_group < 0:
+        return 0.0, (sum(n * o for n, o in points)
+                     / sum(n * n for n, _ in points))
+    return per_group, per_chunk
+
+
+class TapeWriteHistory:
+    """Append-only history of completed write groups, one JSON line each.
+
+    A missing or damaged line is skipped, never fatal: the history only
+    informs scheduling. ``keep`` bounds how many recent groups are read.
+    """
+
+    def __init__(self, log_dir, keep=500):
+        self.path = os.path.join(log_dir or '.', 'tape_write', HISTORY_FILE)
+        self.keep = max(1, int(keep))
+        self._lock = threading.Lock()
+
+    def record(self, *, tape_label, fill_fraction, chunks, group_bytes,
+               duration_seconds, stream_seconds):
+        """Append one completed group; returns the record written."""
+        record = {
+            'at': datetime.now().isoformat(timespec='seconds'),
+            'tape_label': tape_label,
+            'fill_fraction': (None if fill_fraction is None
+                              else round(float(fill_fraction), 4)),
+            'fill_band': fill_band(fill_fraction),
+            'chunks': int(chunks),
+            'group_bytes': int(group_bytes),
+            'duration_seconds': round(float(duration_seconds), 3),
+            'stream_seconds': round(float(stream_seconds), 3),
+            'overhead_seconds': round(
+                max(0.0, float(duration_seconds) - float(stream_seconds)), 3),
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as handle:
+                handle.write(json.dumps(record) + '\n')
+        return record
+
+    def records(self):
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                lines = handle.readlines()[-self.keep:]
+        except OSError:
+            return []
+        out = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if (isinstance(record, dict)
+                    and int(record.get('group_bytes') or 0) > 0
+                    and (_float(record.get('stream_seconds')) or 0) > 0):
+                out.append(record)
+        return out
+
+    def model(self, tape_label, fill_fraction=None, window=50):
+        """A :class:`~src.chunk_sizing.TapeWriteModel` with per-group and
+        per-chunk overhead, from the groups most like this one.
+
+        Prefers the same tape in the same fill band, then any tape in that
+        band, then the same tape at any fill, then every group.
+        """
+        records = self.records()
+        band = fill_band(fill_fraction)
+
+        def near(record):
+            return band is not None and fill_band(
+                record.get('fill_fraction')) == band
+
+        candidates = (
+            [r for r in records
+             if r.get('tape_label') == tape_label and near(r)],
+            [r for r in records if near(r)],
+            [r for r in records if r.get('tape_label') == tape_label],
+            records,
+        )
+        for chosen in candidates:
+            if len(chosen) >= MIN_HISTORY_GROUPS:
+                chosen = chosen[-window:]
+                break
+        else:
+            return None
+        group, chunk = _fit_overheads(chosen)
+        rate = (sum(int(r['group_bytes']) for r in chosen)
+                / sum(float(r['stream_seconds']) for r in chosen))
+        return TapeWriteModel(overhead_seconds=chunk,
+                              stream_bytes_per_second=rate,
+                              samples=len(chosen),
+                              group_overhead_seconds=group)
@@ -6,13 +6,21 @@ in bounded chunks and retains only the typed member records it must return.
 """
 from __future__ import annotations
 
+import hashlib
 import os
 import posixpath
+import queue
 import re
+import threading
 from contextlib import nullcontext
 from dataclasses import replace
 from typing import BinaryIO, Iterable, Mapping, Optional
 
+try:
+    import crc32c as _crc32c
+except ImportError:  # optional: only stored_tar_member_digest = crc32c needs it
+    _crc32c = None
+
 from .pipeline_types import (
     ContainerFormat,
     FileTransferStatus,
@@ -21,6 +29,7 @@ from .pipeline_types import (
     StoredTarExpectedMember,
     StoredTarMember,
     StoredTarSourceDiagnostic,
+    StoredTarStreamScan,
     StoredTarValidationSummary,
 )
 
@@ -65,6 +74,40 @@ class StoredTarError(ValueError):
     """The container cannot be proven to satisfy the Stored TAR contract."""
 
 
+#: Member digests a validation can record, with their hex digest lengths.
+MEMBER_DIGEST_ALGORITHMS = {"crc32c": 8, "blake2b": 64, "sha256": 64}
+
+
+class _Crc32cDigest:
+    def __init__(self):
+        self._value = 0
+
+    def update(self, data):
+        self._value = _crc32c.crc32c(data, self._value)
+
+    def hexdigest(self):
+        return f"{self._value:08x}"
+
+
+def new_member_digest(algorithm: str):
+    """A fresh ``update``/``hexdigest`` object for ``algorithm``.
+
+    BLAKE2b is cut to 256 bits. CRC32C needs the optional ``crc32c`` package;
+    it detects damage but, unlike the other two, not deliberate substitution.
+    """
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=32)
+    if algorithm == "sha256":
+        return hashlib.sha256()
+    if algorithm == "crc32c":
+        if _crc32c is None:
+            raise StoredTarError(
+                "member digest 'crc32c' needs the crc32c package "
+                "(python -m pip install crc32c)")
+        return _Crc32cDigest()
+    raise StoredTarError(f"unsupported member digest algorithm {algorithm!r}")
+
+
 def validate_tar_member_name(name: str) -> str:
     """Return a normalized safe POSIX member name, or reject it.
 
@@ -239,10 +282,12 @@ class _CountingInput:
             self.offset += len(data)
         return data
 
-    def skip_exact(self, size: int, what: str):
+    def skip_exact(self, size: int, what: str, sink=None):
         remaining = size
         while remaining:
             data = self.read_exact(min(remaining, _COPY_BUFFER_SIZE), what)
+            if sink is not None:
+                sink(data)
             remaining -= len(data)
 
     def read_zeroes(self, size: int, what: str):
@@ -403,12 +448,13 @@ def _read_sparse_line(stream: _CountingInput, remaining: int, label: str):
 
 
 def _consume_sparse_payload(stream: _CountingInput, physical_size: int,
-                            logical_size: int):
+                            logical_size: int, digester=None):
     remaining = physical_size
     extent_count, used = _read_sparse_line(stream, remaining, "extent count")
     remaining -= used
     previous_end = 0
     stored_data_bytes = 0
+    extents = []
     for index in range(extent_count):
         offset, used = _read_sparse_line(
             stream, remaining, f"extent {index} offset")
@@ -422,6 +468,7 @@ def _consume_sparse_payload(stream: _CountingInput, physical_size: int,
             raise StoredTarError("invalid or overlapping GNU sparse extent")
         previous_end = offset + length
         stored_data_bytes += length
+        extents.append((offset, length))
 
     map_bytes = physical_size - remaining
     map_padding = (-map_bytes) % BLOCK_SIZE
@@ -432,25 +479,178 @@ def _consume_sparse_payload(stream: _CountingInput, physical_size: int,
     if remaining != stored_data_bytes:
         raise StoredTarError(
             "GNU sparse payload size disagrees with its extent map")
-    stream.skip_exact(remaining, "GNU sparse stored extents")
+    if digester is None:
+        stream.skip_exact(remaining, "GNU sparse stored extents")
+    else:
+        # The digest covers the file as restored: holes are zeros.
+        digester.begin()
+        position = 0
+        for offset, length in extents:
+            digester.zeros(offset - position)
+            stream.skip_exact(
+                length, "GNU sparse stored extents", digester.update)
+            position = offset + length
+        digester.zeros(logical_size - position)
+        digester.end()
     stream.read_zeroes(
         (-physical_size) % BLOCK_SIZE, "TAR member data padding")
     return extent_count
 
 
+_BEGIN = object()
+_END = object()
+
+
+class _MemberDigester:
+    """Hash member payloads on a worker thread, in archive order.
+
+    The parser hands over each block it reads (bounded by ``max_pending``)
+    and moves on; hashlib releases the GIL on large updates, so hashing runs
+    beside the parse instead of inside it. :meth:`finish` returns one hex
+    digest per member, in the order the members were read.
+    """
+
+    _ZEROS = bytes(_COPY_BUFFER_SIZE)
+
+    def __init__(self, algorithm: str, max_pending: int = 16):
+        new_member_digest(algorithm)    # unknown or unavailable fails here
+        self.algorithm = algorithm
+        self._digests = []
+        self._pending = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="stored-tar-digest", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        current = None
+        try:
+            while True:
+                item = self._pending.get()
+                if item is None:
+                    return
+                if item is _BEGIN:
+                    current = new_member_digest(self.algorithm)
+                elif item is _END:
+                    self._digests.append(current.hexdigest())
+                    current = None
+                elif isinstance(item, int):
+                    while item:
+                        step = min(item, len(self._ZEROS))
+                        current.update(memoryview(self._ZEROS)[:step])
+                        item -= step
+                else:
+                    current.update(item)
+        except BaseException as exc:    # reported by finish()
+            self._error = exc
+            # Keep taking work so the parser never blocks on a dead worker.
+            while self._pending.get() is not None:
+                pass
+
+    def begin(self):
+        self._pending.put(_BEGIN)
+
+    def update(self, data):
+        self._pending.put(data)
+
+    def zeros(self, count):
+        if count > 0:
+            self._pending.put(int(count))
+
+    def end(self):
+        self._pending.put(_END)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._pending.put(None)
+            self._thread.join()
+
+    def finish(self):
+        self.close()
+        if self._error is not None:
+            raise StoredTarError(
+                f"member digest failed: {self._error}") from self._error
+        return list(self._digests)
+
+
+class _PlanCursor:
+    """Matches archived members, in archive order, against the present plan."""
+
+    def __init__(self, present):
+        self.present = present
+        self.position = 0
+
+    def match(self, name, logical_size):
+        """The planned ordinal of the next member, or StoredTarError."""
+        present = self.present
+        position = self.position
+        if position >= len(present):
+            raise StoredTarError(f"unexpected TAR member: {name!r}")
+        expected = present[position]
+        if name != expected.name:
+            later = next(
+                (item for item in present[position + 1:]
+                 if item.name == name), None)
+            if later is not None:
+                raise StoredTarError(
+                    f"wrong member ordinal/order: {name!r} at archive "
+                    f"position {position}, planned ordinal "
+                    f"{later.ordinal}")
+            raise StoredTarError(
+                f"unexpected TAR member {name!r}; expected "
+                f"{expected.name!r} at ordinal {expected.ordinal}")
+        if logical_size != expected.logical_size:
+            raise StoredTarError(
+                f"wrong size for {name!r}: archived {logical_size}, "
+                f"expected {expected.logical_size}")
+        self.position += 1
+        return expected.ordinal
+
+    def finish(self):
+        if self.position != len(self.present):
+            missing = self.present[self.position]
+            raise StoredTarError(
+                f"missing TAR member without source exception: "
+                f"{missing.name!r} at ordinal {missing.ordinal}")
+
+
+def _matched_container(members, archive_size, plan_count, plan_bytes, *,
+                       format_version, tar_dialect,
+                       member_digest_algorithm=None):
+    observed_count = len(members)
+    observed_bytes = sum(item.logical_size for item in members)
+    if observed_count != plan_count:
+        raise StoredTarError("TAR member-count aggregate mismatch")
+    if observed_bytes != plan_bytes:
+        raise StoredTarError("TAR logical-byte aggregate mismatch")
+    return StoredTarContainer(
+        container_format=ContainerFormat.STORED_TAR,
+        format_version=format_version,
+        tar_dialect=tar_dialect,
+        members=tuple(members), member_count=observed_count,
+        logical_bytes=observed_bytes, archive_size=archive_size,
+        member_digest_algorithm=member_digest_algorithm)
+
+
 class StoredTarReader:
     """Streaming, non-extracting validator for one Stored TAR container."""
 
-    def __init__(self, source, *, tar_dialect: str, format_version: str):
+    def __init__(self, source, *, tar_dialect: str, format_version: str,
+                 member_digest: Optional[str] = None):
         if tar_dialect != STORED_TAR_DIALECT:
             raise StoredTarError(
                 f"unsupported Stored TAR dialect: {tar_dialect!r}")
         if format_version != STORED_TAR_FORMAT_VERSION:
             raise StoredTarError(
                 f"unsupported Stored TAR format version: {format_version!r}")
+        if member_digest is not None:
+            new_member_digest(member_digest)
         self.source = source
         self.tar_dialect = tar_dialect
         self.format_version = format_version
+        self.member_digest = member_digest
 
     def parse(self, expected_members: Iterable,
               *, expected_member_count: Optional[int] = None,
@@ -484,167 +684,411 @@ class StoredTarReader:
         return result
 
     def _validate_stream(self, raw, present, plan_count, plan_bytes):
-        stream = _CountingInput(raw)
-        global_pax = {}
-        pending_pax = None
-        members = []
-        seen_names = set()
-        seen_folded = {}
-        member_position = 0
-
-        while True:
-            block = stream.read_exact(BLOCK_SIZE, "TAR header/end marker")
-            if block == _ZERO_BLOCK:
-                second = stream.read_exact(BLOCK_SIZE, "second TAR end block")
-                if second != _ZERO_BLOCK:
-                    raise StoredTarError(
-                        "TAR end marker contains only one zero block")
-                if pending_pax is not None:
-                    raise StoredTarError(
-                        "PAX extended header has no following member")
-                break
-
-            header = _parse_header(block)
-            member_type = header["type"]
-            if member_type in _PAX_TYPES:
-                if header["linkname"]:
-                    raise StoredTarError("PAX metadata header has a link target")
-                records = _read_pax(
-                    stream, header["size"], global_header=member_type == b"g")
-                if member_type == b"g":
-                    global_pax.update(records)
-                else:
-                    if pending_pax is not None:
-                        raise StoredTarError(
-                            "multiple PAX extended headers precede one member")
-                    pending_pax = records
-                continue
-            if member_type not in _REGULAR_TYPES:
-                label = member_type.decode("ascii", "backslashreplace")
+        members, archive_size = _scan_stream(
+            raw, _PlanCursor(present), self.member_digest)
+        return _matched_container(
+            members, archive_size, plan_count, plan_bytes,
+            format_version=self.format_version, tar_dialect=self.tar_dialect,
+            member_digest_algorithm=self.member_digest)
+
+
+def _scan_stream(raw, cursor=None, member_digest=None):
+    """Parse a whole Stored TAR from ``raw``; ``(members, archive_size)``.
+
+    With a :class:`_PlanCursor` each member is matched against the plan as
+    soon as its header is read, so a wrong archive fails before its data is
+    consumed. Without one the parse is structural only and members keep
+    ``ordinal=None`` (see :class:`StoredTarStreamValidator`). With a
+    ``member_digest`` algorithm every member's logical bytes are hashed on a
+    :class:`_MemberDigester` thread while the parse goes on.
+    """
+    digester = (None if member_digest is None
+                else _MemberDigester(member_digest))
+    try:
+        members, archive_size = _scan_members(raw, cursor, digester)
+        if digester is not None:
+            digests = digester.finish()
+            if len(digests) != len(members):
                 raise StoredTarError(
-                    f"unsupported TAR member type {label!r}")
-            if header["linkname"]:
-                raise StoredTarError("regular TAR member has a link target")
-
-            pax = dict(global_pax)
-            if pending_pax:
-                pax.update(pending_pax)
-            pending_pax = None
-            sparse_keys = _SPARSE_KEYS.intersection(pax)
-            is_sparse = bool(sparse_keys)
-            if is_sparse and sparse_keys != _SPARSE_KEYS:
-                raise StoredTarError("incomplete GNU sparse v1.0 metadata")
-
-            if is_sparse:
-                if pax["GNU.sparse.major"] != "1" \
-                        or pax["GNU.sparse.minor"] != "0":
-                    raise StoredTarError("unsupported GNU sparse version")
-                if "size" in pax:
-                    raise StoredTarError(
-                        "ambiguous standard size on GNU sparse v1.0 member")
-                name = pax["GNU.sparse.name"]
-                if "path" in pax and pax["path"] != name:
-                    raise StoredTarError(
-                        "PAX path disagrees with GNU sparse member name")
-                logical_size = _parse_decimal(
-                    pax["GNU.sparse.realsize"], "GNU sparse real size")
-                physical_size = header["size"]
-            else:
-                name = pax.get("path", header["name"])
-                logical_size = (_parse_decimal(pax["size"], "size")
-                                if "size" in pax else header["size"])
-                physical_size = logical_size
-
-            normalized = validate_tar_member_name(name)
-            if normalized in seen_names:
+                    "member digests do not cover every TAR member")
+            members = [replace(member, digest=digest)
+                       for member, digest in zip(members, digests)]
+    finally:
+        if digester is not None:
+            digester.close()
+    return tuple(members), archive_size
+
+
+def _scan_members(raw, cursor, digester):
+    stream = _CountingInput(raw)
+    global_pax = {}
+    pending_pax = None
+    members = []
+    seen_names = set()
+    seen_folded = {}
+    header_offset = None
+
+    while True:
+        block_offset = stream.offset
+        block = stream.read_exact(BLOCK_SIZE, "TAR header/end marker")
+        if block == _ZERO_BLOCK:
+            second = stream.read_exact(BLOCK_SIZE, "second TAR end block")
+            if second != _ZERO_BLOCK:
                 raise StoredTarError(
-                    f"duplicate normalized TAR member name: {name!r}")
-            folded = normalized.casefold()
-            if folded in seen_folded:
+                    "TAR end marker contains only one zero block")
+            if pending_pax is not None:
                 raise StoredTarError(
-                    "case-fold collision in TAR members: "
-                    f"{seen_folded[folded]!r} and {name!r}")
-            seen_names.add(normalized)
-            seen_folded[folded] = name
-
-            if member_position >= len(present):
-                raise StoredTarError(f"unexpected TAR member: {name!r}")
-            expected = present[member_position]
-            if name != expected.name:
-                later = next(
-                    (item for item in present[member_position + 1:]
-                     if item.name == name), None)
-                if later is not None:
+                    "PAX extended header has no following member")
+            break
+
+        header = _parse_header(block)
+        member_type = header["type"]
+        if member_type in _PAX_TYPES:
+            if header["linkname"]:
+                raise StoredTarError("PAX metadata header has a link target")
+            records = _read_pax(
+                stream, header["size"], global_header=member_type == b"g")
+            if member_type == b"g":
+                global_pax.update(records)
+            else:
+                if pending_pax is not None:
                     raise StoredTarError(
-                        f"wrong member ordinal/order: {name!r} at archive "
-                        f"position {member_position}, planned ordinal "
-                        f"{later.ordinal}")
+                        "multiple PAX extended headers precede one member")
+                pending_pax = records
+                header_offset = block_offset
+            continue
+        if member_type not in _REGULAR_TYPES:
+            label = member_type.decode("ascii", "backslashreplace")
+            raise StoredTarError(
+                f"unsupported TAR member type {label!r}")
+        if header["linkname"]:
+            raise StoredTarError("regular TAR member has a link target")
+
+        pax = dict(global_pax)
+        if pending_pax:
+            pax.update(pending_pax)
+        pending_pax = None
+        if header_offset is None:
+            header_offset = block_offset
+        data_offset = stream.offset
+        sparse_keys = _SPARSE_KEYS.intersection(pax)
+        is_sparse = bool(sparse_keys)
+        if is_sparse and sparse_keys != _SPARSE_KEYS:
+            raise StoredTarError("incomplete GNU sparse v1.0 metadata")
+
+        if is_sparse:
+            if pax["GNU.sparse.major"] != "1" \
+                    or pax["GNU.sparse.minor"] != "0":
+                raise StoredTarError("unsupported GNU sparse version")
+            if "size" in pax:
                 raise StoredTarError(
-                    f"unexpected TAR member {name!r}; expected "
-                    f"{expected.name!r} at ordinal {expected.ordinal}")
-            if logical_size != expected.logical_size:
+                    "ambiguous standard size on GNU sparse v1.0 member")
+            name = pax["GNU.sparse.name"]
+            if "path" in pax and pax["path"] != name:
                 raise StoredTarError(
-                    f"wrong size for {name!r}: archived {logical_size}, "
-                    f"expected {expected.logical_size}")
+                    "PAX path disagrees with GNU sparse member name")
+            logical_size = _parse_decimal(
+                pax["GNU.sparse.realsize"], "GNU sparse real size")
+            physical_size = header["size"]
+        else:
+            name = pax.get("path", header["name"])
+            logical_size = (_parse_decimal(pax["size"], "size")
+                            if "size" in pax else header["size"])
+            physical_size = logical_size
 
-            if is_sparse:
-                extent_count = _consume_sparse_payload(
-                    stream, physical_size, logical_size)
-            else:
-                stream.skip_exact(physical_size, "TAR member data")
-                stream.read_zeroes(
-                    (-physical_size) % BLOCK_SIZE,
-                    "TAR member data padding")
-                extent_count = 0
-            members.append(StoredTarMember(
-                name=name, normalized_name=normalized,
-                logical_size=logical_size, stored_size=physical_size,
-                ordinal=expected.ordinal, sparse=is_sparse,
-                sparse_extent_count=extent_count))
-            member_position += 1
-
-        if member_position != len(present):
-            missing = present[member_position]
+        normalized = validate_tar_member_name(name)
+        if normalized in seen_names:
             raise StoredTarError(
-                f"missing TAR member without source exception: "
-                f"{missing.name!r} at ordinal {missing.ordinal}")
-
-        # GNU `-b 512` writes exactly enough all-zero padding to finish the
-        # current 512-block record.  Extra all-zero records are not accepted:
-        # they could conceal a concatenated empty archive.
-        blocking_padding = (-stream.offset) % GNU_RECORD_SIZE
-        stream.read_zeroes(blocking_padding, "GNU TAR blocking padding")
-        if stream.read_some(1):
+                f"duplicate normalized TAR member name: {name!r}")
+        folded = normalized.casefold()
+        if folded in seen_folded:
             raise StoredTarError(
-                "nonzero, extra-zero, or concatenated data follows TAR padding")
-
-        observed_count = len(members)
-        observed_bytes = sum(item.logical_size for item in members)
-        if observed_count != plan_count:
-            raise StoredTarError("TAR member-count aggregate mismatch")
-        if observed_bytes != plan_bytes:
-            raise StoredTarError("TAR logical-byte aggregate mismatch")
-        return StoredTarContainer(
-            container_format=ContainerFormat.STORED_TAR,
-            format_version=self.format_version,
-            tar_dialect=self.tar_dialect,
-            members=tuple(members), member_count=observed_count,
-            logical_bytes=observed_bytes, archive_size=stream.offset)
+                "case-fold collision in TAR members: "
+                f"{seen_folded[folded]!r} and {name!r}")
+        seen_names.add(normalized)
+        seen_folded[folded] = name
+
+        ordinal = (None if cursor is None
+                   else cursor.match(name, logical_size))
+
+        if is_sparse:
+            extent_count = _consume_sparse_payload(
+                stream, physical_size, logical_size, digester)
+        else:
+            if digester is not None:
+                digester.begin()
+            stream.skip_exact(
+                physical_size, "TAR member data",
+                None if digester is None else digester.update)
+            if digester is not None:
+                digester.end()
+            stream.read_zeroes(
+                (-physical_size) % BLOCK_SIZE,
+                "TAR member data padding")
+            extent_count = 0
+        members.append(StoredTarMember(
+            name=name, normalized_name=normalized,
+            logical_size=logical_size, stored_size=physical_size,
+            ordinal=ordinal, sparse=is_sparse,
+            sparse_extent_count=extent_count,
+            header_offset=header_offset, data_offset=data_offset))
+        header_offset = None
+
+    if cursor is not None:
+        cursor.finish()
+
+    # GNU `-b 512` writes exactly enough all-zero padding to finish the
+    # current 512-block record.  Extra all-zero records are not accepted:
+    # they could conceal a concatenated empty archive.
+    blocking_padding = (-stream.offset) % GNU_RECORD_SIZE
+    stream.read_zeroes(blocking_padding, "GNU TAR blocking padding")
+    if stream.read_some(1):
+        raise StoredTarError(
+            "nonzero, extra-zero, or concatenated data follows TAR padding")
+    return members, stream.offset
 
 
 def validate_stored_tar(source, expected_members: Iterable, *,
                         tar_dialect: str, format_version: str,
                         expected_member_count: Optional[int] = None,
-                        expected_logical_bytes: Optional[int] = None):
+                        expected_logical_bytes: Optional[int] = None,
+                        member_digest: Optional[str] = None):
     """Validate an entire Stored TAR against its plan/sidecar expectations."""
     return StoredTarReader(
         source, tar_dialect=tar_dialect,
-        format_version=format_version).validate(
+        format_version=format_version,
+        member_digest=member_digest).validate(
         expected_members,
         expected_member_count=expected_member_count,
         expected_logical_bytes=expected_logical_bytes)
 
 
+def match_stored_tar_scan(scan, expected_members: Iterable, *,
+                          expected_member_count: Optional[int] = None,
+                          expected_logical_bytes: Optional[int] = None):
+    """Finish a :class:`StoredTarStreamScan` against its plan.
+
+    The same member-by-member checks :meth:`StoredTarReader.validate` makes
+    while parsing, applied to the members the inline parse recorded, so no
+    archive byte is read again.
+    """
+    present, plan_count, plan_bytes = _prepare_plan(
+        expected_members, expected_member_count, expected_logical_bytes)
+    cursor = _PlanCursor(present)
+    members = [replace(item, ordinal=cursor.match(
+        item.name, item.logical_size)) for item in scan.members]
+    cursor.finish()
+    return _matched_container(
+        members, scan.archive_size, plan_count, plan_bytes,
+        format_version=scan.format_version, tar_dialect=scan.tar_dialect,
+        member_digest_algorithm=scan.member_digest_algorithm)
+
+
+class _PushInput:
+    """The ``read`` side of :class:`StoredTarStreamValidator`'s hand-off."""
+
+    def __init__(self, chunks, aborted):
+        self._chunks = chunks
+        self._aborted = aborted
+        self._data = b""
+        self._pos = 0
+        self._eof = False
+
+    def read(self, size=-1):
+        while self._pos >= len(self._data):
+            if self._eof:
+                return b""
+            chunk = self._chunks.get()
+            if self._aborted.is_set():
+                raise StoredTarError("inline TAR validation was abandoned")
+            if chunk is None:
+                self._eof = True
+                return b""
+            self._data, self._pos = chunk, 0
+        end = len(self._data) if size is None or size < 0 \
+            else self._pos + size
+        data = self._data[self._pos:end]
+        self._pos += len(data)
+        return data
+
+
+class StoredTarStreamValidator:
+    """Validate a Stored TAR from bytes pushed to it as they are received.
+
+    The receiver calls :meth:`feed` with each block it writes to the part
+    file and :meth:`finish` after the last one. The bytes run through the
+    same strict parser :class:`StoredTarReader` uses, on a worker thread
+    behind a bounded hand-off (``max_buffered_chunks`` fed blocks), so
+    memory stays bounded and the structural checks are done the moment the
+    last byte lands. :func:`match_stored_tar_scan` then matches the members
+    against the plan once the source outcome is known.
+
+    Once the parse has failed, :meth:`feed` discards what follows and
+    :meth:`finish` raises that failure.
+    """
+
+    def __init__(self, *, tar_dialect: str, format_version: str,
+                 member_digest: Optional[str] = None,
+                 max_buffered_chunks: int = 16):
+        # Refuses an unsupported dialect/version exactly as the reader does.
+        StoredTarReader(None, tar_dialect=tar_dialect,
+                        format_version=format_version,
+                        member_digest=member_digest)
+        self.tar_dialect = tar_dialect
+        self.format_version = format_version
+        self.member_digest = member_digest
+        self.bytes_fed = 0
+        self._chunks = queue.Queue(maxsize=max(1, int(max_buffered_chunks)))
+        self._aborted = threading.Event()
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._parse, name="stored-tar-inline-validate",
+            daemon=True)
+        self._thread.start()
+
+    def _parse(self):
+        try:
+            self._result = _scan_stream(
+                _PushInput(self._chunks, self._aborted),
+                member_digest=self.member_digest)
+        except BaseException as exc:    # handed to finish()
+            self._error = exc
+        finally:
+            self._done.set()
+
+    def _put(self, item):
+        while not self._done.is_set():
+            try:
+                self._chunks.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def feed(self, data):
+        """Hand over the next received bytes (copied; the caller may reuse
+        its buffer)."""
+        if not data:
+            return
+        self.bytes_fed += len(data)
+        self._put(bytes(data))
+
+    def finish(self) -> StoredTarStreamScan:
+        """End of stream: the scan, or the StoredTarError that failed it."""
+        self._put(None)
+        self._done.wait()
+        self._thread.join()
+        if self._error is not None:
+            if isinstance(self._error, StoredTarError):
+                raise self._error
+            raise StoredTarError(
+                f"inline TAR validation failed: {self._error}") \
+                from self._error
+        members, archive_size = self._result
+        return StoredTarStreamScan(
+            format_version=self.format_version,
+            tar_dialect=self.tar_dialect,
+            members=members, archive_size=archive_size,
+            member_digest_algorithm=self.member_digest)
+
+    def abort(self):
+        """Stop the parser without a result (the receive failed)."""
+        self._aborted.set()
+        try:
+            self._chunks.put_nowait(None)
+        except queue.Full:
+            pass    # the parser is not waiting; it sees the flag next read
+
+
+class StoredTarMemberData:
+    """Bounded reader over one member's stored bytes.
+
+    Reads stop at the member's logical size; reaching the end also proves the
+    block padding that follows it is all-zero.
+    """
+
+    def __init__(self, stream: _CountingInput, size: int):
+        self._stream = stream
+        self._remaining = size
+        self._padding = (-size) % BLOCK_SIZE
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._remaining:
+            if self._padding:
+                self._stream.read_zeroes(
+                    self._padding, "TAR member data padding")
+                self._padding = 0
+            return b""
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._stream.read_exact(
+            min(size, _COPY_BUFFER_SIZE), "TAR member data")
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+
+def open_stored_tar_member(raw: BinaryIO, *, header_offset: int,
+                           data_offset: int, name: str, logical_size: int):
+    """Seek to one sidecar-addressed member and return its bounded data.
+
+    The headers at ``header_offset`` are reparsed with the same strict rules
+    as a full validation and must name exactly ``name`` with ``logical_size``
+    bytes and end at ``data_offset``; anything else fails closed.  GNU sparse
+    members are refused because their stored bytes are not the file bytes.
+    """
+    raw.seek(header_offset)
+    stream = _CountingInput(raw)
+    stream.offset = header_offset
+    pax = {}
+    extended = False
+    while True:
+        header = _parse_header(stream.read_exact(BLOCK_SIZE, "TAR header"))
+        member_type = header["type"]
+        if member_type not in _PAX_TYPES:
+            break
+        if header["linkname"]:
+            raise StoredTarError("PAX metadata header has a link target")
+        records = _read_pax(
+            stream, header["size"], global_header=member_type == b"g")
+        if member_type == b"x":
+            if extended:
+                raise StoredTarError(
+                    "multiple PAX extended headers precede one member")
+            extended = True
+            pax = records
+    if member_type not in _REGULAR_TYPES or header["linkname"]:
+        raise StoredTarError(
+            f"sidecar offset {header_offset} is not a regular TAR member")
+    if _SPARSE_KEYS.intersection(pax):
+        raise StoredTarError(
+            f"GNU sparse member {name!r} cannot be read by byte range")
+    member_name = pax.get("path", header["name"])
+    size = (_parse_decimal(pax["size"], "size")
+            if "size" in pax else header["size"])
+    if member_name != name:
+        raise StoredTarError(
+            f"sidecar offset {header_offset} holds {member_name!r}, "
+            f"not {name!r}")
+    if size != int(logical_size):
+        raise StoredTarError(
+            f"wrong size for {name!r}: archived {size}, "
+            f"expected {logical_size}")
+    if stream.offset != int(data_offset):
+        raise StoredTarError(
+            f"data offset for {name!r} disagrees with its sidecar")
+    return StoredTarMemberData(stream, size)
+
+
 def _coerce_source_diagnostic(record):
     if isinstance(record, StoredTarSourceDiagnostic):
         return record
@@ -666,11 +1110,17 @@ def validate_stored_tar_part(source, plan_members: Iterable, *,
                              container_ordinal: int,
                              source_diagnostics=(), tar_dialect=STORED_TAR_DIALECT,
                              format_version=STORED_TAR_FORMAT_VERSION,
-                             require_part=True):
+                             require_part=True, inline_scan=None,
+                             member_digest=None):
     """Reopen and validate a still-unpublished TAR part against its sealed plan.
 
     Only machine-attributed absent-source outcomes may subtract a plan ordinal.
     Unknown, changed, duplicate, or path-mismatched evidence fails closed.
+
+    ``inline_scan`` is the :class:`StoredTarStreamScan` of the bytes the
+    transport wrote to this part as it received them; with it the part is
+    not re-read, only matched against the plan and checked for its size.
+    A scan that did not compute ``member_digest`` is not used.
     """
     if not isinstance(source, (str, bytes, os.PathLike)):
         raise StoredTarError("Stored TAR part validation requires a file path")
@@ -746,13 +1196,26 @@ def validate_stored_tar_part(source, plan_members: Iterable, *,
     expected_count = len(present)
     expected_bytes = sum(item.logical_size for item in present)
 
-    # ``validate_stored_tar`` opens the named part afresh.  The transport's
-    # writable handle is therefore necessarily closed before parsing begins.
-    parsed = validate_stored_tar(
-        part_path, expectations, tar_dialect=tar_dialect,
-        format_version=format_version,
-        expected_member_count=expected_count,
-        expected_logical_bytes=expected_bytes)
+    if (inline_scan is not None
+            and inline_scan.member_digest_algorithm == member_digest):
+        if (inline_scan.tar_dialect != tar_dialect
+                or inline_scan.format_version != format_version):
+            raise StoredTarError(
+                "inline TAR scan used a different dialect or format version")
+        parsed = match_stored_tar_scan(
+            inline_scan, expectations,
+            expected_member_count=expected_count,
+            expected_logical_bytes=expected_bytes)
+    else:
+        # ``validate_stored_tar`` opens the named part afresh.  The
+        # transport's writable handle is therefore necessarily closed before
+        # parsing begins.
+        parsed = validate_stored_tar(
+            part_path, expectations, tar_dialect=tar_dialect,
+            format_version=format_version,
+            expected_member_count=expected_count,
+            expected_logical_bytes=expected_bytes,
+            member_digest=member_digest)
     try:
         actual_size = os.path.getsize(part_path)
     except OSError as exc:
@@ -773,4 +1236,5 @@ def validate_stored_tar_part(source, plan_members: Iterable, *,
         logical_bytes=parsed.logical_bytes,
         archive_size=parsed.archive_size,
         plan_ordinal_count=len(plan), disposition_counts=counts,
-        members=parsed.members)
+        members=parsed.members,
+        member_digest_algorithm=parsed.member_digest_algorithm)
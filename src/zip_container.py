@@ -0,0 +1,179 @@
+"""Single-pass writes and catalog-addressed reads of bundle ZIP members.
+
+The packer streams each small file into its bundle exactly once: one bounded
+read into a reusable buffer, one write, with the CRC-32 computed on the way
+through. A source that fails part-way is rolled back by truncating the bundle
+to where the entry's local header began, so a truncated member is never sealed
+under the file's real name.
+
+The packer records where each member landed in its bundle: the local-header
+offset, the offset of the first data byte, the stored size and the CRC-32
+(``zip_entry_index``). With that location a restore seeks straight to the
+member, reparses its local header against the catalog, streams exactly the
+stored bytes and checks their CRC-32 at the end. The central directory at the
+tail of the bundle is never read. Bundles are written ``ZIP_STORED`` only, so
+the stored bytes are the file bytes.
+"""
+from __future__ import annotations
+
+import struct
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO
+
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_FLAG_ENCRYPTED = 0x01
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class ZipMemberError(zipfile.BadZipFile):
+    """A catalog-addressed ZIP member does not match its catalog location."""
+
+
+@dataclass(frozen=True)
+class ZipEntryLocation:
+    header_offset: int
+    data_offset: int
+    stored_size: int
+    crc32: int
+
+
+def zip_entry_location(info: zipfile.ZipInfo, *, zip64: bool):
+    """Location of an entry that ``ZipFile.open(name, 'w')`` just closed.
+
+    ``zip64`` must match how the entry was written: the local header then
+    carries a ZIP64 extra field, which moves the data offset by 20 bytes.
+    """
+    header = info.FileHeader(zip64=zip64)
+    return ZipEntryLocation(
+        header_offset=int(info.header_offset),
+        data_offset=int(info.header_offset) + len(header),
+        stored_size=int(info.compress_size),
+        crc32=int(info.CRC),
+    )
+
+
+def write_stored_entry(zipf: zipfile.ZipFile, name: str, source: BinaryIO,
+                       buffer: bytearray, *, size: int = 0):
+    """Stream ``source`` into ``zipf`` as one ZIP64 stored entry.
+
+    ``size`` is the pre-stat length and only sizes the local header; the
+    entry records what was actually read.  Any failure while the entry is open
+    removes it again and re-raises.  Returns the entry's ZipEntryLocation.
+    """
+    info = zipfile.ZipInfo(name, date_time=time.localtime(time.time())[:6])
+    info.compress_type = zipfile.ZIP_STORED
+    info.file_size = int(size)
+    start = zipf.start_dir
+    view = memoryview(buffer)
+    try:
+        with zipf.open(info, "w", force_zip64=True) as out:
+            while True:
+                count = source.readinto(buffer)
+                if not count:
+                    break
+                out.write(view[:count])
+    except BaseException:
+        _rollback_entry(zipf, info, start)
+        raise
+    return zip_entry_location(info, zip64=True)
+
+
+def _rollback_entry(zipf: zipfile.ZipFile, info: zipfile.ZipInfo, start: int):
+    if zipf.filelist and zipf.filelist[-1] is info:
+        zipf.filelist.pop()
+    if zipf.NameToInfo.get(info.filename) is info:
+        del zipf.NameToInfo[info.filename]
+    zipf.fp.seek(start)
+    zipf.fp.truncate(start)
+    zipf.start_dir = start
+
+
+class ZipMemberData:
+    """Bounded reader over one stored member; checks the CRC-32 at EOF."""
+
+    def __init__(self, raw: BinaryIO, size: int, crc32: int, name: str):
+        self._raw = raw
+        self._remaining = size
+        self._expected_crc = crc32
+        self._crc = 0
+        self._name = name
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._remaining:
+            return b""
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._raw.read(min(size, _COPY_BUFFER_SIZE))
+        if not data:
+            raise ZipMemberError(
+                f"bundle ends {self._remaining} byte(s) into {self._name!r}")
+        self._remaining -= len(data)
+        self._crc = zlib.crc32(data, self._crc)
+        if not self._remaining and self._crc != self._expected_crc:
+            raise ZipMemberError(f"Bad CRC-32 for file {self._name!r}")
+        return data
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+
+def open_zip_member(raw: BinaryIO, *, header_offset: int, data_offset: int,
+                    name: str, stored_size: int, crc32: int):
+    """Seek to one catalog-addressed member and return its bounded data.
+
+    The local header at ``header_offset`` must name exactly ``name``, be
+    stored and unencrypted, and end at ``data_offset``; sizes and CRC it
+    carries must agree with the catalog.  Anything else fails closed.
+    """
+    raw.seek(int(header_offset))
+    header = raw.read(_LOCAL_HEADER.size)
+    if len(header) != _LOCAL_HEADER.size:
+        raise ZipMemberError(
+            f"bundle ends inside the local header of {name!r}")
+    (signature, _version, _system, flags, method, _time, _date, header_crc,
+     compress_size, _file_size, name_length, extra_length) = (
+        _LOCAL_HEADER.unpack(header))
+    if signature != _LOCAL_HEADER_SIGNATURE:
+        raise ZipMemberError(
+            f"catalog offset {header_offset} is not a ZIP local header")
+    if method != zipfile.ZIP_STORED or flags & _FLAG_ENCRYPTED:
+        raise ZipMemberError(f"{name!r} is not a stored, unencrypted member")
+    raw_name = raw.read(name_length)
+    member_name = raw_name.decode(
+        "utf-8" if flags & _FLAG_UTF8 else "cp437", errors="replace")
+    if member_name != name:
+        raise ZipMemberError(
+            f"catalog offset {header_offset} holds {member_name!r}, "
+            f"not {name!r}")
+    end = int(header_offset) + _LOCAL_HEADER.size + name_length + extra_length
+    if end != int(data_offset):
+        raise ZipMemberError(
+            f"data offset for {name!r} disagrees with the catalog")
+    if not flags & _FLAG_DATA_DESCRIPTOR:
+        if header_crc != int(crc32):
+            raise ZipMemberError(
+                f"local header CRC-32 for {name!r} disagrees with the catalog")
+        if compress_size not in (0xFFFFFFFF, int(stored_size)):
+            raise ZipMemberError(
+                f"local header size for {name!r} disagrees with the catalog")
+    raw.seek(int(data_offset))
+    return ZipMemberData(raw, int(stored_size), int(crc32), name)
+
+
+__all__ = [
+    "ZipEntryLocation", "ZipMemberData", "ZipMemberError", "open_zip_member",
+    "write_stored_entry", "zip_entry_location",
+]
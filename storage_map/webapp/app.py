@@ -3,7 +3,8 @@
 Serves a single-page frontend plus a small JSON API around the v1 engine
 (:mod:`storage_map.lib.core`): live overview from the fetched raw
 logs, in-app scan/status/fetch actions, and the tape-coverage view backed by
-one read-only PostgreSQL aggregation. Every endpoint is a sync ``def`` on
+one read-only PostgreSQL aggregation (or, once built, the maintained coverage
+totals changed since the last refresh). Every endpoint is a sync ``def`` on
 purpose — SSH status checks block for up to a minute and must run in the
 threadpool, never on the event loop.
 """
@@ -261,15 +262,34 @@ def create_app(cfg=None):
     @app.post('/api/coverage/refresh')
     def api_coverage_refresh():
         def run():
+            threshold = int(cfg.index_min_file_mb * 1024 * 1024)
+            cache = _load_cache(smcfg) or {}
+            since = None
+            if (cache.get('max_segments') == max_segs
+                    and cache.get('threshold_bytes') == threshold):
+                since = cache.get('rollup')
             with CoverageRepository(cfg.db_dsn) as repo:
-                rows = repo.fetch_coverage_rows(
-                    max_segs, int(cfg.index_min_file_mb * 1024 * 1024))
+                changes = repo.fetch_coverage_changes(
+                    max_segs, threshold, since=since)
+                if changes is None:
+                    rows = repo.fetch_coverage_rows(max_segs, threshold)
+            if changes is None:
+                mark = None
+                detail = f'aggregated {len(rows)} directory prefixes from the DB'
+            else:
+                base = [] if changes['full'] else cache.get('rows', [])
+                rows = cov.fold_rows(base, changes['rows'])
+                mark = changes['mark']
+                detail = (f"folded {len(changes['rows'])} changed directory "
+                          f"prefixes from the coverage rollups")
             _write_cache(smcfg, {
                 'generated_at': datetime.now().isoformat(timespec='seconds'),
                 'max_segments': max_segs,
+                'threshold_bytes': threshold,
+                'rollup': mark,
                 'rows': rows,
             })
-            return f'aggregated {len(rows)} directory prefixes from the DB'
+            return detail
 
         return _start('coverage', run)
 
@@ -139,6 +139,22 @@ FROM merged
 GROUP BY 1, 2
 """
 
+def fold_rows(rows, changes):
+    """Replace ``rows`` entries by ``(host, dir_prefix)`` with ``changes``.
+
+    ``changes`` are prefix rows read from the maintained totals since the last
+    refresh. A prefix whose totals dropped to zero is removed.
+    """
+    folded = {(row['host'], row['dir_prefix']): row for row in rows}
+    for row in changes:
+        key = (row['host'], row['dir_prefix'])
+        if row.get('tape_bytes') or row.get('tape_files'):
+            folded[key] = row
+        else:
+            folded.pop(key, None)
+    return list(folded.values())
+
+
 def norm(path):
     """The same normalization rule as ``core._build_tree``."""
     path = (path or '').rstrip('/')
@@ -4,6 +4,10 @@ Mirrors :class:`src.inspector_repository.InspectorRepository`: autocommit so no
 transaction is left open pinning xmin, plus a session-level read-only guard.
 One connection is opened per refresh and closed right after — the web app
 holds no idle connections between refreshes.
+
+Once the maintained coverage totals exist (``src.coverage_rollups``), a refresh
+reads only the prefixes changed since the watermark it was given instead of
+running :data:`COVERAGE_SQL`.
 """
 from typing import Any, TYPE_CHECKING, cast
 
@@ -18,9 +22,22 @@ else:
         psycopg = None
         dict_row = None
 
+from src import coverage_rollups
+
 from .coverage import COVERAGE_SQL
 
 
+def _row_dict(row):
+    last = row.get('last_backup')
+    return {
+        'host': row['host'],
+        'dir_prefix': row['dir_prefix'],
+        'tape_bytes': int(row['tape_bytes'] or 0),
+        'tape_files': int(row['tape_files'] or 0),
+        'last_backup': last.isoformat() if last is not None else None,
+    }
+
+
 class CoverageRepository:
     def __init__(self, dsn):
         if psycopg is None:
@@ -51,14 +68,72 @@ class CoverageRepository:
             'max_segs': int(max_segs),
             'threshold_bytes': int(threshold_bytes),
         })
-        rows = []
-        for row in cursor:
-            last = row.get('last_backup')
-            rows.append({
-                'host': row['host'],
-                'dir_prefix': row['dir_prefix'],
-                'tape_bytes': int(row['tape_bytes'] or 0),
-                'tape_files': int(row['tape_files'] or 0),
-                'last_backup': last.isoformat() if last is not None else None,
-            })
-        return rows
+        return [_row_dict(row) for row in cursor]
+
+    def fetch_coverage_changes(self, max_segs, threshold_bytes, since=None):
+        """Prefix rows from the maintained totals, or None to use the full query.
+
+        ``since`` is the ``rollup`` mark of the previous refresh. When it names
+        the current build, only prefixes changed after its ``watermark`` are
+        returned (``full`` is False) and the caller folds them into its rows;
+        otherwise every prefix is. None when the totals are not built, or were
+        built for another ``max_segs``/threshold.
+        """
+        with self.conn.transaction():
+            # One snapshot for the state row and the prefix rows.
+            self.conn.execute(
+                "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            state = coverage_rollups.rollup_state(self.conn)
+            if (state is None or int(state['max_segs']) != int(max_segs)
+                    or int(state['threshold_bytes']) != int(threshold_bytes)):
+                return None
+            generation = state['built_at'].isoformat()
+            since = since or {}
+            full = since.get('generation') != generation
+            watermark = 0 if full else int(since.get('watermark') or 0)
+            rows = coverage_rollups.prefix_rows_since(self.conn, watermark)
+        return {
+            'full': full,
+            'mark': {
+                'generation': generation,
+                'watermark': max([watermark] + [int(row['change_seq'])
+                                                for row in rows]),
+            },
+            'rows': [_row_dict(row) for row in rows],
+        }
+
+    def verify_rollups(self, max_segs, threshold_bytes, limit=100):
+        """Compare the maintained prefix totals with :data:`COVERAGE_SQL`.
+
+        Read-only. Bytes and file counts must match; ``last_backup`` is not
+        compared because it only moves forward on the maintained rows.
+        All-zero prefixes count as absent on both sides.
+        """
+        state = coverage_rollups.rollup_state(self.conn)
+        built = (state is not None and int(state['max_segs']) == int(max_segs)
+                 and int(state['threshold_bytes']) == int(threshold_bytes))
+        if not built:
+            return {'built': False, 'passed': False, 'mismatches': 0,
+                    'examples': []}
+        expected = {(row['host'], row['dir_prefix']): row
+                    for row in self.fetch_coverage_rows(max_segs, threshold_bytes)}
+        stored = {(row['host'], row['dir_prefix']): _row_dict(row)
+                  for row in coverage_rollups.prefix_rows_since(self.conn)}
+        mismatches = []
+        for key in sorted(set(expected) | set(stored)):
+            want = expected.get(key) or {}
+            have = stored.get(key) or {}
+            want_pair = (want.get('tape_bytes', 0), want.get('tape_files', 0))
+            have_pair = (have.get('tape_bytes', 0), have.get('tape_files', 0))
+            if want_pair != have_pair:
+                mismatches.append({
+                    'host': key[0], 'dir_prefix': key[1],
+                    'expected_bytes': want_pair[0], 'stored_bytes': have_pair[0],
+                    'expected_files': want_pair[1], 'stored_files': have_pair[1],
+                })
+        return {
+            'built': True,
+            'passed': not mismatches,
+            'mismatches': len(mismatches),
+            'examples': mismatches[:max(1, int(limit))],
+        }
@@ -0,0 +1,42 @@
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+_SCRIPT = (Path(__file__).resolve().parent.parent / "scripts"
+           / "benchmark_manifest_search.py")
+_SPEC = importlib.util.spec_from_file_location(
+    "benchmark_manifest_search", _SCRIPT)
+benchmark = importlib.util.module_from_spec(_SPEC)
+assert _SPEC.loader is not None
+sys.modules[_SPEC.name] = benchmark
+_SPEC.loader.exec_module(benchmark)
+
+
+class ManifestSearchBenchmarkSmokeTests(unittest.TestCase):
+    def test_scaled_run_agrees_with_full_scan_and_cleans_up(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = benchmark.run_benchmark(output_root=tmp, scale=0.0005)
+
+            self.assertEqual(summary["version"], benchmark.HARNESS_VERSION)
+            self.assertEqual(summary["rows"], 5000)
+            self.assertGreater(summary["build"]["sidecar_bytes"], 0)
+            queries = summary["queries"]
+            self.assertEqual(queries["rare"]["matches"], 1)
+            self.assertEqual(queries["common"]["matches"], 500)
+            self.assertEqual(queries["absent"]["matches"], 0)
+            run_root = Path(summary["run_root"])
+            self.assertTrue((run_root / "summary.json").exists())
+            self.assertTrue((run_root / "summary.md").exists())
+            self.assertFalse((run_root / "archive").exists())
+
+    def test_non_positive_scale_is_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(benchmark.HarnessError):
+                benchmark.run_benchmark(output_root=tmp, scale=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
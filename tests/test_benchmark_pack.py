@@ -0,0 +1,53 @@
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+_SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "benchmark_pack.py"
+_SPEC = importlib.util.spec_from_file_location("benchmark_pack", _SCRIPT)
+benchmark = importlib.util.module_from_spec(_SPEC)
+assert _SPEC.loader is not None
+sys.modules[_SPEC.name] = benchmark
+_SPEC.loader.exec_module(benchmark)
+
+
+class PackBenchmarkSmokeTests(unittest.TestCase):
+    def test_scaled_profiles_report_both_flows_and_clean_up(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = benchmark.run_benchmark(
+                profiles=["small", "large"], output_root=tmp, scale=0.002,
+                check_crc=True)
+
+            self.assertEqual(summary["version"], benchmark.HARNESS_VERSION)
+            self.assertEqual(summary["flows"], list(benchmark.FLOWS))
+            small, large = summary["profiles"]
+            self.assertEqual(small["spec"]["file_count"], 200)
+            self.assertEqual(large["spec"]["file_count"], 2)
+            for profile in (small, large):
+                for flow in benchmark.FLOWS:
+                    row = profile[flow]
+                    self.assertTrue(row["verified"])
+                    self.assertGreater(row["output_bytes"], row["logical_bytes"])
+                    self.assertGreater(row["mib_per_second"], 0)
+            run_root = Path(summary["run_root"])
+            self.assertTrue((run_root / "summary.json").exists())
+            self.assertTrue((run_root / "summary.md").exists())
+            self.assertFalse((run_root / "small").exists())
+
+    def test_unknown_profile_is_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(benchmark.HarnessError):
+                benchmark.run_benchmark(profiles=["huge"], output_root=tmp)
+
+    def test_parallel_flows_need_two_workers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(benchmark.HarnessError):
+                benchmark.run_benchmark(
+                    profiles=["small"], output_root=tmp, flows=["process"],
+                    workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
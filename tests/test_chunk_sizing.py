@@ -0,0 +1,193 @@
+"""Chunk and write-group sizing from the measured tape-write overhead."""
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from src import remote_orchestrator as ro
+from src.chunk_sizing import (
+    MIN_CHUNK_BYTES, TapeWriteModel, load_tape_write_model,
+    max_chunk_bytes_for_staging, size_chunks)
+from src.constants import LOCAL_STAGING_RESERVE_BYTES
+from src.ready_queue import ReadyQueueLimits
+from src.reporting import append_backup_summary_row
+
+GiB = 1024**3
+MiB = 1024**2
+
+
+def _write_row(log_dir, copied, stream_mbs, overhead, status="completed",
+               tape="T1"):
+    append_backup_summary_row(log_dir, {
+        "status": status,
+        "tape_label": tape,
+        "copied_bytes": copied,
+        "total_time_seconds": copied / (stream_mbs * MiB) + overhead,
+        "tape_stream_mbs": f"{stream_mbs:.1f}",
+        "record_counts": {},
+        "rc_sum": {},
+    })
+
+
+def _limits(min_start=20 * GiB, max_bytes=80 * GiB):
+    return ReadyQueueLimits(min_start, 40 * GiB, max_bytes, 48)
+
+
+class TapeWriteModelTests(unittest.TestCase):
+    def test_model_is_the_median_of_completed_tape_writes(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            _write_row(log_dir, 8 * GiB, 300, 120)
+            _write_row(log_dir, 135 * GiB, 300, 100)
+            _write_row(log_dir, 50 * GiB, 280, 140)
+            # A failed write and a row without profiler data say nothing.
+            _write_row(log_dir, 50 * GiB, 300, 9000, status="failed")
+            append_backup_summary_row(log_dir, {
+                "status": "completed", "copied_bytes": GiB,
+                "total_time_seconds": 600, "record_counts": {},
+                "rc_sum": {}})
+
+            model = load_tape_write_model(log_dir)
+
+        self.assertEqual(model.samples, 3)
+        self.assertAlmostEqual(model.overhead_seconds, 120, delta=0.5)
+        self.assertAlmostEqual(model.stream_bytes_per_second, 300 * MiB,
+                               delta=MiB)
+
+    def test_too_little_history_is_no_model(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            self.assertIsNone(load_tape_write_model(log_dir))
+            _write_row(log_dir, 8 * GiB, 300, 120)
+            _write_row(log_dir, 8 * GiB, 300, 120)
+            self.assertIsNone(load_tape_write_model(log_dir))
+
+    def test_efficiency_follows_the_fixed_cost(self):
+        model = TapeWriteModel(120.0, 300 * MiB, 3)
+        # An 8 GB chunk spends most of its write on the fixed cost.
+        self.assertLess(model.efficiency(8 * GiB), 0.2)
+        needed = model.bytes_for_efficiency(0.9)
+        self.assertAlmostEqual(model.efficiency(needed), 0.9, places=3)
+
+    def test_a_group_pays_the_fixed_cost_once_per_chunk(self):
+        model = TapeWriteModel(20.0, 300 * MiB, 3)
+        # 30 GiB streams in 102.4 s; one write adds 20 s, three add 60 s.
+        self.assertAlmostEqual(model.predict_mbs(30 * GiB), 251.0, delta=0.1)
+        self.assertAlmostEqual(model.predict_mbs(30 * GiB, 3), 189.2,
+                               delta=0.1)
+        self.assertEqual(model.predict_mbs(0, 3), 0.0)
+
+    def test_a_growing_group_amortizes_its_own_fixed_cost(self):
+        model = TapeWriteModel(20.0, 300 * MiB, 3,
+                               group_overhead_seconds=30.0)
+        shares = [model.group_amortization(n * GiB, n) for n in (1, 4, 12)]
+        self.assertEqual(shares, sorted(shares))
+        self.assertGreater(shares[-1], 0.9)
+        # SUMMARY.csv models have no per-group cost.
+        self.assertEqual(
+            TapeWriteModel(20.0, 300 * MiB, 3).group_amortization(GiB), 1.0)
+        self.assertEqual(model.group_amortization(0, 3), 0.0)
+
+    def test_the_tapes_own_writes_are_preferred(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            for _ in range(3):
+                _write_row(log_dir, 8 * GiB, 300, 20, tape="T1")
+                _write_row(log_dir, 8 * GiB, 200, 60, tape="T2")
+            _write_row(log_dir, 8 * GiB, 100, 90, tape="T3")
+
+            own = load_tape_write_model(log_dir, tape_label="T2")
+            # One write of T3 is too few: every recent write is used.
+            mixed = load_tape_write_model(log_dir, tape_label="T3")
+            t1 = load_tape_write_model(log_dir, tape_label="T1")
+
+        self.assertEqual(own.samples, 3)
+        self.assertAlmostEqual(own.overhead_seconds, 60, delta=0.5)
+        self.assertAlmostEqual(own.stream_bytes_per_second, 200 * MiB,
+                               delta=MiB)
+        self.assertEqual(mixed.samples, 7)
+        self.assertAlmostEqual(mixed.overhead_seconds, 60, delta=0.5)
+        self.assertAlmostEqual(mixed.stream_bytes_per_second, 200 * MiB,
+                               delta=MiB)
+        self.assertAlmostEqual(t1.overhead_seconds, 20, delta=0.5)
+
+
+class SizeChunksTests(unittest.TestCase):
+    def test_a_costly_write_grows_chunks_up_to_the_staging_room(self):
+        model = TapeWriteModel(120.0, 300 * MiB, 5)
+        staging = 600 * GiB
+        sizing = size_chunks(
+            model, target_efficiency=0.9, static_chunk_bytes=50 * GiB,
+            limits=_limits(), effective_staging_bytes=staging)
+
+        room = (staging - 80 * GiB - LOCAL_STAGING_RESERVE_BYTES) // 2
+        self.assertEqual(max_chunk_bytes_for_staging(staging, 80 * GiB), room)
+        self.assertEqual(sizing.source, "model")
+        self.assertEqual(sizing.chunk_bytes, room)
+        # A group waits for at least one such chunk, never past the target.
+        self.assertEqual(sizing.min_start_bytes, 40 * GiB)
+        self.assertGreater(sizing.predicted_efficiency, 0.85)
+
+    def test_a_cheap_write_keeps_chunks_small(self):
+        model = TapeWriteModel(5.0, 300 * MiB, 5)
+        sizing = size_chunks(
+            model, target_efficiency=0.9, static_chunk_bytes=50 * GiB,
+            limits=_limits(), effective_staging_bytes=1000 * GiB)
+
+        self.assertEqual(sizing.chunk_bytes, model.bytes_for_efficiency(0.9))
+        self.assertGreaterEqual(sizing.chunk_bytes, MIN_CHUNK_BYTES)
+        self.assertEqual(sizing.min_start_bytes, 20 * GiB)
+
+    def test_no_model_or_no_target_keeps_the_configured_sizes(self):
+        model = TapeWriteModel(120.0, 300 * MiB, 5)
+        for sizing in (
+                size_chunks(None, target_efficiency=0.9,
+                            static_chunk_bytes=50 * GiB, limits=_limits(),
+                            effective_staging_bytes=1000 * GiB),
+                size_chunks(model, target_efficiency=0,
+                            static_chunk_bytes=50 * GiB, limits=_limits(),
+                            effective_staging_bytes=1000 * GiB)):
+            self.assertEqual(sizing.source, "static")
+            self.assertEqual(sizing.chunk_bytes, 50 * GiB)
+            self.assertEqual(sizing.min_start_bytes, 20 * GiB)
+
+
+class OrchestratorChunkSizingTests(unittest.TestCase):
+    def _orch(self, log_dir):
+        orch = ro.RemoteOrchestrator.__new__(ro.RemoteOrchestrator)
+        orch.cfg = SimpleNamespace(backup_log_dir=log_dir)
+        orch.chunk_cap_bytes = 50 * GiB
+        orch.ready_limits = _limits()
+        orch.effective_staging_bytes = 1000 * GiB
+        orch.chunk_target_efficiency = 0.9
+        orch.chunk_sizing_history_rows = 20
+        return orch
+
+    def test_each_session_sizes_from_the_configured_values(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            orch = self._orch(log_dir)
+            self.assertEqual(orch._apply_chunk_sizing().source, "static")
+            self.assertEqual(orch.chunk_cap_bytes, 50 * GiB)
+
+            for _ in range(3):
+                _write_row(log_dir, 8 * GiB, 300, 5)
+            sizing = orch._apply_chunk_sizing()
+            self.assertEqual(sizing.source, "model")
+            self.assertEqual(orch.chunk_cap_bytes, sizing.chunk_bytes)
+            self.assertLess(orch.chunk_cap_bytes, 50 * GiB)
+            self.assertEqual(orch.ready_limits.min_start_bytes, 20 * GiB)
+
+            for _ in range(20):
+                _write_row(log_dir, 8 * GiB, 300, 120)
+            sizing = orch._apply_chunk_sizing()
+            self.assertGreater(orch.chunk_cap_bytes, 50 * GiB)
+            self.assertEqual(orch.ready_limits.min_start_bytes, 40 * GiB)
+            self.assertEqual(orch.ready_limits.max_bytes, 80 * GiB)
+
+    def test_sizing_off_leaves_the_orchestrator_alone(self):
+        orch = self._orch(None)
+        orch.chunk_target_efficiency = 0.0
+        limits = orch.ready_limits
+        self.assertIsNone(orch._apply_chunk_sizing())
+        self.assertIs(orch.ready_limits, limits)
+        self.assertEqual(orch.chunk_cap_bytes, 50 * GiB)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+"""Parallel fetch: unit planning, shared-queue dispatch and stream adaptation."""
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src.fetch_scheduler import (
+    FetchStreamScheduler, FetchUnit, plan_fetch_units)
+from src.packer_parallel import SHARD_FILE_COST_BYTES
+from src.remote_orchestrator import RemoteOrchestrator
+from src.remote_staging import RemoteChunkStager
+
+MB = 1024 * 1024
+
+
+def _item(manifest_id, size):
+    row = {"manifest_id": manifest_id, "file_size_bytes": size}
+    return row, f"f{manifest_id}", f"/fetch/f{manifest_id}"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class PlanFetchUnitsTests(unittest.TestCase):
+    def test_units_are_balanced_by_bytes_and_file_count(self):
+        big = [_item(i, 64 * MB) for i in range(4)]
+        small = [_item(100 + i, 1024) for i in range(40)]
+        units = plan_fetch_units(
+            [("/a", big[:2] + small[:20]), ("/a", big[2:] + small[20:])],
+            streams=2, max_files=8)
+
+        # Every file lands in exactly one unit, under its own base.
+        fetched = [row["manifest_id"]
+                   for unit in units for row, _, _ in unit.batch]
+        self.assertEqual(sorted(fetched),
+                         sorted(row["manifest_id"] for row, _, _ in big + small))
+        self.assertTrue(all(unit.remote_base == "/a" for unit in units))
+        self.assertTrue(all(len(unit.batch) <= 8 for unit in units))
+        # A large file does not drag the small ones after it into its unit,
+        # and the units go out largest first.
+        total = 4 * 64 * MB + 40 * 1024 + 44 * SHARD_FILE_COST_BYTES
+        share = -(-total // 8)
+        self.assertTrue(all(unit.cost <= share or len(unit.batch) == 1
+                            for unit in units))
+        self.assertEqual([unit.cost for unit in units],
+                         sorted((unit.cost for unit in units), reverse=True))
+        self.assertEqual(sum(unit.size_bytes for unit in units),
+                         4 * 64 * MB + 40 * 1024)
+
+    def test_bases_are_never_mixed(self):
+        units = plan_fetch_units(
+            [("/a", [_item(1, 10)]), ("/b", [_item(2, 10)])],
+            streams=4, max_files=100)
+        self.assertEqual(sorted((unit.remote_base, len(unit.batch))
+                                for unit in units), [("/a", 1), ("/b", 1)])
+
+
+class FetchStreamSchedulerTests(unittest.TestCase):
+    def test_a_free_stream_takes_the_next_unit(self):
+        units = [FetchUnit("/a", [_item(0, 100)], 100 * MB, 100 * MB)] + [
+            FetchUnit("/a", [_item(i, 1)], MB, MB) for i in range(1, 5)]
+        scheduler = FetchStreamScheduler(units, 2, adaptive=False)
+        release = threading.Event()
+        taken = {0: [], 1: []}
+
+        def worker(stream):
+            while (unit := scheduler.next_unit(stream)) is not None:
+                taken[stream].append(unit.size_bytes)
+                if unit.size_bytes == 100 * MB:
+                    release.wait(5)
+                elif len(taken[stream]) == 4:
+                    release.set()
+                scheduler.finished(stream, unit, scheduler.clock(), True)
+
+        threads = [threading.Thread(target=worker, args=(stream,))
+                   for stream in (0, 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        # The stream stuck on the large unit did not hold the small ones.
+        self.assertEqual(sorted(taken.values()), [[MB] * 4, [100 * MB]])
+
+    def _drive(self, scheduler, clock, seconds_per_unit):
+        """Run units one at a time on stream 0, each taking
+        ``seconds_per_unit(limit)`` of fake time."""
+        limits = []
+        while (unit := scheduler.next_unit(0)) is not None:
+            started = clock()
+            clock.now += seconds_per_unit(scheduler.limit)
+            scheduler.finished(0, unit, started, True)
+            limits.append(scheduler.limit)
+        return limits
+
+    def test_streams_are_parked_while_the_rate_holds(self):
+        clock = _Clock()
+        units = [FetchUnit("/a", [_item(i, MB)], MB, MB) for i in range(20)]
+        scheduler = FetchStreamScheduler(units, 3, clock=clock)
+        # Same aggregate rate at every stream count: more streams buy nothing.
+        self._drive(scheduler, clock, lambda limit: 1.0)
+        self.assertEqual(scheduler.limit, 1)
+
+    def test_a_parked_stream_comes_back_when_the_rate_drops(self):
+        clock = _Clock()
+        units = [FetchUnit("/a", [_item(i, MB)], MB, MB) for i in range(20)]
+        scheduler = FetchStreamScheduler(units, 3, clock=clock)
+        # Three and two streams run at the same rate; one is half as fast.
+        self._drive(scheduler, clock, lambda limit: 2.0 if limit == 1 else 1.0)
+        self.assertEqual(scheduler.limit, 2)
+
+    def test_not_adaptive_keeps_every_stream(self):
+        clock = _Clock()
+        units = [FetchUnit("/a", [_item(i, MB)], MB, MB) for i in range(20)]
+        scheduler = FetchStreamScheduler(units, 3, adaptive=False, clock=clock)
+        self._drive(scheduler, clock, lambda limit: 1.0)
+        self.assertEqual(scheduler.limit, 3)
+
+    def test_telemetry_reports_rate_and_tail_idle_per_stream(self):
+        clock = _Clock()
+        units = [FetchUnit("/a", [_item(i, 1)], 4 * MB, 4 * MB)
+                 for i in range(3)]
+        scheduler = FetchStreamScheduler(units, 2, adaptive=False, clock=clock)
+        first = scheduler.next_unit(0)
+        second = scheduler.next_unit(1)
+        clock.now = 2.0
+        scheduler.finished(1, second, 0.0, True)
+        third = scheduler.next_unit(1)
+        clock.now = 4.0
+        scheduler.finished(0, first, 0.0, True)
+        clock.now = 5.0
+        scheduler.finished(1, third, 2.0, True)
+
+        telemetry = scheduler.telemetry()
+        self.assertEqual(telemetry["fetch_streams"], 2)
+        self.assertEqual(telemetry["fetch_units"], 3)
+        self.assertEqual(telemetry["fetch_stream_mbs"], "1.0;1.6")
+        self.assertEqual(telemetry["fetch_stream_tail_idle_seconds"],
+                         "1.000;0.000")
+
+
+class ParallelFetchStagerTests(unittest.TestCase):
+    def _host(self, fetch_one_batch):
+        db = mock.MagicMock()
+        return SimpleNamespace(
+            db=db, governor=None, metadata_batch_size=100,
+            fetch_adaptive_streams=True, _fetch_one_batch=fetch_one_batch)
+
+    def test_every_file_is_fetched_once_and_telemetry_is_kept(self):
+        seen = []
+        lock = threading.Lock()
+
+        def fetch(remote_base, batch, fetch_dir, fetch_abort):
+            with lock:
+                seen.extend(row["manifest_id"] for row, _, _ in batch)
+            return True, ""
+
+        host = self._host(fetch)
+        items = [_item(i, (i % 7) * MB) for i in range(60)]
+        ok = RemoteChunkStager(host)._fetch_batches_parallel(
+            [("/a", items[:30]), ("/a", items[30:])], "/fetch",
+            threading.Event(), 7, 3)
+
+        self.assertTrue(ok)
+        self.assertEqual(sorted(seen), list(range(60)))
+        self.assertEqual(host._last_fetch_streams["fetch_streams"], 3)
+        self.assertGreater(host._last_fetch_streams["fetch_units"], 3)
+        self.assertEqual(host._fetch_stream_hint,
+                         host._last_fetch_streams["fetch_streams_active"])
+
+    def test_a_failed_unit_stops_the_fetch_and_fails_its_rows(self):
+        def fetch(remote_base, batch, fetch_dir, fetch_abort):
+            if any(row["manifest_id"] == 0 for row, _, _ in batch):
+                return False, "tar: boom"
+            return True, ""
+
+        host = self._host(fetch)
+        abort = threading.Event()
+        items = [_item(0, 50 * MB)] + [_item(i, MB) for i in range(1, 10)]
+        ok = RemoteChunkStager(host)._fetch_batches_parallel(
+            [("/a", items)], "/fetch", abort, 7, 2)
+
+        self.assertFalse(ok)
+        self.assertTrue(abort.is_set())
+        failed_ids, err = host.db.update_manifest_rows_fetch_failed.call_args[0]
+        self.assertEqual(list(failed_ids), [0])
+        self.assertEqual(err, "tar: boom")
+
+    def test_orchestrator_forwards_the_session_id(self):
+        orch = RemoteOrchestrator.__new__(RemoteOrchestrator)
+        stager = mock.MagicMock()
+        with mock.patch.object(RemoteOrchestrator, "_stager",
+                               return_value=stager):
+            orch._fetch_batches_parallel(["item"], "/fetch", "abort", 7, 2)
+        stager._fetch_batches_parallel.assert_called_once_with(
+            ["item"], "/fetch", "abort", 7, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,8 +21,11 @@ no LTFS.
 import copy
 import os
 import posixpath
+import shutil
+import subprocess
 import tempfile
 import threading
+import time
 import unittest
 from types import SimpleNamespace
 from unittest import mock
@@ -30,7 +33,8 @@ from unittest import mock
 from src import scan_frontier as sf
 from src.archive_artifacts import parse_jsonl_zst_artifact
 from src.pipeline_types import (SCOPE_KIND_DIRECTORY, ScanCoverageState,
-                                ScanDirectoryState, ScanSegmentState)
+                                ScanDirectoryState, ScanMetrics,
+                                ScanSegmentState)
 from src.scan_frontier import (DirectoryFrontierCoordinator,
                                ScopeConfigurationError, canonicalize_scopes,
                                reconcile_scope_order)
@@ -51,6 +55,11 @@ class FakeSource:
         self.observations = dict(observations or {})
         self.listed = []              # every list_directory call, in order
         self.observed = []
+        self.batches = []             # every list_directories call, in order
+
+    def list_directories(self, paths):
+        self.batches.append(list(paths))
+        return [self.list_directory(path) for path in paths]
 
     def list_directory(self, path):
         self.listed.append(path)
@@ -79,7 +88,11 @@ class FrontierDB:
         self.segments = []
         self.errors = []
         self.attempts = {}
+        self.commits = []             # every commit_directory_listings batch
+        self.renewals = []            # every renew_directory_leases owner
         self._next_id = 1
+        # Workers claim concurrently; the real claim is one SQL statement.
+        self._claim_lock = threading.RLock()
 
     def _id(self):
         value = self._next_id
@@ -142,6 +155,10 @@ class FrontierDB:
 
     def claim_next_directory(self, session_id, owner_token, attempt_id,
                              lease_seconds=900):
+        with self._claim_lock:
+            return self._claim_one(owner_token, attempt_id)
+
+    def _claim_one(self, owner_token, attempt_id):
         order = {s["scan_scope_id"]: s["scope_ordinal"] for s in self.scopes}
         candidates = [
             d for d in self.directories
@@ -158,6 +175,46 @@ class FrontierDB:
         row["attempt_id"] = attempt_id
         return dict(row)
 
+    def claim_directories(self, session_id, owner_token, attempt_id, limit,
+                          lease_seconds=900):
+        claimed = []
+        with self._claim_lock:
+            while len(claimed) < limit:
+                row = self._claim_one(owner_token, attempt_id)
+                if row is None:
+                    break
+                claimed.append(row)
+        return claimed
+
+    def renew_directory_leases(self, owner_token, lease_seconds=900):
+        self.renewals.append(owner_token)
+        return sum(1 for d in self.directories
+                   if d["owner_token"] == owner_token)
+
+    def commit_directory_listings(self, owner_token, listings):
+        listings = list(listings)
+        self.commits.append([l["scan_directory_id"] for l in listings])
+        completed = []
+        for listing in listings:
+            directory_id = listing["scan_directory_id"]
+            if listing["segment"]:
+                self.publish_scan_segment(directory_id, **listing["segment"])
+            if listing["children"]:
+                self.enqueue_scan_directories(
+                    listing["scan_scope_id"], listing["children"],
+                    parent_directory_id=directory_id)
+            for category, path, message in listing["errors"]:
+                self.record_scan_error(scan_directory_id=directory_id,
+                                       category=category, path=path,
+                                       message=message)
+            completed.append(self.complete_directory_listing(
+                directory_id, owner_token,
+                direct_file_count=listing["direct_file_count"],
+                direct_byte_count=listing["direct_byte_count"],
+                observation_after=listing["observation_after"],
+                error_count=len(listing["errors"])))
+        return completed
+
     def complete_directory_listing(self, directory_id, owner_token, *,
                                    direct_file_count, direct_byte_count,
                                    observation_after=None, error_count=0):
@@ -800,5 +857,363 @@ class DirectoryListingCommandTests(unittest.TestCase):
         self.assertNotIn("find", command)
 
 
+# =============================================================================
+# H. The persistent listing session
+# =============================================================================
+def _local_stream(_user, _host, command, password="", cipher=""):
+    """Run the exact remote command through a local shell instead of SSH."""
+    return ["sh", "-c", command], None, None
+
+
+@unittest.skipIf(os.name == "nt" or not all(
+    shutil.which(tool) for tool in ("sh", "bash", "find", "stat")),
+    "needs a POSIX shell with GNU find/stat")
+class PersistentListingSessionTests(unittest.TestCase):
+    """The session serves the SAME records the one-shot command prints."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "a")
+        os.makedirs(os.path.join(self.root, "sub"))
+        with open(os.path.join(self.root, "two words"), "wb") as handle:
+            handle.write(b"x" * 10)
+        with open(os.path.join(self.root, "f"), "wb") as handle:
+            handle.write(b"y" * 3)
+        patcher = mock.patch("src.scanning._ssh_stream_command",
+                             _local_stream)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def _scanner(self, **kwargs):
+        from src.pipeline_types import ScanMetrics
+        from src.scanning import DirectoryFrontierScanner
+        self.metrics = ScanMetrics()
+        scanner = DirectoryFrontierScanner(
+            "u", "h", skipped_tracker=mock.MagicMock(), ui=mock.MagicMock(),
+            metrics=self.metrics, persistent_session=True, **kwargs)
+        self.addCleanup(scanner.close)
+        return scanner
+
+    def test_many_listings_share_one_connection(self):
+        scanner = self._scanner(timeout=30)
+        with mock.patch("src.scanning._ssh_run") as one_shot:
+            first = scanner.list_directory(self.root)
+            second = scanner.list_directory(os.path.join(self.root, "sub"))
+            token = scanner.observe(self.root)
+        one_shot.assert_not_called()
+        self.assertEqual(first.files, [(self.root + "/f", 3),
+                                       (self.root + "/two words", 10)])
+        self.assertEqual(first.directories, [self.root + "/sub"])
+        self.assertEqual(second.files, [])
+        self.assertIsNotNone(first.observation)
+        self.assertEqual(token, first.observation)
+        self.assertEqual(
+            self.metrics.snapshot()["scan_listing_sessions_opened"], 1)
+
+    def test_find_warnings_stay_attributed_to_their_directory(self):
+        scanner = self._scanner(timeout=30)
+        listing = scanner.list_directory(os.path.join(self.root, "missing"))
+        self.assertNotEqual(listing.returncode, 0)
+        self.assertTrue(any(e[0] == "listing_warning" for e in listing.errors))
+        self.assertEqual(scanner.list_directory(self.root).errors, [])
+
+    def test_a_dropped_connection_is_reconnected_once(self):
+        from src.runtime import _kill_proc_tree
+        scanner = self._scanner(timeout=30)
+        scanner.list_directory(self.root)
+        proc = scanner._session._proc
+        _kill_proc_tree(proc)
+        proc.wait()
+        listing = scanner.list_directory(self.root)
+        self.assertEqual(len(listing.files), 2)
+        self.assertEqual(
+            self.metrics.snapshot()["scan_listing_sessions_opened"], 2)
+
+    def test_a_timeout_raises_and_discards_the_session(self):
+        def stalled(_user, _host, _command, password="", cipher=""):
+            return ["sh", "-c", "sleep 30"], None, None
+
+        scanner = self._scanner(timeout=0.3)
+        with mock.patch("src.scanning._ssh_stream_command", stalled), \
+                self.assertRaises(RuntimeError) as caught:
+            scanner.list_directory(self.root)
+        self.assertIn("timed out", str(caught.exception))
+        self.assertIsNone(scanner._session._proc)
+
+    def test_a_host_without_the_loop_falls_back_to_one_shot_ssh(self):
+        def no_bash(_user, _host, _command, password="", cipher=""):
+            return ["sh", "-c", "exit 127"], None, None
+
+        result = SimpleNamespace(stdout="OBS 1:2:3\0f 10 /strg/a/x\0",
+                                 stderr="", returncode=0)
+        scanner = self._scanner(timeout=30)
+        with mock.patch("src.scanning._ssh_stream_command", no_bash), \
+                mock.patch("src.scanning._ssh_run",
+                           return_value=result) as one_shot:
+            listing = scanner.list_directory("/strg/a")
+        one_shot.assert_called_once()
+        self.assertEqual(listing.files, [("/strg/a/x", 10)])
+        self.assertFalse(scanner.persistent_session)
+
+    def test_a_batch_is_pipelined_over_one_connection(self):
+        scanner = self._scanner(timeout=30)
+        sub = os.path.join(self.root, "sub")
+        missing = os.path.join(self.root, "missing")
+        with mock.patch("src.scanning._ssh_run") as one_shot:
+            listings = scanner.list_directories([self.root, missing, sub])
+        one_shot.assert_not_called()
+        self.assertEqual([l.path for l in listings], [self.root, missing, sub])
+        self.assertEqual(len(listings[0].files), 2)
+        self.assertEqual(listings[0].errors, [])
+        self.assertTrue(any(e[0] == "listing_warning"
+                            for e in listings[1].errors))
+        self.assertEqual(listings[2].errors, [])
+        self.assertEqual(scanner._session.connects, 1)
+
+    def test_a_one_shot_batch_returns_one_section_per_directory(self):
+        def local_run(_user, _host, command, capture=True, password="",
+                      timeout=None):
+            return subprocess.run(["sh", "-c", command], capture_output=True,
+                                  text=True, timeout=timeout)
+
+        from src.scanning import DirectoryFrontierScanner
+        scanner = DirectoryFrontierScanner(
+            "u", "h", skipped_tracker=mock.MagicMock(), ui=mock.MagicMock())
+        sub = os.path.join(self.root, "sub")
+        missing = os.path.join(self.root, "missing")
+        with mock.patch("src.scanning._ssh_run", side_effect=local_run) as run:
+            listings = scanner.list_directories([self.root, missing, sub])
+        run.assert_called_once()
+        self.assertEqual(listings[0].files, [(self.root + "/f", 3),
+                                             (self.root + "/two words", 10)])
+        self.assertEqual(listings[0].directories, [sub])
+        self.assertIsNotNone(listings[0].observation)
+        self.assertIsNone(listings[1].observation)
+        self.assertTrue(any(e[0] == "listing_warning"
+                            for e in listings[1].errors))
+        self.assertEqual((listings[2].files, listings[2].errors), ([], []))
+
+    def test_a_truncated_one_shot_batch_raises(self):
+        from src.scanning import DirectoryFrontierScanner
+        scanner = DirectoryFrontierScanner(
+            "u", "h", skipped_tracker=mock.MagicMock(), ui=mock.MagicMock())
+        result = SimpleNamespace(
+            stdout="OBS 1:2:3\0f 1 /strg/a/x\0END 0\0OBS 4:5:6\0",
+            stderr="", returncode=0)
+        with mock.patch("src.scanning._ssh_run", return_value=result), \
+                self.assertRaises(RuntimeError) as caught:
+            scanner.list_directories(["/strg/a", "/strg/b"])
+        self.assertIn("truncated", str(caught.exception))
+
+    def test_the_coordinator_closes_the_session_on_exit(self):
+        scanner = mock.MagicMock()
+        coordinator = DirectoryFrontierCoordinator(
+            db=mock.MagicMock(), session_id=1, scan_paths=["/strg"],
+            archive_root=self.tmp.name, scanner_factory=lambda _m: scanner,
+            stop_event=threading.Event())
+        coordinator.scanner()
+        coordinator.close_scanner()
+        scanner.close.assert_called_once_with()
+
+
+# =============================================================================
+# I. Batched listing
+# =============================================================================
+WIDE_TREE = {
+    "/strg/a": {"files": {"f": 1}, "dirs": ["d1", "d2", "d3", "d4"]},
+    "/strg/a/d1": {"files": {"x": 10}, "dirs": []},
+    "/strg/a/d2": {"files": {}, "dirs": ["e"]},
+    "/strg/a/d2/e": {"files": {"y": 20}, "dirs": []},
+    "/strg/a/d3": {"files": {"z": 30}, "dirs": []},
+    "/strg/a/d4": {"files": {}, "dirs": []},
+}
+
+
+class BatchedListingTests(_Frontier):
+    def test_a_batch_lists_and_commits_several_directories_at_once(self):
+        source = FakeSource(WIDE_TREE)
+        self._coordinator(source, batch_size=4).run()
+        self.assertEqual(source.batches,
+                         [["/strg/a"],
+                          ["/strg/a/d1", "/strg/a/d2", "/strg/a/d3",
+                           "/strg/a/d4"],
+                          ["/strg/a/d2/e"]])
+        self.assertEqual([len(ids) for ids in self.db.commits], [1, 4, 1])
+        self.assertEqual(self.db.scopes[0]["coverage_state"],
+                         ScanCoverageState.FINAL.value)
+
+    def test_each_directory_keeps_its_own_artifact(self):
+        self._coordinator(FakeSource(WIDE_TREE), batch_size=8).run()
+        by_dir = {}
+        for segment in self.db.segments:
+            by_dir.setdefault(segment["scan_directory_id"], []).append(segment)
+        self.assertEqual(len(self.db.segments), 4)
+        self.assertTrue(all(len(v) == 1 for v in by_dir.values()))
+        for segment in self.db.segments:
+            _header, entries, _totals = parse_jsonl_zst_artifact(
+                self.root, segment["locator"])
+            self.assertEqual(len(entries), segment["file_count"])
+
+    def test_batched_and_single_traversals_agree(self):
+        single_db, self.db = self.db, FrontierDB()
+        batched_db = self.db
+        self._coordinator(FakeSource(WIDE_TREE), batch_size=3).run()
+        self.db = single_db
+        self._coordinator(FakeSource(WIDE_TREE)).run()
+
+        def shape(db):
+            return sorted((d["canonical_path"], d["traversal_ordinal"],
+                           d["listing_state"], d["direct_file_count"])
+                          for d in db.directories)
+        self.assertEqual(shape(batched_db), shape(single_db))
+
+    def test_a_failed_batch_releases_every_claim_as_partial(self):
+        source = FakeSource(WIDE_TREE, unreadable={"/strg/a/d3"})
+        with self.assertRaises(RuntimeError):
+            self._coordinator(source, batch_size=4).run()
+        states = {d["canonical_path"]: d["listing_state"]
+                  for d in self.db.directories}
+        self.assertEqual(states["/strg/a"], ScanDirectoryState.COMPLETE.value)
+        for child in ("d1", "d2", "d3", "d4"):
+            self.assertEqual(states["/strg/a/" + child],
+                             ScanDirectoryState.PARTIAL.value)
+        self.assertEqual(len(self.db.segments), 1)
+        failed = [e for e in self.db.errors
+                  if e["category"] == "listing_failed"]
+        self.assertEqual(len(failed), 4)
+
+    def test_max_directories_caps_the_batch(self):
+        source = FakeSource(WIDE_TREE)
+        coordinator = self._coordinator(source, batch_size=4,
+                                        max_directories=3)
+        coordinator.run()
+        self.assertEqual(coordinator.directories_listed, 3)
+        self.assertEqual(source.batches,
+                         [["/strg/a"], ["/strg/a/d1", "/strg/a/d2"]])
+
+    def test_a_database_without_batch_claims_uses_single_directories(self):
+        class SingleClaimDB:
+            def __init__(self, inner):
+                self._inner = inner
+
+            def __getattr__(self, name):
+                if name in ("claim_directories", "commit_directory_listings"):
+                    raise AttributeError(name)
+                return getattr(self._inner, name)
+
+        source = FakeSource(SIMPLE_TREE)
+        self.db = SingleClaimDB(self.db)
+        self._coordinator(source, batch_size=4).run()
+        self.assertEqual(source.batches, [])
+        self.assertEqual(source.listed, ["/strg/a", "/strg/a/sub"])
+
+
+# =============================================================================
+# J. Concurrent workers
+# =============================================================================
+def _fan_tree(width, depth):
+    tree, level = {}, ["/strg/a"]
+    for _ in range(depth):
+        below = []
+        for path in level:
+            names = [f"d{i}" for i in range(width)]
+            tree[path] = {"files": {"f": 1}, "dirs": names}
+            below.extend(posixpath.join(path, name) for name in names)
+        level = below
+    for path in level:
+        tree[path] = {"files": {"leaf": 2}, "dirs": []}
+    return tree
+
+
+class SlowSource(FakeSource):
+    """A source whose listings take long enough for workers to overlap."""
+
+    delay = 0.01
+
+    def list_directory(self, path):
+        time.sleep(self.delay)
+        return super().list_directory(path)
+
+
+class ConcurrentWorkerTests(_Frontier):
+    def _pool(self, source, **kwargs):
+        scanners = []
+
+        def factory(_metrics):
+            scanners.append(object())
+            return source
+
+        self.metrics = ScanMetrics()
+        coordinator = DirectoryFrontierCoordinator(
+            db=self.db, session_id=37, scan_paths=["/strg/a"],
+            archive_root=self.root, scanner_factory=factory,
+            stop_event=self.stop, owner_token="owner-1",
+            metrics=self.metrics, **kwargs)
+        return coordinator, scanners
+
+    def test_workers_cover_every_directory_exactly_once(self):
+        tree = _fan_tree(width=4, depth=2)
+        source = SlowSource(tree)
+        coordinator, scanners = self._pool(source, workers=4)
+        coordinator.run()
+        self.assertEqual(sorted(source.listed), sorted(tree))
+        self.assertEqual(coordinator.directories_listed, len(tree))
+        self.assertEqual(len(scanners), 4)       # one scanner per worker
+        self.assertEqual(self.db.scopes[0]["coverage_state"],
+                         ScanCoverageState.FINAL.value)
+
+    def test_workers_and_their_throughput_are_reported(self):
+        coordinator, _ = self._pool(SlowSource(_fan_tree(4, 2)), workers=3)
+        coordinator.run()
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["scan_workers"], 3)
+        rates = snapshot["scan_worker_directories_per_second"].split(";")
+        self.assertTrue(1 <= len(rates) <= 3)
+        self.assertTrue(all(float(rate) > 0 for rate in rates))
+
+    def test_workers_with_batches_agree_with_a_single_worker(self):
+        tree = _fan_tree(width=3, depth=3)
+        self._pool(SlowSource(tree), workers=3, batch_size=4)[0].run()
+        pooled = sorted((d["canonical_path"], d["traversal_ordinal"])
+                        for d in self.db.directories)
+        self.db = FrontierDB()
+        self.root = tempfile.mkdtemp(dir=self.root)   # ids restart at 1
+        self._pool(FakeSource(tree))[0].run()
+        single = sorted((d["canonical_path"], d["traversal_ordinal"])
+                        for d in self.db.directories)
+        self.assertEqual(pooled, single)
+
+    def test_max_directories_is_not_overshot_by_concurrent_workers(self):
+        coordinator, _ = self._pool(SlowSource(_fan_tree(4, 2)), workers=4,
+                                    batch_size=2, max_directories=7)
+        coordinator.run()
+        self.assertEqual(coordinator.directories_listed, 7)
+
+    def test_one_worker_failing_halts_the_pool_and_is_raised(self):
+        tree = _fan_tree(width=4, depth=2)
+        source = SlowSource(tree, unreadable={"/strg/a/d2"})
+        coordinator, _ = self._pool(source, workers=3)
+        with self.assertRaises(RuntimeError):
+            coordinator.run()
+        failed = self.db._by_id(next(
+            d["scan_directory_id"] for d in self.db.directories
+            if d["canonical_path"] == "/strg/a/d2"))
+        self.assertEqual(failed["listing_state"],
+                         ScanDirectoryState.PARTIAL.value)
+        # Nothing is left claimed: every worker released or committed.
+        self.assertFalse([d for d in self.db.directories
+                          if d["listing_state"]
+                          == ScanDirectoryState.SCANNING.value])
+
+    def test_leases_are_renewed_while_a_listing_is_slow(self):
+        source = SlowSource(SIMPLE_TREE)
+        source.delay = 0.3
+        coordinator, _ = self._pool(source, workers=2, lease_seconds=0.15)
+        coordinator.run()
+        self.assertTrue(self.db.renewals)
+        self.assertEqual(set(self.db.renewals), {"owner-1"})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,16 @@
 import inspect
+import json
 import os
 import tempfile
 import unittest
+from unittest import mock
+
+import zstandard as zstd
 
 from src import local_manifest_archive as archive
+from src import manifest_index
+from src import manifest_search
+from src.packer import LTOPacker
 
 
 class LocalManifestPathTests(unittest.TestCase):
@@ -202,5 +209,164 @@ class CompressedManifestTests(unittest.TestCase):
             self.assertEqual(by_id["M:43"]["stored_path"], "E:/loose.txt")
 
 
+def _rows(count, *, first_id=1):
+    return [{
+        "source_file_id": first_id + offset,
+        "original_path": f"/data/p/f{first_id + offset}.txt",
+        "file_size_bytes": 10, "tape_label": "T1", "is_packed": True,
+        "stored_path": f"p/f{first_id + offset}.txt",
+        "container_name": "E:/Bundle_1.zip",
+        "file_name": f"f{first_id + offset}.txt",
+    } for offset in range(count)]
+
+
+class ManifestIndexTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(manifest_index, "MANIFEST_FRAME_BYTES", 512)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _find_indexed(self, root, requested, **kwargs):
+        with mock.patch.object(
+                archive, "iter_manifest_records",
+                side_effect=AssertionError("scanned")), mock.patch.object(
+                archive, "read_frame", wraps=archive.read_frame) as frames:
+            found = archive.find_manifest_record(root, requested, **kwargs)
+        return found, frames.call_count
+
+    def test_point_lookup_decompresses_one_frame(self):
+        with tempfile.TemporaryDirectory() as root:
+            archive._write_segment(root, "T1/s1/bundle_1.jsonl.zst", _rows(500))
+            archive._write_segment(
+                root, "T1/s1/bundle_2.jsonl.zst", _rows(500, first_id=501))
+            path = os.path.join(root, "T1", "s1", "bundle_2.jsonl.zst")
+            self.assertGreater(len(manifest_index.segment_frames(path)), 10)
+
+            found, frames = self._find_indexed(root, "M:777")
+            self.assertEqual(found["stored_path"], "p/f777.txt")
+            self.assertEqual(found["file_id"], "M:777")
+            self.assertEqual(frames, 1)
+            # Streaming readers still see every row across the frames.
+            self.assertEqual(len(archive.search_manifests(
+                root, "*.txt", limit=5000)), 1000)
+
+    def test_index_respects_allowed_paths(self):
+        with tempfile.TemporaryDirectory() as root:
+            archive._write_segment(root, "T1/s1/bundle_1.jsonl.zst", _rows(3))
+            with mock.patch.object(archive, "read_frame") as frames:
+                self.assertIsNone(archive.find_manifest_record(
+                    root, "M:2", allowed_paths=[]))
+            frames.assert_not_called()
+
+    def test_unindexed_legacy_segment_is_scanned_then_backfilled(self):
+        with tempfile.TemporaryDirectory() as root:
+            archive._write_segment(root, "T1/s1/bundle_1.jsonl.zst", _rows(3))
+            legacy = os.path.join(root, "T1", "s0", "legacy.jsonl.zst")
+            os.makedirs(os.path.dirname(legacy))
+            with open(legacy, "wb") as raw:
+                with zstd.ZstdCompressor().stream_writer(raw) as writer:
+                    for row in _rows(2, first_id=900):
+                        writer.write((json.dumps(row) + "\n").encode())
+
+            self.assertEqual(
+                archive.find_manifest_record(root, "M:901")["file_name"],
+                "f901.txt")
+            report = archive.build_manifest_index(root)
+            self.assertEqual(
+                (report["segments_indexed"], report["rows_indexed"]), (1, 2))
+            found, frames = self._find_indexed(root, "M:901")
+            self.assertEqual((found["file_name"], frames), ("f901.txt", 1))
+            self.assertEqual(
+                archive.build_manifest_index(root)["segments_indexed"], 0)
+
+    def test_torn_bucket_tail_is_ignored_and_trimmed(self):
+        with tempfile.TemporaryDirectory() as root:
+            archive._write_segment(root, "T1/s1/bundle_1.jsonl.zst", _rows(1))
+            bucket = os.path.join(
+                root, manifest_index.INDEX_DIRNAME, "bucket_0001.idx")
+            with open(bucket, "ab") as handle:
+                handle.write(b"torn")
+            self.assertEqual(len(manifest_index.lookup(root, 1)), 1)
+            archive._write_segment(
+                root, "T1/s1/bundle_2.jsonl.zst",
+                _rows(1, first_id=1 + manifest_index.INDEX_BUCKETS))
+            self.assertEqual(os.path.getsize(bucket) % 28, 0)
+            found, _frames = self._find_indexed(
+                root, f"M:{1 + manifest_index.INDEX_BUCKETS}")
+            self.assertEqual(found["stored_path"],
+                             f"p/f{1 + manifest_index.INDEX_BUCKETS}.txt")
+
+
+class ManifestSearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(manifest_index, "MANIFEST_FRAME_BYTES", 512)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.root = tempfile.mkdtemp(prefix="lto_manifest_search_")
+        self.addCleanup(__import__("shutil").rmtree, self.root, True)
+        archive._write_segment(self.root, "T1/s1/bundle_1.jsonl.zst", _rows(500))
+        archive._write_segment(
+            self.root, "T1/s1/bundle_2.jsonl.zst", _rows(500, first_id=501))
+
+    def _search(self, query):
+        with mock.patch.object(
+                archive, "read_frame", wraps=archive.read_frame) as frames:
+            rows = archive.search_manifests(self.root, query, limit=5000)
+        return sorted(row["source_file_id"] for row in rows), frames
+
+    def _scanned(self, query):
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(manifest_search.SIDECAR_SUFFIX):
+                    os.remove(os.path.join(dirpath, name))
+        return self._search(query)[0]
+
+    def test_rare_name_reads_only_candidate_frames(self):
+        ids, frames = self._search("f777.txt")
+        self.assertEqual(ids, [777])
+        self.assertEqual(frames.call_count, 1)
+        self.assertTrue(frames.call_args[0][0].endswith("bundle_2.jsonl.zst"))
+
+    def test_absent_name_opens_no_segment(self):
+        with mock.patch.object(archive.zstd, "ZstdDecompressor") as opened:
+            self.assertEqual(self._search("nothing-like-this")[0], [])
+        opened.assert_not_called()
+
+    def test_index_never_hides_a_match(self):
+        for query in ("f7?7.t*", "*p/f12*.txt", "F9", "/data/p/f1[0-4]*"):
+            self.assertEqual(self._search(query)[0], self._scanned(query), query)
+
+    def test_stale_or_missing_sidecar_falls_back_to_scan(self):
+        path = os.path.join(self.root, "T1", "s1", "bundle_1.jsonl.zst")
+        with open(path, "ab") as raw:
+            raw.write(zstd.ZstdCompressor().compress(
+                (json.dumps(_rows(1, first_id=9999)[0]) + "\n").encode()))
+        self.assertEqual(self._search("f9999.txt")[0], [9999])
+        report = manifest_search.rebuild_sidecars([self.root])
+        self.assertEqual((report["rebuilt"], report["current"]), (1, 1))
+        self.assertEqual(self._search("f9999.txt")[0], [9999])
+
+    def test_bundle_manifest_sidecar_skips_whole_file(self):
+        source = os.path.join(self.root, "src")
+        os.makedirs(os.path.join(source, "docs"))
+        entries = []
+        for name in ("alpha.txt", "beta.txt"):
+            path = os.path.join(source, "docs", name)
+            with open(path, "w") as handle:
+                handle.write(name)
+            entries.append({"path": path, "rel": f"docs/{name}", "size": 9})
+        dest = os.path.join(self.root, "pack")
+        LTOPacker(max_zip_size_gb=1).run_manifest(
+            source, dest, 1, entries, source_name="local")
+        manifest = os.path.join(dest, "Bundle_001.manifest.jsonl.zst")
+        keys = manifest_search.pattern_keys
+        self.assertIsNone(manifest_search.candidate_frames(
+            manifest, keys("al", glob=False)))
+        self.assertEqual(manifest_search.candidate_frames(
+            manifest, keys("gamma", glob=False)), [])
+        self.assertEqual(len(manifest_search.candidate_frames(
+            manifest, keys("docs/beta", glob=False))), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
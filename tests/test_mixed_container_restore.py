@@ -1,6 +1,7 @@
 import io
 import json
 import os
+import posixpath
 import shutil
 import tarfile
 import tempfile
@@ -17,7 +18,8 @@ from src.archive_artifacts import (ArtifactError, TAR_SIDECAR_VERSION,
 from src.retriever import LTORetriever
 from src.runtime import CANCEL
 from src.tar_container import (STORED_TAR_DIALECT,
-                               STORED_TAR_FORMAT_VERSION, GNU_RECORD_SIZE)
+                               STORED_TAR_FORMAT_VERSION, GNU_RECORD_SIZE,
+                               validate_stored_tar)
 
 
 def _fake_robocopy(src, dst, display_name=None):
@@ -40,7 +42,20 @@ def _write_tar(path, members):
         handle.write(bytes((-current) % GNU_RECORD_SIZE))
 
 
-def _write_sidecar(path, container_id, source_base, members):
+def _member_offsets(tar_path, members):
+    parsed = validate_stored_tar(
+        tar_path, [{"name": name, "logical_size": len(content),
+                    "ordinal": ordinal}
+                   for ordinal, (name, content) in enumerate(members)],
+        tar_dialect=STORED_TAR_DIALECT,
+        format_version=STORED_TAR_FORMAT_VERSION)
+    return [{"header_offset": item.header_offset,
+             "data_offset": item.data_offset,
+             "stored_size": item.stored_size, "sparse": item.sparse}
+            for item in parsed.members]
+
+
+def _write_sidecar(path, container_id, source_base, members, offsets=None):
     records = [{
         "kind": "header", "version": TAR_SIDECAR_VERSION,
         "container_id": container_id, "source_base_path": source_base,
@@ -52,6 +67,7 @@ def _write_sidecar(path, container_id, source_base, members):
         records.append({
             "kind": "member", "member_name": name,
             "logical_size": len(payload), "ordinal": ordinal,
+            **(offsets[ordinal] if offsets else {}),
         })
     records.append({
         "kind": "footer", "member_count": len(members),
@@ -302,6 +318,126 @@ class MixedContainerRestoreTests(unittest.TestCase):
                          ["two/b.txt"])
 
 
+class ByteRangeTapeRestoreTests(unittest.TestCase):
+    MEMBERS = [("project/a.txt", b"a" * 700), ("project/b.txt", b"bee"),
+               ("project/c.txt", b"c" * 2000)]
+
+    def setUp(self):
+        CANCEL.clear()
+        self.tmp = tempfile.mkdtemp(prefix="byte_range_restore_")
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.restore = os.path.join(self.tmp, "restore")
+        self.staging = os.path.join(self.tmp, "staging")
+        os.makedirs(self.restore)
+        self.tape_tar = os.path.join(self.tmp, "tape", "opaque.data")
+        os.makedirs(os.path.dirname(self.tape_tar))
+        _write_tar(self.tape_tar, self.MEMBERS)
+        self.retriever = LTORetriever(
+            db=cast(Any, None), tape_drive="Z:\\",
+            staging_dir=self.staging, restore_dir=self.restore,
+            manifest_archive_root=self.tmp)
+        self.retriever._resolve_tape_path = lambda path: path
+        self.retriever._verify_tape = mock.Mock()
+        robocopy = mock.patch.object(
+            retriever_mod, "_robocopy_file", side_effect=_fake_robocopy)
+        self.robocopy_mock = robocopy.start()
+        self.addCleanup(robocopy.stop)
+        for name in ("_acquire_tape_io_lock", "_release_tape_io_lock"):
+            patcher = mock.patch.object(retriever_mod, name)
+            setattr(self, name.strip("_"), patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def _records(self, sidecar, names):
+        records = []
+        for name, content in self.MEMBERS:
+            if name not in names:
+                continue
+            records.append({
+                "tape_label": "T5", "is_packed": True, "container_id": 51,
+                "container_format": "stored_tar",
+                "format_version": STORED_TAR_FORMAT_VERSION,
+                "tar_dialect": STORED_TAR_DIALECT,
+                "tape_container_locator": self.tape_tar,
+                "local_sidecar_locator": sidecar,
+                "sidecar_artifact_version": TAR_SIDECAR_VERSION,
+                "expected_member_count": len(self.MEMBERS),
+                "member_name": name, "stored_path": name,
+                "original_path": f"/srv/{name}",
+                "file_name": posixpath.basename(name),
+                "file_size_bytes": len(content),
+            })
+        return records
+
+    def _sidecar(self, offsets):
+        path = os.path.join(self.tmp, "ranges.jsonl.zst")
+        _write_sidecar(path, 51, "/srv", self.MEMBERS, offsets=offsets)
+        return path
+
+    def test_selected_members_are_read_in_place_from_tape(self):
+        sidecar = self._sidecar(_member_offsets(self.tape_tar, self.MEMBERS))
+        records = self._records(sidecar, {"project/c.txt", "project/a.txt"})
+
+        self.assertEqual(self.retriever._restore_container(records), 2)
+
+        for name, content in (("a.txt", b"a" * 700), ("c.txt", b"c" * 2000)):
+            with open(os.path.join(self.restore, name), "rb") as handle:
+                self.assertEqual(handle.read(), content)
+        self.assertFalse(os.path.exists(os.path.join(self.restore, "b.txt")))
+        self.robocopy_mock.assert_not_called()
+        self.assertFalse(os.path.exists(self.staging))
+        self.retriever._verify_tape.assert_called_once_with("T5")
+        self.acquire_tape_io_lock.assert_called_once()
+        self.release_tape_io_lock.assert_called_once()
+
+    def test_stale_offsets_fail_closed_without_publishing(self):
+        offsets = _member_offsets(self.tape_tar, self.MEMBERS)
+        offsets[1] = dict(offsets[1],
+                          header_offset=offsets[0]["header_offset"],
+                          data_offset=offsets[0]["data_offset"])
+        offsets[0] = dict(offsets[0], header_offset=0, data_offset=0)
+        sidecar = self._sidecar(offsets)
+
+        with self.assertRaises(ArtifactError):
+            search_tar_sidecar(sidecar)
+        self.assertEqual(self.retriever._restore_container(
+            self._records(sidecar, {"project/b.txt"})), 0)
+        self.assertEqual(os.listdir(self.restore), [])
+
+    def test_header_mismatch_at_offset_is_refused(self):
+        offsets = _member_offsets(self.tape_tar, self.MEMBERS)
+        offsets[1] = dict(offsets[1], header_offset=offsets[2]["header_offset"],
+                          data_offset=offsets[2]["data_offset"],
+                          stored_size=3)
+        offsets[2] = dict(offsets[2],
+                          header_offset=offsets[2]["header_offset"] + 512,
+                          data_offset=offsets[2]["data_offset"] + 512)
+        sidecar = self._sidecar(offsets)
+
+        self.assertEqual(self.retriever._restore_container(
+            self._records(sidecar, {"project/b.txt"})), 0)
+        self.assertEqual(os.listdir(self.restore), [])
+        self.robocopy_mock.assert_not_called()
+
+    def test_sidecar_without_offsets_stages_the_whole_container(self):
+        sidecar = self._sidecar(None)
+
+        self.retriever._restore_container(
+            self._records(sidecar, {"project/b.txt"}))
+
+        self.robocopy_mock.assert_called_once()
+        self.assertEqual(self.robocopy_mock.call_args.args[0], self.tape_tar)
+
+    def test_disabled_byte_range_restore_stages_the_whole_container(self):
+        sidecar = self._sidecar(_member_offsets(self.tape_tar, self.MEMBERS))
+        self.retriever.byte_range_tar_restore = False
+
+        self.retriever._restore_container(
+            self._records(sidecar, {"project/b.txt"}))
+
+        self.robocopy_mock.assert_called_once()
+        self.assertEqual(self.robocopy_mock.call_args.args[0], self.tape_tar)
+
+
 class SidecarOnlyDirectoryRestoreTests(unittest.TestCase):
     def test_member_without_files_index_row_is_located_and_restored(self):
         CANCEL.clear()
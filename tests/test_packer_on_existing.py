@@ -16,6 +16,7 @@ from unittest import mock
 import src.packer as packer_mod
 from src.packer import LTOPacker
 from src.skipped import SkippedFileTracker
+from src.zip_container import ZipMemberError, open_zip_member
 
 
 class _NoopBudget:
@@ -118,14 +119,12 @@ class PackerOnExistingTests(unittest.TestCase):
     def test_mid_read_io_error_leaves_no_entry_in_bundle(self):
         """Regression: a mid-read IOError must not leave a truncated entry.
 
-        _pack_entries now spools the whole source file through a
-        SpooledTemporaryFile BEFORE opening the zip entry (see src/packer.py
-        comment above the copyfileobj calls), so a failure while reading the
-        source aborts before any bytes are written under the entry's real
-        name inside the zip. This poisons only the first copyfileobj call
-        for the bad file (the source -> spool step); the good file's copy
-        (both spool and spool -> zip steps) goes through the real
-        shutil.copyfileobj unmodified.
+        _pack_entries streams each source straight into its zip entry; when
+        the source read fails part-way, write_stored_entry truncates the
+        bundle back to the entry's local header and forgets the entry (see
+        src/zip_container.py). The bad file delivers one buffer of real bytes
+        before failing, so the rollback has something to undo; entries packed
+        before and after it must stay intact.
         """
         good_path = os.path.join(self.source, "good.bin")
         bad_path = os.path.join(self.source, "bad.bin")
@@ -134,16 +133,33 @@ class PackerOnExistingTests(unittest.TestCase):
         with open(bad_path, "wb") as handle:
             handle.write(b"bad-data")
 
-        real_copyfileobj = packer_mod.shutil.copyfileobj
+        real_open = builtins.open
 
-        def poisoning_copyfileobj(fsrc, fdst, *args, **kwargs):
-            if getattr(fsrc, "name", None) == bad_path:
-                raise OSError("simulated mid-read I/O error")
-            return real_copyfileobj(fsrc, fdst, *args, **kwargs)
+        class FailingReader:
+            def __init__(self, handle):
+                self._handle = handle
+                self._reads = 0
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self._handle.close()
+
+            def readinto(self, buffer):
+                self._reads += 1
+                if self._reads > 1:
+                    raise OSError("simulated mid-read I/O error")
+                return self._handle.readinto(buffer)
+
+        def failing_open(path, mode="r", *args, **kwargs):
+            handle = real_open(path, mode, *args, **kwargs)
+            if os.path.abspath(path) == os.path.abspath(bad_path):
+                return FailingReader(handle)
+            return handle
 
         tracker = SkippedFileTracker()
-        with mock.patch("src.packer.shutil.copyfileobj",
-                         side_effect=poisoning_copyfileobj):
+        with mock.patch("src.packer.open", failing_open):
             metadata = LTOPacker(max_zip_size_gb=1, manifest_enabled=False).run(
                 source=self.source, dest=self.dest, threshold_mb=100,
                 on_existing="clean", skipped_tracker=tracker)
@@ -159,10 +175,48 @@ class PackerOnExistingTests(unittest.TestCase):
             names_in_zip = zf.namelist()
             self.assertIn("good.bin", names_in_zip)
             self.assertNotIn("bad.bin", names_in_zip)
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(zf.read("good.bin"), b"good-data")
 
         skipped_paths = [item.path for item in tracker.items()]
         self.assertIn(bad_path, skipped_paths)
 
+    def test_packed_metadata_locates_each_member_in_its_bundle(self):
+        with open(os.path.join(self.source, "b.bin"), "wb") as handle:
+            handle.write(b"b" * 5000)
+        metadata = LTOPacker(max_zip_size_gb=1, manifest_enabled=False).run(
+            source=self.source, dest=self.dest, threshold_mb=100,
+            on_existing="clean")
+        assert metadata is not None
+
+        bundle = os.path.join(self.dest, "Bundle_001.zip")
+        with open(bundle, "rb") as raw:
+            for record in metadata:
+                with open_zip_member(
+                        raw, header_offset=record["zip_header_offset"],
+                        data_offset=record["zip_data_offset"],
+                        name=record["stored_path"],
+                        stored_size=record["zip_stored_size"],
+                        crc32=record["zip_crc32"]) as member:
+                    data = member.read()
+                with open(record["original_path"], "rb") as handle:
+                    self.assertEqual(data, handle.read())
+
+            record = metadata[0]
+            with self.assertRaises(ZipMemberError):
+                open_zip_member(
+                    raw, header_offset=record["zip_header_offset"],
+                    data_offset=record["zip_data_offset"],
+                    name=record["stored_path"],
+                    stored_size=record["zip_stored_size"],
+                    crc32=record["zip_crc32"] ^ 1)
+            with self.assertRaises(ZipMemberError):
+                open_zip_member(
+                    raw, header_offset=record["zip_header_offset"],
+                    data_offset=record["zip_data_offset"], name="other.bin",
+                    stored_size=record["zip_stored_size"],
+                    crc32=record["zip_crc32"])
+
 
 if __name__ == "__main__":
     unittest.main()
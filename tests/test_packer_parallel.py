@@ -0,0 +1,204 @@
+"""Parallel PACK backends. Real ZIPs in a temp dir; no tape or database."""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+from types import SimpleNamespace
+
+from src.packer import LTOPacker, StagingSpaceError
+from src.packer_parallel import (
+    SHARD_FILE_COST_BYTES, _LeasedBudget, _PauseSignal, _relay_pause, _shard,
+    bundle_spread, pack_entries_parallel)
+from src.skipped import SkippedFileTracker
+
+
+class ParallelBackendTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="lto_pack_parallel_")
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.source = os.path.join(self.tmp, "src")
+        self.entries = []
+        for index in range(6):
+            rel = os.path.join(f"d{index % 2}", f"f{index}.bin")
+            path = os.path.join(self.source, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as handle:
+                handle.write(bytes([index]) * (100 + index))
+            self.entries.append({"path": path, "rel": rel, "size": 100 + index})
+
+    def _pack(self, backend, entries=None, tracker=None):
+        dest = os.path.join(self.tmp, backend)
+        metadata = pack_entries_parallel(
+            LTOPacker(max_zip_size_gb=1, manifest_enabled=False), dest, 100,
+            entries or self.entries, workers=2, source_root=self.source,
+            skipped_tracker=tracker, backend=backend)
+        return dest, metadata
+
+    def test_process_backend_matches_thread_backend(self):
+        results = {}
+        for backend in ("thread", "process"):
+            dest, metadata = self._pack(backend)
+            self.assertEqual(sorted(os.listdir(dest)),
+                             ["Bundle_w00_001.zip", "Bundle_w01_001.zip"])
+            for name in os.listdir(dest):
+                with zipfile.ZipFile(os.path.join(dest, name)) as zf:
+                    self.assertIsNone(zf.testzip())
+            results[backend] = sorted(
+                (m["stored_path"], m["container_name"], m["zip_crc32"])
+                for m in metadata)
+        self.assertEqual(len(results["process"]), 6)
+        self.assertEqual(results["process"], results["thread"])
+
+    def test_process_workers_hand_skipped_files_back(self):
+        missing = {"path": os.path.join(self.source, "gone.bin"),
+                   "rel": "gone.bin", "size": 10}
+        tracker = SkippedFileTracker()
+        _dest, metadata = self._pack(
+            "process", [missing] + self.entries, tracker)
+        self.assertEqual(len(metadata), 6)
+        self.assertEqual([item.path for item in tracker.items()],
+                         [missing["path"]])
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self._pack("fiber")
+
+
+def _entry(directory, name, size=0):
+    return {"path": f"/src/{directory}/{name}", "rel": f"{directory}\\{name}",
+            "size": size}
+
+
+class LocalityShardingTests(unittest.TestCase):
+    def test_directories_stay_whole_and_shards_balance_by_cost(self):
+        mib = 1024 * 1024
+        entries = ([_entry("big", "b0", 60 * mib)] +
+                   [_entry("mid", f"m{i}", 10 * mib) for i in range(4)] +
+                   [_entry("tiny", f"t{i}", 1) for i in range(300)])
+        shards = _shard(entries, 2)
+        dirs = [{e["rel"].split("\\")[0] for e in shard} for shard in shards]
+        self.assertEqual(dirs, [{"big"}, {"mid", "tiny"}])
+        # Scan order is kept inside each shard.
+        self.assertEqual(shards[1], entries[1:])
+
+    def test_directory_larger_than_a_share_is_cut_into_contiguous_runs(self):
+        entries = [_entry("one", f"f{i:02d}", 1000) for i in range(12)]
+        shards = _shard(entries, 3)
+        self.assertEqual([len(shard) for shard in shards], [4, 4, 4])
+        self.assertEqual([entry for shard in sorted(
+            shards, key=lambda shard: shard[0]["rel"]) for entry in shard],
+            entries)
+
+    def test_split_runs_sharing_a_worker_keep_scan_order(self):
+        unit = SHARD_FILE_COST_BYTES // 100
+        sizes = [1000, 1000, 1000, 4000, 4000, 1000, 1000]
+        entries = ([_entry("one", f"f{i}", size * unit)
+                    for i, size in enumerate(sizes)] +
+                   [_entry("two", "x", sum(sizes) * unit // 2)])
+        shards = _shard(entries, 3)
+        # The costlier later run is placed first, on the same worker.
+        self.assertIn(entries[:4], shards)
+        for shard in shards:
+            self.assertEqual(shard, sorted(shard, key=entries.index))
+
+    def test_file_count_counts_even_for_empty_files(self):
+        entries = [_entry("a", f"f{i}") for i in range(4)]
+        shards = _shard(entries, 2)
+        self.assertEqual([len(shard) for shard in shards], [2, 2])
+        self.assertGreater(SHARD_FILE_COST_BYTES, 0)
+
+    def test_bundle_spread_counts_bundles_per_directory(self):
+        metadata = [
+            {"is_packed": True, "stored_path": "a/x", "container_name": "B1"},
+            {"is_packed": True, "stored_path": "a/y", "container_name": "B2"},
+            {"is_packed": True, "stored_path": "b/z", "container_name": "B2"},
+            {"is_packed": False, "stored_path": "c/big", "container_name": None},
+        ]
+        self.assertEqual(bundle_spread(metadata), {"a": 2, "b": 1})
+
+
+class SharedResourceProxyTests(unittest.TestCase):
+    def test_leased_budget_reserves_in_slabs(self):
+        calls = []
+        shared = SimpleNamespace(
+            consume=lambda required, context: calls.append(required))
+        budget = _LeasedBudget(shared, slab_bytes=1000)
+        for _ in range(10):
+            budget.consume(100)
+        budget.consume(2500)
+        self.assertEqual(calls, [1000, 2500])
+
+    def test_leased_budget_falls_back_to_the_exact_need(self):
+        calls = []
+
+        def consume(required, context):
+            if required > 300:
+                raise StagingSpaceError("full")
+            calls.append(required)
+
+        budget = _LeasedBudget(SimpleNamespace(consume=consume), slab_bytes=1000)
+        budget.consume(200)
+        self.assertEqual(calls, [200])
+        with self.assertRaises(StagingSpaceError):
+            budget.consume(400)
+
+    def test_relay_closes_gate_while_governor_pauses_pack(self):
+        gate, done = threading.Event(), threading.Event()
+        seen = []
+
+        class Governor:
+            def decision(self, stage, action):
+                return SimpleNamespace(allowed=False)
+
+            def wait_or_pause(self, stage, action, stop_evt=None):
+                seen.append((stage, action, gate.is_set()))
+                done.set()
+                return False
+
+        gate.set()
+        _relay_pause(Governor(), gate, done, interval=0.01)
+        self.assertEqual(seen, [("pack", "continue", False)])
+        # A finished relay leaves the workers free to run.
+        self.assertTrue(gate.is_set())
+
+    def test_a_failing_governor_opens_the_gate_and_aborts_the_pause(self):
+        gate, done, abort = (threading.Event(), threading.Event(),
+                             threading.Event())
+        calls = []
+
+        class Governor:
+            def decision(self, stage, action):
+                return SimpleNamespace(allowed=False)
+
+            def wait_or_pause(self, stage, action, stop_evt=None):
+                calls.append(gate.is_set())
+                raise RuntimeError("governor broke")
+
+        gate.set()
+        relay = threading.Thread(target=_relay_pause,
+                                 args=(Governor(), gate, done, abort, 0.01))
+        relay.start()
+        relay.join(20)
+        self.assertFalse(relay.is_alive())
+        self.assertEqual(calls, [False])
+        self.assertTrue(gate.is_set())
+        self.assertTrue(abort.is_set())
+
+    def test_a_worker_stops_waiting_once_the_relay_aborts(self):
+        gate, abort = threading.Event(), threading.Event()
+        signal = _PauseSignal(gate, abort, interval=0.01)
+        waiter = threading.Thread(target=signal.wait_or_pause,
+                                  args=("pack", "continue"))
+        waiter.start()
+        waiter.join(0.1)
+        self.assertTrue(waiter.is_alive())
+        abort.set()
+        waiter.join(20)
+        self.assertFalse(waiter.is_alive())
+        self.assertFalse(gate.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -35,9 +35,11 @@ else:
         errors = None
         dict_row = None
 
+from src import catalog_rollups, coverage_rollups
 from src.inspector_repository import InspectorRepository
 from src.local_manifest_archive import (
     dry_run_export, execute_export, prune_export, validate_export)
+from storage_map.webapp.repository import CoverageRepository
 from pg_test_guard import (SKIP_REASON, create_test_database,
                            drop_test_database, pg_available)
 
@@ -237,6 +239,90 @@ class PgIntegrationTests(unittest.TestCase):
         with InspectorRepository(self.conninfo) as repo:
             self.assertEqual(repo.subtree_sizes([]), {})
 
+    def test_directory_rollups_follow_upserts_and_deletes(self):
+        self.db.register_tape("TRU")
+        self.db.bulk_upsert_files([
+            self._loose("/roll/a/x.bin", "TRU", size=100),
+            self._loose("/roll/a/b/y.bin", "TRU", size=20),
+        ])
+        # Re-sync with a new size, then delete one file.
+        self.db.bulk_upsert_files([
+            self._loose("/roll/a/b/y.bin", "TRU", size=30)])
+        ids = [r["file_id"] for r in self._query(
+            "SELECT file_id FROM files_index WHERE original_path=%s",
+            ("/roll/a/x.bin",))]
+        self.db.delete_files(ids)
+        root = self._query(
+            "SELECT directory_id FROM catalog_directories "
+            "WHERE tape_label=%s AND normalized_path=%s",
+            ("TRU", "so02/roll"))[0]["directory_id"]
+        with InspectorRepository(self.conninfo) as repo:
+            self.assertTrue(catalog_rollups.rollups_built(repo.conn))
+            sizes = repo.subtree_sizes([root])
+        self.assertEqual(
+            (sizes[root]["recursive_file_count"],
+             sizes[root]["recursive_bytes"]), (1, 30))
+        self.assertTrue(catalog_rollups.verify(self.conninfo)["passed"])
+        self.assertGreater(
+            catalog_rollups.rebuild(self.conninfo)["directories"], 0)
+        self.assertTrue(catalog_rollups.verify(self.conninfo)["passed"])
+
+    def test_coverage_rollups_fold_changes_after_watermark(self):
+        self.db.register_tape("TCV")
+        self.db.register_tape("TCV2")
+        self.db.bulk_upsert_files([
+            self._loose("/cov/a/x.bin", "TCV", size=100),
+            self._loose("/cov/a/b/y.bin", "TCV", size=20),
+        ])
+        coverage_rollups.rebuild(self.conninfo, max_segs=2, threshold_bytes=0)
+        with CoverageRepository(self.conninfo) as repo:
+            first = repo.fetch_coverage_changes(2, 0)
+        self.assertTrue(first["full"])
+        # x is re-archived on a second tape (counted once), z is new, y goes.
+        self.db.bulk_upsert_files([
+            self._loose("/cov/a/x.bin", "TCV2", size=100),
+            self._loose("/cov/a/z.bin", "TCV2", size=5),
+        ])
+        with _connect(self.conninfo, row_factory=cast(Any, dict_row)) as conn:
+            coverage_rollups.refresh_directories(
+                conn, coverage_rollups.file_directories(
+                    [("so02", "/cov/a/x.bin")]))
+        self.db.delete_files([r["file_id"] for r in self._query(
+            "SELECT file_id FROM files_index WHERE original_path=%s",
+            ("/cov/a/b/y.bin",))])
+        with CoverageRepository(self.conninfo) as repo:
+            changes = repo.fetch_coverage_changes(2, 0, since=first["mark"])
+            report = repo.verify_rollups(2, 0)
+            self.assertIsNone(repo.fetch_coverage_changes(3, 0))
+        self.assertFalse(changes["full"])
+        self.assertEqual(
+            {r["dir_prefix"]: (r["tape_bytes"], r["tape_files"])
+             for r in changes["rows"]},
+            {"/cov/a": (105, 2)})
+        self.assertTrue(report["passed"], report)
+
+    def test_deleting_a_tapes_records_refreshes_coverage_rollups(self):
+        self.db.register_tape("TCD")
+        self.db.register_tape("TCD2")
+        self.db.bulk_upsert_files([
+            self._loose("/cvd/a/x.bin", "TCD", size=100),
+            self._loose("/cvd/a/y.bin", "TCD2", size=7),
+            self._loose("/cvd/b/z.bin", "TCD", size=3),
+        ])
+        coverage_rollups.rebuild(self.conninfo, max_segs=2, threshold_bytes=0)
+        with CoverageRepository(self.conninfo) as repo:
+            first = repo.fetch_coverage_changes(2, 0)
+        self.db.delete_files_for_tape("TCD")
+        with CoverageRepository(self.conninfo) as repo:
+            changes = repo.fetch_coverage_changes(2, 0, since=first["mark"])
+            report = repo.verify_rollups(2, 0)
+        self.assertFalse(changes["full"])
+        self.assertEqual(
+            {r["dir_prefix"]: (r["tape_bytes"], r["tape_files"])
+             for r in changes["rows"]},
+            {"/cvd/a": (7, 1), "/cvd/b": (0, 0)})
+        self.assertTrue(report["passed"], report)
+
     # -- §2.4 upsert stats via RETURNING ------------------------------------
 
     def test_upsert_stats_insert_update_skip(self):
@@ -397,6 +483,8 @@ class PgIntegrationTests(unittest.TestCase):
             f"SELECT COUNT(*) AS n FROM {table}")[0]["n"]
             for table in operational_tables}
         self.assertEqual(after, before)
+        # Pruned rows leave files_index but stay in the subtree totals.
+        self.assertTrue(catalog_rollups.verify(self.conninfo)["passed"])
 
     def test_archive_runs_fk_rejects_unknown_local_session(self):
         self.db.register_tape("TXFK")
@@ -491,6 +579,30 @@ class PgIntegrationTests(unittest.TestCase):
         self.assertEqual(present, 5)
         self.assertEqual(count, 2)
 
+    def test_remote_file_states_apply_in_one_set_based_write(self):
+        self.db.register_tape("TJR")
+        sid = self.db.create_remote_session_with_plan(
+            "JR_S", "host.example", "user", "/jr", "TJR", "C:/stage",
+            rows=[(0, "/jr/a.bin", "a.bin", 1), (0, "/jr/b.bin", "b.bin", 2),
+                  (0, "/jr/c.bin", "c.bin", 3)])
+        a, b, c = [row["manifest_id"]
+                   for row in self.db.get_chunk_files(sid, 0)]
+        self.db.update_manifest_rows_fetched([("a.bin", a)], session_id=sid)
+        self.db.apply_remote_file_states(sid, [
+            # keep_path leaves a's fetched path; b and c are new rows.
+            (a, "fetch_failed", None, True, "boom"),
+            (b, "fetched", "b~1.bin", False, None),
+            (c, "source_missing", None, False, "missing after tar fetch"),
+        ])
+        state = {row["manifest_id"]: (row["status"], row["local_rel_path"],
+                                      row["error_msg"])
+                 for row in self.db.get_chunk_files(sid, 0)}
+        self.assertEqual(state, {
+            a: ("fetch_failed", "a.bin", "boom"),
+            b: ("fetched", "b~1.bin", None),
+            c: ("source_missing", None, "missing after tar fetch"),
+        })
+
     def test_remote_streaming_session_appends_chunks_idempotently(self):
         self.db.register_tape("TSTR")
         sid = self.db.create_remote_streaming_session(
@@ -619,6 +731,48 @@ class PgIntegrationTests(unittest.TestCase):
         self.assertEqual(
             by_path["/src/project/sub"]["recursive_bytes"], large_size + 5)
 
+    def test_packed_zip_location_is_indexed_and_restored(self):
+        self.db.register_tape("TZI")
+        record = {
+            "file_name": "m.bin", "original_path": "/src/zip/m.bin",
+            "file_size_bytes": 7, "tape_label": "TZI", "source_host": "so02",
+            "is_packed": True, "container_name": "TROOT/Bundle_001.zip",
+            "stored_path": "zip/m.bin", "zip_header_offset": 512,
+            "zip_data_offset": 571, "zip_stored_size": 7, "zip_crc32": 123,
+        }
+        self.db.bulk_upsert_files([record])
+        row = self._query(
+            """SELECT f.file_id, z.header_offset, z.crc32
+               FROM files_index f JOIN zip_entry_index z USING (file_id)
+               WHERE f.tape_label=%s""", ("TZI",))[0]
+        self.assertEqual((row["header_offset"], row["crc32"]), (512, 123))
+        hydrated = self.db.get_file_by_id(row["file_id"])
+        self.assertEqual(
+            (hydrated["zip_data_offset"], hydrated["zip_stored_size"]),
+            (571, 7))
+
+    def test_tar_member_digest_is_indexed_and_restored(self):
+        self.db.register_tape("TTD")
+        digest = "ab" * 32
+        record = {
+            "file_name": "m.bin", "original_path": "/src/tar/m.bin",
+            "file_size_bytes": 7, "tape_label": "TTD", "source_host": "so02",
+            "is_packed": True, "container_name": "TROOT/container.tar",
+            "stored_path": "tar/m.bin", "tar_digest_algorithm": "sha256",
+            "tar_digest": digest,
+        }
+        self.db.bulk_upsert_files([record])
+        row = self._query(
+            """SELECT f.file_id, t.digest_algorithm, t.digest
+               FROM files_index f JOIN tar_member_digests t USING (file_id)
+               WHERE f.tape_label=%s""", ("TTD",))[0]
+        self.assertEqual((row["digest_algorithm"], row["digest"]),
+                         ("sha256", digest))
+        hydrated = self.db.get_file_by_id(row["file_id"])
+        self.assertEqual(
+            (hydrated["tar_digest_algorithm"], hydrated["tar_digest"]),
+            ("sha256", digest))
+
     def test_directory_backfill_dry_run_and_execute_are_idempotent(self):
         self.db.register_tape("TBF")
         records = [
@@ -1127,6 +1281,110 @@ class IncrementalScanMigrationTests(unittest.TestCase):
         self.assertEqual(again["scan_directory_id"],
                          claimed["scan_directory_id"])
 
+    def test_a_batch_claim_takes_traversal_order_and_skips_held_rows(self):
+        session_id, scopes = self._frontier_session()
+        self.db.enqueue_scan_directories(
+            scopes[0]["scan_scope_id"],
+            [("/strg/a", 0), ("/strg/a/x", 1), ("/strg/a/y", 2)])
+        first = self.db.claim_directories(session_id, "o1", "a1", 2)
+        self.assertEqual([row["canonical_path"] for row in first],
+                         ["/strg/a", "/strg/a/x"])
+        self.assertTrue(all(row["listing_state"] == "scanning"
+                            for row in first))
+        second = self.db.claim_directories(session_id, "o2", "a2", 5)
+        self.assertEqual([row["canonical_path"] for row in second],
+                         ["/strg/a/y"])
+        self.assertEqual(self.db.claim_directories(session_id, "o3", "a3", 5),
+                         [])
+
+    def test_a_batch_commit_covers_every_directory_in_one_transaction(self):
+        session_id, scopes = self._frontier_session()
+        scope_id = scopes[0]["scan_scope_id"]
+        self.db.enqueue_scan_directories(
+            scope_id, [("/strg/a", 0), ("/strg/b", 1)])
+        claimed = self.db.claim_directories(session_id, "o", "a", 2)
+        completed = self.db.commit_directory_listings("o", [
+            {"scan_directory_id": claimed[0]["scan_directory_id"],
+             "scan_scope_id": scope_id,
+             "segment": {"first_scan_ordinal": 0, "last_scan_ordinal": 1,
+                         "locator": "seg/a.jsonl.zst", "file_count": 2,
+                         "byte_count": 20},
+             "children": [("/strg/a/c", 2)], "errors": [],
+             "direct_file_count": 2, "direct_byte_count": 20,
+             "observation_after": "1:2:3"},
+            {"scan_directory_id": claimed[1]["scan_directory_id"],
+             "scan_scope_id": scope_id, "segment": None, "children": [],
+             "errors": [("listing_warning", None, "denied")],
+             "direct_file_count": 0, "direct_byte_count": 0,
+             "observation_after": None},
+        ])
+        self.assertEqual(completed, [True, True])
+        states = {row["canonical_path"]: row["listing_state"]
+                  for row in self._query(
+                      "SELECT canonical_path, listing_state "
+                      "FROM remote_scan_directories")}
+        self.assertEqual(states, {"/strg/a": "complete", "/strg/b": "error",
+                                  "/strg/a/c": "pending"})
+        self.assertEqual(len(self._query("SELECT * FROM remote_scan_segments")),
+                         1)
+        self.assertEqual(len(self._query("SELECT * FROM remote_scan_errors")),
+                         1)
+
+    def test_an_expired_scanning_lease_is_reclaimed(self):
+        session_id, scopes = self._frontier_session()
+        self.db.enqueue_scan_directories(
+            scopes[0]["scan_scope_id"], [("/strg/a", 0)])
+        held = self.db.claim_next_directory(session_id, "dead", "a1")
+        self.assertIsNone(self.db.claim_next_directory(session_id, "o2", "a2"))
+        self._exec(
+            """UPDATE remote_scan_directories
+               SET lease_expires_at = now() - interval '1 second'""")
+        taken = self.db.claim_next_directory(session_id, "o2", "a2")
+        self.assertEqual(taken["scan_directory_id"], held["scan_directory_id"])
+        self.assertEqual(taken["owner_token"], "o2")
+        # The dead holder can no longer complete or commit it.
+        self.assertFalse(self.db.complete_directory_listing(
+            held["scan_directory_id"], "dead",
+            direct_file_count=0, direct_byte_count=0))
+        self.assertEqual(self.db.commit_directory_listings("dead", [
+            {"scan_directory_id": held["scan_directory_id"],
+             "scan_scope_id": scopes[0]["scan_scope_id"], "segment": None,
+             "children": [("/strg/a/stale", 1)], "errors": [],
+             "direct_file_count": 0, "direct_byte_count": 0,
+             "observation_after": None}]), [False])
+        self.assertEqual(len(self._query(
+            "SELECT * FROM remote_scan_directories")), 1)
+
+    def test_a_renewed_lease_is_not_reclaimed(self):
+        session_id, scopes = self._frontier_session()
+        self.db.enqueue_scan_directories(
+            scopes[0]["scan_scope_id"], [("/strg/a", 0)])
+        self.db.claim_next_directory(session_id, "live", "a1",
+                                     lease_seconds=1)
+        self._exec(
+            """UPDATE remote_scan_directories
+               SET lease_expires_at = now() - interval '1 second'""")
+        self.assertEqual(self.db.renew_directory_leases("live"), 1)
+        self.assertIsNone(self.db.claim_next_directory(session_id, "o2", "a2"))
+
+    def test_a_refused_batch_commit_writes_nothing(self):
+        from src.pg_scan import ScanFrontierError
+        session_id, scopes = self._frontier_session()
+        scope_id = scopes[0]["scan_scope_id"]
+        self.db.enqueue_scan_directories(scope_id, [("/strg/a", 0)])
+        claimed = self.db.claim_directories(session_id, "o", "a", 1)
+        with self.assertRaises(ScanFrontierError):
+            self.db.commit_directory_listings("o", [
+                {"scan_directory_id": claimed[0]["scan_directory_id"],
+                 "scan_scope_id": scope_id,
+                 "segment": {"first_scan_ordinal": 0, "last_scan_ordinal": 0,
+                             "locator": "seg/a.jsonl.zst.part",
+                             "file_count": 1, "byte_count": 1},
+                 "children": [], "errors": [], "direct_file_count": 1,
+                 "direct_byte_count": 1, "observation_after": None}])
+        rows = self._query("SELECT listing_state FROM remote_scan_directories")
+        self.assertEqual(rows[0]["listing_state"], "scanning")
+
     def test_a_ready_segment_is_consumed_exactly_once(self):
         from src.pg_scan import SegmentRangeConflict
         session_id, scopes = self._frontier_session()
@@ -738,6 +738,57 @@ class ScannerPlannerCharacterizationTests(unittest.TestCase):
         self.assertEqual([len(chunk) for chunk in sealed], [2, 2])
 
 
+class OverlappedStagingTests(unittest.TestCase):
+    def test_the_next_fetch_overlaps_the_current_pack_in_chunk_order(self):
+        """With ``fetch_ahead_chunks`` set the stager fetches chunk N+1 while
+        the pack thread is still packing chunk N, and the writer still sees
+        the chunks in index order."""
+        from src.remote_staging import FetchedChunk
+        db = FakeStreamingDB(pending=[])
+        orch = build_streaming_orchestrator(
+            db, chunk_budget=1024, chunk_max_files=1)
+        orch.cfg.fetch_ahead_chunks = 1
+        events = []
+        second_fetch = threading.Event()
+
+        def fetch(session_id, chunk_index, chunk_files):
+            events.append(("fetch", chunk_index))
+            if chunk_index == 1:
+                second_fetch.set()
+            return FetchedChunk(
+                session_id=session_id, chunk_index=chunk_index,
+                packaging_format=ContainerFormat.ZIP,
+                fetch_dir=f"/tmp/_fetch_{chunk_index}",
+                pack_dir=f"/tmp/_pack_{chunk_index}", fetch_seconds=0.0,
+                fetch_bytes=1024, ram_stats={}, source_missing_files=[])
+
+        def pack(fetched):
+            if fetched.chunk_index == 0:
+                # Only finishes once the next fetch has started.
+                self.assertTrue(second_fetch.wait(TIMEOUT),
+                                "chunk 1 was not fetched while 0 was packing")
+            events.append(("packed", fetched.chunk_index))
+            return StagedChunk(chunk_index=fetched.chunk_index,
+                               fetch_dir=fetched.fetch_dir,
+                               pack_dir=fetched.pack_dir, metadata=[],
+                               staged_bytes=1024,
+                               session_id=fetched.session_id,
+                               packaging_format=ContainerFormat.ZIP)
+        orch._fetch_stage = fetch
+        orch._pack_stage = pack
+        orch._stage_chunk = None        # the overlapped path must not use it
+
+        records = [(f"/src/f{i}", 900) for i in range(3)]
+        with StreamingHarness(records=records):
+            result = orch._run_streaming_session(37)
+
+        self.assertEqual(result.exit_code, ExitCode.COMPLETED)
+        self.assertLess(events.index(("fetch", 1)), events.index(("packed", 0)))
+        self.assertEqual(
+            [i for group in orch.written_groups for i in group], [0, 1, 2])
+        self.assertEqual(orch._staged_bytes, 0)
+
+
 # =============================================================================
 # D. Surviving state and duplicate protection
 # =============================================================================
@@ -0,0 +1,139 @@
+"""Write-behind journaling of a chunk fetch's per-file states."""
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src.remote_staging import RemoteChunkStager
+from src.remote_state_journal import RemoteStateJournal
+
+
+class _BulkDB:
+    """Records each bulk write as one round-trip."""
+
+    def __init__(self, fail=False):
+        self.writes = []
+        self.fail = fail
+        self.row_updates = []
+
+    def apply_remote_file_states(self, session_id, states):
+        if self.fail:
+            raise RuntimeError("db down")
+        self.writes.append((session_id, sorted(states)))
+
+    def update_manifest_row(self, manifest_id, session_id=None, **kwargs):
+        self.row_updates.append((manifest_id, kwargs))
+
+
+class RemoteStateJournalTests(unittest.TestCase):
+    def test_only_the_latest_state_of_each_file_is_written(self):
+        db = _BulkDB()
+        with RemoteStateJournal(db, 7) as journal:
+            journal.update_manifest_rows_fetching([1, 2, 3], session_id=7)
+            journal.update_manifest_rows_fetched([("a", 1), ("b", 2)],
+                                                 session_id=7)
+            # A later failure keeps the path the fetch recorded.
+            journal.update_manifest_rows_fetch_failed([2], "x" * 600,
+                                                      session_id=7)
+            journal.update_manifest_row(3, session_id=7,
+                                        status="source_missing",
+                                        local_rel_path=None,
+                                        error_msg="missing after tar fetch")
+            self.assertEqual(db.writes, [])
+
+        self.assertEqual(db.writes, [(7, [
+            (1, "fetched", "a", False, None),
+            (2, "fetch_failed", "b", False, "x" * 500),
+            (3, "source_missing", None, False, "missing after tar fetch"),
+        ])])
+        self.assertEqual((journal.flushes, journal.rows_written), (1, 3))
+
+    def test_a_full_buffer_writes_itself_out(self):
+        db = _BulkDB()
+        with RemoteStateJournal(db, 7, max_rows=3) as journal:
+            journal.update_manifest_rows_fetching(range(7), session_id=7)
+            self.assertEqual(len(db.writes), 1)
+            self.assertEqual(len(journal), 0)
+            journal.update_manifest_rows_fetched([("f", 6)])
+        self.assertEqual([len(states) for _, states in db.writes], [7, 1])
+
+    def test_a_partial_row_update_writes_through_in_order(self):
+        db = _BulkDB()
+        journal = RemoteStateJournal(db, 7)
+        journal.update_manifest_rows_fetching([1], session_id=7)
+        journal.update_manifest_row(1, session_id=7, status="pending")
+        self.assertEqual(len(db.writes), 1)
+        self.assertEqual(db.row_updates, [(1, {"status": "pending"})])
+        with self.assertRaises(RuntimeError):
+            journal.update_manifest_row(1, session_id=7, bogus=1)
+        with self.assertRaises(RuntimeError):
+            journal.update_manifest_rows_fetching([1], session_id=8)
+
+    def test_a_failed_write_keeps_the_states_for_the_next_flush(self):
+        db = _BulkDB(fail=True)
+        journal = RemoteStateJournal(db, 7)
+        journal.update_manifest_rows_fetching([1, 2], session_id=7)
+        with self.assertRaises(RuntimeError):
+            journal.flush()
+        journal.update_manifest_rows_fetched([("a", 1)], session_id=7)
+        db.fail = False
+        self.assertEqual(journal.flush(), 2)
+        self.assertEqual(db.writes, [(7, [
+            (1, "fetched", "a", False, None),
+            (2, "fetching", None, True, None)])])
+
+    def test_without_the_bulk_path_the_batch_calls_are_used(self):
+        db = mock.Mock(spec=["update_manifest_rows_fetching",
+                             "update_manifest_rows_fetched",
+                             "update_manifest_rows_fetch_failed",
+                             "update_manifest_row"])
+        with RemoteStateJournal(db, 7) as journal:
+            journal.update_manifest_rows_fetching([1, 2, 3, 4])
+            journal.update_manifest_rows_fetched([("a", 1)])
+            journal.update_manifest_rows_fetch_failed([2, 3], "boom")
+            journal.update_manifest_row(4, status="fetch_failed",
+                                        error_msg="size mismatch")
+        db.update_manifest_rows_fetching.assert_not_called()
+        db.update_manifest_rows_fetched.assert_called_once_with(
+            [("a", 1)], session_id=7)
+        db.update_manifest_rows_fetch_failed.assert_has_calls([
+            mock.call([2, 3], "boom", session_id=7),
+            mock.call([4], "size mismatch", session_id=7)])
+        db.update_manifest_row.assert_not_called()
+
+
+class StagerJournalTests(unittest.TestCase):
+    def test_a_chunk_fetch_is_written_once_when_it_returns(self):
+        db = _BulkDB()
+        stager = RemoteChunkStager(SimpleNamespace(db=db))
+        seen = []
+
+        def fetch_files(session_id, chunk_index, chunk_files, fetch_dir):
+            for start in range(0, 400, 100):
+                stager._state_db().update_manifest_rows_fetching(
+                    range(start, start + 100), session_id=session_id)
+            # Parallel streams record failures through the same journal.
+            threads = [threading.Thread(
+                target=stager._state_db().update_manifest_rows_fetch_failed,
+                args=([i], "boom"), kwargs={"session_id": session_id})
+                for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            seen.append(list(db.writes))
+            return False, [], 0
+
+        with mock.patch.object(RemoteChunkStager, "_fetch_chunk_files",
+                               side_effect=fetch_files):
+            result = stager._fetch_chunk(7, 0, [], "/fetch")
+
+        self.assertEqual(result, (False, [], 0))
+        self.assertEqual(seen, [[]])
+        self.assertEqual(len(db.writes), 1)
+        self.assertEqual(len(db.writes[0][1]), 400)
+        self.assertIs(stager._state_db(), db)
+
+
+if __name__ == "__main__":
+    unittest.main()
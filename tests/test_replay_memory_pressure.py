@@ -0,0 +1,79 @@
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+_SCRIPT = (Path(__file__).resolve().parent.parent / "scripts"
+           / "replay_memory_pressure.py")
+_SPEC = importlib.util.spec_from_file_location(
+    "replay_memory_pressure", _SCRIPT)
+replay = importlib.util.module_from_spec(_SPEC)
+assert _SPEC.loader is not None
+sys.modules[_SPEC.name] = replay
+_SPEC.loader.exec_module(replay)
+
+
+# A cache-heavy sample (psutil: ~94% used, 1 GB free; really ~2.5 GB in use),
+# the same with PSI stalls, and a genuinely anonymous-memory-bound one.
+_TRACE = """\
+MemTotal:       16777216 kB
+MemAvailable:    1048576 kB
+Cached:         13631488 kB
+AnonPages:       1572864 kB
+Dirty:            131072 kB
+SUnreclaim:       262144 kB
+--- 2026-10-16T10:00:00
+MemTotal:       16777216 kB
+MemAvailable:    1048576 kB
+Cached:         13631488 kB
+AnonPages:       1572864 kB
+some avg10=30.00 avg60=8.00 avg300=2.00 total=123
+full avg10=5.00 avg60=1.00 avg300=0.00 total=45
+--- 2026-10-16T10:00:05
+MemTotal:       16777216 kB
+MemAvailable:     524288 kB
+Cached:           524288 kB
+AnonPages:      15728640 kB
+"""
+
+
+class MemoryPressureReplayTests(unittest.TestCase):
+    def test_replay_separates_phantom_cache_from_real_pressure(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            trace = os.path.join(tmp, "meminfo.trace")
+            with open(trace, "w", encoding="utf-8") as handle:
+                handle.write(_TRACE)
+            summary = replay.run_replay(traces=[trace], output_root=tmp)
+            with open(os.path.join(summary["run_root"], "summary.json"),
+                      encoding="utf-8") as handle:
+                written = json.load(handle)
+
+        self.assertEqual(written["sample_count"], 3)
+        cache, stalled, anon = summary["samples"]
+        self.assertEqual(cache["label"], "2026-10-16T10:00:00")
+        self.assertEqual(anon["label"], "#3")
+        # Phantom cache: the old gate blocks, the model lets fetch start.
+        self.assertIn("hard_ram_limit", cache["fetch"]["legacy"])
+        self.assertEqual(cache["fetch"]["model"], [])
+        # PSI stalls hold fetch and tape under the model only.
+        self.assertEqual(stalled["psi_some_avg10"], 30.0)
+        self.assertIn("memory_psi", stalled["fetch"]["model"])
+        self.assertIn("memory_psi", stalled["tape"]["model"])
+        self.assertNotIn("memory_psi", stalled["pack"]["model"])
+        # Real anonymous pressure blocks both ways.
+        self.assertIn("hard_ram_limit", anon["fetch"]["legacy"])
+        self.assertIn("hard_ram_limit", anon["fetch"]["model"])
+
+        fetch = summary["stages"]["fetch"]
+        self.assertEqual(fetch["legacy_blocked"], 3)
+        self.assertEqual(fetch["model_blocked"], 2)
+        self.assertEqual(fetch["legacy_only"], 1)
+        self.assertEqual(fetch["model_only"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -80,7 +80,11 @@ class ReportingAndRobocopyTests(unittest.TestCase):
             stall_at = header.index("tape_stall_seconds")
             self.assertEqual(header[stall_at:stall_at + 2],
                              ["tape_stall_seconds", "tape_stall_count"])
-            self.assertEqual(header[-1], "scan_seconds_to_first_writer_group")
+            scan_end = header.index("scan_worker_directories_per_second")
+            self.assertEqual(header[scan_end + 1:], [
+                "fetch_streams", "fetch_streams_active", "fetch_units",
+                "fetch_stream_mbs", "fetch_stream_tail_idle_seconds",
+                "governor_decisions", "governor_resource_samples"])
             self.assertEqual(rows[-1]["tape_used_after_bytes"], "3633327538007")
             self.assertEqual(rows[-1]["robocopy_exit_code"], "0")
             self.assertEqual(rows[-1]["robocopy_speed_mbs"], "342.1")
@@ -166,7 +170,11 @@ class ReportingAndRobocopyTests(unittest.TestCase):
             stall_at = header.index("tape_stall_seconds")
             self.assertEqual(header[stall_at:stall_at + 2],
                              ["tape_stall_seconds", "tape_stall_count"])
-            self.assertEqual(header[-1], "scan_seconds_to_first_writer_group")
+            scan_end = header.index("scan_worker_directories_per_second")
+            self.assertEqual(header[scan_end + 1:], [
+                "fetch_streams", "fetch_streams_active", "fetch_units",
+                "fetch_stream_mbs", "fetch_stream_tail_idle_seconds",
+                "governor_decisions", "governor_resource_samples"])
 
     def test_scan_metric_columns_append_and_blank_when_missing(self):
         """Task 0.2 columns are additive and optional.
@@ -1,5 +1,6 @@
 import os
 import tempfile
+import threading
 import unittest
 from types import SimpleNamespace
 from unittest import mock
@@ -7,7 +8,9 @@ from unittest import mock
 from src.backup import LTOBackup
 from src.constants import LOCAL_STAGING_RESERVE_BYTES
 from src.pipeline_types import ContainerFormat
-from src.resource_governor import ResourceGovernor
+from src.ram_telemetry import RamStageSampler
+from src.resource_governor import (
+    MeminfoPressureModel, ResourceGovernor, ResourceSampler, parse_meminfo)
 from src.remote_staging import StagingReservation
 
 
@@ -338,6 +341,166 @@ class DbSyncPackDeadlockTests(unittest.TestCase):
                           f"{stage} continue must yield to an active tape write")
 
 
+class SharedResourceSamplerTests(unittest.TestCase):
+    """One resource snapshot serves every governor checkpoint and reader."""
+
+    def setUp(self):
+        self.vm = mock.patch("src.resource_governor.psutil.virtual_memory",
+                             return_value=_vm())
+        self.disk = mock.patch("src.resource_governor.shutil.disk_usage",
+                               return_value=_disk())
+        self.vm_mock = self.vm.start()
+        self.disk_mock = self.disk.start()
+        self.addCleanup(self.vm.stop)
+        self.addCleanup(self.disk.stop)
+
+    def _governor(self, interval=60):
+        cfg = _cfg(governor_resource_sample_interval_seconds=interval,
+                   governor_tape_exclusive_heavy_stages=False)
+        return ResourceGovernor(cfg, staging_dir=".", sleep_seconds=0.01)
+
+    def test_continue_checkpoints_share_one_sample(self):
+        gov = self._governor()
+        for _ in range(50):
+            self.assertTrue(gov.decision("pack", "continue").allowed)
+        self.assertEqual(self.vm_mock.call_count, 1)
+        self.assertEqual(self.disk_mock.call_count, 1)
+        details = gov.telemetry_details()
+        self.assertEqual(details["governor_decisions"], "50")
+        self.assertEqual(details["governor_resource_samples"], "1")
+
+    def test_start_decisions_resample(self):
+        gov = self._governor()
+        gov.decision("pack", "continue")
+        self.vm_mock.return_value = _vm(percent=90)
+        self.assertTrue(gov.decision("pack", "continue").allowed)
+        start = gov.decision("pack", "start")
+        self.assertIn("hard_ram_limit", start.reasons)
+        self.assertEqual(gov.sampler.samples_taken, 2)
+
+    def test_zero_interval_samples_every_read(self):
+        gov = self._governor(interval=0)
+        for _ in range(3):
+            gov.decision("pack", "continue")
+        self.assertEqual(gov.sampler.samples_taken, 3)
+        gov.sampler.start()  # no background thread at interval 0
+        self.assertIsNone(gov.sampler._thread)
+
+    def test_background_thread_refreshes_the_snapshot(self):
+        sampler = ResourceSampler(".", interval_seconds=0.01)
+        with sampler:
+            first = sampler.snapshot()
+            for _ in range(500):
+                if sampler.samples_taken >= 3:
+                    break
+                threading.Event().wait(0.01)
+        self.assertGreaterEqual(sampler.samples_taken, 3)
+        self.assertIsNot(sampler.snapshot(max_age=60), first)
+
+    def test_stage_ram_sampler_reads_the_shared_snapshot(self):
+        gov = self._governor()
+        gov.decision("pack", "start")
+        with mock.patch("src.ram_telemetry.psutil") as own_psutil:
+            with RamStageSampler("pack", 60, source=gov.sampler) as stage:
+                pass
+        own_psutil.virtual_memory.assert_not_called()
+        self.assertEqual(gov.sampler.samples_taken, 1)
+        self.assertEqual(stage.peak_pct, 20.0)
+        self.assertEqual(stage.min_available_gb, 64.0)
+
+
+_KB = 1024
+# 16 GB host right after a chunk extraction: ~13 GB of clean file cache, so
+# psutil reads ~1 GB available while only ~2.5 GB is really in use.
+_CACHE_HEAVY_MEMINFO = """\
+MemTotal:       16777216 kB
+MemFree:          262144 kB
+MemAvailable:    1048576 kB
+Buffers:           65536 kB
+Cached:         13631488 kB
+Dirty:            131072 kB
+Writeback:         65536 kB
+AnonPages:       1572864 kB
+Shmem:            131072 kB
+SUnreclaim:       262144 kB
+KernelStack:       16384 kB
+PageTables:        32768 kB
+CommitLimit:     8388608 kB
+Committed_AS:    4194304 kB
+"""
+
+
+class MeminfoPressureModelTests(unittest.TestCase):
+    """The meminfo model counts only memory the kernel cannot simply drop."""
+
+    def test_clean_file_cache_is_not_pressure(self):
+        reading = MeminfoPressureModel.evaluate(
+            parse_meminfo(_CACHE_HEAVY_MEMINFO))
+        pinned = (1572864 + 131072 + 131072 + 65536 + 262144 + 32768
+                  + 16384) * _KB
+        self.assertEqual(reading.total_bytes, 16 * 1024**3)
+        self.assertEqual(reading.available_bytes, 16 * 1024**3 - pinned)
+        self.assertAlmostEqual(reading.memory_pct,
+                               pinned / (16 * 1024**3) * 100)
+        self.assertLess(reading.memory_pct, 15)
+
+    def test_strict_overcommit_bounds_the_reading_by_commit_charge(self):
+        fields = parse_meminfo(_CACHE_HEAVY_MEMINFO)
+        fields["Committed_AS"] = 8000000 * _KB
+        reading = MeminfoPressureModel.evaluate(fields, strict_commit=True)
+        self.assertAlmostEqual(reading.memory_pct, 8000000 / 8388608 * 100)
+        self.assertEqual(reading.available_bytes, 388608 * _KB)
+
+    def test_reads_proc_files_and_psi(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            meminfo = os.path.join(tmp, "meminfo")
+            psi = os.path.join(tmp, "memory")
+            with open(meminfo, "w") as handle:
+                handle.write(_CACHE_HEAVY_MEMINFO)
+            with open(psi, "w") as handle:
+                handle.write("some avg10=12.50 avg60=3.00 avg300=1.00 "
+                             "total=100\n"
+                             "full avg10=1.00 avg60=0.00 avg300=0.00 "
+                             "total=10\n")
+            reading = MeminfoPressureModel(
+                meminfo, psi, os.path.join(tmp, "missing")).read()
+        self.assertEqual(reading.model, "meminfo")
+        self.assertEqual(reading.psi_some_avg10, 12.5)
+
+    def test_falls_back_to_psutil_without_proc(self):
+        fallback = mock.Mock()
+        fallback.read.return_value = "psutil-reading"
+        model = MeminfoPressureModel("/nonexistent/meminfo",
+                                     fallback=fallback)
+        self.assertEqual(model.read(), "psutil-reading")
+
+    def test_governor_gates_fetch_on_the_model_and_psi(self):
+        cfg = _cfg(governor_memory_model="meminfo",
+                   governor_memory_psi_limit_pct=10)
+        gov = ResourceGovernor(cfg, staging_dir=".", sleep_seconds=0.01)
+        fields = parse_meminfo(_CACHE_HEAVY_MEMINFO)
+        with mock.patch("src.resource_governor.shutil.disk_usage",
+                        return_value=_disk()), \
+                mock.patch.object(
+                    MeminfoPressureModel, "read",
+                    return_value=MeminfoPressureModel.evaluate(fields)):
+            self.assertTrue(gov.can_start_fetch())
+            self.assertTrue(gov.can_start_tape_write())
+        stalled = MeminfoPressureModel.evaluate(fields, psi_some_avg10=25.0)
+        with mock.patch("src.resource_governor.shutil.disk_usage",
+                        return_value=_disk()), \
+                mock.patch.object(MeminfoPressureModel, "read",
+                                  return_value=stalled):
+            self.assertIn("memory_psi", gov.decision("fetch").reasons)
+            self.assertIn("memory_psi", gov.decision("tape").reasons)
+            self.assertNotIn("memory_psi", gov.decision("pack").reasons)
+            # PSI holds starts only: a fetch or tape write already running
+            # is not paused by a stall.
+            for stage in ("fetch", "tape"):
+                self.assertNotIn("memory_psi",
+                                 gov.decision(stage, "continue").reasons)
+
+
 class _FakeDB:
     def tape_exists(self, tape_label):
         return True
@@ -0,0 +1,167 @@
+"""Tape-order restore planning. No tape, LTFS or database."""
+import io
+import unittest
+from contextlib import redirect_stdout
+from typing import Any, cast
+from unittest import mock
+
+from src import retriever as retriever_mod
+from src.restore_planner import plan_tape_restore, write_order_key
+from src.retriever import LTORetriever
+from src.runtime import CANCEL
+
+
+def _loose(file_id, *, run=1, chunk=0, size=1024, generation=1):
+    return {
+        "file_id": file_id, "tape_label": "T1", "tape_generation": generation,
+        "is_packed": False,
+        "archive_run_id": run, "local_chunk_index": chunk,
+        "stored_path": f"Z:\\\\data\\\\{file_id}.bin",
+        "file_name": f"{file_id}.bin", "file_size_bytes": size,
+    }
+
+
+def _zip(file_id, bundle_id, *, run=1, chunk=0):
+    record = _loose(file_id, run=run, chunk=chunk)
+    record.update({
+        "is_packed": True, "bundle_id": bundle_id,
+        "container_format": "zip", "format_version": "legacy-zip-v1",
+        "tape_container_locator": f"Z:\\\\bundles\\\\{bundle_id}.zip",
+        "stored_path": f"dir/{file_id}.bin",
+    })
+    return record
+
+
+def _tar(file_id, container_id, *, chunk, ordinal, run=1):
+    record = _loose(file_id, run=run)
+    record.update({
+        "is_packed": True, "container_id": container_id,
+        "container_format": "stored_tar", "format_version": "stored-tar-v1",
+        "tar_dialect": "gnu-pax-sparse-v1", "restore_chunk_index": chunk,
+        "restore_container_ordinal": ordinal, "local_chunk_index": None,
+        "tape_container_locator": f"Z:\\\\tar\\\\{container_id}.tar",
+        "stored_path": f"dir/{file_id}.bin", "member_name": f"dir/{file_id}.bin",
+    })
+    return record
+
+
+def _plan(records, **kwargs):
+    return plan_tape_restore(
+        "T1", records, route=LTORetriever._route_container_format, **kwargs)
+
+
+class WriteOrderTests(unittest.TestCase):
+    def test_reads_follow_generation_run_chunk_and_ordinal(self):
+        records = [
+            _loose(90, run=2, chunk=0),
+            _tar(50, 8, chunk=1, ordinal=1),
+            _zip(40, 3, chunk=0),
+            _tar(51, 7, chunk=1, ordinal=0),
+            _loose(10, run=1, chunk=2),
+            _loose(5, generation=2, run=1),
+        ]
+        plan = _plan(records)
+        self.assertEqual(
+            [[r["file_id"] for r in read.records] for read in plan.reads],
+            [[40], [51], [50], [10], [90], [5]])
+
+    def test_container_records_are_read_once_in_container_order(self):
+        records = [_tar(3, 7, chunk=0, ordinal=0), _loose(2, chunk=1),
+                   _tar(1, 7, chunk=0, ordinal=0)]
+        plan = _plan(records)
+        self.assertEqual([read.kind for read in plan.reads],
+                         ["stored_tar", "loose"])
+        self.assertEqual([r["file_id"] for r in plan.reads[0].records], [3, 1])
+
+    def test_unknown_positions_sort_last_in_catalog_order(self):
+        unknown = [{"is_packed": False, "stored_path": "b"},
+                   {"is_packed": False, "stored_path": "a"}]
+        plan = _plan(unknown + [_loose(7)])
+        self.assertEqual([read.locator for read in plan.reads],
+                         ["Z:\\\\data\\\\7.bin", "b", "a"])
+        self.assertEqual(write_order_key(unknown[0])[0], float("inf"))
+
+    def test_start_blocks_override_catalog_order(self):
+        records = [_loose(1), _loose(2), _loose(3)]
+        plan = _plan(records, start_blocks={
+            records[0]["stored_path"]: 900, records[2]["stored_path"]: 10})
+        self.assertEqual([read.records[0]["file_id"] for read in plan.reads],
+                         [3, 1, 2])
+
+
+class CoalescingAndEstimateTests(unittest.TestCase):
+    def test_adjacent_loose_files_share_one_pass(self):
+        records = [_loose(1, chunk=0), _loose(2, chunk=0), _zip(3, 9, chunk=0),
+                   _loose(4, chunk=1), _loose(5, chunk=1)]
+        plan = _plan(records)
+        self.assertEqual(
+            [[read.records[0]["file_id"] for read in item.reads]
+             for item in plan.passes],
+            [[3], [1, 2], [4, 5]])
+
+    def test_estimate_counts_one_locate_per_pass(self):
+        mib = 1024 * 1024
+        plan = _plan([_loose(1, size=300 * mib), _loose(2, size=300 * mib),
+                      _loose(3, chunk=5, size=0)])
+        seek, stream = plan.estimate_seconds(stream_mbs=300, seek_seconds=40)
+        self.assertEqual((seek, stream), (80.0, 2.0))
+
+
+class RetrieverRestoreOrderTests(unittest.TestCase):
+    def setUp(self):
+        CANCEL.clear()
+        self.retriever = LTORetriever(
+            db=cast(Any, None), tape_drive="Z:\\", staging_dir="unused",
+            restore_dir="unused")
+        self.calls = []
+        self.retriever._verify_tape = mock.Mock()
+        self.retriever._restore_loose = lambda record, restore_base=None: \
+            self.calls.append(("loose", record["file_id"]))
+        self.retriever._restore_packed_bulk = \
+            lambda locator, records, restore_base=None: self.calls.append(
+                ("zip", [r["file_id"] for r in records]))
+        self.retriever._restore_container = \
+            lambda records, restore_base=None: self.calls.append(
+                ("tar", [r["file_id"] for r in records]))
+        self.locks = []
+        for name in ("_acquire_tape_io_lock", "_release_tape_io_lock"):
+            patcher = mock.patch.object(
+                retriever_mod, name,
+                side_effect=lambda *args, name=name: self.locks.append(name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_mixed_restore_reads_in_write_order_and_prints_estimate(self):
+        records = [_loose(9, chunk=3), _tar(5, 7, chunk=2, ordinal=0),
+                   _loose(2, chunk=0), _zip(4, 1, chunk=1), _loose(3, chunk=0)]
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.retriever._restore_many(records)
+        self.assertEqual(self.calls, [
+            ("loose", 2), ("loose", 3), ("zip", [4]), ("tar", [5]),
+            ("loose", 9)])
+        self.assertIn("5 read(s) in 4 pass(es)", output.getvalue())
+        # Only the two adjacent loose files are read in one held ownership.
+        self.assertEqual(self.locks, [
+            "_acquire_tape_io_lock", "_release_tape_io_lock"])
+
+    def test_start_block_probe_is_opt_in(self):
+        records = [_loose(1), _loose(2, chunk=4)]
+        with mock.patch.object(
+                retriever_mod, "read_ltfs_start_block_unlocked") as probe:
+            with redirect_stdout(io.StringIO()):
+                self.retriever._restore_many(records)
+            probe.assert_not_called()
+
+            self.calls.clear()
+            self.retriever.probe_ltfs_start_blocks = True
+            probe.side_effect = lambda path: {
+                "Z:\\\\data\\\\1.bin": 500, "Z:\\\\data\\\\2.bin": 20}[path]
+            self.retriever._resolve_tape_path = lambda path: path
+            with redirect_stdout(io.StringIO()):
+                self.retriever._restore_many(records)
+        self.assertEqual(self.calls, [("loose", 2), ("loose", 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ import os
 import shutil
 import tempfile
 import unittest
+import zipfile
 from typing import Any, cast
 from unittest import mock
 
@@ -18,6 +19,7 @@ from src.retriever import LTORetriever
 from src.pg_catalog import PgCatalogMixin
 from src.pipeline_types import ContainerFormat
 from src.runtime import CANCEL
+from src.zip_container import zip_entry_location
 
 
 def _fake_robocopy(src, dst, display_name=None):
@@ -211,6 +213,113 @@ class LocalManifestRestoreDispatchTests(unittest.TestCase):
             self.assertEqual(retriever._verify_tape.call_count, 2)
 
 
+class StreamingZipRestoreTests(unittest.TestCase):
+    """Bundle members are read straight out of the ZIP on tape; the staged
+    copy is only a fallback."""
+
+    def setUp(self):
+        CANCEL.clear()
+        self.tmp = tempfile.mkdtemp(prefix="lto_zipstream_")
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.tape = os.path.join(self.tmp, "tape")
+        self.restore = os.path.join(self.tmp, "restore")
+        self.staging = os.path.join(self.tmp, "staging")
+        os.makedirs(self.tape)
+        os.makedirs(self.restore)
+        import zipfile as _zip
+        self.zip_path = os.path.join(self.tape, "Bundle_007.zip")
+        with _zip.ZipFile(self.zip_path, "w") as zf:
+            zf.writestr("data/a.txt", "alpha")
+            zf.writestr("data/b.txt", "bravo")
+        tmp_drive = os.path.splitdrive(os.path.abspath(self.tmp))[0] + "\\"
+        self.retriever = LTORetriever(
+            db=cast(Any, None), tape_drive=tmp_drive,
+            staging_dir=self.staging, restore_dir=self.restore)
+        self.robocopy = mock.Mock(side_effect=_fake_robocopy)
+        for name, value in (("_robocopy_file", self.robocopy),
+                            ("_acquire_tape_io_lock", mock.DEFAULT),
+                            ("_release_tape_io_lock", mock.DEFAULT)):
+            patcher = mock.patch.object(retriever_mod, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _record(self, name):
+        return {"container_name": self.zip_path, "stored_path": f"data/{name}",
+                "file_name": name, "original_path": f"/srv/data/{name}"}
+
+    def _read(self, name):
+        with open(os.path.join(self.restore, name),
+                  encoding="utf-8") as handle:
+            return handle.read()
+
+    def test_member_is_read_in_place_without_staging(self):
+        self.retriever._restore_packed(self._record("b.txt"))
+        self.assertEqual(self._read("b.txt"), "bravo")
+        self.robocopy.assert_not_called()
+        self.assertFalse(os.path.exists(self.staging))
+
+    def test_bulk_restore_streams_every_member(self):
+        self.retriever._restore_packed_bulk(
+            self.zip_path, [self._record("b.txt"), self._record("a.txt")])
+        self.assertEqual((self._read("a.txt"), self._read("b.txt")),
+                         ("alpha", "bravo"))
+        self.robocopy.assert_not_called()
+
+    def test_disabled_streaming_stages_a_copy(self):
+        self.retriever.stream_zip_restore = False
+        self.retriever._restore_packed(self._record("a.txt"))
+        self.assertEqual(self._read("a.txt"), "alpha")
+        self.assertEqual(self.robocopy.call_args[0][0], self.zip_path)
+        self.assertEqual(os.listdir(self.staging), [])
+
+    def test_unreadable_in_place_falls_back_to_staging(self):
+        real_zipfile = zipfile.ZipFile
+        def _zip(path, *args, **kwargs):
+            if path == self.zip_path:
+                raise OSError("seek not supported")
+            return real_zipfile(path, *args, **kwargs)
+        with mock.patch.object(retriever_mod.zipfile, "ZipFile", _zip):
+            self.retriever._restore_packed(self._record("a.txt"))
+        self.assertEqual(self._read("a.txt"), "alpha")
+        self.robocopy.assert_called_once()
+
+    def test_crc_mismatch_leaves_no_partial_file(self):
+        with open(self.zip_path, "r+b") as handle:
+            data = handle.read()
+            handle.seek(data.index(b"bravo"))
+            handle.write(b"BRAVO")
+        self.retriever._restore_packed(self._record("b.txt"))
+        self.assertEqual(os.listdir(self.restore), [])
+
+    def _indexed(self, name):
+        record = self._record(name)
+        with zipfile.ZipFile(self.zip_path) as zf:
+            info = zf.getinfo(record["stored_path"])
+        location = zip_entry_location(info, zip64=False)
+        record.update({
+            "zip_header_offset": location.header_offset,
+            "zip_data_offset": location.data_offset,
+            "zip_stored_size": location.stored_size,
+            "zip_crc32": location.crc32,
+        })
+        return record
+
+    def test_indexed_members_skip_the_central_directory(self):
+        records = [self._indexed("b.txt"), self._indexed("a.txt")]
+        with mock.patch.object(retriever_mod.zipfile, "ZipFile",
+                               side_effect=AssertionError("central directory")):
+            self.retriever._restore_packed_bulk(self.zip_path, records)
+        self.assertEqual((self._read("a.txt"), self._read("b.txt")),
+                         ("alpha", "bravo"))
+        self.robocopy.assert_not_called()
+
+    def test_stale_index_falls_back_to_the_central_directory(self):
+        record = self._indexed("a.txt")
+        record["zip_crc32"] ^= 1
+        self.retriever._restore_packed(record)
+        self.assertEqual(self._read("a.txt"), "alpha")
+
+
 class DirectoryCompleteRestoreTests(unittest.TestCase):
     """Bundle-complete directory restore extracts the small files that have no
     individual files_index row, and only the requested directory's subtree —
@@ -79,6 +79,17 @@ class CoverageSqlTests(unittest.TestCase):
         self.assertEqual(cov.max_segments(["/"], 2), 2)
         self.assertEqual(cov.max_segments([], 2), 2)
 
+    def test_fold_rows_replaces_changed_prefixes_and_drops_emptied_ones(self):
+        rows = [_db_row("so01", "/strg/D/a", 10), _db_row("so01", "/strg/D/b", 5)]
+        folded = cov.fold_rows(rows, [
+            _db_row("so01", "/strg/D/a", 30, files=2),
+            _db_row("so01", "/strg/D/b", 0, files=0),
+            _db_row("so01", "/strg/D/c", 7),
+        ])
+        self.assertEqual(
+            {r["dir_prefix"]: (r["tape_bytes"], r["tape_files"]) for r in folded},
+            {"/strg/D/a": (30, 2), "/strg/D/c": (7, 1)})
+
 
 class RowStatusTests(unittest.TestCase):
     """The file-count gate: du --inodes counts trump the block-inflated bytes."""
@@ -619,6 +630,10 @@ class WebAppApiTests(unittest.TestCase):
                 assert threshold_bytes == 10 * 1024 * 1024  # index_min_file_mb
                 return rows
 
+            def fetch_coverage_changes(self, max_segs, threshold_bytes,
+                                       since=None):
+                return None  # coverage rollups not built yet
+
         # Before any refresh the report is stale but still shows du data.
         report = self.client.get("/api/coverage").json()
         self.assertTrue(report["stale"])
@@ -643,6 +658,46 @@ class WebAppApiTests(unittest.TestCase):
         # Byte-only scan (no du --inodes, no baseline) → not certified full.
         self.assertEqual(op["status"], "partial")
 
+    def test_coverage_refresh_folds_rollup_changes_after_watermark(self):
+        calls = []
+        batches = [
+            {"full": True, "mark": {"generation": "g1", "watermark": 7},
+             "rows": [_db_row("so01", "/strg/D/shared-data/op", 600 * GIB),
+                      _db_row("so01", "/strg/D/raw", 5 * GIB)]},
+            {"full": False, "mark": {"generation": "g1", "watermark": 9},
+             "rows": [_db_row("so01", "/strg/D/raw", 0, files=0),
+                      _db_row("so01", "/strg/D/new", 1 * GIB)]},
+        ]
+
+        class FakeRepo:
+            def __init__(self, dsn):
+                pass
+            def __enter__(self):
+                return self
+            def __exit__(self, *args):
+                return False
+            def fetch_coverage_rows(self, max_segs, threshold_bytes=None):
+                raise AssertionError("full coverage query must not run")
+            def fetch_coverage_changes(self, max_segs, threshold_bytes,
+                                       since=None):
+                calls.append(since)
+                return batches[len(calls) - 1]
+
+        with mock.patch("storage_map.webapp.app.CoverageRepository", FakeRepo):
+            for _ in batches:
+                self.client.post("/api/coverage/refresh", json={})
+                self.assertEqual(self._wait_job("coverage")["state"], "done")
+
+        # The second refresh asks only for changes after the first watermark.
+        self.assertEqual(calls, [None, {"generation": "g1", "watermark": 7}])
+        with open(os.path.join(self.tmp, "logs", "coverage_cache.json"),
+                  encoding="utf-8") as fh:
+            cache = json.load(fh)
+        self.assertEqual(cache["rollup"], {"generation": "g1", "watermark": 9})
+        self.assertEqual(
+            sorted(r["dir_prefix"] for r in cache["rows"]),
+            ["/strg/D/new", "/strg/D/shared-data/op"])
+
     def test_no_response_ever_contains_the_ssh_password(self):
         with mock.patch("storage_map.lib.core._remote_status",
                         return_value="DONE"):
@@ -13,6 +13,7 @@ from src.tar_container import (
     STORED_TAR_FORMAT_VERSION,
     StoredTarError,
     StoredTarReader,
+    open_stored_tar_member,
     validate_stored_tar,
     validate_tar_member_name,
 )
@@ -429,6 +430,61 @@ class StructuralValidationTests(unittest.TestCase):
             _validate(self.data + _regular_tar(second_entries), self.plan)
 
 
+class MemberOffsetTests(unittest.TestCase):
+    def test_offsets_address_headers_and_data(self):
+        long_name = "long/" + ("segment-" * 20) + "end.txt"
+        entries = [("a", b"first"), (long_name, b"second"), ("c", b"")]
+        data = _regular_tar(entries)
+        result = _validate(data, _typed_plan(entries))
+        for member, (name, payload) in zip(result.members, entries):
+            start = member.data_offset
+            self.assertEqual(member.header_offset % 512, 0)
+            self.assertEqual(data[start:start + len(payload)], payload)
+        # The long name needs a PAX header; its offset covers that header.
+        pax_member = result.members[1]
+        self.assertEqual(pax_member.data_offset - pax_member.header_offset,
+                         3 * 512)
+        self.assertEqual(result.members[0].header_offset, 0)
+
+    def test_open_member_reads_exactly_the_addressed_bytes(self):
+        entries = [("a", b"first"), ("b", b"x" * 1500)]
+        data = _regular_tar(entries)
+        member = _validate(data, _typed_plan(entries)).members[1]
+        with open_stored_tar_member(
+                io.BytesIO(data), header_offset=member.header_offset,
+                data_offset=member.data_offset, name="b",
+                logical_size=1500) as source:
+            self.assertEqual(source.read(), b"x" * 1500)
+            self.assertEqual(source.read(), b"")
+
+    def test_open_member_refuses_a_stale_offset_or_size(self):
+        entries = [("a", b"first"), ("b", b"second")]
+        data = _regular_tar(entries)
+        first, second = _validate(data, _typed_plan(entries)).members
+        with self.assertRaisesRegex(StoredTarError, "holds 'a'"):
+            open_stored_tar_member(
+                io.BytesIO(data), header_offset=first.header_offset,
+                data_offset=first.data_offset, name="b", logical_size=6)
+        with self.assertRaisesRegex(StoredTarError, "wrong size"):
+            open_stored_tar_member(
+                io.BytesIO(data), header_offset=second.header_offset,
+                data_offset=second.data_offset, name="b", logical_size=7)
+        with self.assertRaisesRegex(StoredTarError, "checksum"):
+            open_stored_tar_member(
+                io.BytesIO(data), header_offset=second.data_offset,
+                data_offset=second.data_offset, name="b", logical_size=6)
+
+    def test_open_member_refuses_sparse_members(self):
+        data = _sparse_tar("sparse", 100, [(5, b"x")])
+        member = _validate(
+            data, [StoredTarExpectedMember("sparse", 100, 0)]).members[0]
+        with self.assertRaisesRegex(StoredTarError, "sparse"):
+            open_stored_tar_member(
+                io.BytesIO(data), header_offset=member.header_offset,
+                data_offset=member.data_offset, name="sparse",
+                logical_size=100)
+
+
 class BoundedMemoryTests(unittest.TestCase):
     def test_large_stream_is_not_buffered_in_memory(self):
         logical_size = 256 * 1024 * 1024
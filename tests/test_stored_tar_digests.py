@@ -0,0 +1,207 @@
+"""Per-member digests: computed while validating, kept in the sidecar,
+checked again on restore."""
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Any, cast
+from unittest import mock
+
+from src import tar_container
+from src.archive_artifacts import (
+    TAR_SIDECAR_VERSION, publish_stored_tar_pair, search_tar_sidecar)
+from src.pipeline_types import StoredTarExpectedMember
+from src.retriever import LTORetriever
+from src.runtime import CANCEL
+from src.tar_container import (
+    STORED_TAR_DIALECT,
+    STORED_TAR_FORMAT_VERSION,
+    StoredTarError,
+    StoredTarStreamValidator,
+    match_stored_tar_scan,
+    new_member_digest,
+    validate_stored_tar,
+    validate_stored_tar_part,
+)
+from tests.test_stored_tar import _regular_tar, _sparse_tar
+
+KINDS = {"tar_dialect": STORED_TAR_DIALECT,
+         "format_version": STORED_TAR_FORMAT_VERSION}
+ENTRIES = [("a/one", b"1" * 70_000), ("a/empty", b""), ("b/two", b"two")]
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _plan(entries):
+    return [StoredTarExpectedMember(name, len(data), index)
+            for index, (name, data) in enumerate(entries)]
+
+
+def _sidecar_plan(entries):
+    return [{"member_name": name, "canonical_source_path": f"/r/{name}",
+             "expected_size": len(data), "plan_ordinal": index,
+             "container_ordinal": 0}
+            for index, (name, data) in enumerate(entries)]
+
+
+class _PairDB:
+    def publish_stored_tar_pair(self, **values):
+        return {"ready": True}
+
+
+class MemberDigestTests(unittest.TestCase):
+    def test_digests_cover_each_members_logical_bytes(self):
+        data = _regular_tar(ENTRIES)
+        for algorithm in ("sha256", "blake2b"):
+            with self.subTest(algorithm):
+                result = validate_stored_tar(
+                    io.BytesIO(data), _plan(ENTRIES), member_digest=algorithm,
+                    **KINDS)
+                self.assertEqual(result.member_digest_algorithm, algorithm)
+                expected = []
+                for _name, payload in ENTRIES:
+                    digest = new_member_digest(algorithm)
+                    digest.update(payload)
+                    expected.append(digest.hexdigest())
+                self.assertEqual([m.digest for m in result.members], expected)
+
+        plain = validate_stored_tar(io.BytesIO(data), _plan(ENTRIES), **KINDS)
+        self.assertIsNone(plain.member_digest_algorithm)
+        self.assertTrue(all(m.digest is None for m in plain.members))
+
+    def test_sparse_holes_are_hashed_as_zeros(self):
+        extents = [(3, b"abc"), (700_000, b"tail")]
+        logical = bytearray(700_100)
+        for offset, chunk in extents:
+            logical[offset:offset + len(chunk)] = chunk
+        data = _sparse_tar("sparse/image.bin", len(logical), extents)
+
+        result = validate_stored_tar(
+            io.BytesIO(data),
+            [StoredTarExpectedMember("sparse/image.bin", len(logical), 0)],
+            member_digest="sha256", **KINDS)
+
+        self.assertTrue(result.members[0].sparse)
+        self.assertEqual(result.members[0].digest, _sha256(bytes(logical)))
+
+    def test_the_inline_scan_hashes_as_the_reader_does(self):
+        data = _regular_tar(ENTRIES)
+        validator = StoredTarStreamValidator(
+            max_buffered_chunks=2, member_digest="sha256", **KINDS)
+        for start in range(0, len(data), 997):
+            validator.feed(data[start:start + 997])
+        scan = validator.finish()
+
+        self.assertEqual(match_stored_tar_scan(scan, _plan(ENTRIES)),
+                         validate_stored_tar(
+                             io.BytesIO(data), _plan(ENTRIES),
+                             member_digest="sha256", **KINDS))
+
+    def test_unknown_or_unavailable_algorithms_are_refused(self):
+        with self.assertRaisesRegex(StoredTarError, "unsupported"):
+            new_member_digest("md5")
+        with mock.patch.object(tar_container, "_crc32c", None):
+            with self.assertRaisesRegex(StoredTarError, "crc32c package"):
+                validate_stored_tar(
+                    io.BytesIO(_regular_tar(ENTRIES)), _plan(ENTRIES),
+                    member_digest="crc32c", **KINDS)
+
+
+def _publish(root, member_digest):
+    pack = os.path.join(root, "pack")
+    os.makedirs(pack)
+    part = os.path.join(pack, "c.tar.x.part")
+    with open(part, "wb") as handle:
+        handle.write(_regular_tar(ENTRIES))
+    plan = _sidecar_plan(ENTRIES)
+    validation = validate_stored_tar_part(
+        part, plan, container_ordinal=0, member_digest=member_digest)
+    return publish_stored_tar_pair(
+        os.path.join(root, "manifests"), part,
+        os.path.join(pack, "c.tar"), plan, (), validation=validation,
+        session_id=1, chunk_index=0, container_id=5, container_ordinal=0,
+        owner_token="owner", db=_PairDB(), pack_dir=pack,
+        member_digest=member_digest)
+
+
+class SidecarDigestTests(unittest.TestCase):
+    def test_the_sidecar_records_and_returns_member_digests(self):
+        with tempfile.TemporaryDirectory() as root:
+            result = _publish(root, "sha256")
+            parsed = search_tar_sidecar(result.sidecar_path,
+                                        directory="/r/a")
+
+        self.assertEqual(parsed.header["version"], TAR_SIDECAR_VERSION)
+        self.assertEqual(parsed.header["member_digest_algorithm"], "sha256")
+        self.assertEqual([item["digest"] for item in parsed.expected_members],
+                         [_sha256(payload) for _name, payload in ENTRIES])
+        self.assertEqual({(m["digest_algorithm"], m["digest"])
+                          for m in parsed.matches},
+                         {("sha256", _sha256(ENTRIES[0][1])),
+                          ("sha256", _sha256(b""))})
+
+    def test_digests_are_optional(self):
+        with tempfile.TemporaryDirectory() as root:
+            parsed = search_tar_sidecar(_publish(root, None).sidecar_path)
+        self.assertIsNone(parsed.header["member_digest_algorithm"])
+        self.assertTrue(all("digest" not in item
+                            for item in parsed.expected_members))
+
+
+class RestoreDigestTests(unittest.TestCase):
+    def setUp(self):
+        CANCEL.clear()
+        self.tmp = tempfile.mkdtemp(prefix="digest_restore_")
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.restore = os.path.join(self.tmp, "restore")
+        os.makedirs(self.restore)
+        self.retriever = LTORetriever(
+            db=cast(Any, None), tape_drive="Z:\\",
+            staging_dir=os.path.join(self.tmp, "staging"),
+            restore_dir=self.restore, manifest_archive_root=self.tmp)
+        self.tar = os.path.join(self.tmp, "c.tar")
+        with open(self.tar, "wb") as handle:
+            handle.write(_regular_tar(ENTRIES))
+        self.sidecar = search_tar_sidecar(
+            _publish(os.path.join(self.tmp, "p"), "sha256").sidecar_path)
+
+    def _record(self, name, **extra):
+        return {"member_name": name, "stored_path": name,
+                "original_path": f"/r/{name}",
+                "file_name": os.path.basename(name),
+                "file_size_bytes": len(dict(ENTRIES)[name]),
+                "format_version": STORED_TAR_FORMAT_VERSION,
+                "tar_dialect": STORED_TAR_DIALECT, **extra}
+
+    def test_a_matching_member_is_restored(self):
+        record = self._record("a/one", tar_digest_algorithm="sha256",
+                              tar_digest=_sha256(ENTRIES[0][1]))
+        self.assertEqual(self.retriever._restore_tar_members(
+            self.tar, [record], sidecar=self.sidecar), 1)
+        with open(os.path.join(self.restore, "one"), "rb") as handle:
+            self.assertEqual(handle.read(), ENTRIES[0][1])
+
+    def test_a_digest_mismatch_is_refused_before_publication(self):
+        for item in self.sidecar.expected_members:
+            if item["name"] == "a/one":
+                item["digest"] = _sha256(b"something else")
+        with self.assertRaisesRegex(StoredTarError, "digest mismatch"):
+            self.retriever._restore_tar_members(
+                self.tar, [self._record("a/one")], sidecar=self.sidecar)
+        self.assertEqual(os.listdir(self.restore), [])
+
+    def test_the_catalog_digest_must_agree_with_the_sidecar(self):
+        record = self._record("b/two", tar_digest_algorithm="sha256",
+                              tar_digest=_sha256(b"old"))
+        with self.assertRaisesRegex(StoredTarError, "catalog/sidecar digest"):
+            self.retriever._restore_tar_members(
+                self.tar, [record], sidecar=self.sidecar)
+        self.assertEqual(os.listdir(self.restore), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
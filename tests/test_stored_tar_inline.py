@@ -0,0 +1,205 @@
+"""Stored TAR validation while the stream is received, not after."""
+import io
+import os
+import shlex
+import tarfile
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from src.pipeline_types import StoredTarExpectedMember
+from src import remote_transport
+from src.remote_transport import _remote_tar_store
+from src.tar_container import (
+    GNU_RECORD_SIZE,
+    STORED_TAR_DIALECT,
+    STORED_TAR_FORMAT_VERSION,
+    StoredTarError,
+    StoredTarReader,
+    StoredTarStreamValidator,
+    match_stored_tar_scan,
+    validate_stored_tar_part,
+)
+
+
+def _tar(entries):
+    output = io.BytesIO()
+    with tarfile.open(fileobj=output, mode="w",
+                      format=tarfile.PAX_FORMAT) as archive:
+        for name, data in entries:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    data = output.getvalue()
+    return data + bytes((-len(data)) % GNU_RECORD_SIZE)
+
+
+ENTRIES = [("a/one", b"1" * 700), ("a/two", b""), ("b/three", b"3" * 513)]
+PLAN = [StoredTarExpectedMember(name, len(data), index + 10)
+        for index, (name, data) in enumerate(ENTRIES)]
+KINDS = {"tar_dialect": STORED_TAR_DIALECT,
+         "format_version": STORED_TAR_FORMAT_VERSION}
+
+
+def _scan(data, piece=997):
+    validator = StoredTarStreamValidator(max_buffered_chunks=2, **KINDS)
+    for start in range(0, len(data), piece):
+        validator.feed(data[start:start + piece])
+    return validator.finish()
+
+
+class StreamValidatorTests(unittest.TestCase):
+    def test_pushed_pieces_parse_exactly_as_the_reader_does(self):
+        data = _tar(ENTRIES)
+        scan = _scan(data)
+        self.assertEqual(scan.archive_size, len(data))
+        self.assertTrue(all(item.ordinal is None for item in scan.members))
+
+        matched = match_stored_tar_scan(scan, PLAN)
+        expected = StoredTarReader(io.BytesIO(data), **KINDS).validate(PLAN)
+        self.assertEqual(matched, expected)
+
+    def test_malformed_streams_fail_at_finish(self):
+        data = _tar(ENTRIES)
+        cases = {
+            "truncated": data[:len(data) - GNU_RECORD_SIZE + 100],
+            "trailing": data + b"\1" * 512,
+        }
+        for label, broken in cases.items():
+            with self.subTest(label):
+                with self.assertRaises(StoredTarError):
+                    _scan(broken)
+
+    def test_data_after_a_failure_is_dropped_without_blocking(self):
+        validator = StoredTarStreamValidator(max_buffered_chunks=1, **KINDS)
+        validator.feed(b"\xff" * 512)
+        for _ in range(64):
+            validator.feed(bytes(GNU_RECORD_SIZE))
+        with self.assertRaises(StoredTarError):
+            validator.finish()
+
+    def test_the_plan_is_matched_against_the_scanned_members(self):
+        scan = _scan(_tar(ENTRIES))
+        wrong = [PLAN[0], StoredTarExpectedMember("a/two", 1, 11), PLAN[2]]
+        with self.assertRaisesRegex(StoredTarError, "wrong size"):
+            match_stored_tar_scan(scan, wrong)
+        with self.assertRaisesRegex(StoredTarError, "unexpected TAR member"):
+            match_stored_tar_scan(scan, PLAN[:2])
+
+
+class InlinePartValidationTests(unittest.TestCase):
+    def _sidecar_plan(self):
+        return [{"member_name": name, "canonical_source_path": f"/r/{name}",
+                 "expected_size": len(data), "plan_ordinal": index,
+                 "container_ordinal": 0}
+                for index, (name, data) in enumerate(ENTRIES)]
+
+    def test_an_inline_scan_replaces_the_re_read(self):
+        data = _tar(ENTRIES)
+        with tempfile.TemporaryDirectory() as root:
+            part = os.path.join(root, "c.tar.x.part")
+            with open(part, "wb") as handle:
+                handle.write(data)
+            reread = validate_stored_tar_part(
+                part, self._sidecar_plan(), container_ordinal=0)
+            with mock.patch("src.tar_container.validate_stored_tar") as read:
+                inline = validate_stored_tar_part(
+                    part, self._sidecar_plan(), container_ordinal=0,
+                    inline_scan=_scan(data))
+            read.assert_not_called()
+            self.assertEqual(inline, reread)
+
+            # A part that no longer matches what was scanned is refused.
+            with open(part, "ab") as handle:
+                handle.write(bytes(512))
+            with self.assertRaises(StoredTarError):
+                validate_stored_tar_part(
+                    part, self._sidecar_plan(), container_ordinal=0,
+                    inline_scan=_scan(data))
+
+
+class TransportTeeTests(unittest.TestCase):
+    def _store(self, root, payload, inline):
+        source = os.path.join(root, "source.tar")
+        with open(source, "wb") as handle:
+            handle.write(payload)
+        part = os.path.join(root, f"c.tar.{int(inline)}.part")
+        # Drain the path list as tar would, then emit the archive.
+        command = ["sh", "-c", f"cat >/dev/null; cat {shlex.quote(source)}"]
+        with mock.patch("src.remote_transport._ssh_stream_command",
+                        return_value=(command, None, None)), \
+                mock.patch("src.remote_transport._apply_proc_tuning"):
+            result = _remote_tar_store(
+                "u", "h", "/base", [name for name, _ in ENTRIES], part,
+                inline_validation=inline)
+        with open(part, "rb") as handle:
+            self.assertEqual(handle.read(), payload)
+        return result
+
+    def test_the_part_and_the_scan_come_from_one_pass(self):
+        data = _tar(ENTRIES)
+        with tempfile.TemporaryDirectory() as root:
+            result = self._store(root, data, inline=True)
+            self.assertTrue(result.ok, result.error)
+            self.assertEqual(result.inline_error, "")
+            self.assertEqual(result.inline_scan.archive_size, len(data))
+            self.assertEqual([m.name for m in result.inline_scan.members],
+                             [name for name, _ in ENTRIES])
+
+            plain = self._store(root, data, inline=False)
+            self.assertTrue(plain.ok, plain.error)
+            self.assertIsNone(plain.inline_scan)
+
+    def test_a_malformed_stream_is_reported_not_trusted(self):
+        with tempfile.TemporaryDirectory() as root:
+            result = self._store(root, _tar(ENTRIES) + b"\1" * 512,
+                                 inline=True)
+        self.assertTrue(result.ok, result.error)
+        self.assertIsNone(result.inline_scan)
+        self.assertTrue(result.inline_error)
+
+    def test_a_failed_part_write_fails_the_store_instead_of_hanging(self):
+        real_tee = remote_transport._tee_stored_tar
+
+        class _Full:
+            def __init__(self, exc):
+                self.exc = exc
+
+            def write(self, _block):
+                raise self.exc
+
+        for exc in (OSError(28, "No space left on device"),
+                    RuntimeError("tee broke")):
+            with self.subTest(exc=type(exc).__name__), \
+                    tempfile.TemporaryDirectory() as root:
+                # An endless producer: only a kill can end it.
+                command = ["sh", "-c", "cat >/dev/null; cat /dev/zero"]
+                outcome = {}
+
+                def store():
+                    outcome["result"] = _remote_tar_store(
+                        "u", "h", "/base", ["a"],
+                        os.path.join(root, "c.tar.part"),
+                        inline_validation=True)
+
+                with mock.patch("src.remote_transport._ssh_stream_command",
+                                return_value=(command, None, None)), \
+                        mock.patch("src.remote_transport._apply_proc_tuning"), \
+                        mock.patch(
+                            "src.remote_transport._tee_stored_tar",
+                            side_effect=lambda pipe, _out, v, state: real_tee(
+                                pipe, _Full(exc), v, state)):
+                    worker = threading.Thread(target=store, daemon=True)
+                    worker.start()
+                    worker.join(timeout=20)
+                self.assertFalse(worker.is_alive(), "store hung")
+                result = outcome["result"]
+                self.assertFalse(result.ok)
+                self.assertIn("writing the part failed", result.error)
+                self.assertIn(str(exc), result.error)
+                self.assertIsNone(result.inline_scan)
+
+
+if __name__ == "__main__":
+    unittest.main()
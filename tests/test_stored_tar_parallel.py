@@ -0,0 +1,162 @@
+"""Concurrent container builds for one Stored TAR chunk."""
+import io
+import os
+import tarfile
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src.remote_staging import RemoteChunkStager
+from src.remote_transport import RemoteTarStoreResult
+from src.tar_container import GNU_RECORD_SIZE
+
+TIMEOUT = 20
+
+
+def _write_tar(path, name, payload):
+    with tarfile.open(path, "w", format=tarfile.PAX_FORMAT) as archive:
+        info = tarfile.TarInfo(name)
+        info.size = len(payload)
+        archive.addfile(info, io.BytesIO(payload))
+    with open(path, "ab") as handle:
+        handle.write(bytes((-os.path.getsize(path)) % GNU_RECORD_SIZE))
+
+
+class _DB:
+    def __init__(self, count):
+        self.rows = [{"container_id": 10 + ordinal,
+                      "container_ordinal": ordinal, "owner_token": None,
+                      "validated_part_locator": None,
+                      "validation_state": "planned"}
+                     for ordinal in range(count)]
+        self.claims = []
+        self.validated = []
+        self.lock = threading.Lock()
+
+    def get_archive_containers(self, _session, _chunk):
+        return [dict(row) for row in self.rows]
+
+    def claim_stored_tar_container_build(self, container_id, owner, part):
+        with self.lock:
+            self.claims.append((container_id, part))
+        return True
+
+    def mark_stored_tar_validated_part(self, container_id, *args):
+        with self.lock:
+            self.validated.append(container_id)
+        return True
+
+
+def _chunk(count):
+    containers = [SimpleNamespace(
+        container_ordinal=ordinal, container_name=f"c{ordinal}.tar",
+        tar_dialect="gnu-pax-sparse-v1", format_version="stored-tar-v1")
+        for ordinal in range(count)]
+    members = {ordinal: [SimpleNamespace(
+        plan_ordinal=ordinal, remote_path=f"/remote/f{ordinal}",
+        file_size_bytes=ordinal + 1)] for ordinal in range(count)}
+    return containers, members
+
+
+class ParallelStoredTarBuildTests(unittest.TestCase):
+    def _stager(self, root, count, streams):
+        host = SimpleNamespace(
+            db=_DB(count), remote_path="/remote", remote_user="u",
+            remote_host="h", remote_password="", ssh_cipher="",
+            use_mbuffer=False, mbuffer_size="1G", fetch_cores=None,
+            fetch_parallel_streams=streams,
+            cfg=SimpleNamespace(
+                local_manifest_archive_root=os.path.join(root, "man")),
+            _note_fetch_failure=lambda *args, **kwargs: None)
+        return RemoteChunkStager(host)
+
+    def test_containers_stream_together_and_publish_in_order(self):
+        count = 3
+        containers, members = _chunk(count)
+        # Every stream must be open at once before any can finish, and the
+        # first container finishes streaming last.
+        all_open = threading.Barrier(count, timeout=TIMEOUT)
+        streamed = [threading.Event() for _ in range(count)]
+        finished = []
+        published = []
+
+        def store(_user, _host, _base, paths, part, **_kwargs):
+            ordinal = int(paths[0][1:])
+            all_open.wait()
+            if ordinal == 0:
+                for event in streamed[1:]:
+                    self.assertTrue(event.wait(TIMEOUT))
+            _write_tar(part, paths[0], b"x" * (ordinal + 1))
+            finished.append(ordinal)
+            streamed[ordinal].set()
+            return RemoteTarStoreResult(True, part, os.path.getsize(part), 0, "")
+
+        def publish(_root, part, final, plan, *_args, **kwargs):
+            published.append(kwargs["container_ordinal"])
+            return SimpleNamespace(ordinal=kwargs["container_ordinal"])
+
+        with tempfile.TemporaryDirectory() as root:
+            stager = self._stager(root, count, streams=count)
+            with mock.patch("src.remote_staging._remote_tar_store",
+                            side_effect=store), \
+                    mock.patch("src.remote_staging.publish_stored_tar_pair",
+                               side_effect=publish):
+                publications = stager._build_stored_tar_containers(
+                    2, 3, containers, members, os.path.join(root, "pack"))
+            db = stager.host.db
+
+        self.assertEqual([p.ordinal for p in publications], [0, 1, 2])
+        self.assertEqual(finished[-1], 0)
+        self.assertEqual(published, [0, 1, 2])
+        self.assertEqual(sorted(db.validated), [10, 11, 12])
+        self.assertEqual(len({part for _, part in db.claims}), count)
+
+    def test_a_failed_container_stops_the_rest_and_publishes_nothing_after(self):
+        containers, members = _chunk(3)
+        published = []
+
+        def build(session_id, chunk_index, container_plan, plan_members,
+                  pack_dir, *, abort_evt=None, before_publish=None, **_kwargs):
+            ordinal = container_plan.container_ordinal
+            if ordinal == 0:
+                # Fails once its siblings are already waiting to publish.
+                threading.Event().wait(0.1)
+                raise RuntimeError("direct Stored TAR stream failed: boom")
+            before_publish()
+            published.append(ordinal)
+            return SimpleNamespace(ordinal=ordinal)
+
+        abort = threading.Event()
+        with tempfile.TemporaryDirectory() as root:
+            stager = self._stager(root, 3, streams=3)
+            with mock.patch.object(stager, "_build_stored_tar_container",
+                                   side_effect=build):
+                with self.assertRaisesRegex(RuntimeError, "boom"):
+                    stager._build_stored_tar_containers(
+                        2, 3, containers, members, root, abort_evt=abort)
+
+        self.assertEqual(published, [])
+        self.assertTrue(abort.is_set())
+
+    def test_one_stream_builds_serially(self):
+        containers, members = _chunk(2)
+        calls = []
+
+        def build(_session, _chunk, container_plan, *_args, before_publish=None,
+                  **_kwargs):
+            calls.append((container_plan.container_ordinal, before_publish))
+            return container_plan.container_ordinal
+
+        with tempfile.TemporaryDirectory() as root:
+            stager = self._stager(root, 2, streams=1)
+            with mock.patch.object(stager, "_build_stored_tar_container",
+                                   side_effect=build):
+                self.assertEqual(stager._build_stored_tar_containers(
+                    2, 3, containers, members, root), [0, 1])
+        self.assertEqual(calls, [(0, None), (1, None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
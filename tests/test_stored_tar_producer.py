@@ -10,8 +10,12 @@ from types import SimpleNamespace
 from unittest import mock
 
 from src.archive_artifacts import (
+    TAR_SIDECAR_VERSION,
     ArtifactConflict,
     ArtifactError,
+    _coerce_sidecar_plan,
+    _sidecar_records,
+    _write_tar_sidecar_part,
     publish_no_clobber,
     publish_stored_tar_pair,
     search_tar_sidecar,
@@ -464,6 +468,41 @@ class StoredTarPairPublicationTests(unittest.TestCase):
             shutil.rmtree(fixture[0])
             self.assertTrue(os.path.isfile(result.sidecar_path))
 
+    def test_sidecar_records_member_byte_offsets(self):
+        with tempfile.TemporaryDirectory() as root:
+            fixture = self._fixture(root, with_exception=True)
+            db = _PairDB()
+            result = self._publish(fixture, db)
+            parsed = search_tar_sidecar(result.sidecar_path)
+            member = parsed.expected_members[0]
+            self.assertEqual(
+                (member["header_offset"], member["data_offset"]), (0, 512))
+            self.assertEqual(parsed.matches[0]["data_offset"], 512)
+            self.assertNotIn("data_offset", parsed.expected_members[1])
+            with open(result.tar_path, "rb") as handle:
+                handle.seek(member["data_offset"])
+                self.assertEqual(handle.read(3), b"abc")
+            self.assertEqual(db.calls[0]["sidecar_version"], TAR_SIDECAR_VERSION)
+
+    def test_published_v1_sidecar_keeps_its_version_when_adopted(self):
+        with tempfile.TemporaryDirectory() as root:
+            fixture = self._fixture(root)
+            pack, manifests, part, final, plan, diagnostics, validation = fixture
+            records, _counts = _sidecar_records(
+                _coerce_sidecar_plan(plan, 0), validation, {},
+                session_id=2, chunk_index=3, container_id=4,
+                container_ordinal=0, tar_size=validation.archive_size,
+                version="tar-sidecar-v1")
+            sidecar = os.path.join(
+                manifests, *tar_sidecar_locator(2, 3, 0).split("/"))
+            _write_tar_sidecar_part(sidecar, records)
+            db = _PairDB()
+            result = self._publish(fixture, db)
+            self.assertEqual(db.calls[0]["sidecar_version"], "tar-sidecar-v1")
+            parsed = search_tar_sidecar(
+                result.sidecar_path, expected_version="tar-sidecar-v1")
+            self.assertNotIn("data_offset", parsed.expected_members[0])
+
     def test_permission_and_unreadable_dispositions_roundtrip(self):
         for disposition in (
                 SourceDisposition.SOURCE_PERMISSION_DENIED,
@@ -0,0 +1,230 @@
+"""Streaming tar -> ZIP transcoding (``zip_stream_transcode``).
+
+The remote side is the exact tar command the fetch path sends, run through a
+local shell instead of SSH, so the members, names and diagnostics are the
+real GNU tar ones.
+"""
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+from types import SimpleNamespace
+from unittest import mock
+
+from src.packer import LTOPacker, PackSourceError
+from src.pipeline_types import ContainerFormat
+from src.remote_staging import RemoteChunkStager
+from src.remote_transport import RemoteTarStreamError, _iter_remote_tar_members
+
+
+def _local_stream(_user, _host, command, password="", cipher=""):
+    """Run the exact remote command through a local shell instead of SSH."""
+    return ["sh", "-c", command], None, None
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as handle:
+        handle.write(data)
+
+
+def _packer():
+    return LTOPacker(4, manifest_enabled=False)
+
+
+class _FakeSessionDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.local_rel = {}
+        self.statuses = []
+        self.row_updates = []
+
+    def update_manifest_rows_fetching(self, ids, session_id=None):
+        pass
+
+    def update_manifest_rows_fetched(self, rows, session_id=None):
+        for local_rel, manifest_id in rows:
+            self.local_rel[manifest_id] = local_rel
+
+    def update_manifest_rows_fetch_failed(self, ids, err, session_id=None):
+        self.row_updates.extend((i, "fetch_failed") for i in ids)
+
+    def update_manifest_row(self, manifest_id, session_id=None, status=None,
+                            **kwargs):
+        self.row_updates.append((manifest_id, status))
+
+    def update_chunk_status(self, session_id, chunk_index, status):
+        self.statuses.append(status)
+
+    def get_chunk_files(self, session_id, chunk_index):
+        return [dict(row, local_rel_path=self.local_rel.get(row["manifest_id"]))
+                for row in self.rows]
+
+
+@unittest.skipIf(os.name == "nt" or not all(
+    shutil.which(tool) for tool in ("sh", "tar")),
+    "needs a POSIX shell with GNU tar")
+class StreamTranscodeTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="stream_transcode_")
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.remote = os.path.join(self.tmp, "remote")
+        self.dest = os.path.join(self.tmp, "pack")
+        _write(os.path.join(self.remote, "a.txt"), b"alpha")
+        _write(os.path.join(self.remote, "sub", "b.bin"), b"\x00\x01\x02")
+        _write(os.path.join(self.remote, "big.dat"), b"L" * (2 * 1024 * 1024))
+        patcher = mock.patch("src.remote_transport._ssh_stream_command",
+                             _local_stream)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_members_stream_into_the_bundle_and_loose_files(self):
+        names = ["a.txt", "sub/b.bin", "big.dat", "gone.txt"]
+        seen = []
+
+        def entries():
+            for member, reader in _iter_remote_tar_members(
+                    "u", "h", self.remote, names):
+                seen.append(member.name)
+                yield {"path": member.name, "rel": member.name,
+                       "size": member.size, "open": lambda r=reader: r}
+
+        metadata = _packer().run_stream(
+            self.dest, 1, entries(), 3 * 1024 * 1024)
+
+        # The file the remote could not stat is simply absent, not an error.
+        self.assertEqual(seen, ["a.txt", "sub/b.bin", "big.dat"])
+        with zipfile.ZipFile(os.path.join(self.dest, "Bundle_001.zip")) as z:
+            self.assertEqual(z.namelist(), ["a.txt", "sub/b.bin"])
+            self.assertEqual(z.read("sub/b.bin"), b"\x00\x01\x02")
+        with open(os.path.join(self.dest, "big.dat"), "rb") as handle:
+            self.assertEqual(len(handle.read()), 2 * 1024 * 1024)
+        self.assertEqual([m["is_packed"] for m in metadata],
+                         [True, True, False])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, "_fetch")))
+
+    def test_a_failed_stream_raises(self):
+        with mock.patch("src.remote_transport._ssh_stream_command",
+                        lambda *a, **k: (["sh", "-c", "exit 3"], None, None)):
+            with self.assertRaises(RemoteTarStreamError):
+                list(_iter_remote_tar_members("u", "h", self.remote, ["a.txt"]))
+
+    def test_a_broken_source_ends_the_pack_instead_of_skipping(self):
+        class Broken(io.BytesIO):
+            def readinto(self, buffer):
+                raise PackSourceError("stream broke")
+
+        skipped = mock.MagicMock()
+        entries = [
+            {"path": "a", "rel": "a", "size": 1,
+             "open": lambda: io.BytesIO(b"a")},
+            {"path": "b", "rel": "b", "size": 1, "open": Broken},
+            {"path": "c", "rel": "c", "size": 1,
+             "open": lambda: io.BytesIO(b"c")},
+        ]
+        with self.assertRaises(PackSourceError):
+            _packer().run_stream(self.dest, 1, iter(entries), 3,
+                                 skipped_tracker=skipped)
+        skipped.add.assert_not_called()
+        # The bundle was closed on the way out and holds only what was whole.
+        with zipfile.ZipFile(os.path.join(self.dest, "Bundle_001.zip")) as z:
+            self.assertEqual(z.namelist(), ["a"])
+
+    def _stager(self, rows):
+        db = _FakeSessionDB(rows)
+        host = SimpleNamespace(
+            db=db,
+            cfg=SimpleNamespace(
+                max_zip_size_gb=4, index_min_file_mb=10,
+                index_packed_small_files=False,
+                small_file_manifest_enabled=False,
+                small_file_manifest_format="jsonl",
+                small_file_manifest_compression="zstd",
+                zip_threshold_mb=1),
+            remote_path=self.remote, remote_user="u", remote_host="h",
+            remote_password="", ssh_cipher="", use_mbuffer=False,
+            mbuffer_size="2G", fetch_cores=None, metadata_batch_size=100,
+            pack_file_batch_size=100, ram_sample_interval=0,
+            skipped_tracker=mock.MagicMock(), governor=None,
+            _staged_bytes=0, _staged_lock=threading.Lock(),
+            _start_fetch_monitor=lambda *a, **k: None,
+            _cleanup_dir=lambda path: shutil.rmtree(path, True),
+            _note_fetch_failure=mock.MagicMock())
+        return RemoteChunkStager(host), host
+
+    def test_a_chunk_is_staged_in_one_pass_with_the_fetch_names(self):
+        _write(os.path.join(self.remote, "Dir", "x.txt"), b"upper")
+        _write(os.path.join(self.remote, "dir", "X.txt"), b"lower")
+
+        def row(manifest_id, rel, size, status="planned"):
+            return {"manifest_id": manifest_id,
+                    "remote_path": f"{self.remote}/{rel}",
+                    "file_size_bytes": size, "status": status,
+                    "error_msg": None}
+        rows = [row(1, "Dir/x.txt", 5), row(2, "dir/X.txt", 5),
+                row(3, "big.dat", 2 * 1024 * 1024), row(4, "gone.txt", 1),
+                row(5, "old.txt", 1, status="source_missing")]
+        stager, host = self._stager(rows)
+        fetch_dir = os.path.join(self.tmp, "_fetch")
+
+        desc = stager._stream_stage_chunk(
+            7, 0, rows, fetch_dir, self.dest, ContainerFormat.ZIP, None, 0.0)
+
+        self.assertIsNotNone(desc)
+        self.assertFalse(os.path.exists(fetch_dir))
+        # The case-folded collision got its own name, as the extract path
+        # would have given it, and both files kept their own bytes.
+        second = host.db.local_rel[2]
+        self.assertNotEqual(second.casefold(), "dir/x.txt")
+        with zipfile.ZipFile(os.path.join(self.dest, "Bundle_001.zip")) as z:
+            self.assertEqual(z.read("Dir/x.txt"), b"upper")
+            self.assertEqual(z.read(second), b"lower")
+        self.assertEqual(
+            sorted(m["original_path"] for m in desc.metadata),
+            sorted(f"{self.remote}/{rel}"
+                   for rel in ("Dir/x.txt", "dir/X.txt", "big.dat")))
+        self.assertEqual(
+            sorted(item["manifest_id"] for item in desc.source_missing_files),
+            [4, 5])
+        self.assertIn((4, "source_missing"), host.db.row_updates)
+        self.assertEqual(host._staged_bytes, desc.staged_bytes)
+
+    def test_hard_linked_files_are_both_packed(self):
+        _write(os.path.join(self.remote, "orig.txt"), b"linked")
+        os.link(os.path.join(self.remote, "orig.txt"),
+                os.path.join(self.remote, "link.txt"))
+        rows = [{"manifest_id": i, "remote_path": f"{self.remote}/{rel}",
+                 "file_size_bytes": 6, "status": "planned", "error_msg": None}
+                for i, rel in ((1, "orig.txt"), (2, "link.txt"))]
+        stager, host = self._stager(rows)
+
+        desc = stager._stream_stage_chunk(
+            7, 0, rows, os.path.join(self.tmp, "_fetch"), self.dest,
+            ContainerFormat.ZIP, None, 0.0)
+
+        self.assertIsNotNone(desc)
+        self.assertEqual(desc.source_missing_files, [])
+        with zipfile.ZipFile(os.path.join(self.dest, "Bundle_001.zip")) as z:
+            self.assertEqual(z.read("orig.txt"), b"linked")
+            self.assertEqual(z.read("link.txt"), b"linked")
+
+    def test_a_size_change_fails_the_chunk(self):
+        rows = [{"manifest_id": 1, "remote_path": f"{self.remote}/a.txt",
+                 "file_size_bytes": 4, "status": "planned", "error_msg": None}]
+        stager, host = self._stager(rows)
+
+        desc = stager._stream_stage_chunk(
+            7, 0, rows, os.path.join(self.tmp, "_fetch"), self.dest,
+            ContainerFormat.ZIP, None, 0.0)
+
+        self.assertIsNone(desc)
+        self.assertIn((1, "fetch_failed"), host.db.row_updates)
+        self.assertEqual(host.db.statuses[-1], "fetch_failed")
+        self.assertFalse(os.path.exists(self.dest))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+"""Write-group history and the ready queue's predicted-throughput start."""
+import json
+import os
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src import remote_orchestrator as ro
+from src.chunk_sizing import TapeWriteModel
+from src.ready_queue import ReadyItem, ReadyQueue, ReadyQueueLimits
+from src.remote_writer import RemoteChunkWriter
+from src.tape_write_log import (
+    TapeWriteHistory, chunk_stream_seconds, fill_band)
+
+GiB = 1024**3
+MiB = 1024**2
+TIMEOUT = 20
+
+
+def _record(history, *, tape="T1", fill=0.5, chunks=1, gib=10,
+            mbs=300.0, group_overhead=60.0, chunk_overhead=10.0):
+    stream = gib * GiB / (mbs * MiB)
+    history.record(
+        tape_label=tape, fill_fraction=fill, chunks=chunks,
+        group_bytes=gib * GiB,
+        duration_seconds=stream + group_overhead + chunk_overhead * chunks,
+        stream_seconds=stream)
+
+
+def _item(index, gib):
+    return ReadyItem(chunk_index=index, pack_dir=f"/tmp/_pack_{index}",
+                     prepared_bytes=int(gib * GiB), file_count=1,
+                     desc=SimpleNamespace(chunk_index=index))
+
+
+class TapeWriteHistoryTests(unittest.TestCase):
+    def test_the_fit_separates_group_and_chunk_overhead(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            history = TapeWriteHistory(log_dir)
+            for chunks in (1, 2, 4, 8):
+                _record(history, chunks=chunks)
+            with open(history.path, "a", encoding="utf-8") as handle:
+                handle.write("not json\n")
+
+            model = history.model("T1", 0.5)
+
+        self.assertIsInstance(model, TapeWriteModel)
+        self.assertEqual(model.samples, 4)
+        self.assertAlmostEqual(model.group_overhead_seconds, 60, delta=0.1)
+        self.assertAlmostEqual(model.overhead_seconds, 10, delta=0.1)
+        self.assertAlmostEqual(model.stream_bytes_per_second, 300 * MiB,
+                               delta=0.1 * MiB)
+        self.assertTrue(history.path.endswith(
+            os.path.join("tape_write", "history.jsonl")))
+
+    def test_the_closest_history_wins(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            history = TapeWriteHistory(log_dir)
+            for _ in range(3):
+                _record(history, tape="T1", fill=0.1, mbs=300)
+                _record(history, tape="T2", fill=0.9, mbs=200)
+            for _ in range(2):
+                _record(history, tape="T1", fill=0.92, mbs=100)
+
+            # Same tape in the 90% band has two groups: any tape in that
+            # band. The rate is bytes over streaming time, not a mean.
+            self.assertAlmostEqual(
+                history.model("T1", 0.95).stream_bytes_per_second / MiB,
+                50 / (3 * 10 / 200 + 2 * 10 / 100), delta=0.1)
+            # An unknown fill level falls back to the tape's own groups.
+            self.assertAlmostEqual(
+                history.model("T1", None).stream_bytes_per_second / MiB,
+                50 / (3 * 10 / 300 + 2 * 10 / 100), delta=0.1)
+            self.assertIsNone(TapeWriteHistory(
+                os.path.join(log_dir, "empty")).model("T1", 0.5))
+
+    def test_fill_bands_are_tenths_of_the_tape(self):
+        self.assertEqual(fill_band(0.3), 0.3)
+        self.assertEqual(fill_band(0.349), 0.3)
+        self.assertEqual(fill_band(1.0), 0.9)
+        self.assertIsNone(fill_band(None))
+
+    def test_stream_seconds_need_a_measured_rate(self):
+        self.assertAlmostEqual(chunk_stream_seconds(
+            300 * MiB, {"tape_stream_mbs": "300.0"}), 1.0)
+        self.assertIsNone(chunk_stream_seconds(GiB, {"tape_stream_mbs": ""}))
+        self.assertIsNone(chunk_stream_seconds(GiB, None))
+
+
+class PredictedStartTests(unittest.TestCase):
+    def _queue(self, model, target=0.9, min_start=20 * GiB):
+        q = ReadyQueue(ReadyQueueLimits(min_start, 40 * GiB, 80 * GiB, 48))
+        q.set_write_model(model, target)
+        return q
+
+    def test_a_group_of_undersized_chunks_still_reaches_the_target(self):
+        # 1 GiB chunks with 20 s per chunk and 30 s per group at 300 MB/s:
+        # one chunk streams 6% of the time, far below the target, but each
+        # added chunk spreads the group's own cost further. Eleven chunks
+        # amortize it to 89.6%, twelve to 90.4%.
+        model = TapeWriteModel(20.0, 300 * MiB, 5,
+                               group_overhead_seconds=30.0)
+        self.assertLess(model.efficiency(GiB), 0.1)
+        q = self._queue(model, min_start=4 * GiB)
+        for index in range(11):
+            self.assertTrue(q.put(_item(index, 1)))
+        self.assertEqual(q.wait_for_group(timeout=0.2), ([], "timeout"))
+        q.put(_item(11, 1))
+        items, reason = q.wait_for_group(timeout=TIMEOUT)
+        self.assertEqual(reason, "predicted_throughput_reached")
+        self.assertEqual(len(items), 12)
+
+        for item in items:
+            q.mark_written(item)
+        q.record_group_result(12 * GiB, 12 * GiB / (40 * MiB))
+        metrics = q.metrics()
+        self.assertTrue(metrics["write_model"])
+        self.assertEqual(metrics["target_group_efficiency"], 0.9)
+        self.assertEqual(metrics["groups_measured"], 1)
+        self.assertAlmostEqual(metrics["last_group_predicted_mbs"], 39.5,
+                               delta=0.1)
+        self.assertEqual(metrics["last_group_actual_mbs"], 40.0)
+        self.assertAlmostEqual(metrics["prediction_mean_abs_error_pct"], 1.2,
+                               delta=0.1)
+
+    def test_the_sized_start_bytes_still_apply(self):
+        q = self._queue(TapeWriteModel(1.0, 300 * MiB, 5,
+                                       group_overhead_seconds=5.0))
+        q.put(_item(0, 19))
+        # Amortized past the target, but below min_start_bytes.
+        self.assertEqual(q.wait_for_group(timeout=0.2), ([], "timeout"))
+        q.put(_item(1, 2))
+        items, reason = q.wait_for_group(timeout=TIMEOUT)
+        self.assertEqual(reason, "predicted_throughput_reached")
+        self.assertEqual(len(items), 2)
+
+    def test_a_blocked_producer_starts_the_group_early(self):
+        q = self._queue(TapeWriteModel(60.0, 300 * MiB, 5,
+                                       group_overhead_seconds=600.0))
+        for index in range(7):
+            q.put(_item(index, 10))
+        self.assertEqual(q.wait_for_group(timeout=0.2), ([], "timeout"))
+
+        producer = threading.Thread(target=q.put, args=(_item(7, 15),))
+        producer.start()
+        items, reason = q.wait_for_group(timeout=TIMEOUT)
+        self.assertEqual(reason, "producer_blocked")
+        self.assertEqual(len(items), 7)
+        for item in items:
+            q.mark_written(item)
+        producer.join(TIMEOUT)
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(q.ready_chunks, 1)
+
+    def test_no_model_keeps_the_byte_threshold(self):
+        q = self._queue(None)
+        q.put(_item(0, 25))
+        items, reason = q.wait_for_group(timeout=TIMEOUT)
+        self.assertEqual(reason, "min_ready_bytes_reached")
+        self.assertFalse(q.metrics()["write_model"])
+        self.assertIsNone(q.metrics()["last_group_predicted_mbs"])
+
+
+class HistoryWiringTests(unittest.TestCase):
+    def test_the_orchestrator_hands_over_the_tapes_history(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            orch = ro.RemoteOrchestrator.__new__(ro.RemoteOrchestrator)
+            orch.cfg = SimpleNamespace(backup_log_dir=log_dir)
+            orch.chunk_target_efficiency = 0.9
+            self.assertEqual(orch._ready_write_model("T1"), (None, None))
+            history = TapeWriteHistory(log_dir)
+            for chunks in (1, 2, 4):
+                _record(history, chunks=chunks)
+            model, target = orch._ready_write_model("T1")
+            self.assertEqual(target, 0.9)
+            self.assertAlmostEqual(model.group_overhead_seconds, 60,
+                                   delta=0.1)
+            orch.chunk_target_efficiency = 0.0
+            self.assertEqual(orch._ready_write_model("T1"), (None, None))
+
+    def test_a_written_group_is_recorded_with_its_fill_band(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            host = SimpleNamespace(cfg=SimpleNamespace(backup_log_dir=log_dir),
+                                   _tape_fill_fraction=0.25)
+            writer = RemoteChunkWriter(host)
+            writer._group_writes = [
+                {"copied_bytes": 300 * MiB, "tape_stream_mbs": "300.0"},
+                {"copied_bytes": 600 * MiB, "tape_stream_mbs": "300.0"}]
+            writer._record_group_history("T1", ["a", "b"], 33.0)
+            # A chunk without a measured rate would fold its streaming time
+            # into the fixed cost: that group is not recorded.
+            writer._group_writes = [{"copied_bytes": GiB}]
+            writer._record_group_history("T1", ["c"], 40.0)
+
+            with open(TapeWriteHistory(log_dir).path, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["tape_label"], "T1")
+        self.assertEqual(records[0]["chunks"], 2)
+        self.assertEqual(records[0]["group_bytes"], 900 * MiB)
+        self.assertEqual(records[0]["fill_fraction"], 0.25)
+        self.assertEqual(records[0]["fill_band"], 0.2)
+        self.assertEqual(records[0]["duration_seconds"], 33.0)
+        self.assertEqual(records[0]["stream_seconds"], 3.0)
+        self.assertEqual(records[0]["overhead_seconds"], 30.0)
+
+    def test_the_pipeline_refreshes_the_tapes_model(self):
+        from src.remote_pipeline import RemotePipelineCoordinator
+        model = TapeWriteModel(10.0, 300 * MiB, 3,
+                               group_overhead_seconds=60.0)
+        coordinator = RemotePipelineCoordinator.__new__(
+            RemotePipelineCoordinator)
+        coordinator.host = SimpleNamespace(
+            _ready_write_model=mock.Mock(return_value=(model, 0.9)))
+        coordinator.tape_label = "T1"
+        coordinator.ready_q = mock.Mock()
+        coordinator._refresh_write_model()
+        coordinator.host._ready_write_model.assert_called_once_with("T1")
+        coordinator.ready_q.set_write_model.assert_called_once_with(
+            model, 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()